@@ -29,19 +29,37 @@ __author__ = "Jeremy Evans"
 __email__ = "jeremyevans@hey.com"
 __license__ = "MIT"
 
-# Import main classes for easy access
-from .core.owner_earnings import OwnerEarningsCalculator
-from .core.fair_value import FairValueCalculator
-
-# Lazy import for visualization to avoid dependency issues when matplotlib/PyQt6 not available
-try:
-    from .visualization import OwnerEarningsVisualizer
-    _VISUALIZATION_AVAILABLE = True
-except ImportError:
-    _VISUALIZATION_AVAILABLE = False
-    OwnerEarningsVisualizer = None
-
-from .cli import main as cli_main
+# Main classes are imported on first access (PEP 562), so that importing
+# the package - and commands like `ms version` - do not pay for pandas,
+# matplotlib and seaborn
+_LAZY_ATTRIBUTES = {
+    "OwnerEarningsCalculator": (".core.owner_earnings", "OwnerEarningsCalculator"),
+    "FairValueCalculator": (".core.fair_value", "FairValueCalculator"),
+    "OwnerEarningsVisualizer": (".visualization", "OwnerEarningsVisualizer"),
+    "cli_main": (".cli", "main"),
+}
+
+
+def __getattr__(name):
+    import importlib
+    import importlib.util
+
+    if name == "_VISUALIZATION_AVAILABLE":
+        return importlib.util.find_spec("matplotlib") is not None
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    if name == "OwnerEarningsVisualizer" and not __getattr__("_VISUALIZATION_AVAILABLE"):
+        value = None  # Visualization is optional when matplotlib is not available
+    else:
+        value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 # Define what gets imported with "from marketswimmer import *"
 __all__ = [
@@ -4,7 +4,7 @@ Built with Typer for an excellent user experience
 """
 
 import typer
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 import os
 import subprocess
@@ -12,10 +12,11 @@ import sys
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.text import Text
-from rich.progress import Progress, TextColumn
 import time
 
+# Keep module-level imports light: analysis modules (pandas, matplotlib,
+# seaborn) are imported inside the commands that need them.
+
 # Initialize Rich console for beautiful output
 console = Console()
 
@@ -61,6 +62,16 @@ def run_python_script(script_name: str, args: list = None):
         console.print(f"[red]Error running {script_name}: {e}[/red]")
         return False
 
+def check_render_options(profile: str, chart_format: str):
+    """Validate --profile/--format; exits with an error message if invalid."""
+    from .visualization.render import check_format, get_profile
+    
+    try:
+        return get_profile(profile).name, check_format(chart_format)
+    except ValueError as e:
+        console.print(f"[red]ERROR: {e}[/red]")
+        raise typer.Exit(2)
+
 @app.command()
 def gui(
     safe_mode: bool = typer.Option(False, "--safe", "-s", help="Check for existing processes before launching"),
@@ -110,7 +121,12 @@ def gui(
 def analyze(
     ticker: str = typer.Argument(..., help="Stock ticker symbol (e.g., BRK.B, AAPL, TSLA)"),
     charts_only: bool = typer.Option(False, "--charts-only", "-c", help="Only generate charts from existing data"),
-    force: bool = typer.Option(False, "--force", "-f", help="Force re-download even if data exists")
+    force: bool = typer.Option(False, "--force", "-f", help="Force re-download even if data exists"),
+    explain: bool = typer.Option(False, "--explain", help="Show why each analysis stage ran or was skipped"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run every stage even if its inputs are unchanged"),
+    events: str = typer.Option("rich", "--events", help="Stage progress on stderr: rich, ndjson or none"),
+    profile: str = typer.Option("publication", "--profile", help="Chart render profile: publication, draft or thumbnail"),
+    chart_format: str = typer.Option("png", "--format", help="Chart file format: png, svg or webp")
 ):
     """
     Analyze a stock ticker using Warren Buffett's Owner Earnings method
@@ -121,13 +137,23 @@ def analyze(
     3. Generate comprehensive charts and analysis
     4. Save results to organized directories
     
+    Stages whose inputs have not changed since the last run are skipped.
+    
     Examples:
     - marketswimmer analyze BRK.B
     - marketswimmer analyze AAPL --charts-only
     - marketswimmer analyze TSLA --force
+    - marketswimmer analyze AAPL --explain
+    - marketswimmer analyze AAPL --events ndjson 2> events.ndjson
+    - marketswimmer analyze AAPL --profile draft --format svg
     """
     ticker = ticker.upper()
     
+    if events not in ("rich", "ndjson", "none"):
+        console.print(f"[red]ERROR: --events must be rich, ndjson or none (got {events!r})[/red]")
+        raise typer.Exit(2)
+    profile, chart_format = check_render_options(profile, chart_format)
+    
     # Handle special cases
     if ticker == "BRKB":
         ticker = "BRK.B"
@@ -141,7 +167,21 @@ def analyze(
     else:
         console.print(f"[cyan]>> Running complete analysis for {ticker}...[/cyan]")
         from .core.analysis import analyze_ticker_workflow
-        success = analyze_ticker_workflow(ticker, force)
+        from .core.events import NdjsonWriter, RichRenderer, default_bus
+        
+        renderer = None
+        if events == "rich":
+            renderer = RichRenderer()
+        elif events == "ndjson":
+            renderer = NdjsonWriter(sys.stderr)
+        if renderer is not None:
+            default_bus.subscribe(renderer)
+        try:
+            success = analyze_ticker_workflow(ticker, force, explain=explain, use_cache=not no_cache,
+                                              render_profile=profile, chart_format=chart_format)
+        finally:
+            if renderer is not None:
+                default_bus.unsubscribe(renderer)
     
     if success is True:
         console.print("\n[green]>> Analysis complete![/green]")
@@ -155,6 +195,196 @@ def analyze(
         console.print("[red]ERROR: Analysis failed. Check the output above for details.[/red]")
         raise typer.Exit(1)
 
+@app.command(name="analyze-batch")
+def analyze_batch(
+    tickers: Optional[List[str]] = typer.Argument(None, help="Ticker symbols to analyze"),
+    file: Optional[Path] = typer.Option(None, "--file", "-F", help="Text file with tickers (one per line, # comments)"),
+    workers: int = typer.Option(2, "--workers", "-w", min=1, help="Number of tickers analyzed at once"),
+    retry_failed: bool = typer.Option(False, "--retry-failed", help="Also re-run tickers that failed in a previous batch"),
+    restart: bool = typer.Option(False, "--restart", help="Ignore saved progress and analyze every ticker"),
+    download: bool = typer.Option(False, "--download", help="Open the StockRow download page for tickers without data"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run every stage even if its inputs are unchanged"),
+    status_file: Path = typer.Option(Path("data") / "batch_status.json", "--status-file", help="Where batch progress is saved"),
+    events_file: Path = typer.Option(Path("logs") / "batch" / "events.ndjson", "--events-file", help="NDJSON file receiving progress events"),
+    profile: str = typer.Option("publication", "--profile", help="Chart render profile: publication, draft or thumbnail"),
+    chart_format: str = typer.Option("png", "--format", help="Chart file format: png, svg or webp")
+):
+    """
+    Analyze many tickers in one run with a bounded worker pool
+    
+    Progress is saved after every ticker, so an interrupted batch resumes
+    where it left off when the same command is run again. Each ticker's
+    full output is written to logs/batch/<ticker>.log, and progress events
+    (stage timings, per-ticker results) are appended as NDJSON to
+    logs/batch/events.ndjson.
+    
+    Examples:
+    - marketswimmer analyze-batch AAPL MSFT BRK.B
+    - marketswimmer analyze-batch --file watchlist.txt --workers 4
+    - marketswimmer analyze-batch --file watchlist.txt --retry-failed
+    - marketswimmer analyze-batch --file watchlist.txt --profile draft
+    """
+    from .core.batch import normalize_tickers, read_ticker_file, run_batch
+    
+    profile, chart_format = check_render_options(profile, chart_format)
+    
+    requested = list(tickers or [])
+    if file:
+        if not file.exists():
+            console.print(f"[red]ERROR: Ticker file not found: {file}[/red]")
+            raise typer.Exit(1)
+        requested.extend(read_ticker_file(file))
+    
+    requested = normalize_tickers(requested)
+    if not requested:
+        console.print("[red]ERROR: No tickers given. Pass tickers as arguments or use --file.[/red]")
+        raise typer.Exit(1)
+    
+    result = run_batch(requested, workers=workers, status_file=status_file,
+                       retry_failed=retry_failed, restart=restart,
+                       use_cache=not no_cache, allow_download=download,
+                       events_file=events_file, render_profile=profile,
+                       chart_format=chart_format)
+    
+    summary = Table(title=">> Batch Summary")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", justify="right")
+    summary.add_row("Tickers requested", str(result.total))
+    summary.add_row("Already processed (skipped)", str(result.skipped))
+    summary.add_row("Succeeded", f"[green]{len(result.succeeded)}[/green]")
+    summary.add_row("Failed", f"[red]{len(result.failed)}[/red]" if result.failed else "0")
+    summary.add_row("Elapsed", f"{result.elapsed:.1f}s")
+    summary.add_row("Throughput", f"{result.tickers_per_second:.2f} tickers/sec")
+    console.print(summary)
+    
+    if result.statistics:
+        # Screen the finished tickers by the consistency of their owner earnings
+        screen = Table(title=">> Owner Earnings Screen")
+        screen.add_column("Ticker", style="cyan")
+        screen.add_column("Positive quarters", justify="right")
+        screen.add_column("Mean ($M)", justify="right")
+        screen.add_column("Volatility (CV)", justify="right")
+        screen.add_column("Annual trend ($M/yr)", justify="right")
+        
+        def number(value, spec):
+            return format(value, spec) if value is not None else "-"
+        
+        ranked = sorted(result.statistics.items(),
+                        key=lambda item: (item[1].get('positive_ratio') or 0, item[1].get('mean') or 0),
+                        reverse=True)
+        for ticker, stats in ranked:
+            screen.add_row(ticker, number(stats.get('positive_ratio'), '.0%'), number(stats.get('mean'), ',.0f'),
+                           number(stats.get('coefficient_of_variation'), '.2f'),
+                           number(stats.get('annual_trend'), '+,.0f'))
+        console.print(screen)
+    
+    for ticker, error in result.failed.items():
+        console.print(f"[red]  {ticker}: {error}[/red]")
+    if result.failed:
+        console.print("[yellow]TIP: Re-run with --retry-failed after fixing the data; see logs/batch/ for details[/yellow]")
+    
+    if result.failed or result.interrupted:
+        raise typer.Exit(1)
+
+@app.command()
+def fetch(
+    tickers: Optional[List[str]] = typer.Argument(None, help="Ticker symbols to download"),
+    file: Optional[Path] = typer.Option(None, "--file", "-F", help="Text file with tickers (one per line, # comments)"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Maximum concurrent downloads"),
+    rate: float = typer.Option(1.0, "--rate", min=0.0, help="Requests per second per host (0 = unlimited)"),
+    retries: int = typer.Option(3, "--retries", min=0, help="Retries per ticker on network or server errors"),
+    url: Optional[str] = typer.Option(None, "--url", help="Export URL template with {ticker} (default: $MARKETSWIMMER_EXPORT_URL or StockRow)"),
+    force: bool = typer.Option(False, "--force", "-f", help="Download even if the server reports no change")
+):
+    """
+    Download financial exports without the browser
+
+    Exports are fetched in parallel over a shared connection pool and
+    stored in downloaded_files/. Previously fetched tickers are only
+    downloaded again if the server reports that the export changed.
+
+    Examples:
+    - marketswimmer fetch AAPL MSFT BRK.B
+    - marketswimmer fetch --file watchlist.txt --workers 8
+    - marketswimmer fetch AAPL --url http://localhost:8000/exports/{ticker}.xlsx
+    """
+    from .core.batch import normalize_tickers, read_ticker_file
+    from .core.fetcher import ExportFetcher
+
+    requested = list(tickers or [])
+    if file:
+        if not file.exists():
+            console.print(f"[red]ERROR: Ticker file not found: {file}[/red]")
+            raise typer.Exit(1)
+        requested.extend(read_ticker_file(file))
+
+    requested = normalize_tickers(requested)
+    if not requested:
+        console.print("[red]ERROR: No tickers given. Pass tickers as arguments or use --file.[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"[bold blue]>> Fetching {len(requested)} export(s) with {workers} worker(s)[/bold blue]")
+    started = time.perf_counter()
+    with ExportFetcher(url_template=url, workers=workers, requests_per_second=rate,
+                       retries=retries) as fetcher:
+        results = fetcher.fetch_many(requested, force=force)
+    elapsed = time.perf_counter() - started
+
+    downloaded = [result for result in results if result.status == 'downloaded']
+    current = [result for result in results if result.status in ('not_modified', 'unchanged')]
+    failed = [result for result in results if not result.ok]
+    console.print(f"[green]>> {len(downloaded)} downloaded, {len(current)} already up to date, "
+                  f"{len(failed)} failed in {elapsed:.1f}s[/green]")
+
+    if failed:
+        raise typer.Exit(1)
+
+@app.command(name="import")
+def import_exports(
+    source: Path = typer.Argument(..., help="Folder (e.g. your Downloads) or zip archive of StockRow exports"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Processes used to inspect and parse files"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be imported")
+):
+    """
+    Import existing StockRow exports for many tickers at once
+
+    Scans the folder (including subfolders) or zip archive once, detects
+    each file's ticker from its name and checks its sheets, then adds all
+    exports to downloaded_files/. Identical files are stored only once,
+    and every export is parsed up front so later analyses start faster.
+
+    Examples:
+    - marketswimmer import ~/Downloads
+    - marketswimmer import exports.zip --dry-run
+    """
+    from .core.bulk_import import import_exports as run_import
+
+    if not source.exists():
+        console.print(f"[red]ERROR: Not found: {source}[/red]")
+        raise typer.Exit(1)
+
+    result = run_import(source, workers=workers, dry_run=dry_run)
+
+    table = Table(title=">> Import Summary" + (" (dry run)" if dry_run else ""))
+    table.add_column("Ticker", style="cyan")
+    table.add_column("File")
+    table.add_column("Status")
+    for ticker, path in result.imported:
+        table.add_row(ticker, path.name, "[green]would import[/green]" if dry_run else "[green]imported[/green]")
+    for ticker, path in result.unchanged:
+        table.add_row(ticker, path.name, "[dim]already stored[/dim]")
+    if result.imported or result.unchanged:
+        console.print(table)
+
+    for path, reason in result.skipped.items():
+        console.print(f"[yellow]  Skipped {Path(path).name}: {reason}[/yellow]")
+
+    console.print(f"[green]>> {len(result.tickers)} ticker(s), {len(result.imported)} new and "
+                  f"{len(result.unchanged)} unchanged export(s), {len(result.skipped)} skipped "
+                  f"in {result.elapsed:.1f}s[/green]")
+    if result.tickers and not dry_run:
+        console.print(f"[blue]TIP: marketswimmer analyze-batch {' '.join(result.tickers)}[/blue]")
+
 @app.command()
 def status():
     """
@@ -201,12 +431,22 @@ def status():
         ("marketswimmer.gui.main_window", "MarketSwimmerGUI"),
     ]
     
+    # Locate the modules without importing them; their dependencies are
+    # checked the same way
+    from importlib.util import find_spec
+    for dependency in ["pandas", "matplotlib", "seaborn", "openpyxl", "PyQt6"]:
+        if find_spec(dependency) is None:
+            console.print(f"  ERROR: {dependency} [red](not installed)[/red]")
+    
     for module_name, class_name in modules_to_check:
         try:
-            __import__(module_name)
+            found = find_spec(module_name) is not None
+        except ImportError:
+            found = False
+        if found:
             console.print(f"  >> {module_name}")
-        except ImportError as e:
-            console.print(f"  ERROR: {module_name} [red](import error: {e})[/red]")
+        else:
+            console.print(f"  ERROR: {module_name} [red](module not found)[/red]")
 
 @app.command()
 def quick_start():
@@ -292,7 +532,8 @@ def version():
     """
     console.print("[bold blue]>> MarketSwimmer Version Information[/bold blue]\n")
     
-    console.print("Version: [green]2.4.1[/green] (CLI Edition)")
+    from . import __version__
+    console.print(f"Version: [green]{__version__}[/green] (CLI Edition)")
     console.print("Built with: [cyan]Typer + Rich[/cyan]")
     console.print("Purpose: [yellow]Warren Buffett's Owner Earnings Analysis[/yellow]")
     console.print(f"Working Directory: [blue]{Path.cwd()}[/blue]")
@@ -301,18 +542,13 @@ def version():
     console.print(f"\nSystem: [cyan]{sys.platform}[/cyan]")
     console.print(f"Python: [cyan]{sys.version.split()[0]}[/cyan]")
     
-    # Check for key dependencies
-    try:
-        import pandas
-        console.print(f"Pandas: [green]{pandas.__version__}[/green]")
-    except ImportError:
-        console.print("Pandas: [red]Not installed[/red]")
-    
-    try:
-        import matplotlib
-        console.print(f"Matplotlib: [green]{matplotlib.__version__}[/green]")
-    except ImportError:
-        console.print("Matplotlib: [red]Not installed[/red]")
+    # Check for key dependencies (installed metadata only, no import)
+    from importlib.metadata import PackageNotFoundError, version as package_version
+    for label, distribution in [("Pandas", "pandas"), ("Matplotlib", "matplotlib")]:
+        try:
+            console.print(f"{label}: [green]{package_version(distribution)}[/green]")
+        except PackageNotFoundError:
+            console.print(f"{label}: [red]Not installed[/red]")
 
 @app.command()
 def fair_value(
@@ -457,112 +693,24 @@ def fair_value(
     console.print(f"[bold green]Fair Value Analysis for {ticker.upper()}[/bold green]")
     
     try:
-        from .core.fair_value import FairValueCalculator
-        from pathlib import Path
-        
-        # Look for owner earnings data
-        data_folder = Path("data")
-        clean_ticker = ticker.replace('.', '_').upper()
-        
-        annual_file = data_folder / f"owner_earnings_annual_{clean_ticker.lower()}.csv"
-        
-        if not annual_file.exists():
-            console.print(f"[red]ERROR: Owner earnings data not found for {ticker.upper()}[/red]")
-            console.print(f"[yellow]Expected file: {annual_file}[/yellow]")
-            console.print(f"[yellow]TIP: Run 'ms analyze {ticker}' first to generate owner earnings data[/yellow]")
-            return
-        
-        # Initialize calculator and load data
-        calculator = FairValueCalculator()
-        calculator.company_name = ticker.upper()
-        
-        if not calculator.load_owner_earnings_data(str(annual_file)):
-            console.print(f"[red]ERROR: Failed to load owner earnings data[/red]")
-            return
-        
-        # Calculate 10-year average
-        avg_earnings = calculator.calculate_average_owner_earnings(years=10)
-        if avg_earnings is None:
-            console.print(f"[red]ERROR: Insufficient owner earnings data for analysis[/red]")
+        from .core.fair_value import owner_earnings_dcf_analysis
+        
+        results = owner_earnings_dcf_analysis(
+            ticker,
+            growth_rate=growth_rate,
+            discount_rate=discount_rate,
+            terminal_multiple=terminal_multiple,
+            cash=cash,
+            debt=debt,
+            shares=shares,
+            scenarios=scenarios,
+            manual=manual
+        )
+        if results is None:
             return
         
-        # Auto-extract balance sheet data unless manual mode or values provided
-        if not manual and (cash is None or debt is None or shares is None):
-            console.print(f"\n[bold blue]Auto-Extracting Balance Sheet Data[/bold blue]")
-            
-            # Use automatic extraction method
-            base_results = calculator.calculate_fair_value_auto(
-                ticker=ticker,
-                average_owner_earnings=avg_earnings,
-                discount_rate=discount_rate,
-                growth_rate=growth_rate,
-                terminal_multiple=terminal_multiple
-            )
-            
-        else:
-            # Use manual/provided values
-            console.print(f"\n[bold blue]Manual Balance Sheet Mode[/bold blue]")
-            
-            # Convert shares from millions to actual count if provided
-            shares_actual = shares * 1_000_000 if shares else None
-            
-            # Use provided values or defaults
-            cash_value = cash if cash is not None else 0
-            debt_value = debt if debt is not None else 0
-            
-            console.print(f"Using provided values:")
-            console.print(f"   Cash & Investments: ${cash_value:,.0f}")
-            console.print(f"   Total Debt: ${debt_value:,.0f}")
-            if shares_actual:
-                console.print(f"   Shares Outstanding: {shares_actual:,.0f}")
-            
-            base_results = calculator.calculate_fair_value(
-                average_owner_earnings=avg_earnings,
-                discount_rate=discount_rate,
-                growth_rate=growth_rate,
-                terminal_multiple=terminal_multiple,
-                cash_and_investments=cash_value,
-                total_debt=debt_value,
-                shares_outstanding=shares_actual
-            )
-        
-        # Show key results
-        console.print(f"\n[bold green]FAIR VALUE SUMMARY[/bold green]")
-        console.print(f"Enterprise Value: [green]${base_results['enterprise_value']:,.0f}[/green]")
-        console.print(f"Equity Value: [green]${base_results['equity_value']:,.0f}[/green]")
-        
-        if base_results['fair_value_per_share']:
-            console.print(f"Fair Value per Share: [bold green]${base_results['fair_value_per_share']:,.2f}[/bold green]")
-        
-        # Scenario analysis
-        if scenarios:
-            console.print(f"\n[bold blue]Scenario Analysis[/bold blue]")
-            
-            # For scenarios, use the extracted/provided balance sheet data
-            cash_for_scenarios = base_results['cash_and_investments']
-            debt_for_scenarios = base_results['total_debt']
-            shares_for_scenarios = base_results['shares_outstanding']
-            
-            scenario_df = calculator.create_scenario_analysis(
-                average_owner_earnings=avg_earnings,
-                shares_outstanding=shares_for_scenarios,
-                cash_and_investments=cash_for_scenarios,
-                total_debt=debt_for_scenarios
-            )
-            
-            # Display scenario table
-            if base_results['fair_value_per_share']:
-                console.print(f"\n[bold]Per-Share Fair Values:[/bold]")
-                for _, row in scenario_df.iterrows():
-                    if 'Fair Value per Share' in row:
-                        console.print(f"  {row['Scenario']}: [green]${row['Fair Value per Share']:,.2f}[/green]")
-        
-        # Save report
-        report_file = data_folder / f"fair_value_analysis_{clean_ticker.lower()}.txt"
-        calculator.save_valuation_report(base_results, scenario_df if scenarios else None, str(report_file))
-        
         console.print(f"\n[green]SUCCESS: Fair value analysis complete![/green]")
-        console.print(f"[dim]Report saved to: {report_file}[/dim]")
+        console.print(f"[dim]Report saved to: {results['report_file']}[/dim]")
         
     except ImportError as e:
         console.print(f"[red]ERROR: Cannot import FairValueCalculator: {e}[/red]")
@@ -572,14 +720,21 @@ def fair_value(
 @app.command()
 def visualize(
     ticker: str = typer.Option(None, "--ticker", "-t", help="Stock ticker symbol"),
-    all_data: bool = typer.Option(False, "--all", "-a", help="Visualize all available data")
+    all_data: bool = typer.Option(False, "--all", "-a", help="Visualize every ticker in data/ (rendered in parallel)"),
+    force_render: bool = typer.Option(False, "--force-render", help="Re-render charts even if their data is unchanged"),
+    profile: str = typer.Option("publication", "--profile", help="Chart render profile: publication, draft or thumbnail"),
+    chart_format: str = typer.Option("png", "--format", help="Chart file format: png, svg or webp")
 ):
     """
     Create visualizations from calculated owner earnings data
     
     This command generates charts and graphs from owner earnings calculations.
     Requires calculated data to be available in the data/ directory.
+    Charts whose data is unchanged since they were last rendered are
+    skipped (see charts/.render_manifest.json) unless --force-render is given.
+    --profile draft renders quick low-resolution previews.
     """
+    profile, chart_format = check_render_options(profile, chart_format)
     if ticker:
         console.print(f"[bold blue]>> Creating visualizations for {ticker.upper()}...[/bold blue]")
     else:
@@ -598,6 +753,20 @@ def visualize(
             console.print(f"[yellow]NOTE: Install with: pip install matplotlib PyQt6[/yellow]")
             return
             
+        if all_data:
+            # Chart sets of every ticker in data/, rendered as one parallel batch
+            from .visualization.charts import visualize_all
+            
+            console.print("[green]>> Running visualization for all tickers in data/...[/green]")
+            tickers = visualize_all(force_render=force_render, profile=profile,
+                                    chart_format=chart_format)
+            if not tickers:
+                console.print("[red]ERROR: No owner earnings data found in data/[/red]")
+                raise typer.Exit(1)
+            console.print(f"[green]>> Visualization completed for {len(tickers)} tickers: {', '.join(tickers)}[/green]")
+            console.print("Check the charts/ directory for generated visualizations")
+            return
+        
         console.print(f"[green]>> Running visualization for {ticker or 'available data'}...[/green]")
         
         # Ensure we're in the right directory for data files
@@ -606,7 +775,10 @@ def visualize(
         
         try:
             # Call the visualization main function
-            visualization_main()
+            if not visualization_main(ticker.upper() if ticker else None, force_render=force_render,
+                                      profile=profile, chart_format=chart_format):
+                console.print("[red]ERROR: No owner earnings data found[/red]")
+                raise typer.Exit(1)
             
             console.print(f"[green]>> Visualization completed successfully![/green]")
             console.print("Check the charts/ directory for generated visualizations")
@@ -614,12 +786,18 @@ def visualize(
             # Always restore original directory
             os.chdir(original_dir)
         
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]ERROR: Error during visualization: {e}[/red]")
 
 @app.command()
 def shares_analysis(
     ticker: str = typer.Option(None, "--ticker", "-t", help="Stock ticker symbol"),
+    force_render: bool = typer.Option(False, "--force-render", help="Re-render charts even if their data is unchanged"),
+    profile: str = typer.Option("publication", "--profile", help="Chart render profile: publication, draft or thumbnail"),
+    chart_format: str = typer.Option("png", "--format", help="Chart file format: png, svg or webp"),
+    prices: Path = typer.Option(None, "--prices", help="Price history CSV (Date and Close columns) for converting buybacks to share counts"),
 ):
     """
     Create comprehensive shares outstanding analysis and visualization.
@@ -630,7 +808,15 @@ def shares_analysis(
     
     Example:
     ms shares-analysis --ticker CVNA
+    ms shares-analysis --ticker CVNA --prices cvna_prices.csv
+    
+    Without --prices, data/prices/<ticker>.csv is used if it exists;
+    otherwise prices are estimated as book value per share x P/B ratio.
     """
+    profile, chart_format = check_render_options(profile, chart_format)
+    if prices is not None and not prices.exists():
+        console.print(f"[red]Error: Price file not found: {prices}[/red]")
+        raise typer.Exit(2)
     try:
         from .visualization.charts import create_shares_outstanding_analysis
         
@@ -639,11 +825,15 @@ def shares_analysis(
         
         console.print(f"[bold blue]Analyzing shares outstanding for {ticker.upper()}[/bold blue]")
         
-        result = create_shares_outstanding_analysis(ticker.upper())
+        result = create_shares_outstanding_analysis(ticker.upper(), force_render=force_render,
+                                                    profile=profile, chart_format=chart_format,
+                                                    price_file=prices)
         
         if result:
             console.print(f"\n[bold green]SUCCESS: Shares analysis complete![/bold green]")
-            console.print(f"Analysis saved to: ./analysis_output/{ticker.lower()}_shares_analysis.png")
+            from .visualization.render import share_chart_paths
+            shares_chart, _ = share_chart_paths(ticker.upper(), './analysis_output', profile, chart_format)
+            console.print(f"Analysis saved to: {shares_chart}")
         else:
             console.print(f"[bold red]ERROR: Failed to analyze shares for {ticker}[/bold red]")
             console.print("Make sure you have downloaded financial data first.")
@@ -653,8 +843,81 @@ def shares_analysis(
     except Exception as e:
         console.print(f"[red]Error in shares analysis: {e}[/red]")
 
+@app.command()
+def daemon(
+    action: str = typer.Argument("status", help="start, stop, status or run (foreground)")
+):
+    """
+    Manage the background worker that keeps MarketSwimmer warm
+
+    While the daemon runs, ms commands and the GUI hand their work to it
+    instead of starting a new Python process, so pandas, matplotlib and
+    recently used workbooks are already loaded. Without a daemon every
+    command runs on its own as usual.
+
+    Examples:
+    - marketswimmer daemon start
+    - marketswimmer daemon status
+    - marketswimmer daemon stop
+    """
+    from .core import daemon as worker
+
+    if not worker.daemon_supported():
+        console.print("[red]ERROR: The worker daemon needs Unix domain sockets, which this platform lacks[/red]")
+        raise typer.Exit(1)
+
+    action = action.lower()
+    if action == "status":
+        info = worker.request("status")
+        if info is None:
+            console.print("[yellow]>> Daemon is not running (commands run in-process)[/yellow]")
+            return
+        table = Table(title=">> MarketSwimmer Daemon")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value")
+        table.add_row("Socket", str(worker.socket_path()))
+        table.add_row("PID", str(info["pid"]))
+        table.add_row("Version", info["version"])
+        table.add_row("Running since", info["started_at"])
+        table.add_row("Jobs served", str(info["jobs_served"]))
+        table.add_row("Current job", info["current_job"] or "-")
+        console.print(table)
+    elif action == "start":
+        info = worker.request("status")
+        if info is not None:
+            console.print(f"[green]>> Daemon already running (pid {info['pid']})[/green]")
+            return
+        console.print("[blue]>> Starting daemon (preloading analysis modules)...[/blue]")
+        info = worker.start_background()
+        if info is None:
+            console.print(f"[red]ERROR: Daemon did not start; see {worker.socket_path().with_suffix('.log')}[/red]")
+            raise typer.Exit(1)
+        console.print(f"[green]>> Daemon running (pid {info['pid']}) on {worker.socket_path()}[/green]")
+    elif action == "stop":
+        if worker.request("stop") is None:
+            console.print("[yellow]>> Daemon is not running[/yellow]")
+        else:
+            console.print("[green]>> Daemon stopped[/green]")
+    elif action == "run":
+        server = worker.WorkerDaemon()
+        server.warm_up()
+        try:
+            server.serve_forever()
+        except RuntimeError as e:
+            console.print(f"[red]ERROR: {e}[/red]")
+            raise typer.Exit(1)
+    else:
+        console.print(f"[red]ERROR: Unknown action '{action}'. Use start, stop, status or run.[/red]")
+        raise typer.Exit(1)
+
 def main():
     """Main entry point for the CLI."""
+    # Hand the command to a running worker daemon, if there is one
+    from .core.daemon import run_in_daemon, should_use_daemon
+    if should_use_daemon(sys.argv[1:]):
+        exit_code = run_in_daemon(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
     app()
 
 if __name__ == "__main__":
@@ -7,7 +7,52 @@ Owner Earnings methodology and the FairValueCalculator for intrinsic
 value analysis using DCF methodology.
 """
 
-from .owner_earnings import OwnerEarningsCalculator
-from .fair_value import FairValueCalculator
+# Re-exports are resolved on first access so that light modules such as
+# core.daemon or core.batch can be imported without pandas
+_LAZY_ATTRIBUTES = {
+    "OwnerEarningsCalculator": ".owner_earnings",
+    "FairValueCalculator": ".fair_value",
+    "FinancialWorkbook": ".workbook",
+    "BalanceSheetSnapshot": ".balance_sheet",
+    "SnapshotField": ".balance_sheet",
+    "extract_balance_sheet_snapshot": ".balance_sheet",
+    "AnalysisContext": ".context",
+    "PriceSeries": ".prices",
+    "Period": ".periods",
+    "EarningsStatistics": ".analytics",
+    "compute_earnings_statistics": ".analytics",
+    "OwnerEarningsPeriod": ".results",
+    "OwnerEarningsTable": ".results",
+    "AlternativeMethodsTable": ".results",
+}
 
-__all__ = ["OwnerEarningsCalculator", "FairValueCalculator"]
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "OwnerEarningsCalculator",
+    "FairValueCalculator",
+    "FinancialWorkbook",
+    "BalanceSheetSnapshot",
+    "SnapshotField",
+    "extract_balance_sheet_snapshot",
+    "AnalysisContext",
+    "PriceSeries",
+    "Period",
+    "EarningsStatistics",
+    "compute_earnings_statistics",
+    "OwnerEarningsPeriod",
+    "OwnerEarningsTable",
+    "AlternativeMethodsTable",
+]
@@ -17,13 +17,19 @@ def clean_ticker_for_filename(ticker: str) -> str:
     """Clean ticker symbol for use in filenames."""
     return ticker.replace('.', '_').upper()
 
-def analyze_ticker_workflow(ticker: str, force: bool = False) -> bool:
+def analyze_ticker_workflow(ticker: str, force: bool = False, explain: bool = False,
+                            use_cache: bool = True, render_profile: str = "publication",
+                            chart_format: str = "png") -> bool:
     """
     Run the complete analysis workflow for a ticker.
     
     Args:
         ticker: Stock ticker symbol
         force: Force re-download even if data exists
+        explain: Show why each workflow stage ran or was skipped
+        use_cache: Skip workflow stages whose inputs are unchanged
+        render_profile: Chart render profile (publication, draft or thumbnail)
+        chart_format: Chart file format (png, svg or webp)
         
     Returns:
         bool: True if analysis completed successfully
@@ -31,8 +37,9 @@ def analyze_ticker_workflow(ticker: str, force: bool = False) -> bool:
     try:
         from .workflow import AnalysisWorkflow
         
-        workflow = AnalysisWorkflow()
-        return workflow.run_complete_analysis(ticker, force_download=force)
+        workflow = AnalysisWorkflow(render_profile=render_profile, chart_format=chart_format)
+        return workflow.run_complete_analysis(ticker, force_download=force,
+                                              explain=explain, use_cache=use_cache)
         
     except Exception as e:
         console.print(f"[red]ERROR: Error during analysis: {e}[/red]")
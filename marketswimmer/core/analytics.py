@@ -0,0 +1,278 @@
+"""
+Owner earnings statistics for MarketSwimmer.
+
+Computes the trend, volatility, rolling and distribution statistics of a
+ticker's owner earnings once into an EarningsStatistics object. The
+volatility chart, the console summaries and the batch status all read
+from it, so none of them recompute the numbers and they are available
+without rendering anything. The object is plain data and is stored as
+JSON next to the owner earnings CSV files.
+"""
+
+import json
+import math
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import periods
+
+# Bumped when fields change meaning; older files are recomputed
+STATISTICS_VERSION = 2
+
+ROLLING_WINDOWS = (4, 8)
+HISTOGRAM_BINS = 20
+YOY_FIRST_YEAR = 2020  # Year-over-year comparison covers recent years only
+
+
+def statistics_path(data_folder: Path, ticker: str) -> Path:
+    """Path of the stored statistics of a ticker, next to its owner earnings CSVs."""
+    return Path(data_folder) / f"owner_earnings_stats_{ticker.replace('.', '_').lower()}.json"
+
+
+def _number(value) -> Optional[float]:
+    """JSON-safe float: NaN and infinity become None."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _numbers(values) -> List[Optional[float]]:
+    return [_number(value) for value in values]
+
+
+def _chronological(df: pd.DataFrame, quarterly: bool) -> pd.DataFrame:
+    """Owner earnings sorted oldest first, with 'date' and 'owner_earnings_millions' columns."""
+    df = df.copy()
+    if 'date' not in df.columns:
+        # Dated the way the charts date them (see charts.prepare_quarterly_data)
+        codes = periods.period_codes(df)
+        if not quarterly:
+            df['date'] = periods.start_dates(codes)
+        elif periods.is_annual(codes).all():
+            df['date'] = periods.start_dates(codes, annual_month=7)
+        else:
+            df['date'] = periods.start_dates(codes, annual_month=None)
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable')
+    if 'owner_earnings_millions' not in df.columns:
+        df['owner_earnings_millions'] = df['Owner Earnings'] / 1_000_000
+    return df.reset_index(drop=True)
+
+
+def _extreme(df: pd.DataFrame, largest: bool) -> Optional[Dict[str, Any]]:
+    """Best or worst period, as {'period': ..., 'value': $M}."""
+    values = df['owner_earnings_millions']
+    if values.notna().sum() == 0:
+        return None
+    index = values.idxmax() if largest else values.idxmin()
+    return {'period': str(df.loc[index, 'Period']), 'value': float(values[index])}
+
+
+def _trend(dates: pd.Series, values: pd.Series) -> Optional[float]:
+    """Least squares slope in $M per year."""
+    valid = dates.notna() & values.notna()
+    if valid.sum() < 2:
+        return None
+    years = dates[valid].dt.year + (dates[valid].dt.dayofyear - 1) / 365.25
+    if years.nunique() < 2:
+        return None
+    return _number(np.polyfit(years.to_numpy(dtype=float), values[valid].to_numpy(dtype=float), 1)[0])
+
+
+@dataclass
+class EarningsStatistics:
+    """Owner earnings statistics of one ticker; values are in $ millions."""
+
+    ticker: str
+    annual_periods: List[str] = field(default_factory=list)
+    quarterly_periods: List[str] = field(default_factory=list)  # Oldest first
+    best_annual: Optional[Dict[str, Any]] = None   # {'period', 'value'}
+    worst_annual: Optional[Dict[str, Any]] = None
+    best_quarter: Optional[Dict[str, Any]] = None
+    worst_quarter: Optional[Dict[str, Any]] = None
+    # Distribution of quarterly owner earnings
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std: Optional[float] = None
+    coefficient_of_variation: Optional[float] = None  # std / |mean|
+    histogram_counts: List[int] = field(default_factory=list)
+    histogram_edges: List[float] = field(default_factory=list)
+    positive_quarters: int = 0
+    negative_quarters: int = 0  # Zero counts as negative
+    positive_mean: float = 0.0
+    negative_mean: float = 0.0
+    # Trend: centred rolling means aligned with quarterly_periods, and
+    # least squares slopes in $M per year
+    rolling_4q: List[Optional[float]] = field(default_factory=list)
+    rolling_8q: List[Optional[float]] = field(default_factory=list)
+    annual_trend: Optional[float] = None
+    quarterly_trend: Optional[float] = None
+    # Same-quarter comparison: {year: [Q1, Q2, Q3, Q4]} for recent years
+    quarterly_is_annual: bool = False  # The quarterly file holds annual data
+    year_over_year: Dict[str, List[Optional[float]]] = field(default_factory=dict)
+    year_over_year_error: Optional[str] = None
+    # Fingerprints of the owner earnings CSV content the statistics were
+    # computed from: {'annual': ..., 'quarterly': ...}
+    sources: Dict[str, Optional[str]] = field(default_factory=dict)
+    version: int = STATISTICS_VERSION
+
+    @property
+    def total_quarters(self) -> int:
+        return len(self.quarterly_periods)
+
+    @property
+    def positive_ratio(self) -> Optional[float]:
+        """Share of quarters with positive owner earnings."""
+        return self.positive_quarters / self.total_quarters if self.total_quarters else None
+
+    def matches_sources(self, sources: Dict[str, Optional[str]]) -> bool:
+        """
+        Check that the statistics were computed from the given CSV content.
+
+        Args:
+            sources: Current fingerprints of the owner earnings CSV files
+
+        Returns:
+            bool: False if a file changed or the sources were not recorded
+        """
+        return bool(self.sources) and self.sources == sources
+
+    def summary(self) -> Dict[str, Any]:
+        """Headline figures, e.g. for the batch status file."""
+        return {
+            'quarters': self.total_quarters,
+            'positive_ratio': _number(self.positive_ratio),
+            'mean': self.mean,
+            'coefficient_of_variation': self.coefficient_of_variation,
+            'annual_trend': self.annual_trend,
+            'best_annual': self.best_annual,
+            'worst_annual': self.worst_annual,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The statistics as a JSON-serializable dict."""
+        return asdict(self)
+
+    def to_json(self) -> str:
+        """The statistics as JSON text."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EarningsStatistics":
+        """
+        Rebuild statistics from to_dict() output.
+
+        Raises:
+            ValueError: If the data was written by another statistics version
+        """
+        if data.get('version') != STATISTICS_VERSION:
+            raise ValueError(f"statistics version {data.get('version')} is not {STATISTICS_VERSION}")
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def save(self, path: Path):
+        """Write the statistics to a JSON file atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                handle.write(self.to_json())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["EarningsStatistics"]:
+        """
+        Read stored statistics.
+
+        Returns:
+            EarningsStatistics: The statistics, or None if the file is
+            missing, unreadable or of another version
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                return cls.from_dict(json.load(handle))
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+def compute_earnings_statistics(ticker: str, annual_df: Optional[pd.DataFrame],
+                                quarterly_df: pd.DataFrame) -> EarningsStatistics:
+    """
+    Compute the owner earnings statistics of a ticker.
+
+    Accepts the frames of the owner earnings calculator (or its CSV files)
+    as well as frames prepared for plotting by the charts module.
+
+    Args:
+        ticker: Stock ticker symbol
+        annual_df: Annual owner earnings ('Period' and 'Owner Earnings'
+            columns); None leaves the annual statistics empty
+        quarterly_df: Quarterly owner earnings
+
+    Returns:
+        EarningsStatistics: The statistics
+    """
+    quarterly = _chronological(quarterly_df, quarterly=True)
+    values = quarterly['owner_earnings_millions']
+
+    stats = EarningsStatistics(
+        ticker=ticker,
+        quarterly_periods=[str(period) for period in quarterly['Period']],
+        best_quarter=_extreme(quarterly, largest=True),
+        worst_quarter=_extreme(quarterly, largest=False),
+        mean=_number(values.mean()),
+        median=_number(values.median()),
+        std=_number(values.std()),
+        quarterly_trend=_trend(quarterly['date'], values),
+    )
+    if annual_df is not None:
+        annual = _chronological(annual_df, quarterly=False)
+        stats.annual_periods = [str(period) for period in annual['Period']]
+        stats.best_annual = _extreme(annual, largest=True)
+        stats.worst_annual = _extreme(annual, largest=False)
+        stats.annual_trend = _trend(annual['date'], annual['owner_earnings_millions'])
+    if stats.mean and stats.std is not None:
+        stats.coefficient_of_variation = _number(stats.std / abs(stats.mean))
+
+    finite = values[np.isfinite(values)]
+    if len(finite):
+        counts, edges = np.histogram(finite, bins=HISTOGRAM_BINS)
+        stats.histogram_counts = counts.tolist()
+        stats.histogram_edges = edges.tolist()
+
+    positive = values[values > 0]
+    negative = values[values <= 0]
+    stats.positive_quarters = len(positive)
+    stats.negative_quarters = len(negative)
+    stats.positive_mean = float(positive.mean()) if len(positive) else 0.0
+    stats.negative_mean = float(negative.mean()) if len(negative) else 0.0
+
+    stats.rolling_4q = _numbers(values.rolling(window=ROLLING_WINDOWS[0], center=True).mean())
+    stats.rolling_8q = _numbers(values.rolling(window=ROLLING_WINDOWS[1], center=True).mean())
+
+    years = quarterly['date'].dt.year
+    quarters = quarterly['date'].dt.quarter
+    stats.quarterly_is_annual = quarters.nunique() == 1
+    try:
+        pivot = pd.DataFrame({'quarter': quarters, 'year': years, 'value': values}).pivot(
+            index='quarter', columns='year', values='value')
+        for year in pivot.columns:
+            if year >= YOY_FIRST_YEAR:
+                stats.year_over_year[str(year)] = [
+                    _number(pivot.loc[q, year]) if q in pivot.index else None for q in (1, 2, 3, 4)]
+    except Exception as e:
+        stats.year_over_year_error = str(e)
+
+    return stats
@@ -0,0 +1,272 @@
+"""
+Balance sheet snapshot extraction for MarketSwimmer.
+
+Resolves every balance sheet item used by the fair value calculation
+(cash, short-term investments, debt, preferred stock, preferred shares)
+and the share count fallback chain in one traversal of a parsed workbook:
+
+    quarterly balance sheet -> annual balance sheet -> income statement -> metrics
+
+Each sheet is scanned at most once, and every pending field is matched
+against a row while that row is being visited.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .workbook import FinancialWorkbook
+
+
+ANNUAL_BALANCE_SHEET = 'Balance Sheet, A'
+
+# Search terms in priority order; an earlier term always beats a later one.
+BALANCE_SHEET_TERMS = {
+    'cash_and_equivalents': [
+        'cash and cash equivalents', 'cash & cash equivalents',
+        'cash and short term investments', 'total cash'
+    ],
+    'short_term_investments': [
+        'short term investments', 'short-term investments',
+        'marketable securities', 'current investments'
+    ],
+    'total_debt': [
+        'total debt', 'long term debt (total)', 'long term debt',
+        'total borrowings', 'debt total'
+    ],
+    'preferred_stock': [
+        'preferred stock (total)', 'preferred stock', 'preferred shares',
+        'preferred equity', 'class b shares'
+    ],
+    'preferred_shares': [
+        'shares (preferred)', 'preferred shares outstanding', 'preferred shares',
+        'class b shares outstanding'
+    ],
+}
+
+BALANCE_SHEET_SHARE_TERMS = [
+    'shares (common)', 'common shares', 'shares outstanding',
+    'common stock shares', 'outstanding shares'
+]
+
+INCOME_STATEMENT_SHARE_TERMS = [
+    'shares (diluted, weighted)', 'shares (basic, weighted)',
+    'shares (diluted, average)', 'weighted average shares outstanding',
+    'shares outstanding', 'common shares outstanding'
+]
+
+METRICS_SHARE_TERMS = [
+    'shares outstanding', 'shares (diluted)', 'weighted shares outstanding',
+    'shares outstanding (millions)', 'common shares outstanding'
+]
+
+# (sheet name keywords, search terms, description) in fallback order.
+# Balance sheets hold actual shares outstanding; the income statement and
+# metrics sheets only carry weighted averages, so they come last.
+SHARE_COUNT_CHAIN = [
+    (('balance sheet', ', q'), BALANCE_SHEET_SHARE_TERMS, 'quarterly balance sheet'),
+    (('balance sheet', ', a'), BALANCE_SHEET_SHARE_TERMS, 'annual balance sheet'),
+    (('income statement', ', a'), INCOME_STATEMENT_SHARE_TERMS, 'income statement (fallback)'),
+    (('metrics', ', a'), METRICS_SHARE_TERMS, 'metrics'),
+]
+
+# Share counts below this are assumed to be reported in millions
+SHARES_IN_MILLIONS_THRESHOLD = 100_000
+
+
+@dataclass
+class SnapshotField:
+    """A single resolved balance sheet value and where it came from."""
+
+    value: float = 0.0
+    sheet: Optional[str] = None
+    row_label: Optional[str] = None
+    description: Optional[str] = None
+
+    @property
+    def found(self) -> bool:
+        """True if the value was located in the workbook."""
+        return self.sheet is not None
+
+    @property
+    def source(self) -> Optional[str]:
+        """Human-readable source, e.g. "Balance Sheet, A / Total Debt"."""
+        if not self.found:
+            return None
+        return f"{self.sheet} / {self.row_label}"
+
+
+@dataclass
+class BalanceSheetSnapshot:
+    """Balance sheet items needed for fair value adjustments."""
+
+    cash_and_equivalents: SnapshotField = field(default_factory=SnapshotField)
+    short_term_investments: SnapshotField = field(default_factory=SnapshotField)
+    total_debt: SnapshotField = field(default_factory=SnapshotField)
+    preferred_stock: SnapshotField = field(default_factory=SnapshotField)
+    preferred_shares: SnapshotField = field(default_factory=SnapshotField)
+    shares_outstanding: SnapshotField = field(default_factory=SnapshotField)
+    market_cap: SnapshotField = field(default_factory=SnapshotField)
+
+    @property
+    def net_cash(self) -> float:
+        """Cash plus short-term investments minus total debt."""
+        return (self.cash_and_equivalents.value +
+                self.short_term_investments.value -
+                self.total_debt.value)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Flatten the snapshot to the legacy balance sheet dictionary.
+
+        Returns:
+            dict: Values keyed like FairValueCalculator.extract_balance_sheet_data
+        """
+        return {
+            'cash_and_equivalents': self.cash_and_equivalents.value,
+            'short_term_investments': self.short_term_investments.value,
+            'total_debt': self.total_debt.value,
+            'preferred_stock': self.preferred_stock.value,
+            'preferred_shares': self.preferred_shares.value,
+            'shares_outstanding': self.shares_outstanding.value,
+            'market_cap': self.market_cap.value,
+        }
+
+    def sources(self) -> Dict[str, Optional[str]]:
+        """Source of every field, keyed like as_dict()."""
+        return {name: getattr(self, name).source for name in self.as_dict()}
+
+
+def _coerce_cell(value) -> Optional[float]:
+    """Convert a StockRow cell to float, or None if it holds no number."""
+    if pd.isna(value) or value == '—':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        clean_value = value.replace(',', '').replace('$', '').strip()
+        if clean_value.replace('.', '').replace('-', '').isdigit():
+            return float(clean_value)
+    return None
+
+
+def _first_value(row_values) -> Optional[float]:
+    """Return the most recent (left-most) numeric value of a row."""
+    for value in row_values:
+        number = _coerce_cell(value)
+        if number is not None:
+            return number
+    return None
+
+
+def scan_sheet(df: Optional[pd.DataFrame],
+               field_terms: Dict[str, List[str]]) -> Dict[str, SnapshotField]:
+    """
+    Resolve several line items from one sheet in a single pass over its rows.
+
+    For each field the match with the lowest term index wins, and among
+    rows matching that term the first row holding a numeric value wins.
+    This is the same priority as searching the sheet once per term.
+
+    Args:
+        df: Sheet with line item labels in the first column
+        field_terms: Search terms per field, in priority order
+
+    Returns:
+        dict: Resolved fields; fields without a match are omitted
+    """
+    resolved: Dict[str, SnapshotField] = {}
+    if df is None or df.empty or len(df.columns) == 0:
+        return resolved
+
+    terms = {name: [term.lower() for term in search_terms]
+             for name, search_terms in field_terms.items()}
+    best_rank = {name: len(search_terms) for name, search_terms in terms.items()}
+    pending = set(terms)
+
+    labels = df.iloc[:, 0].tolist()
+    values = df.iloc[:, 1:].to_numpy(dtype=object)
+
+    for idx, label in enumerate(labels):
+        if not pending:
+            break
+        if pd.isna(label):
+            continue
+        label_text = str(label)
+        label_lower = label_text.lower()
+
+        row_value = None
+        row_checked = False
+        for name in list(pending):
+            rank = next((i for i, term in enumerate(terms[name][:best_rank[name]])
+                         if term in label_lower), None)
+            if rank is None:
+                continue
+            if not row_checked:
+                row_value = _first_value(values[idx])
+                row_checked = True
+            if row_value is None:
+                continue
+            best_rank[name] = rank
+            resolved[name] = SnapshotField(row_value, None, label_text)
+            if rank == 0:
+                pending.discard(name)
+
+    return resolved
+
+
+def extract_balance_sheet_snapshot(workbook: FinancialWorkbook) -> BalanceSheetSnapshot:
+    """
+    Extract all balance sheet items and the share count from a workbook.
+
+    Args:
+        workbook: Parsed StockRow export
+
+    Returns:
+        BalanceSheetSnapshot: Resolved values with the source of each field
+    """
+    snapshot = BalanceSheetSnapshot()
+    scanned = set()
+
+    def apply(sheet_name, resolved, description=None):
+        for name, snapshot_field in resolved.items():
+            snapshot_field.sheet = sheet_name
+            snapshot_field.description = description
+            setattr(snapshot, name, snapshot_field)
+
+    def resolve_shares(sheet_name, resolved, description):
+        shares = resolved.pop('shares_outstanding', None)
+        if shares is None or not shares.value:
+            return False
+        if shares.value < SHARES_IN_MILLIONS_THRESHOLD:
+            shares.value = shares.value * 1_000_000
+        apply(sheet_name, {'shares_outstanding': shares}, description)
+        return True
+
+    # Walk the share count chain; the annual balance sheet is scanned for
+    # all balance sheet items at the same time if the chain reaches it.
+    shares_found = False
+    for keywords, share_terms, description in SHARE_COUNT_CHAIN:
+        for sheet_name in workbook.find_sheets(*keywords):
+            if sheet_name in scanned:
+                continue
+            field_terms = {'shares_outstanding': share_terms}
+            if sheet_name == ANNUAL_BALANCE_SHEET:
+                field_terms.update(BALANCE_SHEET_TERMS)
+            resolved = scan_sheet(workbook.get(sheet_name), field_terms)
+            scanned.add(sheet_name)
+
+            shares_found = resolve_shares(sheet_name, resolved, description)
+            if sheet_name == ANNUAL_BALANCE_SHEET:
+                apply(sheet_name, resolved)
+            if shares_found:
+                break
+        if shares_found:
+            break
+
+    if ANNUAL_BALANCE_SHEET not in scanned:
+        resolved = scan_sheet(workbook.get(ANNUAL_BALANCE_SHEET), BALANCE_SHEET_TERMS)
+        apply(ANNUAL_BALANCE_SHEET, resolved)
+
+    return snapshot
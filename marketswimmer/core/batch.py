@@ -0,0 +1,305 @@
+"""
+Batch analysis for MarketSwimmer.
+
+Runs the complete analysis workflow for many tickers inside one process on
+a bounded worker pool, so interpreter startup and imports are paid once.
+Per-ticker progress is persisted to a JSON status file after every state
+change; re-running the same batch resumes where it left off.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from rich.console import Console
+
+from . import output_router
+from .events import ITEMS, NdjsonWriter, default_bus
+
+console = Console()
+
+DEFAULT_STATUS_FILE = Path("data") / "batch_status.json"
+DEFAULT_LOG_DIR = Path("logs") / "batch"
+DEFAULT_EVENTS_FILE = DEFAULT_LOG_DIR / "events.ndjson"
+
+_ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+
+def normalize_tickers(tickers: Iterable[str]) -> List[str]:
+    """
+    Upper-case tickers, drop duplicates and apply the same aliases as `ms analyze`.
+
+    Args:
+        tickers: Raw ticker strings
+
+    Returns:
+        list: Unique tickers in their original order
+    """
+    result = []
+    seen = set()
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        if not ticker:
+            continue
+        if ticker == "BRKB":
+            ticker = "BRK.B"
+        if ticker not in seen:
+            seen.add(ticker)
+            result.append(ticker)
+    return result
+
+
+def read_ticker_file(path: Path) -> List[str]:
+    """
+    Read tickers from a text file.
+
+    Tickers may be separated by newlines, commas or whitespace; anything
+    after a '#' on a line is a comment.
+
+    Args:
+        path: Ticker list file
+
+    Returns:
+        list: Tickers in file order (not yet normalized)
+    """
+    tickers = []
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line in handle:
+            line = line.split('#', 1)[0]
+            tickers.extend(part for part in re.split(r'[\s,]+', line) if part)
+    return tickers
+
+
+class BatchStatus:
+    """
+    Per-ticker batch progress, persisted as JSON.
+
+    Each entry holds a state ('running', 'done' or 'failed') plus timing and
+    the error message of a failed run. The file is rewritten atomically on
+    every update, so an interrupted batch never leaves it half written.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STATUS_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.tickers: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                return json.load(handle).get('tickers', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump({'tickers': self.tickers}, handle, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def state(self, ticker: str) -> Optional[str]:
+        """Return the recorded state of a ticker, or None if never started."""
+        return self.tickers.get(ticker, {}).get('state')
+
+    def mark(self, ticker: str, state: str, **details):
+        """Record a ticker's new state and persist the status file."""
+        with self._lock:
+            entry = {'state': state, 'updated_at': datetime.now().isoformat(timespec='seconds')}
+            entry.update(details)
+            self.tickers[ticker] = entry
+            self._save()
+
+    def reset(self, tickers: Iterable[str]):
+        """Forget the recorded state of the given tickers."""
+        with self._lock:
+            for ticker in tickers:
+                self.tickers.pop(ticker, None)
+            self._save()
+
+    def pending(self, tickers: List[str], retry_failed: bool = False) -> List[str]:
+        """
+        Tickers that still need to run.
+
+        Finished tickers are skipped; tickers left 'running' by an
+        interrupted batch run again. Failed tickers only run again with
+        retry_failed.
+        """
+        skip = {'done'} if retry_failed else {'done', 'failed'}
+        return [ticker for ticker in tickers if self.state(ticker) not in skip]
+
+
+class BatchResult:
+    """Outcome and throughput of one batch run."""
+
+    def __init__(self, total: int, skipped: int):
+        self.total = total
+        self.skipped = skipped
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.elapsed = 0.0
+        self.interrupted = False
+        # Headline owner earnings statistics of every finished ticker
+        self.statistics: Dict[str, Dict] = {}
+
+    @property
+    def processed(self) -> int:
+        """Number of tickers analyzed in this run."""
+        return len(self.succeeded) + len(self.failed)
+
+    @property
+    def tickers_per_second(self) -> float:
+        """Analysis throughput of this run."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _last_error(output: str) -> str:
+    """Pick the last error line from a ticker's captured output."""
+    errors = [line.strip() for line in output.splitlines() if 'ERROR' in line]
+    return errors[-1] if errors else "analysis failed"
+
+
+def _analyze_one(ticker: str, status: BatchStatus, log_dir: Path,
+                 use_cache: bool, allow_download: bool,
+                 render_profile: str = "publication", chart_format: str = "png") -> bool:
+    """Run the full workflow for one ticker with its output sent to a log file."""
+    from .analytics import EarningsStatistics, statistics_path
+    from .workflow import AnalysisWorkflow
+
+    started = time.perf_counter()
+    status.mark(ticker, 'running')
+    success = False
+    with output_router.capture_thread_output() as buffer:
+        try:
+            workflow = AnalysisWorkflow(render_profile=render_profile, chart_format=chart_format)
+            success = workflow.run_complete_analysis(ticker, use_cache=use_cache,
+                                                     allow_download=allow_download)
+        except Exception as e:
+            console.print(f"[red]ERROR: Analysis failed: {e}[/red]")
+    output = _ANSI_ESCAPE.sub('', buffer.getvalue())
+    seconds = round(time.perf_counter() - started, 2)
+
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / f"{ticker.replace('.', '_').lower()}.log"
+    log_file.write_text(output, encoding='utf-8')
+
+    if success:
+        details = {}
+        statistics = EarningsStatistics.load(statistics_path(workflow.data_folder, ticker))
+        if statistics is not None:
+            details['statistics'] = statistics.summary()
+        status.mark(ticker, 'done', seconds=seconds, log=str(log_file), **details)
+    else:
+        status.mark(ticker, 'failed', seconds=seconds, log=str(log_file), error=_last_error(output))
+    return success
+
+
+def run_batch(tickers: List[str],
+              workers: int = 2,
+              status_file: Path = DEFAULT_STATUS_FILE,
+              retry_failed: bool = False,
+              restart: bool = False,
+              use_cache: bool = True,
+              allow_download: bool = False,
+              log_dir: Path = DEFAULT_LOG_DIR,
+              events_file: Optional[Path] = DEFAULT_EVENTS_FILE,
+              render_profile: str = "publication",
+              chart_format: str = "png") -> BatchResult:
+    """
+    Analyze many tickers on a bounded worker pool.
+
+    Args:
+        tickers: Tickers to analyze (normalized by the caller)
+        workers: Maximum number of tickers analyzed at once
+        status_file: JSON file recording per-ticker progress
+        retry_failed: Run tickers that failed in a previous batch again
+        restart: Ignore previous progress and run every ticker
+        use_cache: Let each workflow skip unchanged stages
+        allow_download: Open the StockRow page for tickers without data
+        log_dir: Folder receiving one log file per ticker
+        events_file: NDJSON file the progress events of every ticker are
+            appended to (None: no event log)
+        render_profile: Chart render profile; draft is much cheaper than
+            publication for large batches
+        chart_format: Chart file format (png, svg or webp)
+
+    Returns:
+        BatchResult: Successes, failures and throughput
+    """
+    status = BatchStatus(status_file)
+    if restart:
+        status.reset(tickers)
+    todo = status.pending(tickers, retry_failed=retry_failed)
+    result = BatchResult(total=len(tickers), skipped=len(tickers) - len(todo))
+
+    if result.skipped:
+        console.print(f"[dim]>> Resuming: {result.skipped} ticker(s) already processed "
+                      f"(see {status_file})[/dim]")
+    if not todo:
+        _collect_statistics(result, status, tickers)
+        return result
+
+    if allow_download and workers > 1:
+        # Downloads go through the user's browser, one ticker at a time
+        console.print("[yellow]NOTE: --download runs one ticker at a time[/yellow]")
+        workers = 1
+
+    console.print(f"[bold blue]>> Analyzing {len(todo)} ticker(s) with {workers} worker(s)[/bold blue]")
+    started = time.perf_counter()
+    event_log = NdjsonWriter(events_file) if events_file else None
+    if event_log is not None:
+        default_bus.subscribe(event_log)
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ms-batch")
+    try:
+        with output_router.routed_stdout():
+            futures = {
+                pool.submit(_analyze_one, ticker, status, Path(log_dir), use_cache, allow_download,
+                            render_profile, chart_format): ticker
+                for ticker in todo
+            }
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                ticker = futures[future]
+                seconds = status.tickers[ticker].get('seconds', 0)
+                succeeded = future.result()
+                default_bus.publish(ITEMS, ticker=ticker, state='done' if succeeded else 'failed',
+                                    completed=done_count, total=len(todo), seconds=seconds)
+                if succeeded:
+                    result.succeeded.append(ticker)
+                    console.print(f"[green]>> [{done_count}/{len(todo)}] {ticker} done in {seconds:.1f}s[/green]")
+                else:
+                    result.failed[ticker] = status.tickers[ticker].get('error', 'analysis failed')
+                    console.print(f"[red]>> [{done_count}/{len(todo)}] {ticker} failed in {seconds:.1f}s: "
+                                  f"{result.failed[ticker]}[/red]")
+    except KeyboardInterrupt:
+        result.interrupted = True
+        pool.shutdown(wait=True, cancel_futures=True)
+        console.print("\n[yellow]>> Batch interrupted; run the same command again to resume[/yellow]")
+    finally:
+        pool.shutdown(wait=True)
+        result.elapsed = time.perf_counter() - started
+        if event_log is not None:
+            default_bus.unsubscribe(event_log)
+            event_log.close()
+
+    _collect_statistics(result, status, tickers)
+    return result
+
+
+def _collect_statistics(result: BatchResult, status: BatchStatus, tickers: List[str]):
+    """Copy the recorded statistics of finished tickers, this run's and earlier ones, into the result."""
+    for ticker in tickers:
+        entry = status.tickers.get(ticker, {})
+        if entry.get('state') == 'done' and entry.get('statistics'):
+            result.statistics[ticker] = entry['statistics']
@@ -0,0 +1,228 @@
+"""
+Bulk import of StockRow exports for MarketSwimmer.
+
+Scans a folder (or a zip archive of exports) once, classifies every XLSX
+file by ticker from its file name and by its sheet structure, and
+ingests the exports into the export store and the parse cache. Parsing
+is the expensive part, so files are inspected and parsed on a process
+pool; the store itself is updated from the calling process.
+"""
+
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from .batch import normalize_tickers
+from .export_store import STORE_DIRNAME, ExportStore
+from .parse_cache import PARSED_DIRNAME, ParseCache
+from .stage_cache import fingerprint_file
+
+console = Console()
+
+# Sheets (by name fragment) every StockRow export contains
+EXPORT_SHEETS = ('income statement', 'balance sheet', 'cash flow')
+
+# File name stems of StockRow exports, lower case; the ticker may use '_'
+# for '.' (financials_export_brk_b_2025_08_02_221804)
+_TICKER_PATTERNS = [
+    re.compile(r'^financials_export_(?P<ticker>[a-z0-9._-]+?)(?:_\d{4}_\d{2}_\d{2}(?:_\d+)*)?$'),
+    re.compile(r'^financial_(?P<ticker>[a-z0-9._-]+?)(?:_\d{4}_\d{2}_\d{2}(?:_\d+)*)?$'),
+    re.compile(r'^(?P<ticker>[a-z0-9.-]+)_financials(?:_.*)?$'),
+]
+_DUPLICATE_SUFFIX = re.compile(r'\s*\(\d+\)$')  # "export (1).xlsx" from the browser
+
+
+def ticker_from_filename(filename: str) -> Optional[str]:
+    """
+    Extract the ticker from an export file name.
+
+    Args:
+        filename: File name, e.g. 'financials_export_brk_b_2025_08_02_221804.xlsx'
+
+    Returns:
+        str: Normalized ticker (e.g. 'BRK.B'), or None if the name does not match
+    """
+    stem = _DUPLICATE_SUFFIX.sub('', Path(filename).stem.lower())
+    for pattern in _TICKER_PATTERNS:
+        match = pattern.match(stem)
+        if match:
+            tickers = normalize_tickers([match.group('ticker').replace('_', '.')])
+            return tickers[0] if tickers else None
+    return None
+
+
+def is_export_structure(sheet_names: List[str]) -> bool:
+    """Check that a workbook has the statement sheets of a StockRow export."""
+    lowered = [name.lower() for name in sheet_names]
+    return all(any(required in name for name in lowered) for required in EXPORT_SHEETS)
+
+
+def _inspect_file(path: str, cache_dir: Optional[str]) -> Dict:
+    """
+    Classify one workbook and, for exports, fill the parse cache.
+
+    Runs in a worker process; returns only small, picklable metadata.
+    """
+    import openpyxl
+
+    result = {'path': path, 'sheets': [], 'digest': None, 'error': None}
+    try:
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            result['sheets'] = list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    except Exception as e:
+        result['error'] = f"not a readable workbook ({type(e).__name__})"
+        return result
+
+    if not is_export_structure(result['sheets']):
+        return result
+
+    result['digest'] = fingerprint_file(Path(path))
+    if cache_dir:
+        try:
+            ParseCache(Path(cache_dir)).load(Path(path), digest=result['digest'])
+        except Exception as e:
+            result['error'] = f"could not be parsed: {e}"
+    return result
+
+
+class ImportResult:
+    """Outcome of one bulk import."""
+
+    def __init__(self):
+        self.imported: List[Tuple[str, Path]] = []
+        self.unchanged: List[Tuple[str, Path]] = []
+        self.skipped: Dict[str, str] = {}
+        self.elapsed = 0.0
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with at least one export, in first-seen order."""
+        return list(dict.fromkeys(ticker for ticker, _ in self.imported + self.unchanged))
+
+
+def _collect_files(source: Path, extract_dir: Path) -> List[Path]:
+    """
+    List the XLSX files of a folder (recursively) or extract them from a zip.
+
+    Args:
+        source: Folder or zip archive
+        extract_dir: Scratch folder for zip members
+
+    Returns:
+        list: XLSX files to inspect
+    """
+    if source.is_file() and zipfile.is_zipfile(source) and source.suffix.lower() == '.zip':
+        files = []
+        with zipfile.ZipFile(source) as archive:
+            for number, info in enumerate(archive.infolist()):
+                name = Path(info.filename).name
+                if info.is_dir() or not name.lower().endswith('.xlsx') or info.filename.startswith('__MACOSX'):
+                    continue
+                # Flatten member paths; the number keeps equal names apart
+                target = extract_dir / f"{number}" / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with archive.open(info) as src, open(target, 'wb') as dst:
+                    while True:
+                        chunk = src.read(1 << 20)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                stamp = time.mktime(info.date_time + (0, 0, -1))
+                os.utime(target, (stamp, stamp))
+                files.append(target)
+        return files
+
+    files = []
+    for folder, dirnames, filenames in os.walk(source):
+        dirnames[:] = [name for name in dirnames if name != STORE_DIRNAME]
+        for name in filenames:
+            # Skip Office lock files ("~$export.xlsx")
+            if name.lower().endswith('.xlsx') and not name.startswith('~$'):
+                files.append(Path(folder) / name)
+    return files
+
+
+def import_exports(source: Path,
+                   target: Path = Path("downloaded_files"),
+                   workers: Optional[int] = None,
+                   dry_run: bool = False) -> ImportResult:
+    """
+    Import every StockRow export found in a folder or zip archive.
+
+    Args:
+        source: Folder (searched recursively) or zip archive of exports
+        target: Project downloads folder backed by the export store
+        workers: Worker processes for inspecting and parsing files
+        dry_run: Only classify files; nothing is written
+
+    Returns:
+        ImportResult: Imported, unchanged and skipped files
+    """
+    source = Path(source)
+    result = ImportResult()
+    started = time.perf_counter()
+    store = ExportStore(target)
+    cache_dir = None if dry_run else store.store_dir / PARSED_DIRNAME
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="ms-import-") as scratch:
+        files = _collect_files(source, Path(scratch))
+        console.print(f"[blue]>> Found {len(files)} XLSX file(s) in {source}[/blue]")
+
+        candidates = []
+        for path in files:
+            ticker = ticker_from_filename(path.name)
+            if ticker is None:
+                result.skipped[str(path)] = "no ticker in file name"
+            else:
+                candidates.append((ticker, path))
+        if not candidates:
+            result.elapsed = time.perf_counter() - started
+            return result
+
+        workers = workers or min(4, os.cpu_count() or 1)
+        paths = [str(path) for _, path in candidates]
+        cache_arg = str(cache_dir) if cache_dir is not None else None
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                inspected = list(pool.map(_inspect_file, paths, [cache_arg] * len(paths)))
+        else:
+            inspected = [_inspect_file(path, cache_arg) for path in paths]
+
+        # Oldest first, so the newest export of a ticker ends up as its latest file
+        exports = []
+        for (ticker, path), info in zip(candidates, inspected):
+            if info['error']:
+                result.skipped[str(path)] = info['error']
+            elif info['digest'] is None:
+                result.skipped[str(path)] = "not a StockRow export (missing statement sheets)"
+            else:
+                exports.append((path.stat().st_mtime, ticker, path))
+        exports.sort()
+
+        for mtime, ticker, path in exports:
+            if dry_run:
+                result.imported.append((ticker, path))
+                continue
+            timestamp = time.strftime("%Y_%m_%d_%H%M%S", time.localtime(mtime))
+            alias_name = f"financials_export_{ticker.replace('.', '_').lower()}_{timestamp}.xlsx"
+            known = store.alias_names()
+            alias = store.import_file(path, ticker, alias_name, mtime=mtime)
+            if alias.name in known:
+                result.unchanged.append((ticker, alias))
+            else:
+                result.imported.append((ticker, alias))
+
+    result.elapsed = time.perf_counter() - started
+    return result
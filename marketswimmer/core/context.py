@@ -0,0 +1,110 @@
+"""
+In-memory analysis context for MarketSwimmer.
+
+Carries the parsed workbook and every intermediate result of an analysis
+run from one workflow stage to the next, so stages do not have to read
+back files written by earlier stages.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .analytics import EarningsStatistics, compute_earnings_statistics, statistics_path
+from .balance_sheet import BalanceSheetSnapshot
+from .stage_cache import fingerprint_file
+from .workbook import FinancialWorkbook
+
+
+@dataclass
+class AnalysisContext:
+    """State shared by the stages of one ticker's analysis."""
+
+    ticker: str
+    data_file: Optional[Path] = None
+    workbook: Optional[FinancialWorkbook] = None
+    annual_owner_earnings: Optional[pd.DataFrame] = None
+    quarterly_owner_earnings: Optional[pd.DataFrame] = None
+    earnings_statistics: Optional[EarningsStatistics] = None
+    balance_sheet: Optional[BalanceSheetSnapshot] = None
+    fair_value_results: Optional[Dict[str, Any]] = None
+    outputs: Dict[str, Path] = field(default_factory=dict)
+    force_render: bool = False  # Re-render charts even if they are up to date
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def from_file(cls, ticker: str, data_file: Path) -> "AnalysisContext":
+        """
+        Create a context with the downloaded workbook parsed once.
+
+        Args:
+            ticker: Stock ticker symbol
+            data_file: Path to the StockRow XLSX export
+
+        Returns:
+            AnalysisContext: Context holding the parsed workbook
+        """
+        data_file = Path(data_file)
+        return cls(ticker=ticker, data_file=data_file,
+                   workbook=FinancialWorkbook.load(data_file))
+
+    @property
+    def file_ticker(self) -> str:
+        """Ticker as used in output file names, e.g. BRK.B -> brk_b."""
+        return self.ticker.replace('.', '_').lower()
+
+    def owner_earnings_path(self, data_folder: Path, period: str) -> Path:
+        """Path of the persisted owner earnings CSV for 'annual' or 'quarterly'."""
+        return Path(data_folder) / f"owner_earnings_{period}_{self.file_ticker}.csv"
+
+    def ensure_workbook(self) -> FinancialWorkbook:
+        """Parse the data file if no stage has done so yet in this run."""
+        with self._lock:
+            if self.workbook is None:
+                self.workbook = FinancialWorkbook.load(self.data_file)
+        return self.workbook
+
+    def ensure_owner_earnings(self, data_folder: Path):
+        """
+        Load the owner earnings frames persisted by a previous run.
+
+        Used when the owner earnings stage was skipped because its inputs
+        were unchanged; frames already in memory are kept.
+
+        Args:
+            data_folder: Folder holding the owner earnings CSV files
+        """
+        with self._lock:
+            if self.annual_owner_earnings is None:
+                self.annual_owner_earnings = pd.read_csv(self.owner_earnings_path(data_folder, 'annual'))
+            if self.quarterly_owner_earnings is None:
+                self.quarterly_owner_earnings = pd.read_csv(self.owner_earnings_path(data_folder, 'quarterly'))
+
+    def ensure_earnings_statistics(self, data_folder: Path) -> EarningsStatistics:
+        """
+        Return the owner earnings statistics of this run.
+
+        Statistics stored by a previous run are used when the owner earnings
+        stage was skipped; they are only recomputed if the file is missing,
+        of another statistics version, or was computed from other owner
+        earnings CSV content than the files now in data_folder.
+
+        Args:
+            data_folder: Folder holding the owner earnings files
+        """
+        if self.earnings_statistics is None:
+            sources = {period: fingerprint_file(self.owner_earnings_path(data_folder, period))
+                       for period in ('annual', 'quarterly')}
+            statistics = EarningsStatistics.load(statistics_path(data_folder, self.ticker))
+            if statistics is None or not statistics.matches_sources(sources):
+                self.ensure_owner_earnings(data_folder)
+                statistics = compute_earnings_statistics(self.ticker, self.annual_owner_earnings,
+                                                         self.quarterly_owner_earnings)
+                statistics.sources = sources
+            with self._lock:
+                if self.earnings_statistics is None:
+                    self.earnings_statistics = statistics
+        return self.earnings_statistics
@@ -0,0 +1,383 @@
+"""
+Warm worker daemon for MarketSwimmer.
+
+Every `ms` command normally starts a fresh interpreter and imports pandas,
+matplotlib, seaborn and the analysis modules again. The daemon is a
+long-lived local process that has done those imports once (and keeps
+recently parsed workbooks in memory); `ms` commands submit their
+arguments to it over a Unix socket and receive the output as it is
+produced. When no daemon is running, commands run in-process as before.
+
+Protocol: one JSON object per line. A client sends
+{"op": "run", "argv": [...], "cwd": "...", "env": {...}} and receives
+{"out": "..."} messages followed by {"exit": code}. {"op": "status"} and
+{"op": "stop"} control the daemon. Jobs run one at a time, since each job
+switches the daemon to the client's working directory.
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SOCKET_ENV = "MARKETSWIMMER_DAEMON_SOCKET"
+DISABLE_ENV = "MARKETSWIMMER_NO_DAEMON"
+
+# Commands that must run in the caller's process
+LOCAL_COMMANDS = {"gui", "daemon"}
+
+# Heavy modules imported once when the daemon starts
+WARM_MODULES = [
+    "pandas",
+    "numpy",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_agg",
+    "seaborn",
+    "openpyxl",
+    "marketswimmer.cli",
+    "marketswimmer.core.workflow",
+    "marketswimmer.core.analysis",
+    "marketswimmer.core.fair_value",
+    "marketswimmer.visualization.charts",
+]
+
+
+def daemon_supported() -> bool:
+    """True if this platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> Path:
+    """Location of the daemon socket ($MARKETSWIMMER_DAEMON_SOCKET or ~/.marketswimmer)."""
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return Path(configured)
+    return Path.home() / ".marketswimmer" / "daemon.sock"
+
+
+def should_use_daemon(argv: List[str]) -> bool:
+    """Decide whether a command line may be sent to the daemon."""
+    if os.environ.get(DISABLE_ENV) or not daemon_supported() or not argv:
+        return False
+    return argv[0] not in LOCAL_COMMANDS
+
+
+def _secure_directory(directory: Path):
+    """
+    Create the socket directory, or check an existing one, so that only
+    the current user can reach the socket.
+
+    Raises:
+        RuntimeError: If the directory belongs to another user or is a symlink
+    """
+    directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise RuntimeError(f"{directory} is not a directory owned by you; "
+                           f"point {SOCKET_ENV} at a private directory")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def _connect(path: Optional[Path] = None, timeout: Optional[float] = 2.0) -> Optional[socket.socket]:
+    """Connect to a running daemon, or return None."""
+    path = path or socket_path()
+    if not daemon_supported() or not path.exists():
+        return None
+    # Jobs carry the caller's environment; never hand it to another user's socket
+    try:
+        if path.stat().st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _send(sock: socket.socket, message: Dict):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _messages(sock: socket.socket, deadline: Optional[float] = None):
+    """Yield the JSON messages arriving on a socket until it closes."""
+    pending = b""
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("daemon job timed out")
+            sock.settimeout(min(remaining, 1.0))
+        try:
+            chunk = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not chunk:
+            return
+        pending += chunk
+        while b"\n" in pending:
+            line, pending = pending.split(b"\n", 1)
+            if line.strip():
+                yield json.loads(line.decode("utf-8"))
+
+
+def request(op: str) -> Optional[Dict]:
+    """
+    Send a control request ('status' or 'stop') to the daemon.
+
+    Returns:
+        dict: The daemon's reply, or None if no daemon is running
+    """
+    sock = _connect()
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, {"op": op})
+        for message in _messages(sock, deadline=time.monotonic() + 10):
+            return message
+    return None
+
+
+def run_in_daemon(argv: List[str],
+                  on_output: Optional[Callable[[str], None]] = None,
+                  timeout: Optional[float] = None) -> Optional[int]:
+    """
+    Run a CLI command in the daemon, streaming its output.
+
+    Args:
+        argv: Command line arguments, e.g. ['analyze', 'AAPL']
+        on_output: Called with each chunk of output (default: print to stdout)
+        timeout: Give up waiting after this many seconds (raises TimeoutError)
+
+    Returns:
+        int: The command's exit code, or None if no daemon is running
+    """
+    sock = _connect()
+    if sock is None:
+        return None
+
+    if on_output is None:
+        def on_output(text):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    deadline = time.monotonic() + timeout if timeout else None
+    env = {name: value for name, value in os.environ.items() if name.startswith("MARKETSWIMMER_")}
+    with sock:
+        _send(sock, {"op": "run", "argv": list(argv), "cwd": os.getcwd(), "env": env})
+        for message in _messages(sock, deadline):
+            if "out" in message:
+                on_output(message["out"])
+            elif "exit" in message:
+                return int(message["exit"])
+    on_output("ERROR: Lost connection to the MarketSwimmer daemon\n")
+    return 1
+
+
+class _SocketWriter(io.TextIOBase):
+    """Text stream forwarding a job's output to its client."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.disconnected = False
+
+    def write(self, text: str) -> int:
+        if text and not self.disconnected:
+            try:
+                _send(self.sock, {"out": text})
+            except OSError:
+                # Client went away (e.g. interrupted); let the job finish quietly
+                self.disconnected = True
+        return len(text)
+
+    def writable(self) -> bool:
+        return True
+
+
+class WorkerDaemon:
+    """The long-lived process serving `ms` commands."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else socket_path()
+        self.started_at = datetime.now()
+        self.jobs_served = 0
+        self.current_job: Optional[List[str]] = None
+        self._job_lock = threading.Lock()
+        self._server: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+
+    def warm_up(self):
+        """Import the heavy modules every command needs."""
+        import importlib
+        import matplotlib
+        matplotlib.use('Agg')  # No display in a background process
+        for name in WARM_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"[WARNING] Could not preload {name}: {e}")
+
+    def serve_forever(self):
+        """Listen on the socket until a stop request arrives."""
+        from . import output_router
+
+        # Commands that start `python -m marketswimmer` themselves must not
+        # call back into this daemon
+        os.environ[DISABLE_ENV] = "1"
+
+        _secure_directory(self.path.parent)
+        if self.path.exists():
+            existing = _connect(self.path)
+            if existing is not None:
+                existing.close()
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()  # Left behind by a daemon that did not shut down
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket private rather than narrowing it after bind()
+        previous_umask = os.umask(0o077)
+        try:
+            self._server.bind(str(self.path))
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.path, 0o600)
+        self._server.listen(8)
+        self._server.settimeout(1.0)  # Lets the accept loop notice a stop request
+        print(f"[DAEMON] Listening on {self.path} (pid {os.getpid()})")
+        sys.stdout.flush()
+
+        try:
+            with output_router.routed_stdout():
+                while not self._stopping.is_set():
+                    try:
+                        conn, _ = self._server.accept()
+                    except socket.timeout:
+                        continue
+                    except OSError:
+                        break
+                    conn.settimeout(None)
+                    threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self._server.close()
+            if self.path.exists():
+                self.path.unlink()
+            print("[DAEMON] Stopped")
+
+    def status(self) -> Dict:
+        """Describe the daemon for `ms daemon status`."""
+        from .. import __version__
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "jobs_served": self.jobs_served,
+            "current_job": " ".join(self.current_job) if self.current_job else None,
+        }
+
+    def _handle(self, conn: socket.socket):
+        with conn:
+            try:
+                message = next(_messages(conn), None)
+                if message is None:
+                    return
+                op = message.get("op")
+                if op == "status":
+                    _send(conn, self.status())
+                elif op == "stop":
+                    _send(conn, {"stopping": True})
+                    self._stopping.set()
+                elif op == "run":
+                    code = self._run_job(message.get("argv", []), message.get("cwd"),
+                                         message.get("env", {}), _SocketWriter(conn))
+                    _send(conn, {"exit": code})
+                else:
+                    _send(conn, {"error": f"unknown request {op!r}"})
+            except OSError:
+                pass
+
+    def _run_job(self, argv: List[str], cwd: Optional[str], env: Dict[str, str],
+                 writer: _SocketWriter) -> int:
+        """Run one CLI command with its output sent to the client."""
+        from . import output_router
+
+        with self._job_lock:
+            self.current_job = argv
+            previous_cwd = os.getcwd()
+            previous_env = {name: os.environ.get(name) for name in env}
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                os.environ.update(env)
+                with output_router.capture_thread_output(writer):
+                    return _invoke_cli(argv)
+            finally:
+                os.chdir(previous_cwd)
+                for name, value in previous_env.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+                self.current_job = None
+                self.jobs_served += 1
+
+
+def _invoke_cli(argv: List[str]) -> int:
+    """Run the Typer app in-process and return its exit code."""
+    from ..cli import app
+
+    try:
+        result = app(args=argv, prog_name="marketswimmer", standalone_mode=False)
+        return result if isinstance(result, int) else 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        if hasattr(e, "show") and hasattr(e, "exit_code"):
+            # Usage errors from the command line parser
+            e.show(file=sys.stdout)
+            return e.exit_code
+        traceback.print_exc(file=sys.stdout)
+        return 1
+
+
+def start_background(log_file: Optional[Path] = None, wait: float = 60.0) -> Optional[Dict]:
+    """
+    Start a daemon in a detached process and wait until it answers.
+
+    Args:
+        log_file: Where the daemon's own output goes (default: next to the socket)
+        wait: Seconds to wait for the daemon to finish warming up
+
+    Returns:
+        dict: The new daemon's status, or None if it did not come up
+    """
+    import subprocess
+
+    log_file = Path(log_file) if log_file else socket_path().with_suffix(".log")
+    log_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    env = os.environ.copy()
+    env[DISABLE_ENV] = "1"
+    with open(log_file, "a", encoding="utf-8") as log:
+        subprocess.Popen([sys.executable, "-m", "marketswimmer", "daemon", "run"],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                         env=env, start_new_session=True)
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = request("status")
+        if status is not None:
+            return status
+        time.sleep(0.2)
+    return None
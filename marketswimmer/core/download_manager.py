@@ -4,14 +4,17 @@ Handles automatic detection and processing of financial data downloads.
 """
 
 import os
-import shutil
+import threading
 import time
 import webbrowser
 import glob
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 from rich.console import Console
 
+from .download_watcher import DownloadWatcher, matches_ticker
+from .export_store import ExportStore
+
 console = Console()
 
 class DownloadManager:
@@ -21,6 +24,7 @@ class DownloadManager:
         self.download_folder = self._get_download_folder()
         self.target_folder = Path("downloaded_files")
         self.target_folder.mkdir(exist_ok=True)
+        self.store = ExportStore(self.target_folder)
     
     def _get_download_folder(self) -> Optional[Path]:
         """Get the user's default download folder."""
@@ -80,50 +84,70 @@ class DownloadManager:
         
         return sorted(recent_files, key=lambda x: x.stat().st_mtime, reverse=True)
     
-    def wait_for_download(self, ticker: str, timeout: int = 120) -> Optional[Path]:
+    def wait_for_download(self, ticker: str, timeout: int = 120,
+                          cancel_event: Optional[threading.Event] = None) -> Optional[Path]:
         """Wait for a financial data download to complete."""
-        console.print(f"[yellow]>> Monitoring downloads folder for {ticker} data...[/yellow]")
+        return self.wait_for_downloads([ticker], timeout=timeout, cancel_event=cancel_event).get(ticker)
+    
+    def wait_for_downloads(self, tickers: List[str], timeout: int = 120,
+                           cancel_event: Optional[threading.Event] = None) -> Dict[str, Path]:
+        """
+        Wait for financial data downloads of several tickers at once.
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            # Check for recent files (increased from 2 to 10 minutes to catch existing downloads)
-            recent_files = self.find_recent_xlsx_files(minutes_back=10)
-            
-            for file_path in recent_files:
-                if self._is_financial_data_file(file_path, ticker):
-                    console.print(f"[green]>> Found download: {file_path.name}[/green]")
-                    return file_path
+        Uses inotify on Linux and polling elsewhere; files are only returned
+        once fully written (see download_watcher).
+        
+        Args:
+            tickers: Ticker symbols to wait for
+            timeout: Seconds to wait in total
+            cancel_event: Stop waiting early once this is set
             
-            time.sleep(2)  # Check every 2 seconds
+        Returns:
+            dict: Ticker -> downloaded file, for the tickers that arrived in time
+        """
+        if not self.download_folder or not self.download_folder.exists():
+            console.print(f"[red]ERROR: Downloads folder not found[/red]")
+            return {}
         
-        console.print(f"[red]>> Timeout waiting for download[/red]")
-        return None
+        console.print(f"[yellow]>> Monitoring downloads folder for {', '.join(tickers)} data...[/yellow]")
+        
+        # Look back 10 minutes to catch downloads that finished before we started watching
+        with DownloadWatcher(self.download_folder) as watcher:
+            found = watcher.wait_for(tickers, timeout=timeout, look_back=10 * 60,
+                                     cancel_event=cancel_event)
+        
+        for ticker in tickers:
+            if ticker in found:
+                console.print(f"[green]>> Found download: {found[ticker].name}[/green]")
+            elif cancel_event is not None and cancel_event.is_set():
+                console.print(f"[yellow]>> Stopped waiting for {ticker} download (cancelled)[/yellow]")
+            else:
+                console.print(f"[red]>> Timeout waiting for {ticker} download[/red]")
+        return found
     
     def _is_financial_data_file(self, file_path: Path, ticker: str) -> bool:
         """Check if a file looks like financial data for the given ticker."""
-        filename = file_path.name.lower()
-        ticker_lower = ticker.lower().replace('.', '')
-        
-        # Ticker-specific patterns only - no generic matches to prevent cross-contamination
-        patterns = [
-            f"financials_export_{ticker_lower}",
-            f"financial_{ticker_lower}",
-            f"{ticker_lower}_financials",
-        ]
-        
-        return any(pattern in filename for pattern in patterns)
+        return matches_ticker(file_path.name, ticker)
     
     def copy_to_project(self, source_file: Path, ticker: str) -> Path:
-        """Copy downloaded file to the project's downloaded_files directory."""
+        """
+        Import a downloaded file into the project's downloaded_files directory.
+        
+        The file goes through the content-addressed export store: identical
+        re-downloads reuse the existing file instead of adding a new copy.
+        """
         # Create a clean filename
         clean_ticker = ticker.replace('.', '_').upper()
         timestamp = time.strftime("%Y_%m_%d_%H%M%S")
         target_filename = f"financials_export_{clean_ticker.lower()}_{timestamp}.xlsx"
-        target_path = self.target_folder / target_filename
         
         try:
-            shutil.copy2(source_file, target_path)
-            console.print(f"[green]>> Copied to: {target_path}[/green]")
+            known_aliases = self.store.alias_names()
+            target_path = self.store.import_file(source_file, ticker.upper(), target_filename)
+            if target_path.name in known_aliases:
+                console.print(f"[green]>> Data unchanged, reusing: {target_path}[/green]")
+            else:
+                console.print(f"[green]>> Copied to: {target_path}[/green]")
             return target_path
         except Exception as e:
             console.print(f"[red]ERROR: Error copying file: {e}[/red]")
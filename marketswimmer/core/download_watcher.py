@@ -0,0 +1,271 @@
+"""
+Download folder watching for MarketSwimmer.
+
+On Linux the Downloads folder is watched with inotify (through ctypes, no
+extra dependency), so a finished StockRow export is noticed as soon as the
+browser closes or renames it. Elsewhere, or if inotify is unavailable, the
+folder is polled with a single directory scan per interval.
+
+Either way a file is only reported once its size has stopped changing and
+it opens as a complete XLSX (zip) archive, so partial downloads are never
+handed to the copy step.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def ticker_patterns(ticker: str) -> List[str]:
+    """Filename fragments identifying an export for the ticker (lower case)."""
+    ticker_lower = ticker.lower().replace('.', '')
+    # Ticker-specific patterns only - no generic matches to prevent cross-contamination
+    return [
+        f"financials_export_{ticker_lower}",
+        f"financial_{ticker_lower}",
+        f"{ticker_lower}_financials",
+    ]
+
+
+def matches_ticker(filename: str, ticker: str) -> bool:
+    """Check if a file name looks like financial data for the given ticker."""
+    filename = filename.lower()
+    return filename.endswith('.xlsx') and any(pattern in filename for pattern in ticker_patterns(ticker))
+
+
+def wait_until_stable(path: Path, interval: float = 0.25, checks: int = 2,
+                      timeout: float = 30.0) -> bool:
+    """
+    Wait until a file stops growing and is a complete XLSX archive.
+
+    Args:
+        path: File to watch
+        interval: Seconds between size checks
+        checks: Consecutive identical (size, mtime) readings required
+        timeout: Give up after this many seconds
+
+    Returns:
+        bool: True once the file is stable and readable as a zip archive;
+            False if it is stable but not an archive, vanished or timed out
+    """
+    deadline = time.monotonic() + timeout
+    previous = None
+    identical = 0
+    while time.monotonic() < deadline:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        current = (stat.st_size, stat.st_mtime_ns)
+        if current == previous and stat.st_size > 0:
+            identical += 1
+            if identical >= checks:
+                # A finished file that is not a zip archive is not an export
+                return zipfile.is_zipfile(path)
+        else:
+            identical = 0
+        previous = current
+        time.sleep(interval)
+    return False
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around the Linux inotify API."""
+
+    def __init__(self, folder: Path, mask: int):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(str(folder)), ctypes.c_uint32(mask))
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def read_events(self, timeout: float) -> Optional[List[str]]:
+        """
+        Wait up to timeout seconds for events.
+
+        Returns:
+            list: File names from the events, or None if the kernel queue
+                overflowed and the folder must be rescanned
+        """
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class DownloadWatcher:
+    """
+    Waits for StockRow exports of one or more tickers to land in a folder.
+
+    Use as a context manager so the inotify descriptor is released.
+    """
+
+    def __init__(self, folder: Path, poll_interval: float = 2.0, use_inotify: bool = True):
+        """
+        Initialize the watcher.
+
+        Args:
+            folder: Downloads folder to watch
+            poll_interval: Seconds between scans when polling
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.folder = Path(folder)
+        self.poll_interval = poll_interval
+        self._inotify = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify(self.folder, IN_CLOSE_WRITE | IN_MOVED_TO)
+            except (OSError, AttributeError):
+                self._inotify = None
+
+    @property
+    def mode(self) -> str:
+        """'inotify' or 'polling'."""
+        return 'inotify' if self._inotify is not None else 'polling'
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop watching the folder."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def scan(self, tickers: Iterable[str], newer_than: float = 0.0) -> Dict[str, Path]:
+        """
+        Find the newest existing export per ticker with a single directory scan.
+
+        Args:
+            tickers: Tickers to look for
+            newer_than: Ignore files modified before this timestamp
+
+        Returns:
+            dict: Ticker -> newest matching file
+        """
+        tickers = list(tickers)
+        found: Dict[str, Path] = {}
+        newest: Dict[str, float] = {}
+        try:
+            entries = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            return found
+        for entry in entries:
+            matching = [ticker for ticker in tickers if matches_ticker(entry.name, ticker)]
+            if not matching:
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime <= newer_than:
+                continue
+            for ticker in matching:
+                if mtime > newest.get(ticker, -1.0):
+                    newest[ticker] = mtime
+                    found[ticker] = Path(entry.path)
+        return found
+
+    def wait_for(self, tickers: Iterable[str], timeout: float = 120.0,
+                 look_back: float = 600.0,
+                 cancel_event: Optional[threading.Event] = None) -> Dict[str, Path]:
+        """
+        Wait until an export has arrived for every ticker, or the timeout.
+
+        Exports already downloaded within the look-back window count, so a
+        download finished before waiting started is still picked up.
+
+        Args:
+            tickers: Tickers to wait for
+            timeout: Seconds to wait in total
+            look_back: Accept existing files modified this many seconds ago
+            cancel_event: Stop waiting (within a second) once this is set
+
+        Returns:
+            dict: Ticker -> stable export file, for the tickers that arrived
+        """
+        pending = list(dict.fromkeys(tickers))
+        deadline = time.monotonic() + timeout
+        results: Dict[str, Path] = {}
+
+        def accept(candidates: Dict[str, Path]):
+            for ticker, path in candidates.items():
+                if ticker in pending and wait_until_stable(path, timeout=max(1.0, deadline - time.monotonic())):
+                    results[ticker] = path
+                    pending.remove(ticker)
+
+        accept(self.scan(pending, newer_than=time.time() - look_back))
+
+        def cancelled() -> bool:
+            return cancel_event is not None and cancel_event.is_set()
+
+        while pending and time.monotonic() < deadline and not cancelled():
+            remaining = deadline - time.monotonic()
+            if self._inotify is not None:
+                names = self._inotify.read_events(min(remaining, 1.0))
+                if names is None:
+                    # Event queue overflowed; fall back to one full scan
+                    accept(self.scan(pending, newer_than=time.time() - look_back))
+                    continue
+                candidates = {}
+                for name in names:
+                    for ticker in pending:
+                        if matches_ticker(name, ticker):
+                            candidates[ticker] = self.folder / name
+                accept(candidates)
+            else:
+                if cancel_event is not None:
+                    cancel_event.wait(min(remaining, self.poll_interval, 1.0))
+                else:
+                    time.sleep(min(remaining, self.poll_interval))
+                if cancelled():
+                    break
+                accept(self.scan(pending, newer_than=time.time() - look_back))
+
+        return results
@@ -0,0 +1,177 @@
+"""
+Structured progress events for MarketSwimmer.
+
+The workflow, batch runs and the fetcher publish typed events (run and
+stage start/end, item counts, timings, warnings) on an EventBus instead
+of leaving progress to be inferred from their console output. Renderers
+subscribe to the bus: the CLI prints events with rich, batch runs write
+them as NDJSON, and the GUI receives the Event objects directly.
+
+Publishing is free when nothing is subscribed: publish() returns before
+an Event is even built, and only the attached renderers format anything.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TextIO
+
+# Event kinds
+RUN_START = "run_start"      # One ticker's analysis starts
+RUN_END = "run_end"          # ... and ends; state is 'done', 'failed' or 'cancelled'
+STAGE_START = "stage_start"
+STAGE_END = "stage_end"      # state is 'done', 'skipped', 'failed', 'blocked' or 'cancelled'
+ITEMS = "items"              # completed/total of a multi-item job (batch, fetch)
+WARNING = "warning"
+
+
+@dataclass
+class Event:
+    """One progress event; unused fields stay None."""
+
+    kind: str
+    ticker: Optional[str] = None
+    stage: Optional[str] = None
+    description: Optional[str] = None
+    state: Optional[str] = None
+    completed: Optional[int] = None
+    total: Optional[int] = None
+    seconds: Optional[float] = None
+    message: Optional[str] = None
+    time: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict:
+        """Fields that are set, for serialization."""
+        return {name: value for name, value in asdict(self).items() if value is not None}
+
+
+Handler = Callable[[Event], None]
+
+
+class EventBus:
+    """Delivers published events to every subscribed handler, in the publishing thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: List[Handler] = []
+
+    @property
+    def active(self) -> bool:
+        """True if any handler is subscribed."""
+        return bool(self._handlers)
+
+    def subscribe(self, handler: Handler) -> Handler:
+        """Add a handler; returns it for a later unsubscribe()."""
+        with self._lock:
+            self._handlers = self._handlers + [handler]
+        return handler
+
+    def unsubscribe(self, handler: Handler):
+        """Remove a handler (no error if it is not subscribed)."""
+        with self._lock:
+            self._handlers = [h for h in self._handlers if h is not handler]
+
+    @contextmanager
+    def subscribed(self, handler: Handler) -> Iterator[Handler]:
+        """Keep a handler subscribed for the duration of the block."""
+        self.subscribe(handler)
+        try:
+            yield handler
+        finally:
+            self.unsubscribe(handler)
+
+    def publish(self, kind: str, **fields):
+        """
+        Publish an event to the subscribed handlers.
+
+        Args:
+            kind: One of the event kinds defined in this module
+            **fields: Event fields (ticker, stage, state, completed, ...)
+        """
+        handlers = self._handlers  # Replaced, never mutated, so no lock needed
+        if not handlers:
+            return
+        event = Event(kind, **fields)
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                # A broken renderer must not break the analysis
+                print(f"[WARNING] Progress event handler failed: {e}", file=sys.__stderr__)
+
+
+# Shared bus for components that are not handed one explicitly
+default_bus = EventBus()
+
+
+class RichRenderer:
+    """Prints events as short rich-formatted status lines (stderr by default)."""
+
+    STYLES = {'done': 'green', 'skipped': 'dim', 'failed': 'red', 'blocked': 'yellow',
+              'cancelled': 'yellow'}
+
+    def __init__(self, console=None, show_stage_start: bool = False):
+        """
+        Args:
+            console: rich Console to print to (default: a new one on stderr)
+            show_stage_start: Also print a line when a stage starts
+        """
+        if console is None:
+            from rich.console import Console
+            console = Console(stderr=True)
+        self.console = console
+        self.show_stage_start = show_stage_start
+
+    def __call__(self, event: Event):
+        prefix = f"{event.ticker} " if event.ticker else ""
+        if event.kind == STAGE_END:
+            style = self.STYLES.get(event.state, 'white')
+            timing = f" in {event.seconds:.2f}s" if event.seconds is not None else ""
+            self.console.print(f"[{style}]>> [{event.completed}/{event.total}] {prefix}"
+                               f"{event.description}: {event.state}{timing}[/{style}]")
+        elif event.kind == STAGE_START and self.show_stage_start:
+            self.console.print(f"[dim]>> {prefix}{event.description}...[/dim]")
+        elif event.kind == RUN_END:
+            style = self.STYLES.get(event.state, 'white')
+            self.console.print(f"[{style}]>> {prefix}analysis {event.state} "
+                               f"in {event.seconds:.2f}s[/{style}]")
+        elif event.kind == ITEMS:
+            self.console.print(f"[blue]>> [{event.completed}/{event.total}] {prefix}"
+                               f"{event.state or ''}[/blue]")
+        elif event.kind == WARNING:
+            self.console.print(f"[yellow]WARNING: {prefix}{event.message}[/yellow]")
+
+
+class NdjsonWriter:
+    """Writes each event as one JSON line; safe to share between threads."""
+
+    def __init__(self, target):
+        """
+        Args:
+            target: Path of a file to append to, or a writable text stream
+        """
+        self._lock = threading.Lock()
+        if isinstance(target, (str, Path)):
+            path = Path(target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.stream: TextIO = open(path, 'a', encoding='utf-8')
+            self._owns_stream = True
+        else:
+            self.stream = target
+            self._owns_stream = False
+
+    def __call__(self, event: Event):
+        line = json.dumps(event.to_dict(), separators=(',', ':'))
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+    def close(self):
+        """Close the file if this writer opened it."""
+        if self._owns_stream:
+            with self._lock:
+                self.stream.close()
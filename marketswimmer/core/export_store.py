@@ -0,0 +1,314 @@
+"""
+Content-addressed storage for downloaded StockRow exports.
+
+Every imported workbook is hashed (SHA-256) and stored once under
+downloaded_files/.store/objects/<first two hex digits>/<hash>.xlsx. The
+familiar timestamped files in downloaded_files/ are aliases linked to
+those objects: hardlinks where the filesystem allows it, reflinks
+(copy-on-write clones) or plain copies otherwise.
+
+Importing content that is already stored for the same ticker creates no
+new file at all; the existing alias is simply marked as the newest, so
+re-downloads of unchanged data cost one hash and no disk space.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+from .stage_cache import fingerprint_file
+
+STORE_DIRNAME = ".store"
+
+# ioctl request number of FICLONE from <linux/fs.h>
+_FICLONE = 0x40049409
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """
+    Clone source into a new target file sharing its data blocks.
+
+    Only works on Linux copy-on-write filesystems such as Btrfs or XFS;
+    returns False everywhere else so callers can fall back.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        if target.exists():
+            target.unlink()
+        return False
+
+
+def _copy_and_hash(source: Path, target: Path, chunk_size: int = 1 << 20) -> str:
+    """Copy a file while hashing it, so the source is read only once."""
+    digest = hashlib.sha256()
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        for chunk in iter(lambda: src.read(chunk_size), b''):
+            digest.update(chunk)
+            dst.write(chunk)
+    return digest.hexdigest()
+
+
+def link_file(source: Path, target: Path) -> str:
+    """
+    Make target refer to the same content as source, as cheaply as possible.
+
+    Args:
+        source: Existing file
+        target: New path (must not exist)
+
+    Returns:
+        str: 'hardlink', 'reflink' or 'copy', whichever succeeded
+    """
+    try:
+        os.link(source, target)
+        return 'hardlink'
+    except OSError:
+        pass
+    if _reflink(source, target):
+        return 'reflink'
+    shutil.copy2(source, target)
+    return 'copy'
+
+
+class ExportStore:
+    """
+    Deduplicating store behind the downloaded_files folder.
+
+    The index (.store/index.json) maps each alias file name to the hash of
+    its content, records which tickers each object was imported for and
+    keeps the HTTP validators of fetched exports. Several stores (the
+    download manager, `ms fetch`, `ms import`) may share one folder: every
+    change re-reads the index under a file lock (.store/index.json.lock)
+    and writes it back before releasing the lock.
+    """
+
+    def __init__(self, root: Path = Path("downloaded_files")):
+        """
+        Initialize the store.
+
+        Args:
+            root: Folder holding the alias files (downloaded_files)
+        """
+        self.root = Path(root)
+        self.store_dir = self.root / STORE_DIRNAME
+        self.objects_dir = self.store_dir / "objects"
+        self.index_path = self.store_dir / "index.json"
+        self.lock_path = self.store_dir / "index.json.lock"
+        self._lock = threading.Lock()
+        self.index = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        return {'objects': data.get('objects', {}), 'aliases': data.get('aliases', {}),
+                'validators': data.get('validators', {})}
+
+    def _save(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix="index.json", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(self.index, handle, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Dict[str, Dict]]:
+        """
+        Lock the index against other threads and processes, reload it and
+        save it when the block completes.
+
+        Without fcntl (Windows) only threads of this process are excluded.
+        """
+        with self._lock:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, 'a') as lock_file:
+                try:
+                    import fcntl
+                except ImportError:
+                    fcntl = None
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    # Changes of other stores since this one last read the index
+                    self.index = self._load()
+                    yield self.index
+                    self._save()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Re-read the index for a lookup."""
+        with self._lock:
+            self.index = self._load()
+
+    def alias_names(self) -> Set[str]:
+        """Names of the alias files currently in the index."""
+        self._refresh()
+        return set(self.index['aliases'])
+
+    def object_path(self, digest: str) -> Path:
+        """Location of the stored object with the given content hash."""
+        return self.objects_dir / digest[:2] / f"{digest}.xlsx"
+
+    def _ingest(self, source: Path) -> str:
+        """Store the content of source as an object and return its hash."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.store_dir, suffix='.partial')
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            if _reflink(source, tmp_path):
+                digest = fingerprint_file(tmp_path)
+            else:
+                digest = _copy_and_hash(source, tmp_path)
+            object_path = self.object_path(digest)
+            if object_path.exists():
+                tmp_path.unlink()
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, object_path)
+            return digest
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def _alias_for(self, digest: str, ticker: str) -> Optional[Path]:
+        """Existing alias of an object for the ticker, if its file is still there."""
+        for name, entry in self.index['aliases'].items():
+            if entry['hash'] == digest and entry['ticker'] == ticker and (self.root / name).exists():
+                return self.root / name
+        return None
+
+    def _free_alias_name(self, alias_name: str) -> str:
+        """Alias name that does not clash with an existing file."""
+        candidate = alias_name
+        stem, suffix = os.path.splitext(alias_name)
+        counter = 1
+        while (self.root / candidate).exists():
+            candidate = f"{stem}_{counter}{suffix}"
+            counter += 1
+        return candidate
+
+    def import_file(self, source: Path, ticker: str, alias_name: str,
+                    mtime: Optional[float] = None) -> Path:
+        """
+        Store a downloaded export and link it into downloaded_files.
+
+        Args:
+            source: Downloaded XLSX file
+            ticker: Ticker the export belongs to
+            alias_name: File name to use if a new alias is needed
+            mtime: Modification time to give the alias (default: now)
+
+        Returns:
+            Path: The alias for this content (possibly an existing one)
+        """
+        with self._transaction():
+            digest = self._ingest(Path(source))
+            stamp = time.time() if mtime is None else mtime
+            objects = self.index['objects']
+            entry = objects.setdefault(digest, {
+                'size': self.object_path(digest).stat().st_size,
+                'first_seen': datetime.now().isoformat(timespec='seconds'),
+                'tickers': [],
+            })
+            if ticker not in entry['tickers']:
+                entry['tickers'].append(ticker)
+
+            alias = self._alias_for(digest, ticker)
+            if alias is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                alias_name = self._free_alias_name(alias_name)
+                alias = self.root / alias_name
+                method = link_file(self.object_path(digest), alias)
+                self.index['aliases'][alias_name] = {'hash': digest, 'ticker': ticker, 'link': method}
+            else:
+                # Never move a reused alias back in time
+                stamp = max(stamp, alias.stat().st_mtime)
+
+            # Latest-file lookups go by mtime; mark this content as the newest
+            os.utime(alias, (stamp, stamp))
+            return alias
+
+    def validators(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        HTTP cache validators of the last download from a URL.
+
+        Returns:
+            dict: 'etag', 'last_modified' and the 'alias' the download was
+                stored as, or None if unknown or the alias no longer exists
+        """
+        self._refresh()
+        entry = self.index['validators'].get(url)
+        if entry is None or not (self.root / entry['alias']).exists():
+            return None
+        return entry
+
+    def remember_validators(self, url: str, alias: Path, etag: Optional[str],
+                            last_modified: Optional[str]):
+        """Record the ETag/Last-Modified of a download for conditional requests."""
+        with self._transaction():
+            if etag or last_modified:
+                self.index['validators'][url] = {
+                    'alias': Path(alias).name,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                }
+            else:
+                self.index['validators'].pop(url, None)
+
+    def verify(self, alias: Path) -> bool:
+        """Check that an alias still holds the content it was imported with."""
+        self._refresh()
+        entry = self.index['aliases'].get(Path(alias).name)
+        return entry is not None and Path(alias).exists() and fingerprint_file(Path(alias)) == entry['hash']
+
+    def collect_garbage(self) -> int:
+        """
+        Drop index entries of deleted aliases and objects nothing refers to.
+
+        Returns:
+            int: Number of objects removed
+        """
+        with self._transaction():
+            aliases = {name: entry for name, entry in self.index['aliases'].items()
+                       if (self.root / name).exists()}
+            referenced = {entry['hash'] for entry in aliases.values()}
+            removed = 0
+            for digest in list(self.index['objects']):
+                if digest not in referenced:
+                    path = self.object_path(digest)
+                    if path.exists():
+                        path.unlink()
+                    if path.parent.exists() and not any(path.parent.iterdir()):
+                        path.parent.rmdir()
+                    del self.index['objects'][digest]
+                    removed += 1
+            self.index['aliases'] = aliases
+            self.index['validators'] = {url: entry for url, entry in self.index['validators'].items()
+                                        if entry['alias'] in aliases}
+            return removed
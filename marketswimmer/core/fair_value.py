@@ -14,6 +14,17 @@ import requests
 from datetime import datetime
 from typing import Dict, Optional, Tuple
 from pathlib import Path
+from rich.console import Console
+
+from . import periods
+
+console = Console()
+
+
+def _most_recent_first(df: pd.DataFrame) -> pd.DataFrame:
+    """Owner earnings rows ordered by period code, most recent first."""
+    codes = periods.period_codes(df)
+    return df.iloc[np.argsort(-codes, kind='stable')]
 
 
 class FairValueCalculator:
@@ -33,6 +44,7 @@ class FairValueCalculator:
         self.treasury_rate = None
         self.owner_earnings_data = None
         self.balance_sheet_data = None
+        self.balance_sheet_snapshot = None
         self.shares_outstanding = None
         self.company_name = None
         
@@ -71,7 +83,7 @@ class FairValueCalculator:
             self.treasury_rate = default_rate
             return default_rate
     
-    def load_owner_earnings_data(self, csv_file_path: str) -> bool:
+    def load_owner_earnings_csv(self, csv_file_path: str) -> bool:
         """
         Load owner earnings data from MarketSwimmer CSV output.
         
@@ -95,7 +107,7 @@ class FairValueCalculator:
             
             # Clean and sort data
             df = df.dropna(subset=['Owner Earnings'])
-            df = df.sort_values('Period', ascending=False)  # Most recent first
+            df = _most_recent_first(df)
             
             self.owner_earnings_data = df
             print(f"[OK] Loaded {len(df)} periods of owner earnings data")
@@ -155,273 +167,82 @@ class FairValueCalculator:
         
         return average_earnings
     
-    def extract_balance_sheet_data(self, ticker: str) -> Dict[str, float]:
+    def extract_balance_sheet_data(self, ticker: str, workbook=None) -> Dict[str, float]:
         """
         Automatically extract balance sheet data from downloaded XLSX files.
         
+        All balance sheet items and the share count fallback chain are
+        resolved in one traversal of the parsed workbook (see
+        marketswimmer.core.balance_sheet).
+        
         Args:
             ticker: Stock ticker symbol
+            workbook: Optional already-parsed FinancialWorkbook; when omitted
+                the most recent downloaded file for the ticker is loaded
             
         Returns:
             dict: Balance sheet data with keys 'cash', 'debt', 'shares'
         """
         print(f"[DEBUG] Starting extract_balance_sheet_data for ticker: {ticker}")
         
-        from pathlib import Path
-        import pandas as pd
+        from .balance_sheet import BalanceSheetSnapshot, extract_balance_sheet_snapshot
+        from .workbook import FinancialWorkbook
         
-        balance_sheet_data = {
-            'cash_and_equivalents': 0,
-            'short_term_investments': 0,
-            'total_debt': 0,
-            'preferred_stock': 0,
-            'preferred_shares': 0,
-            'shares_outstanding': 0,
-            'market_cap': 0
-        }
+        snapshot = BalanceSheetSnapshot()
         
         try:
-            # Look for downloaded XLSX files for this ticker
-            downloaded_files = Path("downloaded_files")
-            print(f"[DEBUG] Current working directory: {Path.cwd()}")
-            print(f"[DEBUG] Looking for downloaded_files at: {downloaded_files.absolute()}")
-            if not downloaded_files.exists():
-                print(f"[WARNING] No downloaded_files directory found")
-                return balance_sheet_data
-            
-            # Find most recent file for this ticker
-            # Normalize ticker by replacing dots with underscores (e.g., BRK.B -> brk_b)
-            normalized_ticker = ticker.lower().replace('.', '_')
-            print(f"[DEBUG] Normalized ticker: {normalized_ticker}")
-            ticker_files = list(downloaded_files.glob(f"*{normalized_ticker}*.xlsx"))
-            print(f"[DEBUG] Found {len(ticker_files)} files: {ticker_files}")
-            if not ticker_files:
-                print(f"[WARNING] No XLSX files found for ticker {ticker}")
-                return balance_sheet_data
-            
-            # Use most recent file
-            xlsx_file = sorted(ticker_files, key=lambda x: x.stat().st_mtime)[-1]
-            print(f"[DATA] Extracting balance sheet data from: {xlsx_file.name}")
-            
-            # Create ExcelFile object to access all sheet names
-            xl = pd.ExcelFile(xlsx_file)
-            
-            # Load balance sheet data
-            try:
-                # Try to load the balance sheet
-                balance_sheet = pd.read_excel(xlsx_file, sheet_name='Balance Sheet, A')
-                print(f"[OK] Loaded balance sheet with shape: {balance_sheet.shape}")
-                
-                # Extract cash and cash equivalents
-                cash_terms = [
-                    'cash and cash equivalents', 'cash & cash equivalents', 
-                    'cash and short term investments', 'total cash'
-                ]
-                cash_value = self._extract_financial_item_from_df(balance_sheet, cash_terms)
-                if cash_value:
-                    balance_sheet_data['cash_and_equivalents'] = cash_value
-                    print(f"[CASH] Found cash and equivalents: ${cash_value:,.0f}")
+            if workbook is None:
+                xlsx_file = self._find_latest_ticker_file(ticker)
+                if not xlsx_file:
+                    print(f"[WARNING] No XLSX files found for ticker {ticker} in downloaded_files")
+                    self.balance_sheet_snapshot = snapshot
+                    return snapshot.as_dict()
                 
-                # Extract short-term investments
-                investment_terms = [
-                    'short term investments', 'short-term investments',
-                    'marketable securities', 'current investments'
-                ]
-                investment_value = self._extract_financial_item_from_df(balance_sheet, investment_terms)
-                if investment_value:
-                    balance_sheet_data['short_term_investments'] = investment_value
-                    print(f"[INVESTMENTS] Found short-term investments: ${investment_value:,.0f}")
-                
-                # Extract total debt
-                debt_terms = [
-                    'total debt', 'long term debt (total)', 'long term debt',
-                    'total borrowings', 'debt total'
-                ]
-                debt_value = self._extract_financial_item_from_df(balance_sheet, debt_terms)
-                if debt_value:
-                    balance_sheet_data['total_debt'] = debt_value
-                    print(f"[DEBT] Found total debt: ${debt_value:,.0f}")
-                
-                # Extract preferred stock
-                preferred_terms = [
-                    'preferred stock (total)', 'preferred stock', 'preferred shares',
-                    'preferred equity', 'class b shares'
-                ]
-                preferred_value = self._extract_financial_item_from_df(balance_sheet, preferred_terms)
-                if preferred_value:
-                    balance_sheet_data['preferred_stock'] = preferred_value
-                    print(f"[PREFERRED] Found preferred stock: ${preferred_value:,.0f}")
-                
-                # Extract preferred shares count
-                preferred_shares_terms = [
-                    'shares (preferred)', 'preferred shares outstanding', 'preferred shares',
-                    'class b shares outstanding'
-                ]
-                preferred_shares_value = self._extract_financial_item_from_df(balance_sheet, preferred_shares_terms)
-                if preferred_shares_value:
-                    balance_sheet_data['preferred_shares'] = preferred_shares_value
-                    print(f"[PREFERRED] Found preferred shares: {preferred_shares_value:,.0f}")
-                
-            except Exception as e:
-                print(f"[WARNING] Could not load balance sheet: {e}")
+                print(f"[DATA] Extracting balance sheet data from: {Path(xlsx_file).name}")
+                workbook = FinancialWorkbook.load(xlsx_file)
             
-            # Try to extract shares outstanding from multiple possible sheets
-            try:
-                shares_outstanding_found = False
-                
-                # FIRST try Balance Sheet - this has actual shares outstanding (not weighted averages)
-                # Prioritize quarterly (most recent) over annual data
-                for sheet_name in xl.sheet_names:
-                    if 'balance sheet' in sheet_name.lower() and ', q' in sheet_name.lower():  # Quarterly first
-                        balance_df = pd.read_excel(xlsx_file, sheet_name=sheet_name)
-                        print(f"[OK] Loaded balance sheet: {sheet_name}")
-                        
-                        shares_terms = [
-                            'shares (common)', 'common shares', 'shares outstanding',
-                            'common stock shares', 'outstanding shares'
-                        ]
-                        shares_value = self._extract_financial_item_from_df(balance_df, shares_terms)
-                        if shares_value:
-                            # Convert to actual shares (assuming millions)
-                            if shares_value < 100_000:  # Likely in millions
-                                shares_value = shares_value * 1_000_000
-                            balance_sheet_data['shares_outstanding'] = shares_value
-                            print(f"[SHARES] Found shares outstanding in quarterly balance sheet: {shares_value:,.0f}")
-                            shares_outstanding_found = True
-                            break
-                
-                # If not found in quarterly, try annual balance sheet
-                if not shares_outstanding_found:
-                    for sheet_name in xl.sheet_names:
-                        if 'balance sheet' in sheet_name.lower() and ', a' in sheet_name.lower():  # Annual fallback
-                            balance_df = pd.read_excel(xlsx_file, sheet_name=sheet_name)
-                            print(f"[OK] Loaded balance sheet: {sheet_name}")
-                            
-                            shares_terms = [
-                                'shares (common)', 'common shares', 'shares outstanding',
-                                'common stock shares', 'outstanding shares'
-                            ]
-                            shares_value = self._extract_financial_item_from_df(balance_df, shares_terms)
-                            if shares_value:
-                                # Convert to actual shares (assuming millions)
-                                if shares_value < 100_000:  # Likely in millions
-                                    shares_value = shares_value * 1_000_000
-                                balance_sheet_data['shares_outstanding'] = shares_value
-                                print(f"[SHARES] Found shares outstanding in annual balance sheet: {shares_value:,.0f}")
-                                shares_outstanding_found = True
-                                break
-                
-                # If not found in balance sheet, fall back to Income Statement (weighted averages)
-                if not shares_outstanding_found:
-                    for sheet_name in xl.sheet_names:
-                        if 'income statement' in sheet_name.lower() and ', a' in sheet_name.lower():
-                            income_df = pd.read_excel(xlsx_file, sheet_name=sheet_name)
-                            print(f"[OK] Loaded income statement sheet: {sheet_name}")
-                            
-                            shares_terms = [
-                                'shares (diluted, weighted)', 'shares (basic, weighted)', 
-                                'shares (diluted, average)', 'weighted average shares outstanding',
-                                'shares outstanding', 'common shares outstanding'
-                            ]
-                            shares_value = self._extract_financial_item_from_df(income_df, shares_terms)
-                            if shares_value:
-                                # Convert to actual shares (assuming millions)
-                                if shares_value < 100_000:  # Likely in millions
-                                    shares_value = shares_value * 1_000_000
-                                balance_sheet_data['shares_outstanding'] = shares_value
-                                print(f"[SHARES] Found shares outstanding in income statement (fallback): {shares_value:,.0f}")
-                                shares_outstanding_found = True
-                                break
-                                break
-                
-                # If still not found, try metrics ratios sheet
-                if not shares_outstanding_found:
-                    for sheet_name in xl.sheet_names:
-                        if 'metrics' in sheet_name.lower() and ', a' in sheet_name.lower():
-                            metrics_df = pd.read_excel(xlsx_file, sheet_name=sheet_name)
-                            print(f"[OK] Loaded metrics sheet: {sheet_name}")
-                            
-                            shares_terms = [
-                                'shares outstanding', 'shares (diluted)', 'weighted shares outstanding',
-                                'shares outstanding (millions)', 'common shares outstanding'
-                            ]
-                            shares_value = self._extract_financial_item_from_df(metrics_df, shares_terms)
-                            if shares_value:
-                                # Convert to actual shares (assuming millions)
-                                if shares_value < 100_000:  # Likely in millions
-                                    shares_value = shares_value * 1_000_000
-                                balance_sheet_data['shares_outstanding'] = shares_value
-                                print(f"[SHARES] Found shares outstanding in metrics: {shares_value:,.0f}")
-                                shares_outstanding_found = True
-                                break
-                
-            except Exception as e:
-                print(f"[WARNING] Could not load metrics sheet: {e}")
-            
-            # Calculate net cash position
-            net_cash = (balance_sheet_data['cash_and_equivalents'] + 
-                       balance_sheet_data['short_term_investments'] - 
-                       balance_sheet_data['total_debt'])
-            
-            print(f"\n[SUMMARY] Balance Sheet Summary:")
-            print(f"   Cash & Equivalents: ${balance_sheet_data['cash_and_equivalents']:,.0f}")
-            print(f"   Short-term Investments: ${balance_sheet_data['short_term_investments']:,.0f}")
-            print(f"   Total Debt: ${balance_sheet_data['total_debt']:,.0f}")
-            if balance_sheet_data['preferred_stock'] > 0:
-                print(f"   Preferred Stock: ${balance_sheet_data['preferred_stock']:,.0f}")
-                if balance_sheet_data['preferred_shares'] > 0:
-                    preferred_per_share = balance_sheet_data['preferred_stock'] / balance_sheet_data['preferred_shares']
-                    print(f"   Preferred Shares: {balance_sheet_data['preferred_shares']:,.0f} (${preferred_per_share:,.0f} each)")
-            print(f"   Net Cash Position: ${net_cash:,.0f}")
-            if balance_sheet_data['shares_outstanding']:
-                print(f"   Shares Outstanding: {balance_sheet_data['shares_outstanding']:,.0f}")
-            if balance_sheet_data['market_cap']:
-                print(f"   Market Cap: ${balance_sheet_data['market_cap']:,.0f}")
-            
-            return balance_sheet_data
+            snapshot = extract_balance_sheet_snapshot(workbook)
             
         except Exception as e:
             print(f"[ERROR] Failed to extract balance sheet data: {e}")
-            return balance_sheet_data
+            self.balance_sheet_snapshot = snapshot
+            return snapshot.as_dict()
+        
+        self.balance_sheet_snapshot = snapshot
+        
+        if snapshot.cash_and_equivalents.value:
+            print(f"[CASH] Found cash and equivalents: ${snapshot.cash_and_equivalents.value:,.0f}")
+        if snapshot.short_term_investments.value:
+            print(f"[INVESTMENTS] Found short-term investments: ${snapshot.short_term_investments.value:,.0f}")
+        if snapshot.total_debt.value:
+            print(f"[DEBT] Found total debt: ${snapshot.total_debt.value:,.0f}")
+        if snapshot.preferred_stock.value:
+            print(f"[PREFERRED] Found preferred stock: ${snapshot.preferred_stock.value:,.0f}")
+        if snapshot.preferred_shares.value:
+            print(f"[PREFERRED] Found preferred shares: {snapshot.preferred_shares.value:,.0f}")
+        if snapshot.shares_outstanding.value:
+            print(f"[SHARES] Found shares outstanding in {snapshot.shares_outstanding.description}: "
+                  f"{snapshot.shares_outstanding.value:,.0f}")
+        
+        balance_sheet_data = snapshot.as_dict()
+        
+        print(f"\n[SUMMARY] Balance Sheet Summary:")
+        print(f"   Cash & Equivalents: ${balance_sheet_data['cash_and_equivalents']:,.0f}")
+        print(f"   Short-term Investments: ${balance_sheet_data['short_term_investments']:,.0f}")
+        print(f"   Total Debt: ${balance_sheet_data['total_debt']:,.0f}")
+        if balance_sheet_data['preferred_stock'] > 0:
+            print(f"   Preferred Stock: ${balance_sheet_data['preferred_stock']:,.0f}")
+            if balance_sheet_data['preferred_shares'] > 0:
+                preferred_per_share = balance_sheet_data['preferred_stock'] / balance_sheet_data['preferred_shares']
+                print(f"   Preferred Shares: {balance_sheet_data['preferred_shares']:,.0f} (${preferred_per_share:,.0f} each)")
+        print(f"   Net Cash Position: ${snapshot.net_cash:,.0f}")
+        if balance_sheet_data['shares_outstanding']:
+            print(f"   Shares Outstanding: {balance_sheet_data['shares_outstanding']:,.0f}")
+        if balance_sheet_data['market_cap']:
+            print(f"   Market Cap: ${balance_sheet_data['market_cap']:,.0f}")
+        
+        return balance_sheet_data
     
-    def _extract_financial_item_from_df(self, df: pd.DataFrame, search_terms: list) -> Optional[float]:
-        """
-        Extract a financial item from a DataFrame using search terms.
-        
-        Args:
-            df: DataFrame to search
-            search_terms: List of terms to search for
-            
-        Returns:
-            float: Most recent value found, or None
-        """
-        if df is None or df.empty:
-            return None
-        
-        # Try different approaches to find the data
-        for search_term in search_terms:
-            # Search in first column (typically contains line item names)
-            if len(df.columns) > 0:
-                first_col = df.iloc[:, 0]
-                for idx, item in enumerate(first_col):
-                    if pd.notna(item) and search_term.lower() in str(item).lower():
-                        # Found the row, get the most recent value (typically FIRST data column, not last)
-                        row_data = df.iloc[idx]
-                        
-                        # Look for numeric columns starting from LEFT (most recent data)
-                        for col in df.columns[1:]:  # Start from first data column (skip labels)
-                            value = row_data[col]
-                            if pd.notna(value) and value != '—':
-                                if isinstance(value, (int, float)):
-                                    return float(value)
-                                elif isinstance(value, str):
-                                    # Try to parse string value
-                                    clean_value = str(value).replace(',', '').replace('$', '').strip()
-                                    if clean_value.replace('.', '').replace('-', '').isdigit():
-                                        return float(clean_value)
-        
-        return None
-
     def get_balance_sheet_adjustments(self, balance_sheet_file: Optional[str] = None) -> Dict[str, float]:
         """
         Extract balance sheet items for fair value adjustments.
@@ -453,7 +274,8 @@ class FairValueCalculator:
     
     def enhanced_fair_value_analysis(self,
                                   ticker: str,
-                                  save_detailed_report: bool = True) -> Dict:
+                                  save_detailed_report: bool = True,
+                                  context=None) -> Dict:
         """
         Perform enhanced fair value analysis with detailed balance sheet breakdown.
         
@@ -468,6 +290,9 @@ class FairValueCalculator:
         Args:
             ticker: Stock ticker symbol
             save_detailed_report: Whether to save a detailed report file
+            context: Optional AnalysisContext from the workflow; its owner
+                earnings frames and parsed workbook are used instead of
+                reading the CSV and XLSX files again
             
         Returns:
             Dict: Comprehensive analysis results
@@ -475,7 +300,10 @@ class FairValueCalculator:
         print(f"\n[INFO] Starting enhanced fair value analysis for {ticker.upper()}")
         
         # Load owner earnings data and calculate alternatives
-        annual_data = self.load_owner_earnings_data(ticker, 'annual')
+        if context is not None and context.annual_owner_earnings is not None:
+            annual_data = context.annual_owner_earnings
+        else:
+            annual_data = self.load_owner_earnings_data(ticker, 'annual')
         if annual_data.empty:
             raise ValueError(f"No annual owner earnings data found for {ticker}")
         
@@ -489,9 +317,12 @@ class FairValueCalculator:
         try:
             # Load the calculator to get alternative methods
             from .owner_earnings import OwnerEarningsCalculator
-            latest_file = self._find_latest_ticker_file(ticker)
-            if latest_file:
-                calc = OwnerEarningsCalculator(latest_file)
+            if context is not None and context.workbook is not None:
+                calc = OwnerEarningsCalculator(workbook=context.workbook)
+            else:
+                latest_file = self._find_latest_ticker_file(ticker)
+                calc = OwnerEarningsCalculator(latest_file) if latest_file else None
+            if calc is not None:
                 calc.preferred_data_type = 'Annual'
                 calc.load_financial_statements_by_type('Annual')
                 alternative_methods = calc.calculate_alternative_owner_earnings_methods()
@@ -529,10 +360,14 @@ class FairValueCalculator:
                     print(f"\nOperating Cash Flow vs Traditional: {diff_pct:+.1f}% difference")
         
         # Extract all balance sheet data with preferred stock detection
-        balance_data = self.extract_balance_sheet_data(ticker)
+        workbook = context.workbook if context is not None else None
+        balance_data = self.extract_balance_sheet_data(ticker, workbook=workbook)
+        if context is not None:
+            context.balance_sheet = self.balance_sheet_snapshot
         
         # Calculate fair value using traditional method (primary)
-        valuation_results = self.calculate_fair_value_from_ticker(ticker, preferred_stock=balance_data.get('preferred_stock', 0))
+        valuation_results = self.calculate_fair_value_from_ticker(ticker, preferred_stock=balance_data.get('preferred_stock', 0),
+                                                                  annual_data=annual_data, balance_data=balance_data)
         
         # If alternative methods available, calculate fair value using OCF method too
         alternative_valuations = {}
@@ -592,6 +427,7 @@ class FairValueCalculator:
         print(scenario_df.to_string(index=False))
         
         # Save detailed report if requested
+        report_file = None
         if save_detailed_report:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_file = f"{ticker.upper()}_enhanced_fair_value_{timestamp}.txt"
@@ -605,7 +441,8 @@ class FairValueCalculator:
             'alternative_methods': alternative_methods,
             'alternative_valuations': alternative_valuations,
             'scenario_analysis': scenario_df,
-            'methodology': 'Enhanced fair value with multiple Owner Earnings methods'
+            'methodology': 'Enhanced fair value with multiple Owner Earnings methods',
+            'report_file': report_file
         }
     
     def _find_latest_ticker_file(self, ticker: str) -> Optional[str]:
@@ -627,19 +464,26 @@ class FairValueCalculator:
         except Exception:
             return None
     
-    def calculate_fair_value_from_ticker(self, ticker: str, preferred_stock: float = 0) -> Dict:
+    def calculate_fair_value_from_ticker(self,
+                                         ticker: str,
+                                         preferred_stock: float = 0,
+                                         annual_data: Optional[pd.DataFrame] = None,
+                                         balance_data: Optional[Dict[str, float]] = None) -> Dict:
         """
         Calculate fair value for a ticker by loading owner earnings data and using balance sheet adjustments.
         
         Args:
             ticker: Stock ticker symbol
             preferred_stock: Additional preferred stock amount to subtract
+            annual_data: Annual owner earnings already loaded by the caller
+            balance_data: Balance sheet data already extracted by the caller
             
         Returns:
             Dict: Complete valuation results
         """
         # Load owner earnings data
-        annual_data = self.load_owner_earnings_data(ticker, 'annual')
+        if annual_data is None:
+            annual_data = self.load_owner_earnings_data(ticker, 'annual')
         if annual_data.empty:
             raise ValueError(f"No annual owner earnings data found for {ticker}")
         
@@ -651,7 +495,8 @@ class FairValueCalculator:
         print(f"[EARNINGS] Using {years_to_use}-year average Owner Earnings: ${avg_owner_earnings:,.0f}")
         
         # Extract balance sheet data
-        balance_data = self.extract_balance_sheet_data(ticker)
+        if balance_data is None:
+            balance_data = self.extract_balance_sheet_data(ticker)
         
         # Calculate fair value using the core method
         results = self.calculate_fair_value(
@@ -682,7 +527,8 @@ class FairValueCalculator:
             period: 'annual' or 'quarterly'
             
         Returns:
-            DataFrame: Owner earnings data with Year and Owner Earnings columns
+            DataFrame: Owner earnings data with Period and Owner Earnings
+            columns, most recent period first
         """
         clean_ticker = ticker.replace('.', '_').lower()
         
@@ -705,7 +551,7 @@ class FairValueCalculator:
             return pd.DataFrame()
         
         try:
-            df = pd.read_csv(data_file)
+            df = _most_recent_first(pd.read_csv(data_file))
             print(f"[DATA] Loaded {period} owner earnings data: {len(df)} records from {data_file}")
             return df
         except Exception as e:
@@ -1101,6 +947,131 @@ class FairValueCalculator:
             print(f"[ERROR] Failed to save report: {e}")
 
 
+def owner_earnings_dcf_analysis(ticker: str,
+                                growth_rate: float = 0.02,
+                                discount_rate: Optional[float] = None,
+                                terminal_multiple: float = 15.0,
+                                cash: Optional[float] = None,
+                                debt: Optional[float] = None,
+                                shares: Optional[float] = None,
+                                scenarios: bool = True,
+                                manual: bool = False,
+                                data_folder: Path = Path("data")) -> Optional[Dict]:
+    """
+    Run the Owner Earnings DCF valuation behind `ms fair-value --ticker`.
+    
+    Args:
+        ticker: Stock ticker symbol
+        growth_rate: Annual growth rate
+        discount_rate: Discount rate (uses 10Y Treasury if None)
+        terminal_multiple: Terminal value P/E multiple
+        cash: Cash and short-term investments (auto-extracted if None)
+        debt: Total debt (auto-extracted if None)
+        shares: Shares outstanding in millions (auto-extracted if None)
+        scenarios: Include scenario analysis
+        manual: Use the given values instead of extracting them
+        data_folder: Folder holding the owner earnings CSVs
+        
+    Returns:
+        dict: Valuation results plus 'scenarios' (DataFrame or None) and
+        'report_file', or None if the valuation could not be made
+    """
+    data_folder = Path(data_folder)
+    clean_ticker = ticker.replace('.', '_').lower()
+    annual_file = data_folder / f"owner_earnings_annual_{clean_ticker}.csv"
+    
+    if not annual_file.exists():
+        console.print(f"[red]ERROR: Owner earnings data not found for {ticker.upper()}[/red]")
+        console.print(f"[yellow]Expected file: {annual_file}[/yellow]")
+        console.print(f"[yellow]TIP: Run 'ms analyze {ticker}' first to generate owner earnings data[/yellow]")
+        return None
+    
+    # Initialize calculator and load data
+    calculator = FairValueCalculator()
+    calculator.company_name = ticker.upper()
+    
+    if not calculator.load_owner_earnings_csv(str(annual_file)):
+        console.print(f"[red]ERROR: Failed to load owner earnings data[/red]")
+        return None
+    
+    # Calculate 10-year average
+    avg_earnings = calculator.calculate_average_owner_earnings(years=10)
+    if avg_earnings is None:
+        console.print(f"[red]ERROR: Insufficient owner earnings data for analysis[/red]")
+        return None
+    
+    # Auto-extract balance sheet data unless manual mode or values provided
+    if not manual and (cash is None or debt is None or shares is None):
+        console.print(f"\n[bold blue]Auto-Extracting Balance Sheet Data[/bold blue]")
+        
+        results = calculator.calculate_fair_value_auto(
+            ticker=ticker,
+            average_owner_earnings=avg_earnings,
+            discount_rate=discount_rate,
+            growth_rate=growth_rate,
+            terminal_multiple=terminal_multiple
+        )
+        
+    else:
+        console.print(f"\n[bold blue]Manual Balance Sheet Mode[/bold blue]")
+        
+        # Convert shares from millions to actual count if provided
+        shares_actual = shares * 1_000_000 if shares else None
+        
+        # Use provided values or defaults
+        cash_value = cash if cash is not None else 0
+        debt_value = debt if debt is not None else 0
+        
+        console.print(f"Using provided values:")
+        console.print(f"   Cash & Investments: ${cash_value:,.0f}")
+        console.print(f"   Total Debt: ${debt_value:,.0f}")
+        if shares_actual:
+            console.print(f"   Shares Outstanding: {shares_actual:,.0f}")
+        
+        results = calculator.calculate_fair_value(
+            average_owner_earnings=avg_earnings,
+            discount_rate=discount_rate,
+            growth_rate=growth_rate,
+            terminal_multiple=terminal_multiple,
+            cash_and_investments=cash_value,
+            total_debt=debt_value,
+            shares_outstanding=shares_actual
+        )
+    
+    # Show key results
+    console.print(f"\n[bold green]FAIR VALUE SUMMARY[/bold green]")
+    console.print(f"Enterprise Value: [green]${results['enterprise_value']:,.0f}[/green]")
+    console.print(f"Equity Value: [green]${results['equity_value']:,.0f}[/green]")
+    
+    if results['fair_value_per_share']:
+        console.print(f"Fair Value per Share: [bold green]${results['fair_value_per_share']:,.2f}[/bold green]")
+    
+    scenario_df = None
+    if scenarios:
+        console.print(f"\n[bold blue]Scenario Analysis[/bold blue]")
+        
+        # For scenarios, use the extracted/provided balance sheet data
+        scenario_df = calculator.create_scenario_analysis(
+            average_owner_earnings=avg_earnings,
+            shares_outstanding=results['shares_outstanding'],
+            cash_and_investments=results['cash_and_investments'],
+            total_debt=results['total_debt']
+        )
+        
+        if results['fair_value_per_share']:
+            console.print(f"\n[bold]Per-Share Fair Values:[/bold]")
+            for _, row in scenario_df.iterrows():
+                if 'Fair Value per Share' in row:
+                    console.print(f"  {row['Scenario']}: [green]${row['Fair Value per Share']:,.2f}[/green]")
+    
+    report_file = data_folder / f"fair_value_analysis_{clean_ticker}.txt"
+    calculator.save_valuation_report(results, scenario_df, str(report_file))
+    
+    results['scenarios'] = scenario_df
+    results['report_file'] = report_file
+    return results
+
+
 def main():
     """Example usage of FairValueCalculator."""
     calculator = FairValueCalculator()
@@ -1110,7 +1081,7 @@ def main():
     print("=" * 40)
     
     # This would normally load from MarketSwimmer output
-    # calculator.load_owner_earnings_data("data/owner_earnings_annual_AAPL.csv")
+    # calculator.load_owner_earnings_csv("data/owner_earnings_annual_AAPL.csv")
     
     # Example calculation
     example_earnings = 50_000_000_000  # $50B annual owner earnings
@@ -0,0 +1,281 @@
+"""
+Headless export fetcher for MarketSwimmer.
+
+Downloads StockRow exports over HTTP instead of through the browser. All
+requests share one pooled session; a bounded thread pool limits how many
+downloads run at once and a per-host rate limiter spaces out requests to
+the same server. Failed requests are retried with exponential backoff.
+
+Each download's ETag / Last-Modified is kept in the export store, so the
+next fetch of the same ticker is a conditional request and an unchanged
+export costs a 304 response instead of a download.
+
+The endpoint is configurable (--url or MARKETSWIMMER_EXPORT_URL), e.g. to
+point at a local server that serves fixture workbooks.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from rich.console import Console
+
+from .events import ITEMS, default_bus
+from .export_store import ExportStore
+
+console = Console()
+
+DEFAULT_EXPORT_URL = "https://stockrow.com/vector/exports/financials/{ticker}?direction=desc"
+EXPORT_URL_ENV = "MARKETSWIMMER_EXPORT_URL"
+
+# Status codes worth retrying; anything else is a permanent failure
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def export_url(ticker: str, template: Optional[str] = None) -> str:
+    """
+    Build the export URL of a ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        template: URL with a {ticker} placeholder, or a base URL to which
+            the ticker is appended; defaults to $MARKETSWIMMER_EXPORT_URL
+            and then StockRow
+
+    Returns:
+        str: URL to download the ticker's XLSX export from
+    """
+    template = template or os.environ.get(EXPORT_URL_ENV) or DEFAULT_EXPORT_URL
+    if '{ticker}' not in template:
+        template = template.rstrip('/') + '/{ticker}'
+    return template.format(ticker=ticker.upper())
+
+
+class HostRateLimiter:
+    """Keeps successive requests to the same host at least 1/rate seconds apart."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str):
+        """Block until a request to the URL's host may be sent."""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchResult:
+    """Outcome of fetching one ticker."""
+
+    def __init__(self, ticker: str, url: str):
+        self.ticker = ticker
+        self.url = url
+        self.status = 'failed'  # 'downloaded', 'not_modified', 'unchanged' or 'failed'
+        self.path: Optional[Path] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status != 'failed'
+
+
+class ExportFetcher:
+    """Fetches exports for many tickers over one pooled HTTP session."""
+
+    def __init__(self,
+                 url_template: Optional[str] = None,
+                 workers: int = 4,
+                 requests_per_second: float = 1.0,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 timeout: float = 60.0,
+                 target_folder: Path = Path("downloaded_files")):
+        """
+        Initialize the fetcher.
+
+        Args:
+            url_template: Export URL template (see export_url)
+            workers: Maximum concurrent downloads
+            requests_per_second: Request rate allowed per host (0 = unlimited)
+            retries: Extra attempts after a failed request
+            backoff: Base delay in seconds, doubled on every retry
+            timeout: Connect/read timeout per request in seconds
+            target_folder: Project downloads folder backed by the export store
+        """
+        self.url_template = url_template
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.store = ExportStore(target_folder)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+
+        # One connection pool per host, sized for the worker count
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        from .. import __version__
+        self.session.headers['User-Agent'] = f"MarketSwimmer/{__version__}"
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "ExportFetcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Delay before the next attempt, honouring a numeric Retry-After header."""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** (attempt - 1))
+
+    def _download(self, url: str, headers: Dict[str, str], result: FetchResult) -> Optional[requests.Response]:
+        """
+        GET a URL with retries; the body is left unread for streaming.
+
+        Returns:
+            Response: Final response with status 200 or 304, or None on failure
+        """
+        for attempt in range(1, self.retries + 2):
+            result.attempts = attempt
+            response = None
+            self.rate_limiter.wait(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                if response.status_code in (200, 304):
+                    return response
+                result.error = f"HTTP {response.status_code}"
+                retryable = response.status_code in RETRY_STATUS
+                response.close()
+            except requests.RequestException as e:
+                result.error = f"{type(e).__name__}: {e}"
+                retryable = True
+            if not retryable or attempt > self.retries:
+                return None
+            time.sleep(self._retry_delay(attempt, response))
+        return None
+
+    def fetch(self, ticker: str, force: bool = False) -> FetchResult:
+        """
+        Fetch one ticker's export into the export store.
+
+        Args:
+            ticker: Stock ticker symbol
+            force: Skip the conditional request and always download
+
+        Returns:
+            FetchResult: Status, stored file and diagnostics
+        """
+        url = export_url(ticker, self.url_template)
+        result = FetchResult(ticker, url)
+        started = time.perf_counter()
+
+        headers = {}
+        known = None if force else self.store.validators(url)
+        if known:
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+
+        response = self._download(url, headers, result)
+        if response is None:
+            result.seconds = time.perf_counter() - started
+            return result
+
+        with response:
+            if response.status_code == 304:
+                result.seconds = time.perf_counter() - started
+                if not known:
+                    # Nothing was asked conditionally, so there is no stored copy to point at
+                    result.error = "unexpected 304 without a conditional request"
+                    return result
+                result.status = 'not_modified'
+                result.path = self.store.root / known['alias']
+                result.error = None
+                return result
+
+            self.store.store_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.store.store_dir, suffix='.download')
+            tmp_path = Path(tmp_name)
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        handle.write(chunk)
+                        result.bytes += len(chunk)
+                if not zipfile.is_zipfile(tmp_path):
+                    result.error = "response is not an XLSX file"
+                    return result
+
+                known_aliases = self.store.alias_names()
+                timestamp = time.strftime("%Y_%m_%d_%H%M%S")
+                alias_name = f"financials_export_{ticker.replace('.', '_').lower()}_{timestamp}.xlsx"
+                result.path = self.store.import_file(tmp_path, ticker.upper(), alias_name)
+                result.status = 'unchanged' if result.path.name in known_aliases else 'downloaded'
+                result.error = None
+                self.store.remember_validators(url, result.path, response.headers.get('ETag'),
+                                               response.headers.get('Last-Modified'))
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                result.seconds = time.perf_counter() - started
+        return result
+
+    def fetch_many(self, tickers: List[str], force: bool = False) -> List[FetchResult]:
+        """
+        Fetch several tickers on the bounded worker pool.
+
+        Args:
+            tickers: Ticker symbols (normalized by the caller)
+            force: Skip conditional requests
+
+        Returns:
+            list: One FetchResult per ticker, in the given order
+        """
+        results: Dict[str, FetchResult] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ms-fetch") as pool:
+            futures = {pool.submit(self.fetch, ticker, force): ticker for ticker in tickers}
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                ticker = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = FetchResult(ticker, export_url(ticker, self.url_template))
+                    result.error = str(e)
+                results[ticker] = result
+                default_bus.publish(ITEMS, ticker=ticker, state=result.status, completed=done_count,
+                                    total=len(tickers), seconds=round(result.seconds, 3),
+                                    message=result.error)
+                if result.ok:
+                    console.print(f"[green]>> [{done_count}/{len(tickers)}] {ticker}: "
+                                  f"{result.status.replace('_', ' ')} ({result.seconds:.1f}s)[/green]")
+                else:
+                    console.print(f"[red]>> [{done_count}/{len(tickers)}] {ticker}: failed after "
+                                  f"{result.attempts} attempt(s): {result.error}[/red]")
+        return [results[ticker] for ticker in tickers]
@@ -0,0 +1,145 @@
+"""
+Per-thread stdout capture for MarketSwimmer.
+
+The analysis modules report progress with print() and rich console output.
+When several stages run on worker threads their output would interleave,
+so each worker captures what it writes into its own buffer, and the
+caller replays the buffers in a fixed order.
+
+sys.stdout is replaced by a router that sends writes from a capturing
+thread to that thread's buffer and everything else to the real stdout.
+"""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO
+
+
+class _StdoutRouter(io.TextIOBase):
+    """File-like object dispatching writes to the current thread's buffer."""
+
+    def __init__(self, target):
+        self.target = target
+        self._local = threading.local()
+
+    @property
+    def buffer_for_thread(self) -> Optional[TextIO]:
+        return getattr(self._local, 'buffer', None)
+
+    @buffer_for_thread.setter
+    def buffer_for_thread(self, value: Optional[TextIO]):
+        self._local.buffer = value
+
+    def write(self, text: str) -> int:
+        buffer = self.buffer_for_thread
+        if buffer is not None:
+            return buffer.write(text)
+        return self.target.write(text)
+
+    def flush(self):
+        buffer = self.buffer_for_thread
+        if buffer is not None:
+            buffer.flush()
+        else:
+            self.target.flush()
+
+    # Terminal queries are answered by the real stdout so rich keeps its
+    # colours and width while capturing.
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    def fileno(self) -> int:
+        return self.target.fileno()
+
+    @property
+    def encoding(self):
+        return self.target.encoding
+
+    @property
+    def errors(self):
+        return self.target.errors
+
+    def writable(self) -> bool:
+        return True
+
+
+_install_lock = threading.Lock()
+_install_count = 0
+_router: Optional[_StdoutRouter] = None
+
+
+def install():
+    """Route sys.stdout through the per-thread router (reference counted)."""
+    global _install_count, _router
+    with _install_lock:
+        if _install_count == 0:
+            _router = _StdoutRouter(sys.stdout)
+            sys.stdout = _router
+        _install_count += 1
+
+
+def uninstall():
+    """Undo one install(); the real stdout is restored by the last call."""
+    global _install_count, _router
+    with _install_lock:
+        _install_count -= 1
+        if _install_count == 0 and _router is not None:
+            if sys.stdout is _router:
+                sys.stdout = _router.target
+            _router = None
+
+
+@contextmanager
+def routed_stdout() -> Iterator[None]:
+    """Keep the router installed for the duration of the block."""
+    install()
+    try:
+        yield
+    finally:
+        uninstall()
+
+
+def is_capturing() -> bool:
+    """True if the calling thread's output is being captured."""
+    return _router is not None and _router.buffer_for_thread is not None
+
+
+@contextmanager
+def capture_thread_output(sink: Optional[TextIO] = None) -> Iterator[TextIO]:
+    """
+    Capture everything the calling thread writes to stdout.
+
+    Must be used inside routed_stdout(). Other threads are unaffected.
+
+    Args:
+        sink: Writable text stream receiving the output as it is written
+            (default: a new StringIO)
+
+    Yields:
+        Buffer receiving the captured text
+    """
+    buffer = sink if sink is not None else io.StringIO()
+    router = _router
+    if router is None:
+        raise RuntimeError("stdout router is not installed; use routed_stdout()")
+    previous = router.buffer_for_thread
+    router.buffer_for_thread = buffer
+    try:
+        yield buffer
+    finally:
+        router.buffer_for_thread = previous
+
+
+def emit(text: str):
+    """
+    Write replayed output for the calling thread.
+
+    Goes to the calling thread's capture buffer if it has one (nested
+    capture, e.g. a workflow running inside a batch worker), otherwise
+    to the real stdout.
+    """
+    stream = _router if _router is not None else sys.stdout
+    stream.write(text)
+    stream.flush()
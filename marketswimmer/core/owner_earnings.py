@@ -4,6 +4,9 @@ import sys
 import glob
 from pathlib import Path
 
+from .periods import PERIOD_CODE_COLUMN, Period
+from .results import BANKING, INSURANCE, STANDARD, AlternativeMethodsTable, OwnerEarningsTable
+
 class OwnerEarningsCalculator:
     """
     Calculate Warren Buffett's Owner Earnings from financial statement data.
@@ -11,7 +14,7 @@ class OwnerEarningsCalculator:
     Owner Earnings = Net Income + Depreciation/Amortization - Capital Expenditures - Working Capital Changes
     """
     
-    def __init__(self, xlsx_file_path=None, force_bank=False, force_insurance=False):
+    def __init__(self, xlsx_file_path=None, force_bank=False, force_insurance=False, workbook=None):
         """
         Initialize the calculator.
         
@@ -19,8 +22,13 @@ class OwnerEarningsCalculator:
             xlsx_file_path (str, optional): Path to the XLSX file with financial data
             force_bank (bool, optional): Force treatment as bank financials
             force_insurance (bool, optional): Force treatment as insurance financials
+            workbook (FinancialWorkbook, optional): Already-parsed workbook to read
+                sheets from instead of re-reading the XLSX file
         """
+        if workbook is not None and xlsx_file_path is None and workbook.file_path:
+            xlsx_file_path = str(workbook.file_path)
         self.file_path = xlsx_file_path
+        self.workbook = workbook
         self.company_name = None
         self.income_statement = None
         self.balance_sheet = None
@@ -31,16 +39,18 @@ class OwnerEarningsCalculator:
         
         # If file path provided, load immediately for backward compatibility
         if xlsx_file_path:
-            self.load_financial_data(xlsx_file_path)
+            self.load_financial_data(xlsx_file_path, workbook=workbook)
     
-    def load_financial_data(self, xlsx_file_path):
+    def load_financial_data(self, xlsx_file_path, workbook=None):
         """
         Load financial data from an XLSX file.
         
         Args:
             xlsx_file_path (str): Path to the XLSX file with financial data
+            workbook (FinancialWorkbook, optional): Already-parsed sheets of that file
         """
         self.file_path = xlsx_file_path
+        self.workbook = workbook
         file_basename = os.path.basename(xlsx_file_path)
         
         # Extract company name and ticker from filename
@@ -76,8 +86,7 @@ class OwnerEarningsCalculator:
             print(f"[DATA] Loading financial data from: {os.path.basename(self.file_path)}")
             
             # Get all sheet names
-            xl_file = pd.ExcelFile(self.file_path)
-            sheet_names = xl_file.sheet_names
+            sheet_names = self._get_sheet_names()
             print(f"[INFO] Available sheets: {sheet_names}")
             
             # Try to identify sheets by common names - prefer Annual (A) over Quarterly (Q)
@@ -96,21 +105,21 @@ class OwnerEarningsCalculator:
             
             # Load the sheets
             if income_sheet:
-                self.income_statement = pd.read_excel(self.file_path, sheet_name=income_sheet)
+                self.income_statement = self._read_sheet(income_sheet)
                 print(f"[OK] Loaded Income Statement: {income_sheet}")
                 print(f"   [DATA] Shape: {self.income_statement.shape}")
                 data_type = "Annual" if ", A" in income_sheet else "Quarterly" if ", Q" in income_sheet else "Unknown"
                 print(f"   [DATE] Data type: {data_type}")
             
             if balance_sheet:
-                self.balance_sheet = pd.read_excel(self.file_path, sheet_name=balance_sheet)
+                self.balance_sheet = self._read_sheet(balance_sheet)
                 print(f"[OK] Loaded Balance Sheet: {balance_sheet}")
                 print(f"   [DATA] Shape: {self.balance_sheet.shape}")
                 data_type = "Annual" if ", A" in balance_sheet else "Quarterly" if ", Q" in balance_sheet else "Unknown"
                 print(f"   [DATE] Data type: {data_type}")
             
             if cashflow_sheet:
-                self.cash_flow = pd.read_excel(self.file_path, sheet_name=cashflow_sheet)
+                self.cash_flow = self._read_sheet(cashflow_sheet)
                 print(f"[OK] Loaded Cash Flow Statement: {cashflow_sheet}")
                 print(f"   [DATA] Shape: {self.cash_flow.shape}")
                 data_type = "Annual" if ", A" in cashflow_sheet else "Quarterly" if ", Q" in cashflow_sheet else "Unknown"
@@ -128,8 +137,7 @@ class OwnerEarningsCalculator:
             print(f"[DATA] Loading {data_type.lower()} financial data from: {os.path.basename(self.file_path)}")
             
             # Get all sheet names
-            xl_file = pd.ExcelFile(self.file_path)
-            sheet_names = xl_file.sheet_names
+            sheet_names = self._get_sheet_names()
             
             # Map data type to sheet suffix
             suffix = ', A' if data_type == 'Annual' else ', Q'
@@ -151,19 +159,19 @@ class OwnerEarningsCalculator:
             sheets_loaded = 0
             
             if income_sheet:
-                self.income_statement = pd.read_excel(self.file_path, sheet_name=income_sheet)
+                self.income_statement = self._read_sheet(income_sheet)
                 print(f"[OK] Loaded Income Statement: {income_sheet}")
                 print(f"   [DATA] Shape: {self.income_statement.shape}")
                 sheets_loaded += 1
             
             if balance_sheet:
-                self.balance_sheet = pd.read_excel(self.file_path, sheet_name=balance_sheet)
+                self.balance_sheet = self._read_sheet(balance_sheet)
                 print(f"[OK] Loaded Balance Sheet: {balance_sheet}")
                 print(f"   [DATA] Shape: {self.balance_sheet.shape}")
                 sheets_loaded += 1
             
             if cashflow_sheet:
-                self.cash_flow = pd.read_excel(self.file_path, sheet_name=cashflow_sheet)
+                self.cash_flow = self._read_sheet(cashflow_sheet)
                 print(f"[OK] Loaded Cash Flow Statement: {cashflow_sheet}")
                 print(f"   [DATA] Shape: {self.cash_flow.shape}")
                 sheets_loaded += 1
@@ -174,6 +182,18 @@ class OwnerEarningsCalculator:
             print(f"[ERROR] Error loading {data_type.lower()} financial statements: {e}")
             return False
     
+    def _get_sheet_names(self):
+        """Return the workbook's sheet names, using the parsed workbook if available."""
+        if self.workbook is not None:
+            return self.workbook.sheet_names
+        return pd.ExcelFile(self.file_path).sheet_names
+    
+    def _read_sheet(self, sheet_name):
+        """Return one sheet as a DataFrame, using the parsed workbook if available."""
+        if self.workbook is not None:
+            return self.workbook.get(sheet_name)
+        return pd.read_excel(self.file_path, sheet_name=sheet_name)
+    
     def _find_sheet(self, sheet_names, keywords):
         """Find sheet name that contains any of the keywords."""
         for sheet in sheet_names:
@@ -245,7 +265,8 @@ class OwnerEarningsCalculator:
             years_to_extract: Number of recent periods to extract (40 for ~10 years quarterly)
         
         Returns:
-            dict: Period -> Value mapping
+            dict: Period -> Value mapping (annual Periods for annual data and
+            for annual columns of quarterly data)
         """
         if df is None or df.empty:
             return {}
@@ -364,12 +385,12 @@ class OwnerEarningsCalculator:
                                     numeric_value = float(value)
                                 
                                 # Create proper period key
-                                if hasattr(self, 'preferred_data_type') and self.preferred_data_type == 'Quarterly':
+                                if hasattr(self, 'preferred_data_type') and self.preferred_data_type == 'Quarterly' and period != "Annual":
                                     # For quarterly data, use full quarter identifier
-                                    period_key = f"{year}Q{self._quarter_to_number(period)}" if period != "Annual" else year
+                                    period_key = Period.quarterly(year, self._quarter_to_number(period))
                                 else:
                                     # For annual data, use just the year
-                                    period_key = year
+                                    period_key = Period.annual(year)
                                 
                                 if period_key not in processed_periods:
                                     result[period_key] = numeric_value
@@ -560,12 +581,17 @@ class OwnerEarningsCalculator:
             if debt_data:
                 print(f"   [DATA] Long-term Debt Levels: {debt_data}")
                 # Calculate debt changes (limit display to avoid clutter)
-                debt_periods = sorted(debt_data.keys())
-                for i in range(1, min(len(debt_periods), 8)):  # Show max 7 periods to avoid clutter
-                    prev_period = debt_periods[i-1]
-                    curr_period = debt_periods[i]
+                debt_data = self._same_frequency_levels(debt_data)
+                shown = 0
+                for curr_period in sorted(debt_data.keys()):
+                    prev_period = curr_period.previous()
+                    if prev_period not in debt_data:
+                        continue
                     debt_change = debt_data[curr_period] - debt_data[prev_period]
                     print(f"   [CREDIT] {curr_period}: Debt change from ${debt_data[prev_period]:,.0f} to ${debt_data[curr_period]:,.0f} = ${debt_change:,.0f}")
+                    shown += 1
+                    if shown >= 7:  # Show max 7 periods to avoid clutter
+                        break
                 break
         
         if not debt_data:
@@ -573,11 +599,13 @@ class OwnerEarningsCalculator:
         
         print(f"\n   [DATA] WORKING CAPITAL CHANGES:")
         working_capital_changes = {}
-        sorted_years = sorted(working_capital_levels.keys())
+        working_capital_levels = self._same_frequency_levels(working_capital_levels)
         
-        for i in range(1, len(sorted_years)):
-            current_year = sorted_years[i]
-            previous_year = sorted_years[i-1]
+        for current_year in sorted(working_capital_levels.keys()):
+            # Only against the directly preceding quarter (or year)
+            previous_year = current_year.previous()
+            if previous_year not in working_capital_levels:
+                continue
             
             current_wc = working_capital_levels[current_year]
             previous_wc = working_capital_levels[previous_year]
@@ -590,6 +618,29 @@ class OwnerEarningsCalculator:
         
         return working_capital_changes
 
+    def _same_frequency_levels(self, levels):
+        """
+        Drop balance sheet levels whose frequency differs from the run's.
+
+        Quarterly runs can pick up annual columns as annual Periods; a year
+        is no neighbour of a quarter, so changes are only taken between
+        periods of one frequency.
+
+        Args:
+            levels: Period -> level mapping
+
+        Returns:
+            dict: The levels of the run's frequency
+        """
+        quarterly = hasattr(self, 'preferred_data_type') and self.preferred_data_type == 'Quarterly'
+        kept = {period: value for period, value in levels.items() if period.is_annual != quarterly}
+        dropped = sorted(set(levels) - set(kept))
+        if dropped and kept:
+            print(f"   [WARNING] Ignoring {'annual' if quarterly else 'quarterly'} periods: {[str(p) for p in dropped]}")
+            return kept
+        # Only the other frequency was found: use what there is
+        return kept or levels
+
     def _detect_insurance_company(self):
         """
         Detect if this appears to be an insurance company based on financial patterns.
@@ -791,72 +842,50 @@ class OwnerEarningsCalculator:
         return is_insurance
 
     def calculate_owner_earnings(self):
-        """Calculate owner earnings for each available year."""
+        """
+        Calculate owner earnings for each available year.
+
+        Returns:
+            OwnerEarningsTable: {Period: OwnerEarningsPeriod}, most recent first;
+            each record also reads like a dict (record['owner_earnings'])
+        """
         if not self.owner_earnings_data:
             self.extract_owner_earnings_components()
         
         print(f"\n[MONEY] Calculating Owner Earnings for {self.company_name}...")
         
-        # Get all available years
-        all_years = set()
-        for component in self.owner_earnings_data.values():
-            all_years.update(component.keys())
-        
-        owner_earnings = {}
-        
-        for year in sorted(all_years, reverse=True):
-            try:
-                # Get components for this year
-                net_income = self.owner_earnings_data.get('net_income', {}).get(year, 0)
-                depreciation = self.owner_earnings_data.get('depreciation', {}).get(year, 0)
-                capex = self.owner_earnings_data.get('capex', {}).get(year, 0)
-                wc_change = self.owner_earnings_data.get('working_capital_change', {}).get(year, 0)
-
-                # Always use forced logic for banks/insurance if set
-                if self.force_bank or self.force_insurance:
-                    owner_earnings_value = net_income + depreciation - abs(capex)
-                    if self.force_bank:
-                        print(f"   [BANK] Forced banking methodology (excluding working capital changes)")
-                    if self.force_insurance:
-                        print(f"   [INSURANCE] Forced insurance methodology (excluding working capital changes)")
-                else:
-                    # Calculate owner earnings with industry-specific adjustments
-                    is_insurance_company = self._detect_insurance_company()
-                    is_bank = self._detect_bank()
-
-                    if is_insurance_company:
-                        owner_earnings_value = net_income + depreciation - abs(capex)
-                        print(f"   [INSURANCE] Using insurance company methodology (excluding working capital changes)")
-                    elif is_bank:
-                        owner_earnings_value = net_income + depreciation - abs(capex)
-                        print(f"   [BANK] Using banking methodology (excluding working capital changes)")
-                    else:
-                        owner_earnings_value = net_income + depreciation - abs(capex) - wc_change
-
-                owner_earnings[year] = {
-                    'net_income': net_income,
-                    'depreciation': depreciation,
-                    'capex': capex,
-                    'working_capital_change': wc_change,
-                    'owner_earnings': owner_earnings_value
-                }
-
-            except Exception as e:
-                print(f"[WARNING]  Error calculating owner earnings for {year}: {e}")
-                continue
+        # Always use forced logic for banks/insurance if set
+        if self.force_bank or self.force_insurance:
+            exclude_working_capital = True
+            if self.force_bank:
+                print(f"   [BANK] Forced banking methodology (excluding working capital changes)")
+            if self.force_insurance:
+                print(f"   [INSURANCE] Forced insurance methodology (excluding working capital changes)")
+        else:
+            # Calculate owner earnings with industry-specific adjustments
+            is_insurance_company = self._detect_insurance_company()
+            is_bank = self._detect_bank()
+            exclude_working_capital = is_insurance_company or is_bank
+            
+            if is_insurance_company:
+                print(f"   [INSURANCE] Using insurance company methodology (excluding working capital changes)")
+            elif is_bank:
+                print(f"   [BANK] Using banking methodology (excluding working capital changes)")
         
-        return owner_earnings
+        return OwnerEarningsTable.from_components(self.owner_earnings_data, exclude_working_capital)
     
     def calculate_alternative_owner_earnings_methods(self):
         """
         Calculate Owner Earnings using multiple methodologies for comparison.
         
-        Returns a dictionary with different calculation methods:
+        Returns a table with different calculation methods per period:
         1. Traditional Method: Net Income + Depreciation - CapEx - Working Capital Changes
         2. Operating Cash Flow Method: Operating Cash Flow - CapEx
         3. Free Cash Flow Method: Operating Cash Flow - CapEx (simplified)
         
         This provides multiple perspectives on the true cash generation of the business.
+        The AlternativeMethodsTable maps each Period to {method: OwnerEarningsMethod},
+        most recent first, and reads like the nested dicts it replaces.
         """
         if not self.owner_earnings_data:
             self.extract_owner_earnings_components()
@@ -864,85 +893,17 @@ class OwnerEarningsCalculator:
         print(f"\n[ALTERNATIVE] Calculating Alternative Owner Earnings Methods for {self.company_name}...")
         print(f"[INFO] These methods provide different perspectives on cash generation")
         
-        # Get all available years
-        all_years = set()
-        for component in self.owner_earnings_data.values():
-            if component:  # Check if component exists
-                all_years.update(component.keys())
-        
-        alternative_methods = {}
-        
-        for year in sorted(all_years, reverse=True):
-            try:
-                # Get components for this year
-                net_income = self.owner_earnings_data.get('net_income', {}).get(year, 0)
-                operating_cash_flow = self.owner_earnings_data.get('operating_cash_flow', {}).get(year, 0)
-                depreciation = self.owner_earnings_data.get('depreciation', {}).get(year, 0)
-                capex = self.owner_earnings_data.get('capex', {}).get(year, 0)
-                wc_change = self.owner_earnings_data.get('working_capital_change', {}).get(year, 0)
-                
-                # Check if this appears to be an insurance company or bank
-                is_insurance_company = self._detect_insurance_company()
-                is_bank = self._detect_bank()
-                
-                year_methods = {}
-                
-                # Method 1: Traditional Buffett Formula
-                if is_insurance_company:
-                    traditional_oe = net_income + depreciation - abs(capex)
-                    method_note = "Insurance methodology (excludes working capital)"
-                elif is_bank:
-                    traditional_oe = net_income + depreciation - abs(capex)
-                    method_note = "Banking methodology (excludes working capital)"
-                else:
-                    traditional_oe = net_income + depreciation - abs(capex) - wc_change
-                    method_note = "Standard methodology"
-                
-                year_methods['traditional'] = {
-                    'value': traditional_oe,
-                    'method': 'Net Income + Depreciation - CapEx - Working Capital Changes',
-                    'note': method_note,
-                    'components': {
-                        'net_income': net_income,
-                        'depreciation': depreciation,
-                        'capex': capex,
-                        'working_capital_change': wc_change
-                    }
-                }
-                
-                # Method 2: Operating Cash Flow Method (Buffett's alternative approach)
-                if operating_cash_flow != 0:
-                    ocf_oe = operating_cash_flow - abs(capex)
-                    year_methods['operating_cash_flow'] = {
-                        'value': ocf_oe,
-                        'method': 'Operating Cash Flow - CapEx',
-                        'note': 'Uses actual cash flow from operations',
-                        'components': {
-                            'operating_cash_flow': operating_cash_flow,
-                            'capex': capex
-                        }
-                    }
-                
-                # Method 3: Free Cash Flow Method (commonly used alternative)
-                if operating_cash_flow != 0:
-                    fcf_oe = operating_cash_flow - abs(capex)  # Same as OCF method for simplicity
-                    year_methods['free_cash_flow'] = {
-                        'value': fcf_oe,
-                        'method': 'Free Cash Flow (Operating Cash Flow - CapEx)',
-                        'note': 'Standard free cash flow definition',
-                        'components': {
-                            'operating_cash_flow': operating_cash_flow,
-                            'capex': capex
-                        }
-                    }
-                
-                alternative_methods[year] = year_methods
-                
-            except Exception as e:
-                print(f"[WARNING] Error calculating alternative methods for {year}: {e}")
-                continue
+        # Check if this appears to be an insurance company or bank
+        is_insurance_company = self._detect_insurance_company()
+        is_bank = self._detect_bank()
+        if is_insurance_company:
+            methodology = INSURANCE
+        elif is_bank:
+            methodology = BANKING
+        else:
+            methodology = STANDARD
         
-        return alternative_methods
+        return AlternativeMethodsTable.from_components(self.owner_earnings_data, methodology)
     
     def print_alternative_methods_analysis(self):
         """Print a comprehensive comparison of alternative Owner Earnings methods."""
@@ -1070,7 +1031,8 @@ class OwnerEarningsCalculator:
                 else:
                     owner_earnings_value = data['net_income'] + data['depreciation'] - abs(data['capex']) - data['working_capital_change']
                 row = {
-                    'Period': year,
+                    'Period': str(year),
+                    PERIOD_CODE_COLUMN: int(year),
                     'Net Income': data['net_income'],
                     'Depreciation': data['depreciation'],
                     'CapEx': data['capex'],
@@ -1109,7 +1071,8 @@ class OwnerEarningsCalculator:
                 else:
                     owner_earnings_value = data['net_income'] + data['depreciation'] - abs(data['capex']) - data['working_capital_change']
                 row = {
-                    'Period': period,
+                    'Period': str(period),
+                    PERIOD_CODE_COLUMN: int(period),
                     'Net Income': data['net_income'],
                     'Depreciation': data['depreciation'],
                     'CapEx': data['capex'],
@@ -1156,15 +1119,17 @@ class OwnerEarningsCalculator:
                 print(f"   Owner Earnings/NI:    {margin:>15.1f}%")
         
         # Calculate trends
-        years_list = sorted(owner_earnings.keys(), reverse=True)
-        if len(years_list) >= 2:
-            recent_oe = owner_earnings[years_list[0]]['owner_earnings']
-            older_oe = owner_earnings[years_list[1]]['owner_earnings']
+        # Latest period against the same quarter (or year) a year earlier
+        latest = max(owner_earnings.keys())
+        year_ago = latest.year_ago()
+        if year_ago in owner_earnings:
+            recent_oe = owner_earnings[latest]['owner_earnings']
+            older_oe = owner_earnings[year_ago]['owner_earnings']
             
             if older_oe != 0:
                 growth = ((recent_oe - older_oe) / abs(older_oe)) * 100
                 print(f"\n[DATA] YEAR-OVER-YEAR GROWTH:")
-                print(f"   {years_list[1]} to {years_list[0]}: {growth:+.1f}%")
+                print(f"   {year_ago} to {latest}: {growth:+.1f}%")
         
         # Calculate average
         oe_values = [data['owner_earnings'] for data in owner_earnings.values()]
@@ -1285,7 +1250,7 @@ def main():
                 # Convert to DataFrame for easy CSV export
                 df_data = []
                 for year, data in owner_earnings.items():
-                    row = {'Period': year}
+                    row = {'Period': str(year), PERIOD_CODE_COLUMN: int(year)}
                     row.update(data)
                     df_data.append(row)
                 
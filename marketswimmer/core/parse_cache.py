@@ -0,0 +1,146 @@
+"""
+Parse cache for StockRow workbooks.
+
+Parsing an XLSX export with pandas is far slower than reading the same
+frames back from a pickle. Once the export store exists
+(downloaded_files/.store), every parsed workbook is kept under
+.store/parsed/<content hash>.pkl and reused by later loads of identical
+content, whatever the file is called.
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .export_store import STORE_DIRNAME
+from .stage_cache import fingerprint_file
+
+PARSED_DIRNAME = "parsed"
+
+# Recently loaded workbooks are also kept in memory, so a long-lived
+# process (the worker daemon) skips even the unpickling
+MEMORY_ENTRIES = 8
+_memory: "OrderedDict[str, Dict[str, pd.DataFrame]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _copy_sheets(sheets: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    # Callers may modify the frames they get; keep the cached ones pristine
+    return {name: frame.copy() for name, frame in sheets.items()}
+
+
+def _remember(digest: str, sheets: Dict[str, pd.DataFrame]):
+    with _memory_lock:
+        _memory[digest] = _copy_sheets(sheets)
+        _memory.move_to_end(digest)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _recall(digest: str) -> Optional[Dict[str, pd.DataFrame]]:
+    with _memory_lock:
+        sheets = _memory.get(digest)
+        if sheets is None:
+            return None
+        _memory.move_to_end(digest)
+    return _copy_sheets(sheets)
+
+
+class ParseCache:
+    """Pickled sheets of parsed workbooks, keyed by file content hash."""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder holding the pickled workbooks
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @classmethod
+    def for_file(cls, file_path: Path) -> Optional["ParseCache"]:
+        """
+        Return the cache serving a workbook, if its folder has an export store.
+
+        Args:
+            file_path: XLSX file about to be parsed
+
+        Returns:
+            ParseCache: Cache next to the file, or None
+        """
+        store_dir = Path(file_path).parent / STORE_DIRNAME
+        if not store_dir.is_dir():
+            return None
+        return cls(store_dir / PARSED_DIRNAME)
+
+    def path_for(self, digest: str) -> Path:
+        """Location of the cached sheets for a content hash."""
+        return self.cache_dir / f"{digest}.pkl"
+
+    def get(self, digest: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Read cached sheets.
+
+        Entries written by another pandas version, or unreadable for any
+        other reason, count as missing.
+
+        Args:
+            digest: Content hash of the XLSX file
+
+        Returns:
+            dict: Sheet name -> DataFrame, or None on a cache miss
+        """
+        try:
+            with open(self.path_for(digest), 'rb') as handle:
+                payload = pickle.load(handle)
+        except Exception:
+            return None
+        if not isinstance(payload, dict) or payload.get('pandas') != pd.__version__:
+            return None
+        return payload.get('sheets')
+
+    def put(self, digest: str, sheets: Dict[str, pd.DataFrame]):
+        """Write parsed sheets to the cache atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=digest[:12], suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                pickle.dump({'pandas': pd.__version__, 'sheets': sheets}, handle,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path_for(digest))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, file_path: Path, digest: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Return the parsed sheets of a workbook, parsing it only on a miss.
+
+        Args:
+            file_path: XLSX file
+            digest: Content hash if already known
+
+        Returns:
+            dict: Sheet name -> DataFrame, in workbook order
+        """
+        digest = digest or fingerprint_file(file_path)
+        sheets = _recall(digest)
+        if sheets is not None:
+            return sheets
+        sheets = self.get(digest)
+        if sheets is None:
+            sheets = pd.read_excel(file_path, sheet_name=None)
+            try:
+                self.put(digest, sheets)
+            except OSError:
+                pass  # A read-only store only costs the speed-up
+        _remember(digest, sheets)
+        return sheets
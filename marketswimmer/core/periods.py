@@ -0,0 +1,277 @@
+"""
+Integer period codes for MarketSwimmer.
+
+The owner earnings calculators label periods as 2024 (annual) or "2024Q3"
+(quarterly), so a CSV 'Period' column can hold ints, strings or both.
+Alongside it they now write a 'Period Code' column holding one integer
+per period:
+
+    code = (year * 4 + quarter - 1) << 1 | annual
+
+Annual periods are coded as the fourth quarter of their year with the
+annual bit set, so codes sort chronologically (a year right after its
+Q4) and year, quarter and dates follow from a few vectorized integer
+operations instead of string parsing.
+
+A single period is a Period: an int holding its code, so period keys sort,
+hash and compare as plain integers while printing as their labels, and
+arrays of codes support the same arithmetic through shift() and
+year_ago().
+"""
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+PERIOD_CODE_COLUMN = "Period Code"
+
+# Code of a period label that could not be parsed
+INVALID_CODE = -1
+
+# Years a period label can name (four digits)
+MIN_YEAR = 1000
+MAX_YEAR = 9999
+
+ANNUAL = "A"
+QUARTERLY = "Q"
+
+_LABEL_PATTERN = r'^\s*(?:(?P<year>\d{4})(?:\.0)?\s*-?\s*(?:Q(?P<quarter>[1-4]))?|Q(?P<quarter_first>[1-4])\s*-?\s*(?P<year_last>\d{4}))\s*$'
+
+
+def encode(year, quarter=4, annual=False):
+    """
+    Period codes of years and quarters (scalars or arrays).
+
+    Args:
+        year: Calendar year(s)
+        quarter: Quarter(s) 1-4; ignored for annual periods
+        annual: Whether the period is a whole year
+
+    Returns:
+        int or np.ndarray: Period code(s)
+    """
+    year = np.asarray(year, dtype=np.int64)
+    annual = np.asarray(annual, dtype=bool)
+    quarter = np.where(annual, 4, np.asarray(quarter, dtype=np.int64))
+    codes = ((year * 4 + quarter - 1) << 1) | annual.astype(np.int64)
+    return int(codes) if codes.ndim == 0 else codes
+
+
+def code_of(period) -> int:
+    """
+    Period code of one calculator period key (2024, "2024" or "2024Q3").
+
+    Returns:
+        int: The code, INVALID_CODE if the key is not a period
+    """
+    if isinstance(period, Period):
+        return int(period)
+    return int(codes_from_labels(pd.Series([period]))[0])
+
+
+def codes_from_labels(periods: pd.Series) -> np.ndarray:
+    """
+    Parse period labels into codes in one vectorized pass.
+
+    Understands years (2024, "2024") and quarters ("2024Q3", "2024-Q3",
+    "Q3-2024"). Used for files written before the 'Period Code' column.
+
+    Args:
+        periods: Period labels
+
+    Returns:
+        np.ndarray: int64 codes, INVALID_CODE where a label is not a period
+    """
+    parts = periods.astype(str).str.extract(_LABEL_PATTERN)
+    year = pd.to_numeric(parts['year'].fillna(parts['year_last']), errors='coerce')
+    quarter = pd.to_numeric(parts['quarter'].fillna(parts['quarter_first']), errors='coerce')
+    valid = year.notna().to_numpy()
+    annual = quarter.isna().to_numpy()
+    codes = encode(year.fillna(0).to_numpy(dtype=np.int64), quarter.fillna(4).to_numpy(dtype=np.int64), annual)
+    return np.where(valid, codes, INVALID_CODE)
+
+
+def period_codes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Period codes of an owner earnings frame.
+
+    Args:
+        df: Frame with a 'Period Code' column, or only 'Period' (older files)
+
+    Returns:
+        np.ndarray: int64 codes aligned with the rows
+    """
+    if PERIOD_CODE_COLUMN in df.columns:
+        return df[PERIOD_CODE_COLUMN].to_numpy(dtype=np.int64)
+    return codes_from_labels(df['Period'])
+
+
+def years(codes) -> np.ndarray:
+    """Calendar year of each code."""
+    return (np.asarray(codes, dtype=np.int64) >> 1) // 4
+
+
+def quarters(codes) -> np.ndarray:
+    """Quarter (1-4) of each code; 4 for annual periods."""
+    return (np.asarray(codes, dtype=np.int64) >> 1) % 4 + 1
+
+
+def is_annual(codes) -> np.ndarray:
+    """Whether each code is a whole year."""
+    return (np.asarray(codes, dtype=np.int64) & 1).astype(bool)
+
+
+def start_dates(codes, annual_month: Union[int, None] = 1) -> pd.DatetimeIndex:
+    """
+    First day of each period.
+
+    Args:
+        codes: Period codes
+        annual_month: Month annual periods start in; None dates them by
+            their quarter like quarterly periods (i.e. October 1st)
+
+    Returns:
+        pd.DatetimeIndex: Dates, NaT for invalid codes
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    months = (quarters(codes) - 1) * 3 + 1
+    if annual_month is not None:
+        months = np.where(is_annual(codes), annual_month, months)
+    # Months since 1970-01 -> datetime64[M] -> datetime64[ns]
+    dates = ((years(codes) - 1970) * 12 + months - 1).astype('datetime64[M]').astype('datetime64[ns]')
+    return pd.DatetimeIndex(np.where(codes >= 0, dates, np.datetime64('NaT', 'ns')))
+
+
+def shift(codes, n: int = 1) -> np.ndarray:
+    """
+    Move each code n periods of its own frequency (quarters or years).
+
+    Args:
+        codes: Period codes
+        n: Number of periods; negative moves back in time
+
+    Returns:
+        np.ndarray: Shifted codes
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    return codes + np.where(codes & 1, 8, 2) * n
+
+
+def year_ago(codes) -> np.ndarray:
+    """The same quarter (or year) one year earlier, for each code."""
+    return np.asarray(codes, dtype=np.int64) - 8
+
+
+def labels(codes) -> np.ndarray:
+    """Period labels as the calculators write them: "2024" or "2024Q3"."""
+    codes = np.asarray(codes, dtype=np.int64)
+    year_text = years(codes).astype(str).astype(object)
+    quarter_text = np.char.add('Q', quarters(codes).astype(str)).astype(object)
+    return np.where(is_annual(codes), year_text, year_text + quarter_text)
+
+
+class Period(int):
+    """
+    One reporting period, stored as its period code.
+
+    Periods are ints, so they sort chronologically, work as dict keys and
+    DataFrame values, and compare equal to their codes; str() gives the
+    calculator label ("2024" or "2024Q3").
+
+    The constructor takes labels, so Period(2024) is the year 2024;
+    Period.from_code() wraps a period code.
+
+    Example:
+        >>> Period("2024Q1").previous()
+        Period('2023Q4')
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, label):
+        """
+        Period of a label such as 2024, "2024Q3" or "Q3-2024".
+
+        Raises:
+            ValueError: If the label is not a period
+        """
+        if isinstance(label, Period):
+            return label
+        code = code_of(label)
+        if code == INVALID_CODE:
+            raise ValueError(f"not a period: {label!r}")
+        return cls.from_code(code)
+
+    @classmethod
+    def from_code(cls, code: int) -> "Period":
+        """
+        Period of a period code.
+
+        Raises:
+            ValueError: If the code does not decode to a four-digit year
+        """
+        code = int(code)
+        if code < 0 or not MIN_YEAR <= (code >> 1) // 4 <= MAX_YEAR:
+            raise ValueError(f"invalid period code: {code}")
+        return int.__new__(cls, code)
+
+    @classmethod
+    def annual(cls, year: int) -> "Period":
+        """The whole calendar year."""
+        return cls.from_code(encode(year, annual=True))
+
+    @classmethod
+    def quarterly(cls, year: int, quarter: int) -> "Period":
+        """A quarter (1-4) of a year."""
+        if not 1 <= quarter <= 4:
+            raise ValueError(f"invalid quarter: {quarter}")
+        return cls.from_code(encode(year, quarter))
+
+    @classmethod
+    def parse(cls, label) -> "Period":
+        """Period of a label; same as Period(label)."""
+        return cls(label)
+
+    @property
+    def year(self) -> int:
+        return (int(self) >> 1) // 4
+
+    @property
+    def quarter(self) -> int:
+        """Quarter 1-4; 4 for annual periods."""
+        return (int(self) >> 1) % 4 + 1
+
+    @property
+    def is_annual(self) -> bool:
+        return bool(int(self) & 1)
+
+    @property
+    def frequency(self) -> str:
+        """ANNUAL or QUARTERLY."""
+        return ANNUAL if self.is_annual else QUARTERLY
+
+    def shift(self, n: int = 1) -> "Period":
+        """The period n quarters (or years, for annual periods) later."""
+        return Period.from_code(int(self) + (8 if self.is_annual else 2) * n)
+
+    def previous(self) -> "Period":
+        """The preceding quarter or year."""
+        return self.shift(-1)
+
+    def year_ago(self) -> "Period":
+        """The same quarter (or year) one year earlier."""
+        return Period.from_code(int(self) - 8)
+
+    def __reduce__(self):
+        # int pickles by value, which the constructor would read as a year
+        return (Period.from_code, (int(self),))
+
+    def __str__(self) -> str:
+        return str(self.year) if self.is_annual else f"{self.year}Q{self.quarter}"
+
+    def __repr__(self) -> str:
+        return f"Period('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
@@ -0,0 +1,243 @@
+"""
+Stock price series for MarketSwimmer.
+
+Share issuance and buybacks are reported in dollars; turning them into
+share counts needs the stock price around each reporting date. A
+PriceSeries keeps prices in sorted numpy arrays and answers as-of
+lookups (the last price on or before a date) with a binary search, so
+whole columns of amounts convert at once and reporting dates do not have
+to coincide with price dates.
+
+Prices come from a local price history file when there is one
+(data/prices/<ticker>.csv), otherwise they are estimated from the
+workbook as book value per share times the P/B ratio.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PRICE_DIR = Path("data") / "prices"
+
+# Column names recognised in price history files, in order of preference
+DATE_COLUMNS = ("date", "datetime", "timestamp")
+PRICE_COLUMNS = ("adj close", "adj_close", "adjusted close", "close", "price")
+
+_MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+_MONTH_YEAR = re.compile(r"^([A-Za-z]{3})[a-z]*\s+'?(\d{2}|\d{4})$")
+_QUARTER_YEAR = re.compile(r"^Q([1-4])\s+(\d{4})$", re.IGNORECASE)
+
+
+def _full_year(year: str) -> int:
+    value = int(year)
+    if len(year) == 2:
+        value += 2000 if value < 50 else 1900
+    return value
+
+
+def period_end(label) -> np.datetime64:
+    """
+    Date a reporting period label stands for.
+
+    Understands the StockRow column headers ("Jun '25"), the quarter labels
+    of the shares analysis ("Q2 2025") and plain dates ("2025-06-30").
+    Month and quarter labels map to the last day of the month or quarter.
+
+    Args:
+        label: Period label or date
+
+    Returns:
+        np.datetime64: Day precision date, NaT if the label is not a date
+    """
+    text = str(label).strip()
+    match = _MONTH_YEAR.match(text)
+    if match and match.group(1).lower() in _MONTHS:
+        month = _MONTHS[match.group(1).lower()]
+        year = _full_year(match.group(2))
+    else:
+        match = _QUARTER_YEAR.match(text)
+        if match:
+            month = int(match.group(1)) * 3
+            year = int(match.group(2))
+        else:
+            try:
+                return np.datetime64(pd.Timestamp(text).date(), 'D')
+            except (ValueError, TypeError):
+                return np.datetime64('NaT', 'D')
+    # Last day of the month: first day of the next month minus one day
+    return np.datetime64(f"{year:04d}-{month:02d}", 'M') + np.timedelta64(1, 'M') - np.timedelta64(1, 'D')
+
+
+def period_ends(labels: Iterable) -> np.ndarray:
+    """
+    Dates of many period labels; each distinct label is parsed once.
+
+    Args:
+        labels: Period labels or dates
+
+    Returns:
+        np.ndarray: datetime64[D] array (NaT for labels that are not dates)
+    """
+    labels = pd.Series(list(labels), dtype=object)
+    codes, uniques = pd.factorize(labels, use_na_sentinel=False)
+    parsed = np.array([period_end(label) for label in uniques], dtype='datetime64[D]')
+    return parsed[codes] if len(parsed) else np.array([], dtype='datetime64[D]')
+
+
+class PriceSeries:
+    """Stock prices by date, sorted for as-of lookups."""
+
+    def __init__(self, dates, prices, source: str = ""):
+        """
+        Initialize the series; rows without a date or a positive price are dropped.
+
+        Args:
+            dates: Price dates (anything numpy converts to datetime64)
+            prices: Prices, aligned with dates
+            source: Where the prices came from (for messages)
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        prices = np.asarray(prices, dtype=float)
+        valid = ~np.isnat(dates) & np.isfinite(prices) & (prices > 0)
+        dates, prices = dates[valid], prices[valid]
+        # Stable sort keeps the last of several prices on the same day last
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+        self.prices = prices[order]
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"PriceSeries(empty, source={self.source!r})"
+        return (f"PriceSeries({len(self)} prices, {self.dates[0]} to {self.dates[-1]}, "
+                f"source={self.source!r})")
+
+    @classmethod
+    def from_ratios(cls, ratios_df: pd.DataFrame) -> "PriceSeries":
+        """
+        Estimate prices as book value per share times the P/B ratio.
+
+        Args:
+            ratios_df: The 'Metrics Ratios, Q' sheet of a StockRow export
+
+        Returns:
+            PriceSeries: One price per quarter (empty if either row is missing)
+        """
+        labels = ratios_df.iloc[:, 0].astype(str).str.lower()
+        book_value = np.flatnonzero(labels.str.contains('book value per share', regex=False))
+        pb_ratio = np.flatnonzero(labels.str.contains('p/b ratio', regex=False))
+        if not len(book_value) or not len(pb_ratio):
+            return cls([], [], source="book value per share x P/B ratio")
+
+        rows = ratios_df.iloc[[book_value[0], pb_ratio[0]], 1:]
+        values = rows.apply(lambda column: pd.to_numeric(
+            column.astype(str).str.replace(r'[,$]', '', regex=True), errors='coerce')).to_numpy(dtype=float)
+        return cls(period_ends(ratios_df.columns[1:]), values[0] * values[1],
+                   source="book value per share x P/B ratio")
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "PriceSeries":
+        """
+        Read a price history CSV (e.g. a daily export of a quote service).
+
+        The file needs a date column (Date, Datetime or Timestamp) and a
+        price column (Adj Close, Close or Price); names are case-insensitive.
+
+        Args:
+            path: CSV file
+
+        Returns:
+            PriceSeries: Prices of the file
+
+        Raises:
+            ValueError: If the file lacks a date or price column
+        """
+        frame = pd.read_csv(path)
+        columns = {str(column).strip().lower(): column for column in frame.columns}
+        date_column = next((columns[name] for name in DATE_COLUMNS if name in columns), None)
+        price_column = next((columns[name] for name in PRICE_COLUMNS if name in columns), None)
+        if date_column is None or price_column is None:
+            raise ValueError(f"{path}: needs a date column ({', '.join(DATE_COLUMNS)}) "
+                             f"and a price column ({', '.join(PRICE_COLUMNS)})")
+        dates = pd.to_datetime(frame[date_column], errors='coerce', utc=True).dt.tz_localize(None)
+        prices = pd.to_numeric(frame[price_column], errors='coerce')
+        return cls(dates.to_numpy(dtype='datetime64[D]'), prices.to_numpy(dtype=float),
+                   source=str(path))
+
+    @classmethod
+    def for_ticker(cls, ticker: str, workbook=None, price_file: Optional[Union[str, Path]] = None,
+                   price_dir: Path = DEFAULT_PRICE_DIR) -> "PriceSeries":
+        """
+        Best available prices for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            workbook (FinancialWorkbook, optional): Export to estimate prices from
+            price_file: Price history file to use
+            price_dir: Folder searched for <ticker>.csv when price_file is not given
+
+        Returns:
+            PriceSeries: Prices of the price history file if there is one,
+            otherwise estimated from the workbook (empty without either)
+        """
+        if price_file is None:
+            candidate = Path(price_dir) / f"{ticker.replace('.', '_').lower()}.csv"
+            if candidate.exists():
+                price_file = candidate
+        if price_file is not None:
+            return cls.from_file(price_file)
+        ratios_df = workbook.get('Metrics Ratios, Q') if workbook is not None else None
+        if ratios_df is None:
+            return cls([], [], source="no price data")
+        return cls.from_ratios(ratios_df)
+
+    def asof(self, dates) -> np.ndarray:
+        """
+        Last price on or before each date.
+
+        Args:
+            dates: Dates (datetime64 values or anything numpy converts)
+
+        Returns:
+            np.ndarray: Prices; NaN for dates before the first price
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        index = np.searchsorted(self.dates, dates, side='right') - 1
+        found = (index >= 0) & ~np.isnat(dates)
+        result = np.full(dates.shape, np.nan)
+        result[found] = self.prices[index[found]]
+        return result
+
+    def to_shares(self, amounts, dates) -> np.ndarray:
+        """
+        Convert dollar amounts (e.g. buybacks) to share counts.
+
+        Args:
+            amounts: Dollar amounts; the sign is kept
+            dates: Date of each amount
+
+        Returns:
+            np.ndarray: Amount / as-of price; NaN where no price is known
+        """
+        return np.asarray(amounts, dtype=float) / self.asof(dates)
+
+    def by_label(self, labels: Iterable) -> Dict[str, float]:
+        """
+        As-of prices keyed by period label, for labels that have one.
+
+        Args:
+            labels: Period labels such as "Q2 2025"
+
+        Returns:
+            dict: {label: price}
+        """
+        labels = list(dict.fromkeys(labels))
+        prices = self.asof(period_ends(labels))
+        return {label: price for label, price in zip(labels, prices.tolist()) if not np.isnan(price)}
@@ -0,0 +1,310 @@
+"""
+Compact owner earnings results for MarketSwimmer.
+
+OwnerEarningsCalculator used to return one dict per period (and three
+levels of nested dicts for the alternative methods), which dominated the
+memory of universe-scale runs. The tables here keep each component in a
+numpy column instead, one row per period, and hand out small slotted
+records on access. Tables and records are read-only mappings, so code
+written against the old dicts (result[period]['owner_earnings'],
+.items(), .get(...)) keeps working.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator
+
+import numpy as np
+
+from .periods import INVALID_CODE, Period, code_of
+
+OWNER_EARNINGS_FIELDS = ('net_income', 'depreciation', 'capex', 'working_capital_change', 'owner_earnings')
+# Components the alternative methods are computed from, in column order
+METHOD_COMPONENTS = ('net_income', 'operating_cash_flow', 'depreciation', 'capex', 'working_capital_change')
+
+TRADITIONAL = 'traditional'
+OPERATING_CASH_FLOW = 'operating_cash_flow'
+FREE_CASH_FLOW = 'free_cash_flow'
+
+METHOD_DESCRIPTIONS = {
+    TRADITIONAL: 'Net Income + Depreciation - CapEx - Working Capital Changes',
+    OPERATING_CASH_FLOW: 'Operating Cash Flow - CapEx',
+    FREE_CASH_FLOW: 'Free Cash Flow (Operating Cash Flow - CapEx)',
+}
+# Notes of the traditional method, indexed by AlternativeMethodsTable.methodology
+METHODOLOGY_NOTES = (
+    "Standard methodology",
+    "Insurance methodology (excludes working capital)",
+    "Banking methodology (excludes working capital)",
+)
+STANDARD, INSURANCE, BANKING = range(len(METHODOLOGY_NOTES))
+
+
+def _owner_earnings(net_income, depreciation, capex, working_capital_change, exclude_working_capital: bool):
+    """Net income + depreciation - |capex| (- working capital change); scalars or arrays."""
+    value = net_income + depreciation - abs(capex)
+    return value if exclude_working_capital else value - working_capital_change
+
+
+def _component_columns(components: Dict[str, Dict], names, codes: np.ndarray) -> np.ndarray:
+    """Per-period component dicts as a float matrix, one column per name; missing values are 0."""
+    values = np.zeros((len(codes), len(names)))
+    for column, name in enumerate(names):
+        series = components.get(name) or {}
+        for row, code in enumerate(codes.tolist()):
+            values[row, column] = series.get(code, 0)
+    return values
+
+
+def _all_periods(components: Dict[str, Dict]) -> np.ndarray:
+    """Codes of every period any component has, most recent first."""
+    keys = set()
+    for series in components.values():
+        if series:
+            keys.update(series.keys())
+    return np.array(sorted(keys, reverse=True), dtype=np.int64)
+
+
+class _PeriodTable(Mapping):
+    """Rows keyed by Period (or a label such as 2024 or "2024Q3"), most recent first."""
+
+    __slots__ = ('_codes',)
+
+    def _row(self, period) -> int:
+        # Plain ints are years like the old dict keys, not raw codes
+        code = int(period) if isinstance(period, Period) else code_of(period)
+        rows = np.flatnonzero(self._codes == code) if code != INVALID_CODE else ()
+        if not len(rows):
+            raise KeyError(period)
+        return int(rows[0])
+
+    def __iter__(self) -> Iterator[Period]:
+        return (Period.from_code(code) for code in self._codes.tolist())
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, period) -> bool:
+        try:
+            self._row(period)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Period codes of the rows (read-only)."""
+        return self._codes
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} periods)"
+
+
+class OwnerEarningsPeriod(Mapping):
+    """
+    Owner earnings of one period.
+
+    Fields are attributes; the record also reads like the dict it replaces
+    (record['owner_earnings'], dict(record)).
+    """
+
+    __slots__ = ('period',) + OWNER_EARNINGS_FIELDS
+
+    def __init__(self, period: Period, net_income: float, depreciation: float, capex: float,
+                 working_capital_change: float, owner_earnings: float):
+        self.period = period
+        self.net_income = net_income
+        self.depreciation = depreciation
+        self.capex = capex
+        self.working_capital_change = working_capital_change
+        self.owner_earnings = owner_earnings
+
+    def __getitem__(self, key: str) -> float:
+        if key not in OWNER_EARNINGS_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(OWNER_EARNINGS_FIELDS)
+
+    def __len__(self) -> int:
+        return len(OWNER_EARNINGS_FIELDS)
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={getattr(self, name):,.0f}" for name in OWNER_EARNINGS_FIELDS)
+        return f"OwnerEarningsPeriod({self.period}, {values})"
+
+
+class OwnerEarningsTable(_PeriodTable):
+    """
+    Owner earnings of many periods, stored column-wise.
+
+    Maps each Period (most recent first) to an OwnerEarningsPeriod built
+    on access. Owner earnings are derived from the stored components, so
+    a period costs four floats and its code.
+    """
+
+    __slots__ = ('_components', 'exclude_working_capital')
+
+    def __init__(self, codes, components, exclude_working_capital: bool = False):
+        """
+        Initialize the table.
+
+        Args:
+            codes: Period codes, one per row
+            components: (rows, 4) array of net income, depreciation, capex
+                and working capital change
+            exclude_working_capital: Owner earnings leave out working
+                capital changes (banks and insurers)
+        """
+        self._codes = np.asarray(codes, dtype=np.int64)
+        self._components = np.asarray(components, dtype=float).reshape(len(self._codes), 4)
+        self._codes.flags.writeable = False
+        self._components.flags.writeable = False
+        self.exclude_working_capital = exclude_working_capital
+
+    @classmethod
+    def from_components(cls, components: Dict[str, Dict], exclude_working_capital: bool = False) -> "OwnerEarningsTable":
+        """
+        Build the table from per-component {period: value} dicts.
+
+        Args:
+            components: The calculator's owner_earnings_data
+            exclude_working_capital: See __init__
+
+        Returns:
+            OwnerEarningsTable: One row per period any component has
+        """
+        codes = _all_periods(components)
+        return cls(codes, _component_columns(components, OWNER_EARNINGS_FIELDS[:4], codes),
+                   exclude_working_capital)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        One field for every period, aligned with the rows.
+
+        Args:
+            name: A name from OWNER_EARNINGS_FIELDS
+
+        Returns:
+            np.ndarray: The values
+        """
+        if name == 'owner_earnings':
+            return _owner_earnings(*self._components.T, self.exclude_working_capital)
+        return self._components[:, OWNER_EARNINGS_FIELDS.index(name)]
+
+    def __getitem__(self, period) -> OwnerEarningsPeriod:
+        row = self._row(period)
+        net_income, depreciation, capex, working_capital_change = self._components[row].tolist()
+        return OwnerEarningsPeriod(
+            Period.from_code(self._codes[row]), net_income, depreciation, capex, working_capital_change,
+            _owner_earnings(net_income, depreciation, capex, working_capital_change,
+                            self.exclude_working_capital))
+
+
+class OwnerEarningsMethod(Mapping):
+    """One owner earnings method of one period: 'value', 'method', 'note' and 'components'."""
+
+    __slots__ = ('value', 'method', 'note', '_components')
+
+    _KEYS = ('value', 'method', 'note', 'components')
+
+    def __init__(self, value: float, method: str, note: str, components: tuple):
+        self.value = value
+        self.method = method
+        self.note = note
+        self._components = components
+
+    @property
+    def components(self) -> Dict[str, float]:
+        """The inputs of the method, by component name."""
+        return dict(self._components)
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"OwnerEarningsMethod({self.method!r}, value={self.value:,.0f})"
+
+
+class AlternativeMethodsTable(_PeriodTable):
+    """
+    Owner earnings of every period under the traditional, operating cash
+    flow and free cash flow methods, stored column-wise.
+
+    Maps each Period (most recent first) to {method name:
+    OwnerEarningsMethod}; the cash flow methods are only present for
+    periods with an operating cash flow. Descriptions and notes are
+    shared module constants rather than copied into every period.
+    """
+
+    __slots__ = ('_components', 'methodology')
+
+    def __init__(self, codes, components, methodology: int = STANDARD):
+        """
+        Initialize the table.
+
+        Args:
+            codes: Period codes, one per row
+            components: (rows, 5) array with the METHOD_COMPONENTS columns
+            methodology: STANDARD, INSURANCE or BANKING; the latter two
+                leave working capital out of the traditional method
+        """
+        self._codes = np.asarray(codes, dtype=np.int64)
+        self._components = np.asarray(components, dtype=float).reshape(len(self._codes), len(METHOD_COMPONENTS))
+        self._codes.flags.writeable = False
+        self._components.flags.writeable = False
+        self.methodology = methodology
+
+    @classmethod
+    def from_components(cls, components: Dict[str, Dict], methodology: int = STANDARD) -> "AlternativeMethodsTable":
+        """Build the table from the calculator's per-component {period: value} dicts."""
+        codes = _all_periods(components)
+        return cls(codes, _component_columns(components, METHOD_COMPONENTS, codes), methodology)
+
+    def method_values(self, method: str) -> np.ndarray:
+        """
+        Values of one method for the periods that have it, most recent first.
+
+        Args:
+            method: TRADITIONAL, OPERATING_CASH_FLOW or FREE_CASH_FLOW
+
+        Returns:
+            np.ndarray: The values
+        """
+        net_income, operating_cash_flow, depreciation, capex, working_capital_change = self._components.T
+        if method == TRADITIONAL:
+            return _owner_earnings(net_income, depreciation, capex, working_capital_change,
+                                   self.methodology != STANDARD)
+        if method in (OPERATING_CASH_FLOW, FREE_CASH_FLOW):
+            has_cash_flow = operating_cash_flow != 0
+            return operating_cash_flow[has_cash_flow] - np.abs(capex[has_cash_flow])
+        raise KeyError(method)
+
+    def __getitem__(self, period) -> Dict[str, OwnerEarningsMethod]:
+        net_income, operating_cash_flow, depreciation, capex, working_capital_change = \
+            self._components[self._row(period)].tolist()
+        methods = {
+            TRADITIONAL: OwnerEarningsMethod(
+                _owner_earnings(net_income, depreciation, capex, working_capital_change,
+                                self.methodology != STANDARD),
+                METHOD_DESCRIPTIONS[TRADITIONAL], METHODOLOGY_NOTES[self.methodology],
+                (('net_income', net_income), ('depreciation', depreciation), ('capex', capex),
+                 ('working_capital_change', working_capital_change))),
+        }
+        if operating_cash_flow != 0:
+            cash_flow_components = (('operating_cash_flow', operating_cash_flow), ('capex', capex))
+            methods[OPERATING_CASH_FLOW] = OwnerEarningsMethod(
+                operating_cash_flow - abs(capex), METHOD_DESCRIPTIONS[OPERATING_CASH_FLOW],
+                'Uses actual cash flow from operations', cash_flow_components)
+            methods[FREE_CASH_FLOW] = OwnerEarningsMethod(
+                operating_cash_flow - abs(capex), METHOD_DESCRIPTIONS[FREE_CASH_FLOW],
+                'Standard free cash flow definition', cash_flow_components)
+        return methods
@@ -0,0 +1,251 @@
+"""
+Make-style stage caching for the MarketSwimmer analysis workflow.
+
+Every workflow stage declares named input files and the output files it
+produces. A stage's cache key is a hash over the package version, the
+stage parameters and the content fingerprints of its inputs. A stage is
+skipped when its key matches the last successful run and all recorded
+outputs are still present and unmodified. Because downstream stages list
+upstream outputs as inputs, a change only re-runs the stages it affects.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def fingerprint_bytes(data: bytes) -> str:
+    """Return the SHA-256 content fingerprint of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint_file(path: Path, chunk_size: int = 1 << 20) -> Optional[str]:
+    """
+    Return the SHA-256 content fingerprint of a file.
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        str: Hex digest, or None if the file does not exist
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """
+    Declaration of one workflow stage.
+
+    Attributes:
+        name: Stable identifier used in the cache manifest
+        description: Human-readable name for progress and --explain output
+        run: Callable executing the stage; returns True on success
+        depends_on: Names of stages that must succeed before this one starts
+        inputs: Named input files, e.g. {'workbook': Path(...)}
+        outputs: Output files the stage always produces
+        params: Extra values that change the stage result (part of the key)
+        collect_outputs: Returns outputs only known after the stage ran
+            (e.g. a timestamped report file)
+        fatal: Whether a failure aborts the workflow
+        always_run: Never skip this stage (e.g. the results summary)
+    """
+
+    name: str
+    description: str
+    run: Callable[[], bool]
+    depends_on: List[str] = field(default_factory=list)
+    inputs: Dict[str, Path] = field(default_factory=dict)
+    outputs: List[Path] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    collect_outputs: Callable[[], List[Path]] = list
+    fatal: bool = True
+    always_run: bool = False
+
+
+class StageCache:
+    """
+    Manifest of the last successful run of each stage for one ticker.
+
+    The manifest is a small JSON file stored next to the stage outputs.
+    """
+
+    def __init__(self, manifest_path: Path, version: str = ""):
+        """
+        Initialize the cache.
+
+        Args:
+            manifest_path: JSON manifest location, e.g. data/.stages_brk_b.json
+            version: Package version; a new version invalidates every stage
+        """
+        self.manifest_path = Path(manifest_path)
+        self.version = version
+        self.records = self._load()
+        self._fingerprints: Dict[str, Optional[str]] = {}
+        # Stages may finish concurrently; serialize manifest updates
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the manifest, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            return data.get('stages', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        with self._lock:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {'version': self.version, 'stages': self.records}
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_path.parent,
+                                            prefix=self.manifest_path.name, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump(payload, handle, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.manifest_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+    def note_fingerprint(self, path: Path, digest: str):
+        """
+        Record the fingerprint of content that is being written to path.
+
+        Lets downstream stages key on an output before the background
+        write to disk has finished.
+        """
+        self._fingerprints[str(path)] = digest
+
+    def fingerprint(self, path: Path) -> Optional[str]:
+        """Return the (memoized) content fingerprint of a file."""
+        key = str(path)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = fingerprint_file(path)
+        return self._fingerprints[key]
+
+    def forget(self, paths: List[Path]):
+        """Drop memoized fingerprints of files a stage is about to rewrite."""
+        for path in paths:
+            self._fingerprints.pop(str(path), None)
+
+    def input_fingerprints(self, stage: Stage) -> Dict[str, Optional[str]]:
+        """Fingerprint every declared input of a stage."""
+        return {name: self.fingerprint(path) for name, path in sorted(stage.inputs.items())}
+
+    def stage_key(self, stage: Stage, inputs: Dict[str, Optional[str]]) -> str:
+        """Compute the cache key of a stage from its inputs and parameters."""
+        material = json.dumps({
+            'stage': stage.name,
+            'version': self.version,
+            'inputs': inputs,
+            'params': stage.params,
+        }, sort_keys=True, default=str)
+        return fingerprint_bytes(material.encode('utf-8'))
+
+    def check(self, stage: Stage) -> Tuple[bool, List[str]]:
+        """
+        Decide whether a stage can be skipped.
+
+        Args:
+            stage: Stage declaration
+
+        Returns:
+            tuple: (up_to_date, reasons) where reasons explain the decision
+        """
+        if stage.always_run:
+            return False, ["always runs"]
+
+        record = self.records.get(stage.name)
+        if record is None:
+            return False, ["no previous successful run"]
+
+        inputs = self.input_fingerprints(stage)
+        missing = [name for name, digest in inputs.items() if digest is None]
+        if missing:
+            return False, [f"input '{name}' does not exist" for name in missing]
+
+        reasons = []
+        if record.get('version') != self.version:
+            reasons.append(f"MarketSwimmer version changed ({record.get('version')} -> {self.version})")
+        previous_inputs = record.get('inputs', {})
+        for name, digest in inputs.items():
+            if name not in previous_inputs:
+                reasons.append(f"new input '{name}'")
+            elif previous_inputs[name] != digest:
+                reasons.append(f"input '{name}' changed")
+        for name in previous_inputs:
+            if name not in inputs:
+                reasons.append(f"input '{name}' removed")
+        if record.get('params') != json.loads(json.dumps(stage.params, default=str)):
+            reasons.append("parameters changed")
+        if not reasons and record.get('key') != self.stage_key(stage, inputs):
+            reasons.append("cache key changed")
+        if reasons:
+            return False, reasons
+
+        for path, digest in record.get('outputs', {}).items():
+            current = self.fingerprint(Path(path))
+            if current is None:
+                reasons.append(f"output {path} is missing")
+            elif current != digest:
+                reasons.append(f"output {path} was modified")
+        if reasons:
+            return False, reasons
+
+        return True, [f"inputs unchanged (key {record['key'][:12]})"]
+
+    def record(self, stage: Stage, outputs: List[Path]) -> bool:
+        """
+        Remember a successful stage run.
+
+        Outputs must have been forgotten (see forget()) before the stage ran
+        so that their fingerprints reflect the new content.
+
+        Args:
+            stage: Stage that completed
+            outputs: Files it produced
+
+        Returns:
+            bool: False if an output is missing, in which case nothing is recorded
+        """
+        output_digests = {}
+        for path in outputs:
+            digest = self.fingerprint(path)
+            if digest is None:
+                self.invalidate(stage.name)
+                return False
+            output_digests[str(path)] = digest
+
+        inputs = self.input_fingerprints(stage)
+        with self._lock:
+            self.records[stage.name] = {
+                'key': self.stage_key(stage, inputs),
+                'version': self.version,
+                'inputs': inputs,
+                'params': json.loads(json.dumps(stage.params, default=str)),
+                'outputs': output_digests,
+                'completed_at': datetime.now().isoformat(timespec='seconds'),
+            }
+        return True
+
+    def invalidate(self, stage_name: str):
+        """Forget a stage's last run so that it executes next time."""
+        with self._lock:
+            self.records.pop(stage_name, None)
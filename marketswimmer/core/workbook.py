@@ -0,0 +1,84 @@
+"""
+Parsed StockRow workbook for MarketSwimmer.
+
+Reads every sheet of a StockRow XLSX export once so that the calculators
+can share the parsed frames instead of calling ``read_excel`` per lookup.
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .parse_cache import ParseCache
+
+
+class FinancialWorkbook:
+    """
+    All sheets of a StockRow financial export, parsed once.
+
+    Sheet names follow the StockRow convention, e.g. 'Balance Sheet, A'
+    for annual data and 'Balance Sheet, Q' for quarterly data.
+    """
+
+    def __init__(self, sheets: Dict[str, pd.DataFrame], file_path: Optional[Path] = None):
+        """
+        Initialize the workbook from already-parsed sheets.
+
+        Args:
+            sheets: Mapping of sheet name to DataFrame, in workbook order
+            file_path: Path of the XLSX file the sheets were read from
+        """
+        self.sheets = sheets
+        self.file_path = Path(file_path) if file_path else None
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path]) -> "FinancialWorkbook":
+        """
+        Parse every sheet of an XLSX file in a single read.
+
+        Files kept in the export store (downloaded_files) are served from
+        the parse cache when the same content was parsed before.
+
+        Args:
+            file_path: Path to the XLSX file
+
+        Returns:
+            FinancialWorkbook: Workbook holding all parsed sheets
+        """
+        cache = ParseCache.for_file(Path(file_path))
+        if cache is not None:
+            sheets = cache.load(Path(file_path))
+        else:
+            sheets = pd.read_excel(file_path, sheet_name=None)
+        return cls(sheets, Path(file_path))
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names in workbook order."""
+        return list(self.sheets.keys())
+
+    def get(self, sheet_name: str) -> Optional[pd.DataFrame]:
+        """Return the parsed sheet with the exact given name, or None."""
+        return self.sheets.get(sheet_name)
+
+    def find_sheets(self, *keywords: str) -> List[str]:
+        """
+        Find sheet names containing all keywords (case-insensitive).
+
+        Args:
+            keywords: Substrings that must all appear in the sheet name,
+                e.g. ('balance sheet', ', q')
+
+        Returns:
+            list: Matching sheet names in workbook order
+        """
+        keywords = [keyword.lower() for keyword in keywords]
+        return [
+            name for name in self.sheets
+            if all(keyword in name.lower() for keyword in keywords)
+        ]
+
+    def find_sheet(self, *keywords: str) -> Optional[str]:
+        """Return the first sheet name containing all keywords, or None."""
+        matches = self.find_sheets(*keywords)
+        return matches[0] if matches else None
@@ -4,22 +4,69 @@ Orchestrates the full end-to-end analysis process.
 """
 
 import os
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from rich.console import Console
 from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn
 
 from .download_manager import DownloadManager
 from .owner_earnings import OwnerEarningsCalculator
 from .fair_value import FairValueCalculator
+from .analytics import EarningsStatistics, compute_earnings_statistics, statistics_path
+from .context import AnalysisContext
+from .stage_cache import Stage, StageCache, fingerprint_bytes
+from .events import (EventBus, default_bus, RUN_END, RUN_START, STAGE_END, STAGE_START,
+                     WARNING)
+from . import output_router
 
 console = Console()
 
+@dataclass
+class AnalysisResult:
+    """Outcome of one ticker's analysis, returned instead of printed."""
+
+    ticker: str
+    success: bool = False
+    cancelled: bool = False
+    data_file: Optional[Path] = None
+    stage_status: Dict[str, str] = field(default_factory=dict)
+    context: Optional[AnalysisContext] = None
+    error: Optional[str] = None
+
+    @property
+    def outputs(self) -> Dict[str, Path]:
+        """Files written by the stages, by name."""
+        return self.context.outputs if self.context is not None else {}
+
+    @property
+    def fair_value_results(self) -> Optional[Dict[str, Any]]:
+        """Results of the enhanced fair value stage, if it ran."""
+        return self.context.fair_value_results if self.context is not None else None
+
+
 class AnalysisWorkflow:
     """Orchestrates the complete MarketSwimmer analysis workflow."""
     
-    def __init__(self):
+    def __init__(self, stage_workers: int = 3, events: Optional[EventBus] = None,
+                 render_profile: str = "publication", chart_format: str = "png"):
+        """
+        Initialize the workflow.
+        
+        Args:
+            stage_workers: Maximum number of independent stages run at once;
+                1 runs the stages one after another
+            events: Bus receiving progress events (default: the shared bus)
+            render_profile: Chart render profile (publication, draft or thumbnail)
+            chart_format: Chart file format (png, svg or webp)
+        """
+        self.stage_workers = max(1, stage_workers)
+        self.events = events if events is not None else default_bus
+        self.render_profile = render_profile
+        self.chart_format = chart_format
         self.download_manager = DownloadManager()
         self.data_folder = Path("data")
         self.charts_folder = Path("charts")
@@ -27,56 +74,323 @@ class AnalysisWorkflow:
         # Ensure directories exist
         self.data_folder.mkdir(exist_ok=True)
         self.charts_folder.mkdir(exist_ok=True)
+        
+        # Results are handed between stages in memory; CSV files are written
+        # in the background and only awaited before the results summary.
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ms-persist")
+        self._pending_writes: List[Future] = []
+        self.stage_cache: Optional[StageCache] = None
     
-    def run_complete_analysis(self, ticker: str, force_download: bool = False) -> bool:
+    def run_complete_analysis(self,
+                              ticker: str,
+                              force_download: bool = False,
+                              explain: bool = False,
+                              use_cache: bool = True,
+                              allow_download: bool = True) -> bool:
         """
         Run the complete analysis workflow for a ticker.
         
+        Stages whose inputs are unchanged since their last successful run
+        are skipped (see marketswimmer.core.stage_cache).
+        
         Args:
             ticker: Stock ticker symbol
             force_download: Force new download even if data exists
+            explain: Print why each stage ran or was skipped
+            use_cache: Skip stages whose inputs are unchanged
+            allow_download: Open the StockRow download page when no data exists
             
         Returns:
             bool: True if analysis completed successfully
         """
+        return self.run_analysis(ticker, force_download=force_download, explain=explain,
+                                 use_cache=use_cache, allow_download=allow_download).success
+    
+    def run_analysis(self,
+                     ticker: str,
+                     force_download: bool = False,
+                     explain: bool = False,
+                     use_cache: bool = True,
+                     allow_download: bool = True,
+                     cancel_event: Optional[threading.Event] = None) -> AnalysisResult:
+        """
+        Run the complete analysis and return its results as objects.
+        
+        Used by callers that run the workflow in-process (the GUI) and
+        need the results rather than the console output. Progress is
+        published on self.events, always from the calling thread.
+        
+        Args:
+            ticker: Stock ticker symbol
+            force_download: Force new download even if data exists
+            explain: Print why each stage ran or was skipped
+            use_cache: Skip stages whose inputs are unchanged
+            allow_download: Open the StockRow download page when no data exists
+            cancel_event: Checked between stages and while waiting for a
+                download; once set, no further stage is started
+            
+        Returns:
+            AnalysisResult: Success flag, stage states and the analysis context
+        """
+        result = AnalysisResult(ticker=ticker)
+        started = time.perf_counter()
+        self.events.publish(RUN_START, ticker=ticker)
         try:
             console.print(f"[bold blue]>> Starting complete analysis for {ticker.upper()}[/bold blue]")
             
             # Step 1: Handle data download
-            data_file = self._handle_data_download(ticker, force_download)
+            data_file = self._handle_data_download(ticker, force_download, allow_download, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                console.print(f"[yellow]>> Analysis of {ticker.upper()} cancelled[/yellow]")
+                result.cancelled = True
+                return result
             if not data_file:
-                return False
-            
-            # Step 2: Calculate owner earnings
-            if not self._calculate_owner_earnings(data_file, ticker):
-                return False
-            
-            # Step 3: Calculate enhanced fair value
-            if not self._calculate_enhanced_fair_value(ticker):
-                return False
-            
-            # Step 4: Generate visualizations
-            if not self._generate_visualizations(ticker):
-                return False
+                result.error = "No data file available"
+                self.events.publish(WARNING, ticker=ticker, message=result.error)
+                return result
             
-            # Step 5: Generate shares analysis
-            if not self._generate_shares_analysis(ticker):
-                return False
+            result.data_file = Path(data_file)
+            context = AnalysisContext(ticker=ticker, data_file=result.data_file,
+                                      force_render=not use_cache)
+            result.context = context
+            self.stage_cache = self._open_stage_cache(context)
             
-            console.print(f"\n[bold green]>> Complete analysis finished for {ticker.upper()}![/bold green]")
-            self._show_results_summary(ticker)
-            return True
+            # Steps 2-6: owner earnings, fair value, charts, shares, summary
+            stages = self._declare_stages(context)
+            result.stage_status = self._run_stage_graph(stages, context, explain, use_cache,
+                                                        cancel_event)
+            result.cancelled = 'cancelled' in result.stage_status.values()
+            result.success = all(state in ('done', 'skipped') for state in result.stage_status.values())
+            if result.cancelled:
+                console.print(f"[yellow]>> Analysis of {ticker.upper()} cancelled[/yellow]")
+            return result
             
         except Exception as e:
             console.print(f"[red]ERROR: Analysis failed: {e}[/red]")
-            return False
+            result.error = str(e)
+            return result
+        
+        finally:
+            self._wait_for_persistence()
+            state = 'cancelled' if result.cancelled else ('done' if result.success else 'failed')
+            self.events.publish(RUN_END, ticker=ticker, state=state,
+                                seconds=round(time.perf_counter() - started, 3))
     
-    def _handle_data_download(self, ticker: str, force_download: bool) -> Optional[Path]:
-        """Handle the data download process."""
-        with Progress(
+    def _open_stage_cache(self, context: AnalysisContext) -> StageCache:
+        """Open the stage manifest for a ticker (data/.stages_<ticker>.json)."""
+        from .. import __version__
+        manifest = self.data_folder / f".stages_{context.file_ticker}.json"
+        return StageCache(manifest, version=__version__)
+    
+    def _declare_stages(self, context: AnalysisContext) -> List[Stage]:
+        """
+        Declare the workflow stages with their inputs and outputs.
+        
+        Downstream stages take upstream outputs as inputs, so only the
+        stages affected by a change are re-run.
+        """
+        from ..visualization.render import owner_earnings_chart_paths, share_chart_paths
+        
+        ticker = context.ticker
+        chart_settings = {'profile': self.render_profile, 'format': self.chart_format}
+        annual_csv = context.owner_earnings_path(self.data_folder, 'annual')
+        quarterly_csv = context.owner_earnings_path(self.data_folder, 'quarterly')
+        shares_folder = Path("analysis_output")
+        
+        return [
+            Stage(
+                name="owner_earnings",
+                description="Owner earnings",
+                run=lambda: self._calculate_owner_earnings(context),
+                inputs={'workbook': context.data_file},
+                outputs=[annual_csv, quarterly_csv, statistics_path(self.data_folder, ticker)],
+            ),
+            Stage(
+                name="fair_value",
+                description="Enhanced fair value",
+                run=lambda: self._calculate_enhanced_fair_value(context),
+                depends_on=["owner_earnings"],
+                inputs={'workbook': context.data_file, 'annual_owner_earnings': annual_csv},
+                collect_outputs=lambda: [context.outputs['fair_value_report']]
+                                        if 'fair_value_report' in context.outputs else [],
+            ),
+            Stage(
+                name="visualizations",
+                description="Visualizations",
+                run=lambda: self._generate_visualizations(context),
+                depends_on=["owner_earnings"],
+                inputs={'annual_owner_earnings': annual_csv, 'quarterly_owner_earnings': quarterly_csv},
+                outputs=[Path(path) for path in owner_earnings_chart_paths(
+                    ticker, str(self.charts_folder), self.render_profile, self.chart_format)],
+                params=chart_settings,
+            ),
+            Stage(
+                name="shares_analysis",
+                description="Shares analysis",
+                run=lambda: self._generate_shares_analysis(context),
+                # Reads the workbook only, so it can start right away
+                depends_on=[],
+                inputs={'workbook': context.data_file},
+                outputs=[Path(path) for path in share_chart_paths(
+                    ticker.upper(), str(shares_folder), self.render_profile, self.chart_format)],
+                params=chart_settings,
+                fatal=False,
+            ),
+            Stage(
+                name="summary",
+                description="Results summary",
+                run=lambda: self._finish_analysis(context),
+                depends_on=["owner_earnings", "fair_value", "visualizations", "shares_analysis"],
+                always_run=True,
+            ),
+        ]
+    
+    def _run_stage_graph(self, stages: List[Stage], context: AnalysisContext,
+                         explain: bool, use_cache: bool,
+                         cancel_event: Optional[threading.Event] = None) -> Dict[str, str]:
+        """
+        Run the stages as a DAG, starting each one once its dependencies succeeded.
+        
+        Independent stages run concurrently on a thread pool. Each stage's
+        console output is captured and replayed in declaration order, so the
+        output is the same no matter which stage finishes first. A failing
+        stage only prevents the stages depending on it; non-fatal stages
+        (shares analysis) never fail the workflow. Once cancel_event is set,
+        running stages finish but no new stage starts. Stage start/end
+        events are published from the calling thread; end events are
+        published with the stage's replayed output, so they follow
+        declaration order as well.
+        
+        Returns:
+            dict: Stage name -> 'done', 'skipped', 'failed', 'blocked' or 'cancelled'
+        """
+        order = [stage.name for stage in stages]
+        by_name = {stage.name: stage for stage in stages}
+        status: Dict[str, str] = {}
+        captured: Dict[str, str] = {}
+        started: Dict[str, float] = {}
+        seconds: Dict[str, Optional[float]] = {}
+        replayed = 0
+        events = self.events
+        
+        def finish(name: str, state: str):
+            status[name] = state
+            seconds[name] = round(time.perf_counter() - started[name], 3) if name in started else None
+        
+        def publish_end(name: str, completed: int):
+            state = status[name]
+            events.publish(STAGE_END, ticker=context.ticker, stage=name,
+                           description=by_name[name].description, state=state,
+                           completed=completed, total=len(stages), seconds=seconds[name])
+            if state in ('failed', 'blocked'):
+                events.publish(WARNING, ticker=context.ticker, stage=name,
+                               message=f"{by_name[name].description} {state}")
+        
+        def execute(stage: Stage) -> str:
+            with output_router.capture_thread_output() as buffer:
+                try:
+                    return self._run_stage(stage, context, explain, use_cache)
+                except Exception as e:
+                    console.print(f"[red]ERROR: {stage.description} stage failed: {e}[/red]")
+                    return 'failed' if stage.fatal else 'done'
+                finally:
+                    captured[stage.name] = buffer.getvalue()
+        
+        def replay_finished():
+            nonlocal replayed
+            while replayed < len(order) and order[replayed] in status:
+                output_router.emit(captured.pop(order[replayed], ""))
+                replayed += 1
+                if events.active:
+                    publish_end(order[replayed - 1], completed=replayed)
+        
+        with output_router.routed_stdout(), \
+                ThreadPoolExecutor(max_workers=self.stage_workers, thread_name_prefix="ms-stage") as pool:
+            running: Dict[Future, str] = {}
+            while len(status) < len(stages):
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                for name in order:
+                    if name in status or name in running.values():
+                        continue
+                    deps = by_name[name].depends_on
+                    if cancelled:
+                        finish(name, 'cancelled')
+                    elif any(status.get(dep) in ('failed', 'blocked') for dep in deps):
+                        # Block stages whose dependencies failed
+                        with output_router.capture_thread_output() as buffer:
+                            console.print(f"[yellow]>> {by_name[name].description} skipped: "
+                                          f"a required stage failed[/yellow]")
+                        captured[name] = buffer.getvalue()
+                        finish(name, 'blocked')
+                    elif all(status.get(dep) in ('done', 'skipped') for dep in deps):
+                        started[name] = time.perf_counter()
+                        running[pool.submit(execute, by_name[name])] = name
+                        events.publish(STAGE_START, ticker=context.ticker, stage=name,
+                                       description=by_name[name].description,
+                                       completed=len(status), total=len(stages))
+                
+                replay_finished()
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finish(name, future.result())
+            
+            replay_finished()
+        
+        return {name: status.get(name, 'blocked') for name in order}
+    
+    def _run_stage(self, stage: Stage, context: AnalysisContext, explain: bool, use_cache: bool) -> str:
+        """
+        Run a stage unless it is up to date, and record a successful run.
+        
+        Returns:
+            str: 'skipped' if up to date, 'done', or 'failed' if the
+            workflow should stop
+        """
+        cache = self.stage_cache
+        if use_cache:
+            up_to_date, reasons = cache.check(stage)
+        else:
+            up_to_date, reasons = False, ["caching disabled (--no-cache)"]
+        
+        if explain:
+            decision = "SKIP" if up_to_date else "RUN"
+            console.print(f"[cyan]>> [EXPLAIN] {stage.description}: {decision} - {'; '.join(reasons)}[/cyan]")
+        
+        if up_to_date:
+            console.print(f"[dim]>> {stage.description} is up to date, skipping[/dim]")
+            return 'skipped'
+        
+        cache.forget(stage.outputs)
+        success = stage.run()
+        
+        if not stage.always_run:
+            if success and cache.record(stage, stage.outputs + stage.collect_outputs()):
+                cache.save()
+            else:
+                if success and explain:
+                    console.print(f"[dim]>> [EXPLAIN] {stage.description}: outputs incomplete, not cached[/dim]")
+                cache.invalidate(stage.name)
+                cache.save()
+        
+        return 'done' if success or not stage.fatal else 'failed'
+    
+    def _stage_progress(self) -> Progress:
+        """Progress spinner for a stage; disabled while the stage's output is captured."""
+        return Progress(
             TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
+            console=console,
+            disable=output_router.is_capturing()
+        )
+    
+    def _handle_data_download(self, ticker: str, force_download: bool,
+                              allow_download: bool = True,
+                              cancel_event: Optional[threading.Event] = None) -> Optional[Path]:
+        """Handle the data download process."""
+        with self._stage_progress() as progress:
             
             # Check for existing data
             if not force_download:
@@ -86,52 +400,60 @@ class AnalysisWorkflow:
                     console.print(f"[green]>> Using existing data: {existing_file.name}[/green]")
                     return existing_file
             
+            if not allow_download:
+                console.print(f"[red]ERROR: No downloaded data for {ticker.upper()} and downloads are disabled[/red]")
+                return None
+            
             # Open download page
             task = progress.add_task("Opening StockRow download page...", total=None)
             self.download_manager.open_stockrow_download(ticker)
             
             # Wait for download
             progress.update(task, description="Waiting for download...")
-            downloaded_file = self.download_manager.wait_for_download(ticker, timeout=300)  # 5 minutes
+            downloaded_file = self.download_manager.wait_for_download(ticker, timeout=300,  # 5 minutes
+                                                                     cancel_event=cancel_event)
             
             if downloaded_file:
                 progress.update(task, description="Copying file to project...")
                 return self.download_manager.copy_to_project(downloaded_file, ticker)
+            elif cancel_event is not None and cancel_event.is_set():
+                return None
             else:
                 console.print("[red]ERROR: Download not detected. Please ensure you downloaded the XLSX file.[/red]")
                 return None
     
-    def _calculate_owner_earnings(self, data_file: Path, ticker: str) -> bool:
+    def _calculate_owner_earnings(self, context: AnalysisContext) -> bool:
         """Calculate owner earnings from the data file."""
         try:
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
+            with self._stage_progress() as progress:
                 task = progress.add_task("Calculating owner earnings...", total=None)
                 
+                # Parse the workbook once; every later stage reuses it
+                progress.update(task, description="Loading financial data...")
+                context.ensure_workbook()
+                
                 # Create separate calculator instances for annual and quarterly data
                 annual_calculator = OwnerEarningsCalculator()
                 quarterly_calculator = OwnerEarningsCalculator()
                 
                 # Calculate annual data
-                progress.update(task, description="Loading financial data...")
-                annual_calculator.load_financial_data(str(data_file))
+                annual_calculator.load_financial_data(str(context.data_file), workbook=context.workbook)
                 
                 progress.update(task, description="Calculating annual owner earnings...")
                 annual_results = annual_calculator.calculate_annual_owner_earnings()
                 
                 # Calculate quarterly data with fresh calculator
                 progress.update(task, description="Calculating quarterly owner earnings...")
-                quarterly_calculator.load_financial_data(str(data_file))
+                quarterly_calculator.load_financial_data(str(context.data_file), workbook=context.workbook)
                 quarterly_results = quarterly_calculator.calculate_quarterly_owner_earnings()
                 
-                # Save results
-                progress.update(task, description="Saving results...")
-                clean_ticker = ticker.replace('.', '_').upper()
+                context.annual_owner_earnings = annual_results
+                context.quarterly_owner_earnings = quarterly_results
                 
-                annual_output = self.data_folder / f"owner_earnings_annual_{clean_ticker.lower()}.csv"
-                quarterly_output = self.data_folder / f"owner_earnings_quarterly_{clean_ticker.lower()}.csv"
+                # Save results in the background
+                progress.update(task, description="Saving results...")
+                annual_output = context.owner_earnings_path(self.data_folder, 'annual')
+                quarterly_output = context.owner_earnings_path(self.data_folder, 'quarterly')
                 
                 # Debug information
                 console.print(f"[dim]DEBUG: Saving to {annual_output}[/dim]")
@@ -141,31 +463,24 @@ class AnalysisWorkflow:
                 # Ensure directory exists
                 self.data_folder.mkdir(parents=True, exist_ok=True)
                 
-                # Save with error handling
-                try:
-                    annual_results.to_csv(annual_output, index=False)
-                    console.print(f"[dim]DEBUG: Annual CSV saved successfully[/dim]")
-                except Exception as e:
-                    console.print(f"[red]ERROR: Failed to save annual CSV: {e}[/red]")
-                    
-                try:
-                    quarterly_results.to_csv(quarterly_output, index=False)
-                    console.print(f"[dim]DEBUG: Quarterly CSV saved successfully[/dim]")
-                except Exception as e:
-                    console.print(f"[red]ERROR: Failed to save quarterly CSV: {e}[/red]")
+                annual_csv = annual_results.to_csv(index=False).encode('utf-8')
+                quarterly_csv = quarterly_results.to_csv(index=False).encode('utf-8')
+                self._persist_bytes(annual_csv, annual_output, "Annual")
+                self._persist_bytes(quarterly_csv, quarterly_output, "Quarterly")
+                context.outputs['annual_owner_earnings'] = annual_output
+                context.outputs['quarterly_owner_earnings'] = quarterly_output
                 
-                # Verify files were created
-                if annual_output.exists():
-                    console.print(f"[green]>> Annual file created: {annual_output.stat().st_size} bytes[/green]")
-                else:
-                    console.print(f"[red]ERROR: Annual file NOT created: {annual_output}[/red]")
-                    
-                if quarterly_output.exists():
-                    console.print(f"[green]>> Quarterly file created: {quarterly_output.stat().st_size} bytes[/green]")
-                else:
-                    console.print(f"[red]ERROR: Quarterly file NOT created: {quarterly_output}[/red]")
+                # Trend and volatility statistics, read by the charts and summaries
+                progress.update(task, description="Computing owner earnings statistics...")
+                statistics = compute_earnings_statistics(context.ticker, annual_results, quarterly_results)
+                statistics.sources = {'annual': fingerprint_bytes(annual_csv),
+                                      'quarterly': fingerprint_bytes(quarterly_csv)}
+                context.earnings_statistics = statistics
+                statistics_output = statistics_path(self.data_folder, context.ticker)
+                self._persist_bytes(statistics.to_json().encode('utf-8'), statistics_output, "Statistics")
+                context.outputs['earnings_statistics'] = statistics_output
                 
-                console.print(f"[green]>> Owner earnings calculated and saved[/green]")
+                console.print(f"[green]>> Owner earnings calculated[/green]")
                 console.print(f"[dim]Annual: {annual_output}[/dim]")
                 console.print(f"[dim]Quarterly: {quarterly_output}[/dim]")
                 
@@ -175,15 +490,55 @@ class AnalysisWorkflow:
             console.print(f"[red]ERROR: Owner earnings calculation failed: {e}[/red]")
             return False
     
-    def _calculate_enhanced_fair_value(self, ticker: str) -> bool:
+    def _persist_bytes(self, content: bytes, output_path: Path, label: str) -> Future:
+        """
+        Write a results file on the background persistence thread.
+        
+        The content is rendered up front so its fingerprint is known to the
+        stage cache before the file lands on disk.
+        """
+        if self.stage_cache is not None:
+            self.stage_cache.note_fingerprint(output_path, fingerprint_bytes(content))
+        
+        # Messages are returned rather than printed so they appear at a
+        # deterministic point, when the writes are awaited.
+        def write():
+            try:
+                with open(output_path, 'wb') as handle:
+                    handle.write(content)
+            except Exception as e:
+                return False, f"[red]ERROR: Failed to save {label.lower()} file {output_path.name}: {e}[/red]"
+            return True, f"[green]>> {label} file created: {output_path.stat().st_size} bytes[/green]"
+        
+        future = self._persist_executor.submit(write)
+        self._pending_writes.append(future)
+        return future
+    
+    def _wait_for_persistence(self) -> bool:
+        """
+        Wait for all background CSV writes to finish.
+        
+        Returns:
+            bool: True if every pending write succeeded
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        all_saved = True
+        for future in pending:
+            saved, message = future.result()
+            console.print(message)
+            all_saved = all_saved and saved
+        return all_saved
+    
+    def _calculate_enhanced_fair_value(self, context: AnalysisContext) -> bool:
         """Calculate enhanced fair value analysis."""
         try:
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
+            with self._stage_progress() as progress:
                 task = progress.add_task("Calculating enhanced fair value...", total=None)
                 
+                # Upstream stages may have been skipped; load what they left on disk
+                context.ensure_owner_earnings(self.data_folder)
+                context.ensure_workbook()
+                
                 # Create fair value calculator
                 fair_value_calc = FairValueCalculator()
                 
@@ -194,7 +549,11 @@ class AnalysisWorkflow:
                 # - Fair value calculation with proper adjustments
                 # - Scenario analysis
                 # - Enhanced reporting
-                results = fair_value_calc.enhanced_fair_value_analysis(ticker, save_detailed_report=True)
+                results = fair_value_calc.enhanced_fair_value_analysis(context.ticker, save_detailed_report=True,
+                                                                       context=context)
+                context.fair_value_results = results
+                if results.get('report_file'):
+                    context.outputs['fair_value_report'] = Path(results['report_file'])
                 
                 console.print(f"[green]>> Enhanced fair value analysis completed[/green]")
                 console.print(f"[dim]Results include balance sheet analysis and scenario modeling[/dim]")
@@ -206,13 +565,10 @@ class AnalysisWorkflow:
             console.print(f"[yellow]TIP: Ensure owner earnings data exists first[/yellow]")
             return False
     
-    def _generate_shares_analysis(self, ticker: str) -> bool:
+    def _generate_shares_analysis(self, context: AnalysisContext) -> bool:
         """Generate shares outstanding and debt analysis."""
         try:
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
+            with self._stage_progress() as progress:
                 task = progress.add_task("Generating shares analysis...", total=None)
                 
                 # Import shares analysis module with graceful fallback
@@ -221,7 +577,11 @@ class AnalysisWorkflow:
                     
                     # Generate shares and debt analysis charts
                     progress.update(task, description="Creating shares and debt analysis...")
-                    success = create_shares_outstanding_analysis(ticker)
+                    workbook = context.ensure_workbook()
+                    success = create_shares_outstanding_analysis(context.ticker, workbook=workbook,
+                                                                 force_render=context.force_render,
+                                                                 profile=self.render_profile,
+                                                                 chart_format=self.chart_format)
                     
                     if success:
                         console.print(f"[green]>> Shares analysis generated[/green]")
@@ -239,13 +599,10 @@ class AnalysisWorkflow:
             console.print(f"[red]ERROR: Shares analysis generation failed: {e}[/red]")
             return True  # Don't fail the workflow
     
-    def _generate_visualizations(self, ticker: str) -> bool:
+    def _generate_visualizations(self, context: AnalysisContext) -> bool:
         """Generate charts and visualizations."""
         try:
-            with Progress(
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
+            with self._stage_progress() as progress:
                 task = progress.add_task("Generating visualizations...", total=None)
                 
                 # Import visualization module with graceful fallback
@@ -254,7 +611,14 @@ class AnalysisWorkflow:
                     
                     # Generate charts using the working charts module
                     progress.update(task, description="Creating owner earnings charts...")
-                    visualization_main(ticker)
+                    context.ensure_owner_earnings(self.data_folder)
+                    visualization_main(context.ticker,
+                                       annual_df=context.annual_owner_earnings,
+                                       quarterly_df=context.quarterly_owner_earnings,
+                                       statistics=context.ensure_earnings_statistics(self.data_folder),
+                                       force_render=context.force_render,
+                                       profile=self.render_profile,
+                                       chart_format=self.chart_format)
                     
                     console.print(f"[green]>> Visualizations generated[/green]")
                     return True
@@ -268,21 +632,34 @@ class AnalysisWorkflow:
             console.print(f"[red]ERROR: Visualization generation failed: {e}[/red]")
             return False
     
+    def _finish_analysis(self, context: AnalysisContext) -> bool:
+        """Wait for pending writes and show the results summary."""
+        self._wait_for_persistence()
+        console.print(f"\n[bold green]>> Complete analysis finished for {context.ticker.upper()}![/bold green]")
+        self._show_results_summary(context.ticker)
+        return True
+    
     def _show_results_summary(self, ticker: str):
         """Show a summary of analysis results."""
         console.print(f"\n[bold]>> Analysis Results for {ticker.upper()}:[/bold]")
         console.print("=" * 50)
         
+        from ..visualization.render import owner_earnings_chart_paths, share_chart_paths
+        
         # Check what files were created
         clean_ticker = ticker.replace('.', '_').lower()
+        comparison_chart, components_chart, _ = owner_earnings_chart_paths(
+            ticker, str(self.charts_folder), self.render_profile, self.chart_format)
+        shares_chart, debt_chart = share_chart_paths(
+            ticker.upper(), "analysis_output", self.render_profile, self.chart_format)
         
         files_to_check = [
             (self.data_folder / f"owner_earnings_annual_{clean_ticker}.csv", ">> Annual Owner Earnings"),
             (self.data_folder / f"owner_earnings_quarterly_{clean_ticker}.csv", ">> Quarterly Owner Earnings"),
-            (self.charts_folder / f"{clean_ticker}_owner_earnings_comparison.png", ">> Comparison Chart"),
-            (self.charts_folder / f"{clean_ticker}_earnings_components_breakdown.png", ">> Components Chart"),
-            (Path("analysis_output") / f"{ticker.upper()}_shares_analysis.png", ">> Shares Analysis Chart"),
-            (Path("analysis_output") / f"{ticker.upper()}_debt_analysis.png", ">> Debt Analysis Chart"),
+            (Path(comparison_chart), ">> Comparison Chart"),
+            (Path(components_chart), ">> Components Chart"),
+            (Path(shares_chart), ">> Shares Analysis Chart"),
+            (Path(debt_chart), ">> Debt Analysis Chart"),
         ]
         
         for file_path, description in files_to_check:
@@ -291,6 +668,14 @@ class AnalysisWorkflow:
             else:
                 console.print(f">> {description}: [dim]Not generated[/dim]")
         
+        statistics = EarningsStatistics.load(statistics_path(self.data_folder, ticker))
+        if statistics is not None and statistics.total_quarters:
+            console.print(f">> >> Owner Earnings Statistics: [dim]{statistics_path(self.data_folder, ticker)}[/dim]")
+            console.print(f"   Positive quarters: {statistics.positive_quarters}/{statistics.total_quarters}, "
+                          f"mean ${statistics.mean:,.0f}M, median ${statistics.median:,.0f}M")
+            if statistics.annual_trend is not None:
+                console.print(f"   Annual trend: ${statistics.annual_trend:+,.0f}M per year")
+        
         # Check for fair value reports (they have timestamps, so look for pattern)
         import glob
         fair_value_reports = glob.glob(f"{ticker.upper()}_enhanced_fair_value_*.txt")
@@ -5,15 +5,22 @@ This module contains the PyQt6-based graphical user interface
 for interactive owner earnings analysis.
 """
 
-try:
-    from .main_window import MarketSwimmerGUI, main as gui_main
-    GUI_AVAILABLE = True
-    # Alias for backward compatibility
-    MarketSwimmerApp = MarketSwimmerGUI
-except ImportError:
+from importlib.util import find_spec
+
+GUI_AVAILABLE = find_spec("PyQt6") is not None
+
+if GUI_AVAILABLE:
+    # The window module imports PyQt6; load it on first access (PEP 562)
+    def __getattr__(name):
+        if name not in ("MarketSwimmerGUI", "MarketSwimmerApp", "gui_main"):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        from .main_window import MarketSwimmerGUI, main as gui_main
+        globals().update(MarketSwimmerGUI=MarketSwimmerGUI, gui_main=gui_main,
+                         # Alias for backward compatibility
+                         MarketSwimmerApp=MarketSwimmerGUI)
+        return globals()[name]
+else:
     # PyQt6 not available
-    GUI_AVAILABLE = False
-    
     def gui_main(*args, **kwargs):
         """Stub function when GUI is not available."""
         print("GUI not available. Please install PyQt6: pip install PyQt6")
@@ -0,0 +1,113 @@
+"""
+Console output widget for the MarketSwimmer GUI.
+
+The analysis modules print thousands of lines per ticker. Appending each
+one to a QTextEdit repaints the widget per line and keeps every line of
+the session in memory. ConsoleView instead queues incoming lines and
+appends them in one batch per timer tick, keeps at most max_lines lines
+(older ones are dropped), and filters lines below the selected log level
+before they reach the widget.
+"""
+
+import re
+from collections import deque
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+
+# Log levels in increasing severity, as shown in the level selector
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+# "[DEBUG] ...", "DEBUG: ...", "[WARNING] ...", "ERROR: ..." and similar
+_LEVEL_PREFIX = re.compile(r'^\s*\[?(DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL)\b')
+_LEVEL_ALIASES = {"WARN": "WARNING", "CRITICAL": "ERROR"}
+
+
+def line_level(line: str) -> str:
+    """
+    Classify a console line by its level prefix.
+
+    Args:
+        line: One line of output
+
+    Returns:
+        str: One of LEVELS; lines without a prefix count as INFO
+    """
+    match = _LEVEL_PREFIX.match(line)
+    if not match:
+        return "INFO"
+    level = match.group(1)
+    return _LEVEL_ALIASES.get(level, level)
+
+
+class ConsoleView(QPlainTextEdit):
+    """Read-only console with a bounded line buffer and batched updates."""
+
+    def __init__(self, max_lines: int = 5000, flush_interval_ms: int = 50,
+                 min_level: str = "INFO", parent=None):
+        """
+        Initialize the console.
+
+        Args:
+            max_lines: Lines kept in the widget; older lines are discarded
+            flush_interval_ms: How often queued lines are appended
+            min_level: Lines below this level (see LEVELS) are dropped
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.max_lines = max_lines
+        self.min_level = min_level
+
+        # Lines waiting for the next flush; a burst longer than the widget
+        # can hold only keeps its tail
+        self._pending = deque(maxlen=max_lines)
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def set_min_level(self, level: str):
+        """Only show lines at or above this level from now on."""
+        self.min_level = level.upper()
+
+    def append(self, text: str):
+        """
+        Queue text for display (QTextEdit-compatible name).
+
+        Multi-line text is split; each line is filtered by its own level.
+        """
+        threshold = LEVELS.index(self.min_level)
+        for line in str(text).split('\n'):
+            if LEVELS.index(line_level(line)) >= threshold:
+                self._pending.append(line)
+        if self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Append all queued lines in one edit."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        lines = list(self._pending)
+        self._pending.clear()
+
+        # Follow the output only if the user has not scrolled up
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.appendPlainText('\n'.join(lines))
+        if at_bottom:
+            self.moveCursor(QTextCursor.MoveOperation.End)
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        """Drop queued and displayed lines."""
+        self._pending.clear()
+        self._timer.stop()
+        super().clear()
+
+    def toPlainText(self) -> str:
+        """Displayed text including lines not yet flushed."""
+        self.flush()
+        return super().toPlainText()
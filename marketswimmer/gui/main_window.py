@@ -1,13 +1,11 @@
 import sys
 import os
-import subprocess
-import threading
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QPushButton, QLabel, QInputDialog, QTextEdit, 
+                             QWidget, QPushButton, QLabel, QInputDialog, QComboBox, 
                              QMessageBox, QProgressBar, QFrame, QGroupBox, QGridLayout)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QIcon, QPalette, QColor, QTextCursor
+from PyQt6.QtCore import Qt, QThreadPool, QTimer
+from PyQt6.QtGui import QFont, QIcon, QPalette, QColor
 
 # Optional logging - only import if available
 try:
@@ -30,130 +28,10 @@ except ImportError:
     LOGGING_ENABLED = False
     logger = DummyLogger()
 
-class WorkerThread(QThread):
-    output_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal()
-    error_signal = pyqtSignal(str)
-
-    def __init__(self, command, timeout=10):
-        super().__init__()
-        self.command = command
-        self.timeout = timeout
-
-    def run(self):
-        log_function_entry(f"WorkerThread.run() args=[{self.command}]")
-        logger.info(f"Starting subprocess: {self.command}")
-        
-        if LOGGING_ENABLED:
-            log_subprocess_call()
-        
-        try:
-            # Keep the original working directory instead of changing to GUI directory
-            # This ensures files are created where the user expects them
-            original_cwd = os.getcwd()
-            logger.debug(f"Using working directory: {original_cwd}")
-            
-            # Create the subprocess with unbuffered output
-            logger.debug(f"Creating subprocess: {self.command}")
-            env = os.environ.copy()
-            env['PYTHONUNBUFFERED'] = '1'  # Force unbuffered output
-            
-            process = subprocess.Popen(
-                self.command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=0,  # Unbuffered
-                universal_newlines=True,
-                cwd=original_cwd,
-                env=env  # Use environment with unbuffered Python
-            )
-            
-            logger.info(f"Subprocess PID: {process.pid}")
-            
-            # Read output with timeout using threading for Windows compatibility
-            import time
-            import threading
-            import queue
-            
-            def read_output(proc, q):
-                """Read output in a separate thread to avoid blocking"""
-                try:
-                    for line in iter(proc.stdout.readline, ''):
-                        if line:
-                            q.put(line.rstrip())
-                        if proc.poll() is not None:
-                            break
-                except Exception as e:
-                    q.put(f"Error reading output: {e}")
-                finally:
-                    q.put(None)  # Signal end of output
-            
-            output_queue = queue.Queue()
-            reader_thread = threading.Thread(target=read_output, args=(process, output_queue))
-            reader_thread.daemon = True
-            reader_thread.start()
-            
-            start_time = time.time()
-            last_output_time = start_time
-            
-            while True:
-                # Check if process has finished
-                if process.poll() is not None:
-                    break
-                    
-                # Check for timeout
-                current_time = time.time()
-                if current_time - start_time > self.timeout:
-                    if self.timeout > 60:  # If using the longer timeout for downloads
-                        self.output_signal.emit("⏱️ Download timeout reached")
-                        self.output_signal.emit("📁 Browser should be open - please download XLSX file manually")
-                        self.output_signal.emit("🔄 Click 'Calculate Owner Earnings' once download completes")
-                    else:
-                        self.output_signal.emit("⚠️ Process timeout - this command requires manual interaction")
-                        self.output_signal.emit("📁 Opening browser for manual download...")
-                    process.terminate()
-                    process.wait()
-                    self.error_signal.emit(f"Process timed out after {self.timeout} seconds - download manually and use Calculate Owner Earnings")
-                    return
-                
-                # Try to get output from queue with short timeout
-                try:
-                    line = output_queue.get(timeout=0.5)
-                    if line is None:  # End of output signal
-                        break
-                    self.output_signal.emit(line)
-                    last_output_time = current_time
-                except queue.Empty:
-                    # No output available, continue checking
-                    time.sleep(0.1)
-            
-            # Wait for process to complete and get final output
-            process.wait()
-            
-            # Get any remaining output from queue
-            while True:
-                try:
-                    line = output_queue.get_nowait()
-                    if line is None:
-                        break
-                    self.output_signal.emit(line)
-                except queue.Empty:
-                    break
-            
-            if process.returncode == 0:
-                logger.info(f"Subprocess completed successfully with return code: {process.returncode}")
-                self.finished_signal.emit()
-            else:
-                error_msg = f"Process failed with return code: {process.returncode}"
-                logger.error(error_msg)
-                self.error_signal.emit(error_msg)
-                
-        except Exception as e:
-            error_msg = f"Error running subprocess: {str(e)}"
-            logger.error(error_msg)
-            self.error_signal.emit(error_msg)
+from ..core.events import STAGE_END, STAGE_START, WARNING
+from .console_view import LEVELS as CONSOLE_LEVELS, ConsoleView
+from ..visualization.render import CHART_FORMATS, DEFAULT_PROFILE, RENDER_PROFILES
+from .tasks import AnalysisTask, EnhancedFairValueTask, FairValueTask, VisualizationTask
 
 class MarketSwimmerGUI(QMainWindow):
     def __init__(self):
@@ -210,7 +88,7 @@ class MarketSwimmerGUI(QMainWindow):
                 border-color: #cccccc;
                 color: #999999;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 border: 1px solid #d0d0d0;
                 border-radius: 6px;
                 padding: 10px;
@@ -235,6 +113,10 @@ class MarketSwimmerGUI(QMainWindow):
         # Current ticker
         self.current_ticker = ""
         
+        # Analysis runs in-process on Qt's shared thread pool
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_task = None
+        
         logger.info("GUI window created successfully")
 
     def init_ui(self):
@@ -300,6 +182,12 @@ class MarketSwimmerGUI(QMainWindow):
         # Arrange buttons in grid
         analysis_layout.addWidget(self.complete_button, 0, 0, 1, 2)  # Span 2 columns  # Complete analysis button
         
+        # Cancel button for the running task (stops after the current step)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_task)
+        self.cancel_button.setEnabled(False)
+        analysis_layout.addWidget(self.cancel_button, 1, 0, 1, 2)
+        
         # Add Open Charts Folder button
         self.open_charts_button = QPushButton("Open Charts Folder")
         self.open_charts_button.clicked.connect(self.open_charts_folder)
@@ -354,11 +242,13 @@ class MarketSwimmerGUI(QMainWindow):
         console_group = QGroupBox("Console Output")
         console_layout = QVBoxLayout(console_group)
         
-        self.console_output = QTextEdit()
-        self.console_output.setReadOnly(True)
+        # Bounded, batched view: keeps the last 5000 lines, appends every 50 ms
+        self.console_output = ConsoleView(max_lines=5000, flush_interval_ms=50)
         self.console_output.setMinimumHeight(300)
         console_layout.addWidget(self.console_output)
         
+        console_controls = QHBoxLayout()
+        
         # Clear console button
         clear_button = QPushButton("Clear Console")
         clear_button.clicked.connect(self.clear_console)
@@ -381,7 +271,30 @@ class MarketSwimmerGUI(QMainWindow):
                 color: #ffffff;
             }
         """)
-        console_layout.addWidget(clear_button)
+        console_controls.addWidget(clear_button)
+        console_controls.addStretch()
+        
+        # Lines below the selected level never reach the console
+        console_controls.addWidget(QLabel("Show:"))
+        self.level_selector = QComboBox()
+        self.level_selector.addItems(CONSOLE_LEVELS)
+        self.level_selector.setCurrentText(self.console_output.min_level)
+        self.level_selector.currentTextChanged.connect(self.console_output.set_min_level)
+        console_controls.addWidget(self.level_selector)
+
+        # Draft and thumbnail charts render much faster than publication ones
+        console_controls.addWidget(QLabel("Charts:"))
+        self.profile_selector = QComboBox()
+        self.profile_selector.addItems(list(RENDER_PROFILES))
+        self.profile_selector.setCurrentText(DEFAULT_PROFILE)
+        for index, name in enumerate(RENDER_PROFILES):
+            self.profile_selector.setItemData(index, RENDER_PROFILES[name].description,
+                                              Qt.ItemDataRole.ToolTipRole)
+        console_controls.addWidget(self.profile_selector)
+        self.format_selector = QComboBox()
+        self.format_selector.addItems(CHART_FORMATS)
+        console_controls.addWidget(self.format_selector)
+        console_layout.addLayout(console_controls)
         
         main_layout.addWidget(console_group)
         
@@ -393,6 +306,11 @@ class MarketSwimmerGUI(QMainWindow):
         # Status bar
         self.statusBar().showMessage("Ready - Select a ticker to begin analysis")
 
+    def render_options(self):
+        """Chart profile and format selected in the console toolbar."""
+        return {'render_profile': self.profile_selector.currentText(),
+                'chart_format': self.format_selector.currentText()}
+
     def select_ticker(self):
         log_gui_event("BUTTON_CLICK", "Select Ticker button clicked")
         
@@ -431,13 +349,9 @@ class MarketSwimmerGUI(QMainWindow):
         self.disable_buttons()
         self.show_progress()
         
-        # Use the modern CLI for data analysis with proper timeout (5 minutes)
-        command = f'python -m marketswimmer analyze {self.current_ticker} --force'
-        self.worker_thread = WorkerThread(command, timeout=300)  # 5 minutes like the original
-        self.worker_thread.output_signal.connect(self.update_console)
-        self.worker_thread.finished_signal.connect(self.on_download_finished)
-        self.worker_thread.error_signal.connect(self.on_download_timeout)
-        self.worker_thread.start()
+        # The workflow waits up to 5 minutes for the download
+        task = AnalysisTask(self.current_ticker, force_download=True, **self.render_options())
+        self.start_task(task, self.on_download_result, self.on_download_timeout)
 
     def run_complete_analysis(self):
         """Run the complete analysis workflow including enhanced fair value calculation."""
@@ -463,15 +377,9 @@ class MarketSwimmerGUI(QMainWindow):
         self.disable_buttons()
         self.show_progress()
         
-        # First run the complete analysis (includes enhanced fair value)
-        command = f'python -m marketswimmer analyze {self.current_ticker} --force'
-        logger.info(f"Complete analysis command: {command}")
-        
-        self.worker_thread = WorkerThread(command, timeout=300)
-        self.worker_thread.output_signal.connect(self.update_console)
-        self.worker_thread.finished_signal.connect(self.on_complete_analysis_phase1_finished)
-        self.worker_thread.error_signal.connect(self.on_process_error)
-        self.worker_thread.start()
+        # Run the complete analysis (includes enhanced fair value)
+        task = AnalysisTask(self.current_ticker, force_download=True, **self.render_options())
+        self.start_task(task, self.on_complete_analysis_result, self.on_process_error)
 
     def calculate_fair_value(self):
         if not self.current_ticker:
@@ -514,7 +422,7 @@ class MarketSwimmerGUI(QMainWindow):
             self.console_output.append(f"\n>> Starting enhanced fair value analysis for {self.current_ticker}...")
             self.console_output.append(f">> This includes automatic balance sheet detection and scenario analysis")
             
-            command = f'python -m marketswimmer enhanced-fair-value {self.current_ticker} --no-report'
+            task = EnhancedFairValueTask(self.current_ticker, save_report=False)
             
         else:
             # Legacy manual mode
@@ -541,8 +449,7 @@ class MarketSwimmerGUI(QMainWindow):
                 self.console_output.append(f">> Growth Rate: {growth_rate:.1%}")
                 self.console_output.append(f">> Auto-extracting cash, debt, and shares from downloaded data...")
                 
-                command = (f'python -m marketswimmer fair-value --ticker {self.current_ticker} '
-                          f'--growth {growth_rate}')
+                task = FairValueTask(self.current_ticker, growth_rate=growth_rate)
             else:
                 # Manual input mode - get all values
                 cash_investments, ok2 = QInputDialog.getDouble(self, "Cash & Investments", 
@@ -569,21 +476,17 @@ class MarketSwimmerGUI(QMainWindow):
                 self.console_output.append(f">> Total Debt: ${total_debt:,.0f}")
                 self.console_output.append(f">> Shares Outstanding: {shares_millions:,.0f}M")
                 
-                command = (f'python -m marketswimmer fair-value --ticker {self.current_ticker} '
-                          f'--growth {growth_rate} '
-                          f'--cash {cash_investments} '
-                          f'--debt {total_debt} '
-                          f'--shares {shares_millions} '
-                          f'--manual')
+                task = FairValueTask(self.current_ticker,
+                                     growth_rate=growth_rate,
+                                     cash=cash_investments,
+                                     debt=total_debt,
+                                     shares=shares_millions,
+                                     manual=True)
         
         self.disable_buttons()
         self.show_progress()
         
-        self.worker_thread = WorkerThread(command, timeout=120)  # Increased timeout for enhanced analysis
-        self.worker_thread.output_signal.connect(self.update_console)
-        self.worker_thread.finished_signal.connect(self.on_fair_value_finished)
-        self.worker_thread.error_signal.connect(self.on_fair_value_error)
-        self.worker_thread.start()
+        self.start_task(task, self.on_fair_value_result, self.on_fair_value_error)
 
     def create_visualizations(self):
         if not self.current_ticker:
@@ -597,10 +500,8 @@ class MarketSwimmerGUI(QMainWindow):
         self.disable_buttons()
         self.show_progress()
         
-        # Use the MarketSwimmer visualization command instead of a standalone script
-        # Use python command which is available in PATH
-        command = f'python -m marketswimmer visualize --ticker {self.current_ticker}'
-        self.run_command(command)
+        task = VisualizationTask(self.current_ticker, **self.render_options())
+        self.start_task(task, self.on_visualization_result, self.on_process_error)
 
     def on_complete_analysis_phase1_finished(self):
         """Handle completion of complete analysis workflow (enhanced fair value already included)."""
@@ -662,22 +563,108 @@ class MarketSwimmerGUI(QMainWindow):
         if hasattr(self, 'temp_growth_rate'):
             delattr(self, 'temp_growth_rate')
 
-    def run_command(self, command):
-        """Run a command in a separate thread"""
-        self.worker_thread = WorkerThread(command)
-        self.worker_thread.output_signal.connect(self.update_console)
-        self.worker_thread.finished_signal.connect(self.on_process_finished)
-        self.worker_thread.error_signal.connect(self.on_process_error)
-        self.worker_thread.start()
+    def start_task(self, task, on_finished, on_failed):
+        """Run a GuiTask on the thread pool with its signals wired to the window"""
+        self.current_task = task
+        task.signals.output.connect(self.update_console)
+        task.signals.progress.connect(self.on_progress_event)
+        task.signals.finished.connect(self.on_task_done)
+        task.signals.failed.connect(self.on_task_done)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        self.cancel_button.setEnabled(True)
+        self.thread_pool.start(task)
+        
+        logger.info(f"Started {type(task).__name__} for {self.current_ticker}")
+
+    def cancel_task(self):
+        """Ask the running task to stop after its current step"""
+        if self.current_task is None:
+            return
+        log_gui_event("BUTTON_CLICK", "Cancel button clicked")
+        self.current_task.cancel()
+        self.cancel_button.setEnabled(False)
+        self.console_output.append("\n>> Cancelling - the current step will finish first...")
+        self.statusBar().showMessage("Cancelling...")
+
+    def on_task_done(self, _result=None):
+        """Forget the finished task (runs before the task's own result handler)"""
+        self.current_task = None
+        self.cancel_button.setEnabled(False)
+
+    def on_progress_event(self, event):
+        """Show a workflow progress event (core.events.Event) in the progress and status bars"""
+        if event.kind in (STAGE_START, STAGE_END):
+            self.progress_bar.setRange(0, event.total)
+            self.progress_bar.setValue(event.completed)
+        if event.kind == STAGE_START:
+            self.statusBar().showMessage(f"{event.description}...")
+        elif event.kind == STAGE_END:
+            logger.debug(f"Stage {event.stage}: {event.state} in {event.seconds}s "
+                         f"({event.completed}/{event.total})")
+        elif event.kind == WARNING:
+            self.statusBar().showMessage(f"Warning: {event.message}")
+
+    def on_task_cancelled(self):
+        """Handle a task that stopped because the user cancelled it"""
+        self.console_output.append("\n>> Cancelled.")
+        self.hide_progress()
+        self.enable_buttons()
+        self.statusBar().showMessage("Cancelled")
+        
+        logger.info("Task cancelled by user")
+
+    def on_download_result(self, result):
+        """Route the AnalysisResult of Download & Analyze"""
+        if result.success:
+            self.on_download_finished()
+        elif result.cancelled:
+            self.on_task_cancelled()
+        elif result.data_file is None:
+            self.on_download_timeout("Download not detected within 5 minutes - download manually and run the analysis again")
+        else:
+            self.on_process_error(self._describe_failure(result))
+
+    def on_complete_analysis_result(self, result):
+        """Route the AnalysisResult of the complete analysis"""
+        if result.success:
+            fair_value = (result.fair_value_results or {}).get('valuation_results', {}).get('fair_value_per_share')
+            if fair_value:
+                self.console_output.append(f"\n>> Fair value per share: ${fair_value:,.2f}")
+            self.on_complete_analysis_phase1_finished()
+        elif result.cancelled:
+            self.on_task_cancelled()
+        else:
+            self.on_process_error(self._describe_failure(result))
+
+    def on_fair_value_result(self, results):
+        """Route the results of a fair value calculation (None on failure)"""
+        if not results:
+            self.on_fair_value_error("Fair value calculation failed - see the output above")
+            return
+        # Enhanced analysis nests the valuation; the DCF calculation does not
+        valuation = results.get('valuation_results', results)
+        if valuation.get('fair_value_per_share'):
+            self.console_output.append(f"\n>> Fair value per share: ${valuation['fair_value_per_share']:,.2f}")
+        self.on_fair_value_finished()
+
+    def on_visualization_result(self, created):
+        """Route the result of chart generation"""
+        if created:
+            self.on_process_finished()
+        else:
+            self.on_process_error(f"No owner earnings data found for {self.current_ticker} - run the analysis first")
+
+    def _describe_failure(self, result):
+        """Error message naming the workflow stages that failed"""
+        failed = [stage for stage, state in result.stage_status.items() if state == 'failed']
+        if failed:
+            return f"Analysis failed in: {', '.join(failed)}"
+        return result.error or "Analysis failed"
 
     def update_console(self, text):
-        """Update console output with new text"""
+        """Queue a line of task output; the console view batches and scrolls"""
         self.console_output.append(text)
-        
-        # Auto-scroll to bottom
-        cursor = self.console_output.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.console_output.setTextCursor(cursor)
 
     def on_process_finished(self):
         """Handle process completion"""
@@ -732,7 +719,7 @@ class MarketSwimmerGUI(QMainWindow):
 
     def on_fair_value_finished(self):
         """Handle fair value calculation completion"""
-        log_function_exit("WorkerThread.run()")
+        log_function_exit("calculate_fair_value()")
         
         self.console_output.append("\n>> Fair value calculation completed successfully!")
         self.console_output.append(">> Fair value analysis report has been generated")
@@ -745,7 +732,7 @@ class MarketSwimmerGUI(QMainWindow):
 
     def on_fair_value_error(self, error_msg):
         """Handle fair value calculation error/timeout"""
-        log_function_exit("WorkerThread.run() - ERROR")
+        log_function_exit("calculate_fair_value() - ERROR")
         
         self.console_output.append(f"\n>> ERROR in fair value calculation: {error_msg}")
         self.console_output.append(">> Please check that owner earnings data exists")
@@ -774,6 +761,14 @@ class MarketSwimmerGUI(QMainWindow):
         """Hide progress bar"""
         self.progress_bar.setVisible(False)
 
+    def closeEvent(self, event):
+        """Stop the running task before the window closes"""
+        if self.current_task is not None:
+            self.current_task.cancel()
+            self.statusBar().showMessage("Waiting for the current step to finish...")
+            self.thread_pool.waitForDone()
+        super().closeEvent(event)
+
     def clear_console(self):
         """Clear the console output"""
         self.console_output.clear()
@@ -0,0 +1,169 @@
+"""
+In-process background tasks for the MarketSwimmer GUI.
+
+The GUI used to start `python -m marketswimmer ...` subprocesses and scrape
+their console output. These tasks call the analysis code directly on
+Qt's global thread pool instead: the console output is still streamed
+line by line, but progress arrives as core.events.Event objects and the result
+as the object the analysis code returns.
+
+Cancellation is cooperative. cancel() sets an event that the workflow
+checks between stages and while waiting for a download; a running stage
+always finishes.
+"""
+
+import io
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+# Colour and cursor sequences rich emits when stdout is a terminal
+_ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+
+class TaskSignals(QObject):
+    """Signals of a GuiTask; delivered to the GUI thread through queued connections."""
+
+    output = pyqtSignal(str)        # One line of console output
+    progress = pyqtSignal(object)   # core.events.Event
+    finished = pyqtSignal(object)   # The task's result object
+    failed = pyqtSignal(str)        # Unexpected exception
+
+
+class _LineEmitter(io.TextIOBase):
+    """Text stream turning captured output into one signal per line."""
+
+    def __init__(self, emit_line: Callable[[str], None]):
+        self.emit_line = emit_line
+        self.pending = ""
+
+    def write(self, text: str) -> int:
+        self.pending += text
+        *lines, self.pending = self.pending.split('\n')
+        for line in lines:
+            self.emit_line(_ANSI_ESCAPE.sub('', line).rstrip())
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.emit_line(_ANSI_ESCAPE.sub('', self.pending).rstrip())
+            self.pending = ""
+
+    def writable(self) -> bool:
+        return True
+
+
+class GuiTask(QRunnable):
+    """A unit of analysis work run on a QThreadPool."""
+
+    def __init__(self):
+        super().__init__()
+        # The GUI keeps a reference while the task runs; Qt must not delete
+        # the Python-owned object behind its back.
+        self.setAutoDelete(False)
+        self.signals = TaskSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the task to stop at the next safe point."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def execute(self) -> Any:
+        """Do the work; runs on a pool thread. Returns the result object."""
+        raise NotImplementedError
+
+    def run(self):
+        from ..core import output_router
+
+        writer = _LineEmitter(self.signals.output.emit)
+        try:
+            with output_router.routed_stdout(), output_router.capture_thread_output(writer):
+                result = self.execute()
+        except Exception as e:
+            writer.flush()
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        writer.flush()
+        self.signals.finished.emit(result)
+
+
+class AnalysisTask(GuiTask):
+    """Complete workflow for one ticker; the result is an AnalysisResult."""
+
+    def __init__(self, ticker: str, force_download: bool = False, use_cache: bool = True,
+                 render_profile: str = "publication", chart_format: str = "png"):
+        super().__init__()
+        self.ticker = ticker
+        self.force_download = force_download
+        self.use_cache = use_cache
+        self.render_profile = render_profile
+        self.chart_format = chart_format
+
+    def execute(self):
+        from ..core.events import EventBus
+        from ..core.workflow import AnalysisWorkflow
+
+        # A bus of its own, so events of other runs in this process stay out
+        events = EventBus()
+        events.subscribe(self.signals.progress.emit)
+        workflow = AnalysisWorkflow(events=events, render_profile=self.render_profile,
+                                    chart_format=self.chart_format)
+        return workflow.run_analysis(self.ticker,
+                                     force_download=self.force_download,
+                                     use_cache=self.use_cache,
+                                     cancel_event=self.cancel_event)
+
+
+class EnhancedFairValueTask(GuiTask):
+    """Enhanced fair value analysis; the result is the calculator's results dict."""
+
+    def __init__(self, ticker: str, save_report: bool = False):
+        super().__init__()
+        self.ticker = ticker
+        self.save_report = save_report
+
+    def execute(self) -> Dict:
+        from ..core.fair_value import FairValueCalculator
+
+        calculator = FairValueCalculator()
+        return calculator.enhanced_fair_value_analysis(self.ticker, save_detailed_report=self.save_report)
+
+
+class FairValueTask(GuiTask):
+    """
+    Owner Earnings DCF valuation (auto-extracted or manual balance sheet).
+
+    The result is the valuation dict, or None if it could not be made.
+    """
+
+    def __init__(self, ticker: str, **options):
+        super().__init__()
+        self.ticker = ticker
+        self.options = options
+
+    def execute(self) -> Optional[Dict]:
+        from ..core.fair_value import owner_earnings_dcf_analysis
+
+        return owner_earnings_dcf_analysis(self.ticker, **self.options)
+
+
+class VisualizationTask(GuiTask):
+    """Owner earnings charts from the existing CSV files; the result is a success flag."""
+
+    def __init__(self, ticker: str, render_profile: str = "publication", chart_format: str = "png"):
+        super().__init__()
+        self.ticker = ticker
+        self.render_profile = render_profile
+        self.chart_format = chart_format
+
+    def execute(self) -> bool:
+        from ..visualization.charts import main as visualization_main
+
+        return visualization_main(self.ticker, profile=self.render_profile,
+                                  chart_format=self.chart_format)
@@ -10,6 +10,8 @@ from pathlib import Path
 import sys
 from datetime import datetime
 
+from .core.periods import PERIOD_CODE_COLUMN, Period, codes_from_labels
+
 def process_xlsx_to_quarterly_data(xlsx_file, ticker, output_path=Path("data")):
     """
     Process XLSX financial export to extract quarterly data
@@ -33,16 +35,15 @@ def process_xlsx_to_quarterly_data(xlsx_file, ticker, output_path=Path("data")):
     
     for period in quarterly_periods[:40]:  # Limit to last 40 quarters (10 years)
         try:
-            # Convert period format from "Jun '25" to "2025Q2" 
+            # Convert period format from "Jun '25" to Period 2025Q2
             month_part, year_part = period.split(" '")
             year = 2000 + int(year_part) if int(year_part) < 50 else 1900 + int(year_part)
             
             # Map months to quarters
             month_to_quarter = {
-                'Mar': 'Q1', 'Jun': 'Q2', 'Sep': 'Q3', 'Dec': 'Q4'
+                'Mar': 1, 'Jun': 2, 'Sep': 3, 'Dec': 4
             }
-            quarter = month_to_quarter.get(month_part, 'Q1')
-            period_key = f"{year}{quarter}"
+            period_key = Period.quarterly(year, month_to_quarter.get(month_part, 1))
             
             # Extract financial metrics for this quarter
             quarter_data = {}
@@ -70,7 +71,7 @@ def process_xlsx_to_quarterly_data(xlsx_file, ticker, output_path=Path("data")):
     # Save processed quarterly data
     json_file = output_path / f"{ticker.lower()}_quarterly_data.json"
     with open(json_file, 'w') as f:
-        json.dump(quarterly_data, f, indent=2)
+        json.dump({str(period): data for period, data in quarterly_data.items()}, f, indent=2)
     print(f">> Saved quarterly JSON data to: {json_file}")
     
     # Create MarketSwimmer format CSV for quarterly data
@@ -88,7 +89,8 @@ def process_xlsx_to_quarterly_data(xlsx_file, ticker, output_path=Path("data")):
         capexs.append(0)
     
     quarterly_df = pd.DataFrame({
-        'Period': periods,
+        'Period': [str(period) for period in periods],
+        PERIOD_CODE_COLUMN: [int(period) for period in periods],
         'Net Income': net_incomes,
         'Depreciation': depreciations,
         'CapEx': capexs,
@@ -97,7 +99,7 @@ def process_xlsx_to_quarterly_data(xlsx_file, ticker, output_path=Path("data")):
     })
     
     # Sort by period for chronological order
-    quarterly_df = quarterly_df.sort_values('Period')
+    quarterly_df = quarterly_df.sort_values(PERIOD_CODE_COLUMN)
     
     csv_file = output_path / f"owner_earnings_quarterly_{ticker.lower()}.csv"
     quarterly_df.to_csv(csv_file, index=False)
@@ -213,6 +215,7 @@ def process_xlsx_to_annual_data(xlsx_file, ticker, output_path=Path("data")):
     
     expected_df = pd.DataFrame({
         'Period': periods,
+        PERIOD_CODE_COLUMN: codes_from_labels(pd.Series(periods, dtype=object)),
         'Net Income': net_incomes,
         'Depreciation': depreciations,
         'CapEx': capexs,
@@ -6,17 +6,34 @@ for owner earnings analysis including waterfall charts, trend analysis,
 and volatility studies.
 """
 
-from .charts import (
-    detect_ticker_symbol,
-    load_data,
-    prepare_quarterly_data,
-    prepare_annual_data,
-    create_owner_earnings_comparison,
-    create_components_breakdown,
-    create_volatility_analysis,
-    save_and_show_plots,
-    main as visualize_main
-)
+# Chart functions live in .charts, which imports matplotlib and seaborn;
+# they are loaded on first access (PEP 562)
+_CHART_FUNCTIONS = {
+    "detect_ticker_symbol": "detect_ticker_symbol",
+    "load_data": "load_data",
+    "prepare_quarterly_data": "prepare_quarterly_data",
+    "prepare_annual_data": "prepare_annual_data",
+    "create_owner_earnings_comparison": "create_owner_earnings_comparison",
+    "create_components_breakdown": "create_components_breakdown",
+    "create_volatility_analysis": "create_volatility_analysis",
+    "save_and_show_plots": "save_and_show_plots",
+    "visualize_main": "main",
+    "visualize_all": "visualize_all",
+}
+
+
+def __getattr__(name):
+    if name not in _CHART_FUNCTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import charts
+    value = getattr(charts, _CHART_FUNCTIONS[name])
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_CHART_FUNCTIONS))
+
 
 # Create a convenience class for the visualizer
 class OwnerEarningsVisualizer:
@@ -25,11 +42,13 @@ class OwnerEarningsVisualizer:
     @staticmethod
     def create_all_charts(ticker=None):
         """Create all standard charts for owner earnings analysis."""
+        from .charts import main as visualize_main
         return visualize_main()
     
     @staticmethod
     def detect_ticker():
         """Detect ticker symbol from most recent data file."""
+        from .charts import detect_ticker_symbol
         return detect_ticker_symbol()
 
 __all__ = [
@@ -42,5 +61,6 @@ __all__ = [
     "create_components_breakdown",
     "create_volatility_analysis",
     "save_and_show_plots",
-    "visualize_main"
+    "visualize_main",
+    "visualize_all"
 ]
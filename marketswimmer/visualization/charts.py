@@ -1,17 +1,20 @@
 import pandas as pd
 import matplotlib
-# Set non-interactive backend for headless operation - must be before pyplot import
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-# Ensure matplotlib is in non-interactive mode
-plt.ioff()
+# Figures are built with their own Agg canvas instead of through pyplot, so
+# no backend is selected and no global figure registry is involved
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from cycler import cycler
 import seaborn as sns
 import numpy as np
+from contextlib import contextmanager
 from datetime import datetime
 import os
 import glob
 import re
 import sys
+import threading
 
 def is_bank_or_insurance(ticker):
     """
@@ -48,17 +51,70 @@ def is_bank_or_insurance(ticker):
     
     return ticker_upper in financial_tickers
 
+# Professional plotting style of the owner earnings charts, applied on top
+# of matplotlib's default style
+PLOTTING_STYLE = {
+    'axes.prop_cycle': cycler(color=sns.color_palette("husl")),
+    'figure.figsize': (15, 10),
+    'font.size': 10,
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'legend.fontsize': 10,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+}
+
+# savefig() settings of the owner earnings and the shares/debt charts, on
+# top of the render profile's dpi and cropping (see render.RenderProfile)
+SAVE_OPTIONS = {'facecolor': 'white'}
+SHARES_SAVE_OPTIONS = {}
+
+
+def _publication_options(base):
+    """savefig() options of the default (publication) render profile."""
+    from .render import DEFAULT_PROFILE, get_profile
+    return get_profile(DEFAULT_PROFILE).save_options(base)
+
+# rcParams are global to the process; figures are built one at a time
+# while their style is applied. Saving happens outside the lock, so
+# threads still render (rasterize and encode) in parallel.
+_style_lock = threading.RLock()
+
+
+@contextmanager
+def chart_style(style=None):
+    """
+    Apply matplotlib's default style plus `style` while building a figure.
+    
+    Artists read rcParams when they are created, so everything up to and
+    including tight_layout() must happen inside this context. The previous
+    rcParams are restored on exit.
+    
+    Args:
+        style (dict, optional): rcParams on top of the default style
+    """
+    with _style_lock, matplotlib.style.context(['default', style or {}]):
+        yield
+
+
+def new_figure(nrows=1, ncols=1, figsize=None):
+    """
+    Create a Figure on its own Agg canvas, with a grid of subplots.
+    
+    Unlike pyplot.subplots() the figure is not registered anywhere; it is
+    freed as soon as it is no longer referenced.
+    
+    Returns:
+        tuple: (figure, axes) as returned by pyplot.subplots()
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols)
+
+
 def setup_plotting_style():
-    """Set up a professional plotting style."""
-    plt.style.use('default')
-    sns.set_palette("husl")
-    plt.rcParams['figure.figsize'] = (15, 10)
-    plt.rcParams['font.size'] = 10
-    plt.rcParams['axes.labelsize'] = 12
-    plt.rcParams['axes.titlesize'] = 14
-    plt.rcParams['legend.fontsize'] = 10
-    plt.rcParams['xtick.labelsize'] = 9
-    plt.rcParams['ytick.labelsize'] = 9
+    """Set up a professional plotting style for pyplot-based callers (global)."""
+    matplotlib.style.use(['default', PLOTTING_STYLE])
 
 def detect_ticker_symbol():
     """Detect the ticker symbol from the most recent XLSX file."""
@@ -85,631 +141,648 @@ def detect_ticker_symbol():
     except:
         return "TICKER"
 
-def create_shares_outstanding_analysis(ticker, output_dir='./analysis_output'):
+
+def _parse_quarter_date(date_str):
+    """Convert quarter strings like "Jun '25" to readable format"""
+    try:
+        if "'" in date_str:
+            # Handle formats like "Jun '25", "Mar '24"
+            month_abbr, year_abbr = date_str.split(" '")
+            year = int("20" + year_abbr) if int(year_abbr) < 50 else int("19" + year_abbr)
+
+            # Convert month abbreviation to quarter
+            month_to_quarter = {
+                'Mar': 'Q1', 'Jun': 'Q2', 'Sep': 'Q3', 'Dec': 'Q4'
+            }
+            quarter = month_to_quarter.get(month_abbr, 'Q1')
+            return f"{quarter} {year}"
+        else:
+            return date_str
+    except:
+        return date_str
+
+
+def _date_sort_key(date_str):
+    """Sort dates like Q1 2023, Q2 2023, etc. chronologically"""
+    try:
+        if 'Q' in date_str and len(date_str.split()) == 2:
+            quarter, year = date_str.split()
+            quarter_num = int(quarter[1])  # Extract number from Q1, Q2, etc.
+            year_num = int(year)
+            return (year_num, quarter_num)
+        else:
+            return (2000, 1)  # Default for unparseable dates
+    except:
+        return (2000, 1)
+
+
+# Share and debt metric classification, matched against lower-cased row labels
+_SHARE_DEBT_LABEL = re.compile('share|outstanding|diluted|basic|common|weighted|stock|issuance|issued|'
+                               'repurchase|buyback|debt|borrowing|loan|bond|credit|financing')
+_SHARE_DEBT_EXCLUDE = re.compile('|'.join(re.escape(word) for word in [
+    'equity', 'liabilit', 'asset', 'book', 'value', 'price', 'market', 'per share', 'ratio',
+    'treasury', 'common stock (net)', 'common stock net', 'financing cash flow', 'financing']))
+_SHARE = re.compile('share')
+_ISSUANCE = re.compile('issuance|issued')
+_REPURCHASE = re.compile('repurchase|buyback')
+_DEBT = re.compile('debt|borrowing|loan|bond')
+_DEBT_PROCEEDS = re.compile('issuance|issued|proceeds')
+_DEBT_REPAYMENT = re.compile('repayment|payment|retire')
+_DEBT_LEVEL = re.compile('long term debt|current part of debt|net debt|total debt|debt total')
+_SHARE_COUNT = re.compile('outstanding|diluted|basic|common shares')
+
+SHARE_DEBT_COLUMNS = ['sheet', 'row', 'metric', 'kind', 'date', 'value']
+
+# Metrics dict entry receiving each kind of share_debt_frame row
+SHARE_DEBT_KINDS = {
+    'shares': 'shares_data',
+    'share_issuance': 'issuance_data',
+    'share_repurchase': 'repurchase_data',
+    'debt_issuance': 'debt_issuance_data',
+    'debt_repayment': 'debt_repayment_data',
+    'debt_level': 'debt_metrics_data',
+}
+
+
+def _coerce_numeric(block):
     """
-    Create comprehensive analysis of shares outstanding data from downloaded financial statements.
+    Convert a block of workbook cells to floats.
+    
+    Text such as '$1,234' or '5%' is cleaned before conversion; anything
+    that is still not a number (e.g. '—') becomes NaN.
+    """
+    def convert(column):
+        if pd.api.types.is_numeric_dtype(column):
+            return column.astype(float)
+        text = column.astype(str).str.replace(r'[,$%]', '', regex=True).str.strip()
+        return pd.to_numeric(text, errors='coerce').astype(float)
+    return block.apply(convert)
+
+
+def _classify_share_debt_labels(labels):
+    """
+    Classify lower-cased metric labels.
+    
+    Returns:
+        tuple: (kind, limit, use_abs) arrays; a value is kept when it (or its
+        magnitude, where use_abs is set) is above limit
+    """
+    def has(pattern):
+        return labels.str.contains(pattern).to_numpy()
+
+    share = has(_SHARE)
+    debt = has(_DEBT)
+    share_issuance = has(_ISSUANCE) & share
+    share_repurchase = has(_REPURCHASE) & share
+    debt_issuance = debt & has(_DEBT_PROCEEDS)
+    debt_repayment = debt & has(_DEBT_REPAYMENT)
+    debt_level = has(_DEBT_LEVEL)
+    share_count = has(_SHARE_COUNT) & ~debt_level
+    # Net figures like "Issuance/Purchase of Shares" carry both directions
+    share_activity = labels.str.contains('issuance', regex=False).to_numpy() & \
+        labels.str.contains('purchase', regex=False).to_numpy()
+
+    kind = np.select(
+        [share_activity, share_issuance, share_repurchase, debt_issuance, debt_repayment, debt_level],
+        ['share_activity', 'share_issuance', 'share_repurchase', 'debt_issuance', 'debt_repayment',
+         'debt_level'],
+        'shares')
+    # Low thresholds for share and debt activity, a higher one for share counts
+    share_flows = share_issuance | share_repurchase
+    debt_flows = debt_issuance | debt_repayment
+    limit = np.select([share_flows, debt_flows, share_count], [1, 10, 1000], 100)
+    return kind, limit, share_flows | debt_flows
+
+
+def share_debt_frame(workbook):
+    """
+    Collect the share and debt metrics of a workbook as a tidy frame.
+    
+    Only the quarterly balance sheet and cash flow sheets are read. Each
+    row label is classified once per sheet, the values are converted as a
+    block and filtered by the threshold of their metric's kind.
     
     Args:
-        ticker (str): Stock ticker symbol
-        output_dir (str): Directory to save analysis charts
+        workbook (FinancialWorkbook): Parsed StockRow export
         
     Returns:
-        bool: True if analysis was successful, False otherwise
+        pd.DataFrame: One row per kept value with the columns 'sheet', 'row'
+        (position of the metric in its sheet), 'metric', 'kind' (a
+        SHARE_DEBT_KINDS key or 'share_activity'), 'date' (e.g. "Q2 2025")
+        and 'value', in sheet, row and column order
     """
-    def parse_quarter_date(date_str):
-        """Convert quarter strings like "Jun '25" to readable format"""
+    frames = []
+    for sheet_name in workbook.sheet_names:
+        sheet = sheet_name.lower()
+        if not ('q' in sheet and ('balance' in sheet or 'cash' in sheet)):
+            print(f"Skipping sheet '{sheet_name}' - only using quarterly balance sheet and cash flow data")
+            continue
+
         try:
-            if "'" in date_str:
-                # Handle formats like "Jun '25", "Mar '24"
-                month_abbr, year_abbr = date_str.split(" '")
-                year = int("20" + year_abbr) if int(year_abbr) < 50 else int("19" + year_abbr)
-                
-                # Convert month abbreviation to quarter
-                month_to_quarter = {
-                    'Mar': 'Q1', 'Jun': 'Q2', 'Sep': 'Q3', 'Dec': 'Q4'
-                }
-                quarter = month_to_quarter.get(month_abbr, 'Q1')
-                return f"{quarter} {year}"
-            else:
-                return date_str
-        except:
-            return date_str
-    
-    try:
-        # Find the most recent downloaded file for the ticker
-        # Normalize ticker by replacing dots with underscores (e.g., BRK.B -> brk_b)
-        normalized_ticker = ticker.lower().replace('.', '_')
-        pattern = f'./downloaded_files/*{normalized_ticker}*.xlsx'
-        xlsx_files = glob.glob(pattern)
-        
-        if not xlsx_files:
-            print(f"No downloaded files found for ticker {ticker} (searched for pattern: {pattern})")
-            return False
-            
-        # Get the most recent file
-        latest_file = max(xlsx_files, key=os.path.getmtime)
-        print(f"Analyzing shares data from: {os.path.basename(latest_file)}")
-        
-        # Read Excel file
-        xl = pd.ExcelFile(latest_file)
-        
-        # Initialize data storage
-        shares_data = {}
-        issuance_data = {}  # For share issuance (positive bars)
-        repurchase_data = {}  # For share repurchase (negative bars)
-        debt_issuance_data = {}  # For debt issuance (positive bars)
-        debt_repayment_data = {}  # For debt repayment (negative bars)
-        debt_metrics_data = {}  # For debt level metrics (lines on debt chart)
-        quarterly_data = []
-        annual_data = []
-        
-        # Store stock price data for converting cash flow amounts to share counts
-        stock_price_data = {}  # Will store {date: price} mapping
-        
-        # Process each sheet - Use quarterly balance sheet AND cash flow data
-        for sheet_name in xl.sheet_names:
-            # Process quarterly balance sheet data for share counts and quarterly cash flow for issuance
-            if not ('q' in sheet_name.lower() and ('balance' in sheet_name.lower() or 'cash' in sheet_name.lower())):
-                print(f"Skipping sheet '{sheet_name}' - only using quarterly balance sheet and cash flow data")
-                continue
-                
-            try:
-                df = pd.read_excel(latest_file, sheet_name=sheet_name)
-                print(f"Processing quarterly sheet: {sheet_name}")
-                
-                # Look for share-related metrics and debt activities in quarterly data
-                share_keywords = ['share', 'outstanding', 'diluted', 'basic', 'common', 'weighted', 'stock', 'issuance', 'issued', 'repurchase', 'buyback']
-                debt_keywords = ['debt', 'borrowing', 'loan', 'bond', 'credit', 'financing']
-                all_keywords = share_keywords + debt_keywords
-                exclude_keywords = ['equity', 'liabilit', 'asset', 'book', 'value', 'price', 'market', 'treasury', 'common stock (net)', 'common stock net', 'financing cash flow']
-                
-                # Find rows with relevant keywords but exclude unwanted metrics
-                relevant_rows = df[df.iloc[:, 0].astype(str).str.contains('|'.join(all_keywords), case=False, na=False)]
-                if not relevant_rows.empty:
-                    # Filter out unwanted metrics
-                    filtered_rows = relevant_rows[~relevant_rows.iloc[:, 0].astype(str).str.contains('|'.join(re.escape(word) for word in exclude_keywords), case=False, na=False)]
-                    share_rows = filtered_rows
-                
-                if not share_rows.empty:
-                    print(f"Found {len(share_rows)} relevant metrics in {sheet_name}")
-                    for idx, row in share_rows.iterrows():
-                        metric_name = str(row.iloc[0]).strip()
-                        
-                        # Additional filtering to ensure we only get relevant metrics
-                        if any(exclude_word in metric_name.lower() for exclude_word in ['equity', 'liabilit', 'asset', 'book', 'value', 'price', 'market', 'per share', 'ratio', 'treasury', 'common stock (net)', 'common stock net', 'financing cash flow', 'financing']):
-                            continue
-                            
-                        # Process relevant metric
-                        values = row.iloc[1:].dropna()
-                        
-                        # Determine the type of metric
-                        is_share_issuance = any(keyword in metric_name.lower() for keyword in ['issuance', 'issued']) and 'share' in metric_name.lower()
-                        is_share_repurchase = any(keyword in metric_name.lower() for keyword in ['repurchase', 'buyback']) and 'share' in metric_name.lower()
-                        is_debt_issuance = any(keyword in metric_name.lower() for keyword in ['debt', 'borrowing', 'loan', 'bond']) and any(keyword in metric_name.lower() for keyword in ['issuance', 'issued', 'proceeds'])
-                        is_debt_repayment = any(keyword in metric_name.lower() for keyword in ['debt', 'borrowing', 'loan', 'bond']) and any(keyword in metric_name.lower() for keyword in ['repayment', 'payment', 'retire'])
-                        is_debt_metric = any(keyword in metric_name.lower() for keyword in ['long term debt', 'current part of debt', 'net debt', 'total debt', 'debt total'])
-                        is_share_count = any(keyword in metric_name.lower() for keyword in ['outstanding', 'diluted', 'basic', 'common shares']) and not is_debt_metric
-                        
-                        # Handle combined metrics like "Issuance/Purchase of Shares" 
-                        is_combined_share_activity = 'issuance' in metric_name.lower() and ('purchase' in metric_name.lower() or 'repurchase' in metric_name.lower())
-                        
-                        # Convert to numeric and store
-                        numeric_values = []
-                        dates = []
-                        
-                        for i, val in enumerate(values):
-                            try:
-                                if pd.notna(val) and str(val) != '—' and str(val) != '':
-                                    # Handle different number formats
-                                    if isinstance(val, str):
-                                        # Remove commas, dollar signs, and other formatting
-                                        clean_val = str(val).replace(',', '').replace('$', '').replace('%', '').strip()
-                                        if clean_val and clean_val != '—':
-                                            numeric_val = float(clean_val)
-                                        else:
-                                            continue
-                                    else:
-                                        numeric_val = float(val)
-                                    
-                                    # Apply appropriate threshold based on metric type
-                                    should_include = False
-                                    if is_share_issuance or is_share_repurchase:
-                                        should_include = abs(numeric_val) > 1  # Very low threshold for share activities
-                                    elif is_debt_issuance or is_debt_repayment:
-                                        should_include = abs(numeric_val) > 10  # Low threshold for debt activities
-                                    elif is_share_count:
-                                        should_include = numeric_val > 1000  # Higher threshold for share counts
-                                    else:
-                                        should_include = numeric_val > 100  # Default threshold
-                                    
-                                    if should_include:
-                                        numeric_values.append(numeric_val)
-                                        # Get the actual column header as date
-                                        if i + 1 < len(df.columns):
-                                            date_str = str(df.columns[i + 1])
-                                            # Parse and format the date
-                                            formatted_date = parse_quarter_date(date_str)
-                                            dates.append(formatted_date)
-                                        else:
-                                            dates.append(f"Period_{i+1}")
-                                        
-                            except (ValueError, TypeError):
-                                continue
-                        
-                        if numeric_values:
-                            key = f"{sheet_name}_{metric_name}"
-                            
-                            # Handle combined share activity metrics (like "Issuance/Purchase of Shares")
-                            if is_combined_share_activity:
-                                # Split positive and negative values based on cash flow direction
-                                positive_values = []
-                                positive_dates = []
-                                negative_values = []
-                                negative_dates = []
-                                
-                                # Note: Share issuance/repurchase bars are currently disabled for cleaner analysis
-                                print(f"  Found combined metric '{metric_name}' - bars disabled for cleaner chart")
-                                
-                                for value, date in zip(numeric_values, dates):
-                                    if value > 0:  # Positive = Net Issuance
-                                        positive_values.append(value)
-                                        positive_dates.append(date)
-                                    elif value < 0:  # Negative = Net Repurchase
-                                        negative_values.append(abs(value))  # Store as positive amount
-                                        negative_dates.append(date)
-                                
-                                # Store positive cash flows as issuance (for potential future use)
-                                if positive_values:
-                                    issuance_data[f"{key}_positive"] = {
-                                        'values': positive_values,
-                                        'dates': positive_dates,
-                                        'sheet': sheet_name,
-                                        'metric': f"{metric_name} (Issuance)"
-                                    }
-                                
-                                # Store negative cash flows as repurchase (for potential future use)
-                                if negative_values:
-                                    repurchase_data[f"{key}_negative"] = {
-                                        'values': [-v for v in negative_values],  # Make negative for chart display
-                                        'dates': negative_dates,
-                                        'sheet': sheet_name,
-                                        'metric': f"{metric_name} (Repurchase)"
-                                    }
-                            
-                            # Store in appropriate data structure for single-purpose metrics
-                            elif is_share_issuance:
-                                issuance_data[key] = {
-                                    'values': numeric_values,
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            elif is_share_repurchase:
-                                repurchase_data[key] = {
-                                    'values': [-abs(v) for v in numeric_values],  # Make negative for repurchases
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            elif is_debt_issuance:
-                                debt_issuance_data[key] = {
-                                    'values': numeric_values,
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            elif is_debt_repayment:
-                                debt_repayment_data[key] = {
-                                    'values': [-abs(v) for v in numeric_values],  # Make negative for repayments
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            elif is_debt_metric:
-                                debt_metrics_data[key] = {
-                                    'values': numeric_values,
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            else:
-                                shares_data[key] = {
-                                    'values': numeric_values,
-                                    'dates': dates,
-                                    'sheet': sheet_name,
-                                    'metric': metric_name
-                                }
-                            
-                            # Store for time series analysis
-                            if 'q' in sheet_name.lower():
-                                quarterly_data.extend([(d, v, metric_name) for d, v in zip(dates, numeric_values)])
-                            else:
-                                annual_data.extend([(d, v, metric_name) for d, v in zip(dates, numeric_values)])
-                                
-            except Exception as e:
-                print(f"Warning: Could not process sheet {sheet_name}: {str(e)}")
+            df = workbook.get(sheet_name)
+            print(f"Processing quarterly sheet: {sheet_name}")
+
+            names = df.iloc[:, 0].astype(str).str.strip()
+            labels = names.str.lower()
+            selected = (labels.str.contains(_SHARE_DEBT_LABEL) & ~labels.str.contains(_SHARE_DEBT_EXCLUDE)).to_numpy()
+            if not selected.any():
                 continue
+            print(f"Found {int(selected.sum())} relevant metrics in {sheet_name}")
+
+            kind, limit, use_abs = _classify_share_debt_labels(labels[selected])
+            values = _coerce_numeric(df.iloc[selected, 1:]).to_numpy()
+            rows, periods = values.shape
+            dates = np.array([_parse_quarter_date(str(column)) for column in df.columns[1:]], dtype=object)
+
+            magnitude = np.where(use_abs[:, None], np.abs(values), values)
+            keep = (magnitude > limit[:, None]).ravel()
+            row_index = np.repeat(np.flatnonzero(selected), periods)
+            kind_index = np.repeat(np.arange(rows), periods)
+            frames.append(pd.DataFrame({
+                'sheet': sheet_name,
+                'row': row_index[keep],
+                'metric': names.to_numpy()[row_index[keep]],
+                'kind': kind[kind_index[keep]],
+                'date': np.tile(dates, rows)[keep],
+                'value': values.ravel()[keep],
+            }))
+
+        except Exception as e:
+            print(f"Warning: Could not process sheet {sheet_name}: {str(e)}")
+            continue
+
+    if not frames:
+        return pd.DataFrame(columns=SHARE_DEBT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[SHARE_DEBT_COLUMNS]
+
+
+def extract_share_debt_metrics(workbook, ticker, prices=None):
+    """
+    Collect share count, share activity and debt series from a workbook.
+    
+    Args:
+        workbook (FinancialWorkbook): Parsed StockRow export
+        ticker (str): Stock ticker symbol (for messages)
+        prices (PriceSeries, optional): Stock prices; by default the ticker's
+            price history file, or prices estimated from the workbook
         
-        if not shares_data and not issuance_data and not repurchase_data and not debt_issuance_data and not debt_repayment_data and not debt_metrics_data:
-            print(f"No relevant share or debt data found for {ticker}")
-            return False
-        
-        # Extract stock price data from metrics ratios to convert cash flow amounts to share counts
+    Returns:
+        dict: Series by kind ('shares_data', 'issuance_data', 'repurchase_data',
+        'debt_issuance_data', 'debt_repayment_data', 'debt_metrics_data',
+        'stock_price_data'), or None if the workbook has no such data.
+        Share issuance and repurchase series also hold 'shares', the dollar
+        amounts converted to share counts at the as-of price (NaN where no
+        price is known).
+    """
+    from ..core.prices import PriceSeries, period_ends
+
+    frame = share_debt_frame(workbook)
+    if frame.empty:
+        print(f"No relevant share or debt data found for {ticker}")
+        return None
+
+    # Stock prices convert cash flow amounts to share counts
+    if prices is None:
         try:
-            ratios_df = pd.read_excel(latest_file, sheet_name='Metrics Ratios, Q')
-            
-            # Look for Book value per Share to calculate approximate stock price
-            book_value_per_share_row = ratios_df[ratios_df.iloc[:, 0].astype(str).str.contains('Book value per Share', case=False, na=False)]
-            pb_ratio_row = ratios_df[ratios_df.iloc[:, 0].astype(str).str.contains('P/B ratio', case=False, na=False)]
-            
-            if not book_value_per_share_row.empty and not pb_ratio_row.empty:
-                # Calculate estimated stock prices for share count conversion
-                
-                # Extract book value per share data
-                bv_row = book_value_per_share_row.iloc[0]
-                pb_row = pb_ratio_row.iloc[0]
-                
-                for i in range(1, len(bv_row)):
-                    if pd.notna(bv_row.iloc[i]) and pd.notna(pb_row.iloc[i]):
-                        try:
-                            book_value = float(str(bv_row.iloc[i]).replace(',', '').replace('$', ''))
-                            pb_ratio = float(str(pb_row.iloc[i]).replace(',', '').replace('$', ''))
-                            stock_price = book_value * pb_ratio
-                            
-                            # Get the date for this column
-                            date_str = str(ratios_df.columns[i])
-                            formatted_date = parse_quarter_date(date_str)
-                            stock_price_data[formatted_date] = stock_price
-                        except (ValueError, TypeError):
-                            continue
-                            
-                print(f"Extracted stock prices for {len(stock_price_data)} periods")
-                if len(stock_price_data) > 0:
-                    # Show a few examples of the calculated stock prices
-                    sample_dates = list(stock_price_data.keys())[:3]
-                    print("Sample stock price calculations:")
-                    for date in sample_dates:
-                        print(f"  {date}: ${stock_price_data[date]:.2f}")
-            else:
-                # No stock price data available - proceed without price conversion
-                pass
+            prices = PriceSeries.for_ticker(ticker, workbook)
         except Exception as e:
             print(f"Warning: Could not extract stock price data: {str(e)}")
+            prices = PriceSeries([], [])
+    if len(prices):
+        print(f"Using {len(prices)} stock prices ({prices.source})")
+        print("Latest stock prices:")
+        for date, price in zip(prices.dates[-3:], prices.prices[-3:]):
+            print(f"  {date}: ${price:.2f}")
+
+    share_flows = frame['kind'].isin(['share_issuance', 'share_repurchase', 'share_activity']).to_numpy()
+    shares = np.full(len(frame), np.nan)
+    shares[share_flows] = prices.to_shares(frame['value'].to_numpy()[share_flows],
+                                           period_ends(frame['date'][share_flows]))
+    frame['shares'] = shares
+
+    metrics = {name: {} for name in SHARE_DEBT_KINDS.values()}
+
+    def series(rows, sheet_name, metric_name, sign=1):
+        entry = {
+            'values': (sign * rows['value'].abs() if sign < 0 else rows['value']).tolist(),
+            'dates': rows['date'].tolist(),
+            'sheet': sheet_name,
+            'metric': metric_name
+        }
+        if rows['kind'].iat[0] in ('share_issuance', 'share_repurchase', 'share_activity'):
+            entry['shares'] = (sign * rows['shares'].abs() if sign < 0 else rows['shares']).tolist()
+        return entry
+
+    for (sheet_name, _), rows in frame.groupby(['sheet', 'row'], sort=False):
+        metric_name = rows['metric'].iat[0]
+        kind = rows['kind'].iat[0]
+        key = f"{sheet_name}_{metric_name}"
+
+        if kind == 'share_activity':
+            # Note: Share issuance/repurchase bars are currently disabled for cleaner analysis
+            print(f"  Found combined metric '{metric_name}' - bars disabled for cleaner chart")
+            # Positive cash flows are net issuance, negative ones net repurchase
+            issued = rows[rows['value'] > 0]
+            repurchased = rows[rows['value'] < 0]
+            if not issued.empty:
+                metrics['issuance_data'][f"{key}_positive"] = series(issued, sheet_name, f"{metric_name} (Issuance)")
+            if not repurchased.empty:
+                metrics['repurchase_data'][f"{key}_negative"] = series(repurchased, sheet_name, f"{metric_name} (Repurchase)")
+            continue
+
+        # Outflows are drawn below the axis
+        sign = -1 if kind in ('share_repurchase', 'debt_repayment') else 1
+        metrics[SHARE_DEBT_KINDS[kind]][key] = series(rows, sheet_name, metric_name, sign)
+
+    metrics['stock_price_data'] = prices.by_label(frame['date'])
+    return metrics
+
+
+def has_shares_chart(metrics):
+    """True if the metrics contain data for the shares chart."""
+    return bool(metrics['shares_data'] or metrics['issuance_data'] or metrics['repurchase_data'])
+
+
+def has_debt_chart(metrics):
+    """True if the metrics contain data for the debt chart."""
+    return bool(metrics['debt_issuance_data'] or metrics['debt_repayment_data'] or metrics['debt_metrics_data'])
+
+
+def create_shares_chart(ticker, metrics):
+    """
+    Create the shares outstanding chart.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        metrics (dict): Result of extract_share_debt_metrics
         
-        # Create visualizations
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Create two separate charts: one for shares, one for debt
-        plt.style.use('default')  # Clean, professional style
+    Returns:
+        Figure: The chart, laid out
+    """
+    shares_data = metrics['shares_data']
+    issuance_data = metrics['issuance_data']
+    repurchase_data = metrics['repurchase_data']
+    date_sort_key = _date_sort_key
+    
+    fig1, ax1 = new_figure(1, 1, figsize=(16, 10))
+    fig1.suptitle(f'{ticker.upper()} - Shares Outstanding Analysis', fontsize=24, fontweight='bold', y=0.98)
+
+    # Add more space at the top
+    fig1.subplots_adjust(top=0.92)
+
+    # Find unique dates for shares data only
+    shares_dates = set()
+    for data_dict in [shares_data, issuance_data, repurchase_data]:
+        for data in data_dict.values():
+            shares_dates.update(data['dates'])
+
+    shares_timeline = sorted(list(shares_dates), key=date_sort_key)
+    shares_date_to_x = {date: i for i, date in enumerate(shares_timeline)}
+
+    # Plot share count lines
+    colors = matplotlib.colormaps['Set1'](np.linspace(0, 1, min(len(shares_data), 9)))
+
+    for i, (key, data) in enumerate(shares_data.items()):
+        values = data['values']
+        dates = data['dates']
+
+        # Convert values to millions and sort by date chronologically
+        date_value_pairs = list(zip(dates, [v/1e6 for v in values]))
+        date_value_pairs.sort(key=lambda x: date_sort_key(x[0]))
+
+        # Create aligned x and y data
+        x_positions = []
+        y_values = []
+
+        for date, value in date_value_pairs:
+            if date in shares_date_to_x:
+                x_positions.append(shares_date_to_x[date])
+                y_values.append(value)
+
+        if x_positions and y_values:
+            label = data['metric'][:40] if len(data['metric']) <= 40 else data['metric'][:37] + '...'
+            line_styles = ['-', '--', '-.', ':', '-', '--', '-.', ':', '-']
+            line_style = line_styles[i % len(line_styles)]
+
+            ax1.plot(x_positions, y_values, marker='o', label=label, color=colors[i % len(colors)], 
+                   linewidth=3, markersize=6, linestyle=line_style, alpha=0.8)
+
+    # Configure shares chart
+    ax1.set_title('Historical Shares Outstanding (Millions)', fontsize=18, fontweight='bold', pad=30)
+    ax1.set_xlabel('Time Period', fontsize=16, fontweight='bold')
+    ax1.set_ylabel('Shares (Millions)', fontsize=16, fontweight='bold')
+
+    # Fix x-axis for shares
+    max_periods = len(shares_timeline)
+    ax1.set_xlim(-0.5, max_periods - 0.5)
+
+    # Create proper x-tick labels - ensure we show first and last
+    if max_periods > 12:
+        step = max(1, max_periods // 8)
+        tick_positions = list(range(0, max_periods, step))
+        # Always include the last tick
+        if tick_positions[-1] != max_periods - 1:
+            tick_positions.append(max_periods - 1)
+    else:
+        tick_positions = list(range(max_periods))
+
+    tick_labels = [shares_timeline[i] for i in tick_positions]
+    ax1.set_xticks(tick_positions)
+    ax1.set_xticklabels(tick_labels, rotation=45, ha='right')
+
+    ax1.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=12, frameon=True, 
+             fancybox=True, shadow=True)
+    ax1.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+    ax1.tick_params(axis='both', which='major', labelsize=12)
+    ax1.set_facecolor('#fafafa')
+
+    fig1.tight_layout()
+    return fig1
+
+
+def plot_shares_chart(ticker, metrics, shares_chart_path, save_options=None):
+    """
+    Create and save the shares outstanding chart (a render job).
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        metrics (dict): Result of extract_share_debt_metrics
+        shares_chart_path (str): File to write; the extension sets the format
+        save_options (dict, optional): savefig() options (default:
+            publication quality)
+    """
+    with chart_style():  # Clean, professional style
+        fig = create_shares_chart(ticker, metrics)
+    fig.savefig(shares_chart_path, **(save_options or _publication_options(SHARES_SAVE_OPTIONS)))
+    print(f"Shares chart saved to: {shares_chart_path}")
+
+
+def create_debt_chart(ticker, metrics):
+    """
+    Create the debt activity chart.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        metrics (dict): Result of extract_share_debt_metrics
         
-        # Sort dates chronologically - create a custom sort function
-        def date_sort_key(date_str):
-            """Sort dates like Q1 2023, Q2 2023, etc. chronologically"""
-            try:
-                if 'Q' in date_str and len(date_str.split()) == 2:
-                    quarter, year = date_str.split()
-                    quarter_num = int(quarter[1])  # Extract number from Q1, Q2, etc.
-                    year_num = int(year)
-                    return (year_num, quarter_num)
-                else:
-                    return (2000, 1)  # Default for unparseable dates
-            except:
-                return (2000, 1)
+    Returns:
+        Figure: The chart, laid out
+    """
+    debt_issuance_data = metrics['debt_issuance_data']
+    debt_repayment_data = metrics['debt_repayment_data']
+    debt_metrics_data = metrics['debt_metrics_data']
+    date_sort_key = _date_sort_key
+    
+    fig2, ax2 = new_figure(1, 1, figsize=(16, 10))
+    fig2.suptitle(f'{ticker.upper()} - Debt Activity Analysis', fontsize=24, fontweight='bold', y=0.98)
+
+    # Add subtitle explaining data availability
+    fig2.text(0.5, 0.94, 'Note: Lines may start/end at different times based on data availability in financial reports', 
+             ha='center', fontsize=12, style='italic', alpha=0.7)
+
+    # Add more space at the top
+    fig2.subplots_adjust(top=0.90)
+
+    # Find unique dates for debt data including debt metrics
+    debt_dates = set()
+    for data_dict in [debt_issuance_data, debt_repayment_data, debt_metrics_data]:
+        for data in data_dict.values():
+            debt_dates.update(data['dates'])
+
+    debt_timeline = sorted(list(debt_dates), key=date_sort_key)
+    debt_date_to_x = {date: i for i, date in enumerate(debt_timeline)}
+
+    # Plot debt level lines first (as background)
+    debt_colors = matplotlib.colormaps['Set2'](np.linspace(0, 1, min(len(debt_metrics_data), 8)))
+
+    for i, (key, data) in enumerate(debt_metrics_data.items()):
+        values = data['values']
+        dates = data['dates']
+
+        # Convert values to millions and sort by date chronologically
+        date_value_pairs = list(zip(dates, [v/1e6 for v in values]))
+        date_value_pairs.sort(key=lambda x: date_sort_key(x[0]))
+
+        # Create aligned x and y data
+        x_positions = []
+        y_values = []
+
+        for date, value in date_value_pairs:
+            if date in debt_date_to_x:
+                x_positions.append(debt_date_to_x[date])
+                y_values.append(value)
+
+        if x_positions and y_values:
+            label = data['metric'][:40] if len(data['metric']) <= 40 else data['metric'][:37] + '...'
+            line_styles = ['-', '--', '-.', ':', '-', '--', '-.', ':', '-']
+            line_style = line_styles[i % len(line_styles)]
+
+            ax2.plot(x_positions, y_values, marker='o', label=label, color=debt_colors[i % len(debt_colors)], 
+                   linewidth=3, markersize=6, linestyle=line_style, alpha=0.8)
+
+    # Plot debt bars
+    bar_width = 0.6
+    debt_bar_data = {}
+
+    # Debt issuance (positive, blue bars)
+    for key, data in debt_issuance_data.items():
+        for date, value in zip(data['dates'], data['values']):
+            if date in debt_date_to_x:
+                x_pos = debt_date_to_x[date]
+                if x_pos not in debt_bar_data:
+                    debt_bar_data[x_pos] = {'issuance': 0, 'repayment': 0}
+                debt_bar_data[x_pos]['issuance'] += value / 1e6
+
+    # Debt repayment (negative, orange bars)
+    for key, data in debt_repayment_data.items():
+        for date, value in zip(data['dates'], data['values']):
+            if date in debt_date_to_x:
+                x_pos = debt_date_to_x[date]
+                if x_pos not in debt_bar_data:
+                    debt_bar_data[x_pos] = {'issuance': 0, 'repayment': 0}
+                debt_bar_data[x_pos]['repayment'] += value / 1e6
+
+    # Plot debt bars
+    if debt_bar_data:
+        x_positions = list(debt_bar_data.keys())
+        debt_issuance_vals = [debt_bar_data[x]['issuance'] for x in x_positions]
+        debt_repayment_vals = [debt_bar_data[x]['repayment'] for x in x_positions]
+
+        if any(v != 0 for v in debt_issuance_vals):
+            ax2.bar(x_positions, debt_issuance_vals, bar_width, label='Debt Issuance', color='blue', alpha=0.7)
+        if any(v != 0 for v in debt_repayment_vals):
+            ax2.bar(x_positions, debt_repayment_vals, bar_width, label='Debt Repayment', color='orange', alpha=0.7)
+
+    # Configure debt chart
+    ax2.set_title('Historical Debt Activity (Millions)', fontsize=18, fontweight='bold', pad=30)
+    ax2.set_xlabel('Time Period', fontsize=16, fontweight='bold')
+    ax2.set_ylabel('Amount (Millions)', fontsize=16, fontweight='bold')
+
+    # Fix x-axis for debt
+    max_periods = len(debt_timeline)
+    ax2.set_xlim(-0.5, max_periods - 0.5)
+
+    # Create proper x-tick labels - ensure we show first and last
+    if max_periods > 12:
+        step = max(1, max_periods // 8)
+        tick_positions = list(range(0, max_periods, step))
+        # Always include the last tick
+        if tick_positions[-1] != max_periods - 1:
+            tick_positions.append(max_periods - 1)
+    else:
+        tick_positions = list(range(max_periods))
+
+    tick_labels = [debt_timeline[i] for i in tick_positions]
+    ax2.set_xticks(tick_positions)
+    ax2.set_xticklabels(tick_labels, rotation=45, ha='right')
+
+    ax2.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=12, frameon=True, 
+             fancybox=True, shadow=True)
+    ax2.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+    ax2.tick_params(axis='both', which='major', labelsize=12)
+    ax2.set_facecolor('#fafafa')
+
+    fig2.tight_layout()
+    return fig2
+
+
+def plot_debt_chart(ticker, metrics, debt_chart_path, save_options=None):
+    """
+    Create and save the debt activity chart (a render job).
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        metrics (dict): Result of extract_share_debt_metrics
+        debt_chart_path (str): File to write; the extension sets the format
+        save_options (dict, optional): savefig() options (default:
+            publication quality)
+    """
+    with chart_style():  # Clean, professional style
+        fig = create_debt_chart(ticker, metrics)
+    fig.savefig(debt_chart_path, **(save_options or _publication_options(SHARES_SAVE_OPTIONS)))
+    print(f"Debt chart saved to: {debt_chart_path}")
+
+
+def print_shares_summary(ticker, metrics):
+    """Print the shares outstanding summary and key insights."""
+    shares_data = metrics['shares_data']
+    
+    # Print detailed summary to console
+    print(f"\n=== {ticker.upper()} SHARES OUTSTANDING SUMMARY ===")
+
+    # Group by sheet type for better organization
+    balance_sheet_data = {}
+    income_statement_data = {}
+    other_data = {}
+
+    for key, data in shares_data.items():
+        sheet = data['sheet'].lower()
+        metric = data['metric']
+        current = data['values'][0] if data['values'] else 0
+
+        if 'balance' in sheet:
+            balance_sheet_data[metric] = current
+        elif 'income' in sheet:
+            income_statement_data[metric] = current
+        else:
+            other_data[metric] = current
+
+    if balance_sheet_data:
+        print("\nBalance Sheet (Shares Outstanding):")
+        for metric, value in balance_sheet_data.items():
+            print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+
+    if income_statement_data:
+        print("\nIncome Statement (Weighted Average Shares):")
+        for metric, value in income_statement_data.items():
+            print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+
+    if other_data:
+        print("\nOther Share Metrics:")
+        for metric, value in other_data.items():
+            print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+
+    # Key insights
+    print(f"\n=== KEY INSIGHTS ===")
+    if balance_sheet_data and income_statement_data:
+        balance_max = max(balance_sheet_data.values()) if balance_sheet_data else 0
+        income_max = max(income_statement_data.values()) if income_statement_data else 0
+
+        if balance_max > income_max * 1.1:  # More than 10% difference
+            print(f"NOTICE: Balance sheet shows {balance_max/1e6:.1f}M shares outstanding")
+            print(f"        Income statement shows {income_max/1e6:.1f}M weighted average shares")
+            print(f"        Difference: {(balance_max-income_max)/1e6:.1f}M shares ({((balance_max-income_max)/income_max*100):.1f}%)")
+            print("        This suggests significant share issuance during reporting periods")
+
+    # Dollar amounts converted at the as-of stock price of each quarter
+    issued = sum(np.nansum(data.get('shares', [])) for data in metrics['issuance_data'].values())
+    repurchased = -sum(np.nansum(data.get('shares', [])) for data in metrics['repurchase_data'].values())
+    if issued or repurchased:
+        print(f"Estimated shares issued: {issued/1e6:.1f}M, repurchased: {repurchased/1e6:.1f}M "
+              f"(net {(issued - repurchased)/1e6:+.1f}M)")
+
+
+def create_shares_outstanding_analysis(ticker, output_dir='./analysis_output', workbook=None,
+                                       force_render=False, profile="publication", chart_format="png",
+                                       price_file=None):
+    """
+    Create comprehensive analysis of shares outstanding data from downloaded financial statements.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        output_dir (str): Directory to save analysis charts
+        workbook (FinancialWorkbook, optional): Already-parsed workbook; when
+            omitted the most recent downloaded file for the ticker is loaded
+        force_render (bool): Render the charts even if they are up to date
+        profile (str): Render profile (publication, draft or thumbnail)
+        chart_format (str): png, svg or webp
+        price_file (str, optional): Price history CSV for converting buybacks
+            to share counts (default: data/prices/<ticker>.csv if present,
+            else prices estimated from the workbook)
         
-        # CHART 1: SHARES ANALYSIS
-        if shares_data or issuance_data or repurchase_data:
-            fig1, ax1 = plt.subplots(1, 1, figsize=(16, 10))
-            fig1.suptitle(f'{ticker.upper()} - Shares Outstanding Analysis', fontsize=24, fontweight='bold', y=0.98)
-            
-            # Add more space at the top
-            plt.subplots_adjust(top=0.92)
-            
-            # Find unique dates for shares data only
-            shares_dates = set()
-            for data_dict in [shares_data, issuance_data, repurchase_data]:
-                for data in data_dict.values():
-                    shares_dates.update(data['dates'])
-            
-            shares_timeline = sorted(list(shares_dates), key=date_sort_key)
-            shares_date_to_x = {date: i for i, date in enumerate(shares_timeline)}
-            
-            # Plot share count lines
-            colors = plt.cm.Set1(np.linspace(0, 1, min(len(shares_data), 9)))
-            
-            for i, (key, data) in enumerate(shares_data.items()):
-                values = data['values']
-                dates = data['dates']
-                
-                # Convert values to millions and sort by date chronologically
-                date_value_pairs = list(zip(dates, [v/1e6 for v in values]))
-                date_value_pairs.sort(key=lambda x: date_sort_key(x[0]))
-                
-                # Create aligned x and y data
-                x_positions = []
-                y_values = []
-                
-                for date, value in date_value_pairs:
-                    if date in shares_date_to_x:
-                        x_positions.append(shares_date_to_x[date])
-                        y_values.append(value)
-                
-                if x_positions and y_values:
-                    label = data['metric'][:40] if len(data['metric']) <= 40 else data['metric'][:37] + '...'
-                    line_styles = ['-', '--', '-.', ':', '-', '--', '-.', ':', '-']
-                    line_style = line_styles[i % len(line_styles)]
-                    
-                    ax1.plot(x_positions, y_values, marker='o', label=label, color=colors[i % len(colors)], 
-                           linewidth=3, markersize=6, linestyle=line_style, alpha=0.8)
-            
-            # Commented out share issuance and repurchase bars for cleaner analysis
-            # # Plot share issuance and repurchase bars
-            # bar_width = 0.6
-            # share_bar_data = {}
-            # 
-            # # Share issuance (positive, green bars) - Convert from dollars to shares
-            # for key, data in issuance_data.items():
-            #     for date, value in zip(data['dates'], data['values']):
-            #         if date in shares_date_to_x:
-            #             x_pos = shares_date_to_x[date]
-            #             if x_pos not in share_bar_data:
-            #                 share_bar_data[x_pos] = {'issuance': 0, 'repurchase': 0}
-            #             
-            #             # Convert from dollars to approximate shares using stock price
-            #             if date in stock_price_data and stock_price_data[date] > 0:
-            #                 shares_issued = value / stock_price_data[date]  # dollars / price per share = shares
-            #                 
-            #                 # Cap extremely large issuances (likely one-time events like IPO, SPAC, etc.)
-            #                 # Flag if issuance would represent more than 25% of outstanding shares (~50M shares)
-            #                 if shares_issued > 50e6:  # More than 50 million shares
-            #                     print(f"  Large share issuance detected in {date}: ${value/1e6:.0f}M → {shares_issued/1e6:.1f}M shares (capped at 25M)")
-            #                     shares_issued = min(shares_issued, 25e6)  # Cap at 25 million shares
-            #                 
-            #                 share_bar_data[x_pos]['issuance'] += shares_issued / 1e6  # Convert to millions
-            #             else:
-            #                 # Fallback: treat as millions of dollars if no stock price available
-            #                 share_bar_data[x_pos]['issuance'] += value / 1e6
-            # 
-            # # Share repurchase (negative, red bars) - Convert from dollars to shares
-            # for key, data in repurchase_data.items():
-            #     for date, value in zip(data['dates'], data['values']):
-            #         if date in shares_date_to_x:
-            #             x_pos = shares_date_to_x[date]
-            #             if x_pos not in share_bar_data:
-            #                 share_bar_data[x_pos] = {'issuance': 0, 'repurchase': 0}
-            #             
-            #             # Convert from dollars to approximate shares using stock price
-            #             if date in stock_price_data and stock_price_data[date] > 0:
-            #                 shares_repurchased = abs(value) / stock_price_data[date]  # dollars / price per share = shares
-            #                 
-            #                 # Cap extremely large repurchases (likely one-time events)
-            #                 if shares_repurchased > 100e6:  # More than 100 million shares
-            #                     print(f"  Large share repurchase detected in {date}: ${abs(value)/1e6:.0f}M → {shares_repurchased/1e6:.1f}M shares (capped at 50M)")
-            #                     shares_repurchased = min(shares_repurchased, 50e6)  # Cap at 50 million shares
-            #                 
-            #                 share_bar_data[x_pos]['repurchase'] += -shares_repurchased / 1e6  # Convert to millions, keep negative
-            #             else:
-            #                 # Fallback: treat as millions of dollars if no stock price available
-            #                 share_bar_data[x_pos]['repurchase'] += value / 1e6
-            # 
-            # # Plot share bars
-            # if share_bar_data:
-            #     x_positions = list(share_bar_data.keys())
-            #     issuance_vals = [share_bar_data[x]['issuance'] for x in x_positions]
-            #     repurchase_vals = [share_bar_data[x]['repurchase'] for x in x_positions]
-            #     
-            #     # Determine labels based on whether we have stock price data
-            #     if stock_price_data:
-            #         issuance_label = 'Share Issuance (Est. Shares)'
-            #         repurchase_label = 'Share Repurchase (Est. Shares)'
-            #     else:
-            #         issuance_label = 'Share Issuance ($M)'
-            #         repurchase_label = 'Share Repurchase ($M)'
-            #     
-            #     if any(v != 0 for v in issuance_vals):
-            #         ax1.bar(x_positions, issuance_vals, bar_width, label=issuance_label, color='green', alpha=0.7)
-            #     if any(v != 0 for v in repurchase_vals):
-            #         ax1.bar(x_positions, repurchase_vals, bar_width, label=repurchase_label, color='red', alpha=0.7)
-            
-            # Configure shares chart
-            ax1.set_title('Historical Shares Outstanding (Millions)', fontsize=18, fontweight='bold', pad=30)
-            ax1.set_xlabel('Time Period', fontsize=16, fontweight='bold')
-            ax1.set_ylabel('Shares (Millions)', fontsize=16, fontweight='bold')
-            
-            # Fix x-axis for shares
-            max_periods = len(shares_timeline)
-            ax1.set_xlim(-0.5, max_periods - 0.5)
-            
-            # Create proper x-tick labels - ensure we show first and last
-            if max_periods > 12:
-                step = max(1, max_periods // 8)
-                tick_positions = list(range(0, max_periods, step))
-                # Always include the last tick
-                if tick_positions[-1] != max_periods - 1:
-                    tick_positions.append(max_periods - 1)
-            else:
-                tick_positions = list(range(max_periods))
-            
-            tick_labels = [shares_timeline[i] for i in tick_positions]
-            ax1.set_xticks(tick_positions)
-            ax1.set_xticklabels(tick_labels, rotation=45, ha='right')
-            
-            ax1.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=12, frameon=True, 
-                     fancybox=True, shadow=True)
-            ax1.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-            ax1.tick_params(axis='both', which='major', labelsize=12)
-            ax1.set_facecolor('#fafafa')
-            
-            # Save shares chart
-            plt.tight_layout()
-            shares_chart_path = os.path.join(output_dir, f'{ticker}_shares_analysis.png')
-            plt.savefig(shares_chart_path, dpi=300, bbox_inches='tight')
-            plt.close(fig1)
-            print(f"Shares chart saved to: {shares_chart_path}")
+    Returns:
+        bool: True if analysis was successful, False otherwise
         
-        # CHART 2: DEBT ANALYSIS
-        if debt_issuance_data or debt_repayment_data or debt_metrics_data:
-            fig2, ax2 = plt.subplots(1, 1, figsize=(16, 10))
-            fig2.suptitle(f'{ticker.upper()} - Debt Activity Analysis', fontsize=24, fontweight='bold', y=0.98)
-            
-            # Add subtitle explaining data availability
-            fig2.text(0.5, 0.94, 'Note: Lines may start/end at different times based on data availability in financial reports', 
-                     ha='center', fontsize=12, style='italic', alpha=0.7)
-            
-            # Add more space at the top
-            plt.subplots_adjust(top=0.90)
-            
-            # Find unique dates for debt data including debt metrics
-            debt_dates = set()
-            for data_dict in [debt_issuance_data, debt_repayment_data, debt_metrics_data]:
-                for data in data_dict.values():
-                    debt_dates.update(data['dates'])
-            
-            debt_timeline = sorted(list(debt_dates), key=date_sort_key)
-            debt_date_to_x = {date: i for i, date in enumerate(debt_timeline)}
-            
-            # Plot debt level lines first (as background)
-            debt_colors = plt.cm.Set2(np.linspace(0, 1, min(len(debt_metrics_data), 8)))
-            
-            for i, (key, data) in enumerate(debt_metrics_data.items()):
-                values = data['values']
-                dates = data['dates']
-                
-                # Convert values to millions and sort by date chronologically
-                date_value_pairs = list(zip(dates, [v/1e6 for v in values]))
-                date_value_pairs.sort(key=lambda x: date_sort_key(x[0]))
-                
-                # Create aligned x and y data
-                x_positions = []
-                y_values = []
-                
-                for date, value in date_value_pairs:
-                    if date in debt_date_to_x:
-                        x_positions.append(debt_date_to_x[date])
-                        y_values.append(value)
-                
-                if x_positions and y_values:
-                    label = data['metric'][:40] if len(data['metric']) <= 40 else data['metric'][:37] + '...'
-                    line_styles = ['-', '--', '-.', ':', '-', '--', '-.', ':', '-']
-                    line_style = line_styles[i % len(line_styles)]
-                    
-                    ax2.plot(x_positions, y_values, marker='o', label=label, color=debt_colors[i % len(debt_colors)], 
-                           linewidth=3, markersize=6, linestyle=line_style, alpha=0.8)
-            
-            # Plot debt bars
-            bar_width = 0.6
-            debt_bar_data = {}
-            
-            # Debt issuance (positive, blue bars)
-            for key, data in debt_issuance_data.items():
-                for date, value in zip(data['dates'], data['values']):
-                    if date in debt_date_to_x:
-                        x_pos = debt_date_to_x[date]
-                        if x_pos not in debt_bar_data:
-                            debt_bar_data[x_pos] = {'issuance': 0, 'repayment': 0}
-                        debt_bar_data[x_pos]['issuance'] += value / 1e6
-            
-            # Debt repayment (negative, orange bars)
-            for key, data in debt_repayment_data.items():
-                for date, value in zip(data['dates'], data['values']):
-                    if date in debt_date_to_x:
-                        x_pos = debt_date_to_x[date]
-                        if x_pos not in debt_bar_data:
-                            debt_bar_data[x_pos] = {'issuance': 0, 'repayment': 0}
-                        debt_bar_data[x_pos]['repayment'] += value / 1e6
+    The two charts are rendered by the render scheduler
+    (marketswimmer.visualization.render), in parallel where it has workers.
+    """
+    try:
+        if workbook is None:
+            # Find the most recent downloaded file for the ticker
+            # Normalize ticker by replacing dots with underscores (e.g., BRK.B -> brk_b)
+            normalized_ticker = ticker.lower().replace('.', '_')
+            pattern = f'./downloaded_files/*{normalized_ticker}*.xlsx'
+            xlsx_files = glob.glob(pattern)
             
-            # Plot debt bars
-            if debt_bar_data:
-                x_positions = list(debt_bar_data.keys())
-                debt_issuance_vals = [debt_bar_data[x]['issuance'] for x in x_positions]
-                debt_repayment_vals = [debt_bar_data[x]['repayment'] for x in x_positions]
+            if not xlsx_files:
+                print(f"No downloaded files found for ticker {ticker} (searched for pattern: {pattern})")
+                return False
                 
-                if any(v != 0 for v in debt_issuance_vals):
-                    ax2.bar(x_positions, debt_issuance_vals, bar_width, label='Debt Issuance', color='blue', alpha=0.7)
-                if any(v != 0 for v in debt_repayment_vals):
-                    ax2.bar(x_positions, debt_repayment_vals, bar_width, label='Debt Repayment', color='orange', alpha=0.7)
-            
-            # Configure debt chart
-            ax2.set_title('Historical Debt Activity (Millions)', fontsize=18, fontweight='bold', pad=30)
-            ax2.set_xlabel('Time Period', fontsize=16, fontweight='bold')
-            ax2.set_ylabel('Amount (Millions)', fontsize=16, fontweight='bold')
-            
-            # Fix x-axis for debt
-            max_periods = len(debt_timeline)
-            ax2.set_xlim(-0.5, max_periods - 0.5)
-            
-            # Create proper x-tick labels - ensure we show first and last
-            if max_periods > 12:
-                step = max(1, max_periods // 8)
-                tick_positions = list(range(0, max_periods, step))
-                # Always include the last tick
-                if tick_positions[-1] != max_periods - 1:
-                    tick_positions.append(max_periods - 1)
-            else:
-                tick_positions = list(range(max_periods))
-            
-            tick_labels = [debt_timeline[i] for i in tick_positions]
-            ax2.set_xticks(tick_positions)
-            ax2.set_xticklabels(tick_labels, rotation=45, ha='right')
-            
-            ax2.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=12, frameon=True, 
-                     fancybox=True, shadow=True)
-            ax2.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-            ax2.tick_params(axis='both', which='major', labelsize=12)
-            ax2.set_facecolor('#fafafa')
-            
-            # Save debt chart
-            plt.tight_layout()
-            debt_chart_path = os.path.join(output_dir, f'{ticker}_debt_analysis.png')
-            plt.savefig(debt_chart_path, dpi=300, bbox_inches='tight')
-            plt.close(fig2)
-            print(f"Debt chart saved to: {debt_chart_path}")
-        
-        # Print detailed summary to console
-        print(f"\n=== {ticker.upper()} SHARES OUTSTANDING SUMMARY ===")
+            # Get the most recent file and parse all sheets once
+            from ..core.workbook import FinancialWorkbook
+            latest_file = max(xlsx_files, key=os.path.getmtime)
+            workbook = FinancialWorkbook.load(latest_file)
         
-        # Group by sheet type for better organization
-        balance_sheet_data = {}
-        income_statement_data = {}
-        other_data = {}
+        if workbook.file_path:
+            print(f"Analyzing shares data from: {workbook.file_path.name}")
         
-        for key, data in shares_data.items():
-            sheet = data['sheet'].lower()
-            metric = data['metric']
-            current = data['values'][0] if data['values'] else 0
-            
-            if 'balance' in sheet:
-                balance_sheet_data[metric] = current
-            elif 'income' in sheet:
-                income_statement_data[metric] = current
-            else:
-                other_data[metric] = current
+        prices = None
+        if price_file is not None:
+            from ..core.prices import PriceSeries
+            prices = PriceSeries.from_file(price_file)
         
-        if balance_sheet_data:
-            print("\nBalance Sheet (Shares Outstanding):")
-            for metric, value in balance_sheet_data.items():
-                print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+        metrics = extract_share_debt_metrics(workbook, ticker, prices)
+        if metrics is None:
+            return False
         
-        if income_statement_data:
-            print("\nIncome Statement (Weighted Average Shares):")
-            for metric, value in income_statement_data.items():
-                print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+        # Create visualizations: one chart for shares, one for debt
+        os.makedirs(output_dir, exist_ok=True)
         
-        if other_data:
-            print("\nOther Share Metrics:")
-            for metric, value in other_data.items():
-                print(f"  {metric}: {value:,.0f} shares ({value/1e6:.1f}M)")
+        from .render import render_figures, share_chart_jobs
+        render_figures(share_chart_jobs(ticker, metrics, output_dir, profile, chart_format),
+                       force=force_render)
         
-        # Key insights
-        print(f"\n=== KEY INSIGHTS ===")
-        if balance_sheet_data and income_statement_data:
-            balance_max = max(balance_sheet_data.values()) if balance_sheet_data else 0
-            income_max = max(income_statement_data.values()) if income_statement_data else 0
-            
-            if balance_max > income_max * 1.1:  # More than 10% difference
-                print(f"NOTICE: Balance sheet shows {balance_max/1e6:.1f}M shares outstanding")
-                print(f"        Income statement shows {income_max/1e6:.1f}M weighted average shares")
-                print(f"        Difference: {(balance_max-income_max)/1e6:.1f}M shares ({((balance_max-income_max)/income_max*100):.1f}%)")
-                print("        This suggests significant share issuance during reporting periods")
+        print_shares_summary(ticker, metrics)
         
         return True
         
@@ -875,158 +948,76 @@ def load_data(ticker=None):
         print("[INFO] CSV files should be in the 'data/' directory")
         return None, None
 
+# CSV columns converted to $ millions for plotting
+MILLIONS_COLUMNS = {
+    'Net Income': 'net_income',
+    'Depreciation': 'depreciation', 
+    'CapEx': 'capex',
+    'Working Capital Change': 'working_capital_change',
+    'Owner Earnings': 'owner_earnings'
+}
+
+def _add_millions(df):
+    for csv_col, standard_col in MILLIONS_COLUMNS.items():
+        if csv_col in df.columns:
+            df[f'{standard_col}_millions'] = df[csv_col] / 1_000_000
+
 def prepare_quarterly_data(df):
-    """Prepare quarterly data for plotting."""
-    # Convert period to datetime for better plotting
-    df = df.copy()
+    """
+    Prepare quarterly data for plotting.
     
-    print(f"[DEBUG] Raw quarterly data shape: {df.shape}")
-    print(f"[DEBUG] Period column sample values: {df['Period'].head().tolist()}")
-    print(f"[DEBUG] Period column data types: {df['Period'].dtype}")
+    Dates come from the integer 'Period Code' column the calculators write
+    (parsed from 'Period' for older files), in one vectorized conversion.
+    """
+    from ..core import periods
     
-    # Ensure Period column is string type for string operations
+    df = df.copy()
+    codes = periods.period_codes(df)
     df['Period'] = df['Period'].astype(str)
-    print(f"[DEBUG] Period column after string conversion: {df['Period'].head().tolist()}")
-    
-    # Check if this is actually annual data masquerading as quarterly data
-    period_values = df['Period'].unique()
-    is_annual_data = all(len(p) == 4 and p.isdigit() for p in period_values)
     
-    if is_annual_data:
+    if periods.is_annual(codes).all():
+        # Annual data in the quarterly file: plot each year mid-year
         print(f"[WARNING] Detected annual data in quarterly file - treating as annual")
-        # This is annual data, so just parse as years
-        df['year'] = df['Period'].astype(int)
-        df['quarter'] = 2  # Use Q2 as a middle-of-year approximation
-        df['date'] = pd.to_datetime(df[['year']].assign(month=7, day=1))  # July 1st
-        print(f"[DEBUG] Converted annual-as-quarterly data: {df['date'].head().tolist()}")
+        df['year'] = periods.years(codes)
+        df['quarter'] = 2
+        df['date'] = periods.start_dates(codes, annual_month=7)
     else:
-        # Extract year and quarter from Period (format should be like "2024Q1")
-        try:
-            # Handle different Period formats more robustly
-            print(f"[DEBUG] Attempting to parse quarterly Period values: {df['Period'].unique()}")
-            
-            if df['Period'].str.contains('Q').any():
-                # Format like "2024Q1"
-                df['year'] = df['Period'].str[:4].astype(int)
-                df['quarter'] = df['Period'].str[-1].astype(int)
-            elif df['Period'].str.contains('-').any():
-                # Format like "2024-Q1" or "Q1-2024"
-                # Try to extract 4-digit year and 1-digit quarter
-                year_pattern = df['Period'].str.extract(r'(\d{4})')
-                quarter_pattern = df['Period'].str.extract(r'Q(\d)')
-                df['year'] = year_pattern[0].astype(int)
-                df['quarter'] = quarter_pattern[0].astype(int)
-            else:
-                # Fallback: try to parse as much as possible
-                print(f"[WARNING] Unknown Period format, attempting generic parsing")
-                # Try to extract any 4-digit number as year
-                year_match = df['Period'].str.extract(r'(\d{4})')
-                if not year_match[0].isna().all():
-                    df['year'] = year_match[0].astype(int)
-                else:
-                    df['year'] = 2024  # Default year
-                
-                # Try to extract quarter number
-                quarter_match = df['Period'].str.extract(r'(\d)')
-                if not quarter_match[0].isna().all():
-                    df['quarter'] = quarter_match[0].astype(int)
-                else:
-                    df['quarter'] = 1  # Default quarter
-            
-            print(f"[DEBUG] Extracted years: {df['year'].tolist()}")
-            print(f"[DEBUG] Extracted quarters: {df['quarter'].tolist()}")
-            
-            # Validate extracted values
-            if df['year'].isna().any() or df['quarter'].isna().any():
-                raise ValueError("Failed to extract valid year/quarter values")
-            if (df['quarter'] < 1).any() or (df['quarter'] > 4).any():
-                print(f"[WARNING] Invalid quarter values found: {df['quarter'].unique()}")
-                df['quarter'] = df['quarter'].clip(1, 4)  # Clamp to valid range
-                
-        except Exception as e:
-            print(f"[ERROR] Failed to extract year/quarter: {e}")
-            print(f"[DEBUG] Period values causing issues: {df['Period'].unique()}")
-            # Create fallback values to prevent complete failure
-            df['year'] = 2024
-            df['quarter'] = 1
-            print(f"[WARNING] Using fallback year/quarter values")
-        
-        # Create a proper date column
-        try:
-            df['date'] = pd.to_datetime(df[['year']].assign(month=(df['quarter']-1)*3+1, day=1))
-            print(f"[DEBUG] Successfully created date column: {df['date'].head().tolist()}")
-        except Exception as e:
-            print(f"[ERROR] Failed to create date column: {e}")
-            print(f"[DEBUG] Year values: {df['year'].tolist()}")
-            print(f"[DEBUG] Quarter values: {df['quarter'].tolist()}")
-            # Create a simple date column based on just the year
-            df['date'] = pd.to_datetime(df['year'], format='%Y')
-            print(f"[WARNING] Using year-only dates: {df['date'].head().tolist()}")
-    
-    # Convert to millions for better readability - use the actual CSV column names
-    financial_cols_map = {
-        'Net Income': 'net_income',
-        'Depreciation': 'depreciation', 
-        'CapEx': 'capex',
-        'Working Capital Change': 'working_capital_change',
-        'Owner Earnings': 'owner_earnings'
-    }
+        # A year among quarters stands for its fourth quarter
+        df['year'] = periods.years(codes)
+        df['quarter'] = periods.quarters(codes)
+        df['date'] = periods.start_dates(codes, annual_month=None)
     
-    for csv_col, standard_col in financial_cols_map.items():
-        if csv_col in df.columns:
-            df[f'{standard_col}_millions'] = df[csv_col] / 1_000_000
+    invalid = codes == periods.INVALID_CODE
+    if invalid.any():
+        print(f"[WARNING] Skipping unrecognised periods: {df.loc[invalid, 'Period'].tolist()}")
+        df = df[~invalid]
     
-    # Sort by date for proper chronological plotting
-    df = df.sort_values('date')
+    _add_millions(df)
     
-    return df
+    # Sort by date for proper chronological plotting
+    return df.sort_values('date')
 
 def prepare_annual_data(df):
-    """Prepare annual data for plotting with robust error handling."""
+    """Prepare annual data for plotting (see prepare_quarterly_data)."""
+    from ..core import periods
+    
     df = df.copy()
+    codes = periods.period_codes(df)
+    df['date'] = periods.start_dates(codes)
     
-    print(f"[DEBUG] Annual Period column: {df['Period'].head().tolist()}")
-    print(f"[DEBUG] Annual Period dtypes: {df['Period'].dtype}")
+    invalid = codes == periods.INVALID_CODE
+    if invalid.any():
+        print(f"[WARNING] Skipping unrecognised periods: {df.loc[invalid, 'Period'].tolist()}")
+        df = df[~invalid]
     
-    # Try different date parsing approaches
-    try:
-        # First try: assume it's just years like "2024"
-        df['date'] = pd.to_datetime(df['Period'], format='%Y')
-        print(f"[DEBUG] Successfully parsed annual dates as years")
-    except ValueError as e:
-        print(f"[DEBUG] Year format failed: {e}")
-        try:
-            # Second try: generic datetime parsing
-            df['date'] = pd.to_datetime(df['Period'], errors='coerce')
-            print(f"[DEBUG] Successfully parsed annual dates with generic parser")
-        except Exception as e2:
-            print(f"[ERROR] All annual date parsing failed: {e2}")
-            print(f"[DEBUG] Problematic Period values: {df['Period'].unique()}")
-            # Create a dummy date column to prevent crashes
-            df['date'] = pd.to_datetime('2020-01-01')
-            print(f"[WARNING] Using dummy dates for annual data")
-    
-    # Convert to millions for better readability - use the actual CSV column names
-    financial_cols_map = {
-        'Net Income': 'net_income',
-        'Depreciation': 'depreciation', 
-        'CapEx': 'capex',
-        'Working Capital Change': 'working_capital_change',
-        'Owner Earnings': 'owner_earnings'
-    }
-    
-    for csv_col, standard_col in financial_cols_map.items():
-        if csv_col in df.columns:
-            df[f'{standard_col}_millions'] = df[csv_col] / 1_000_000
+    _add_millions(df)
     
     # Sort by date for proper chronological plotting (oldest to newest)
-    df = df.sort_values('date')
-    
-    return df
+    return df.sort_values('date')
 
 def create_owner_earnings_comparison(annual_df, quarterly_df, ticker):
     """Create a comparison chart of annual vs quarterly owner earnings."""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 12))
+    fig, (ax1, ax2) = new_figure(2, 1, figsize=(15, 12))
     
     # Annual chart
     annual_df.plot(x='date', y='owner_earnings_millions', kind='line', 
@@ -1080,7 +1071,7 @@ def create_owner_earnings_comparison(annual_df, quarterly_df, ticker):
                 bbox=dict(boxstyle='round,pad=0.3', facecolor='lightcoral', alpha=0.7),
                 arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 def create_components_breakdown(annual_df, quarterly_df, ticker, exclude_working_capital=False):
@@ -1092,7 +1083,7 @@ def create_components_breakdown(annual_df, quarterly_df, ticker, exclude_working
         ticker: company ticker symbol
         exclude_working_capital: bool, if True excludes working capital (for banks/insurance)
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 14))
+    fig, (ax1, ax2) = new_figure(2, 1, figsize=(15, 14))
     
     # Annual components waterfall
     create_annual_waterfall_chart(ax1, annual_df, ticker, exclude_working_capital)
@@ -1107,10 +1098,95 @@ def create_components_breakdown(annual_df, quarterly_df, ticker, exclude_working
     # Rotate x-axis labels for better readability
     ax2.tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
-    return fig
+    fig.tight_layout()
     return fig
 
+# Colors for each waterfall component
+WATERFALL_COLORS = {
+    'Net Income': '#2E86AB',
+    'Depreciation': '#A23B72', 
+    'CapEx': '#F18F01',
+    'WC Changes': '#C73E1D',
+    'Owner Earnings': '#4CAF50'
+}
+
+
+def _draw_waterfall_bars(ax, df, bar_width, show_working_capital=True, exclude_working_capital=False):
+    """Draw the grouped waterfall bars of all periods, one bar call per component.
+    
+    Each period gets Net Income, + Depreciation, - CapEx, WC Changes (if
+    shown) and Owner Earnings bars side by side, the components stacked on
+    the running total, plus a dashed line from the running total to
+    positive Owner Earnings.
+    
+    Args:
+        ax: matplotlib axis
+        df: dataframe with owner earnings data, one row per period
+        bar_width: width of a single bar
+        show_working_capital: bool, draw the WC Changes bar
+        exclude_working_capital: bool, the flow line starts below working capital
+        
+    Returns:
+        numpy array: x positions of the Owner Earnings bars
+    """
+    x_base = np.arange(len(df))
+    net_income = df['net_income_millions'].to_numpy(dtype=float)
+    depreciation = df['depreciation_millions'].to_numpy(dtype=float)
+    capex = df['capex_millions'].to_numpy(dtype=float)
+    wc_change = df['working_capital_change_millions'].to_numpy(dtype=float)
+    owner_earnings = df['owner_earnings_millions'].to_numpy(dtype=float)
+    
+    # Cumulative positions for the waterfall, one column per step:
+    # 0, NI, NI + Dep, NI + Dep + CapEx, NI + Dep + CapEx + WC
+    cumulative = np.cumsum(np.column_stack([np.zeros(len(df)), net_income, depreciation,
+                                            capex, wc_change]), axis=1)
+    
+    # Net Income (starts from 0)
+    ax.bar(x_base - 2*bar_width, net_income, bar_width, 
+           bottom=0, color=WATERFALL_COLORS['Net Income'], alpha=0.8, 
+           edgecolor='black', linewidth=0.3, label='Net Income')
+    
+    # Depreciation (stacks on Net Income)
+    ax.bar(x_base - bar_width, depreciation, bar_width,
+           bottom=cumulative[:, 1], color=WATERFALL_COLORS['Depreciation'], alpha=0.8,
+           edgecolor='black', linewidth=0.3, label='+ Depreciation')
+    
+    # CapEx (negative, stacks on previous)
+    ax.bar(x_base, capex, bar_width,
+           bottom=cumulative[:, 2], color=WATERFALL_COLORS['CapEx'], alpha=0.8,
+           edgecolor='black', linewidth=0.3, label='- CapEx')
+    
+    # Working Capital Changes (can be positive or negative)
+    if show_working_capital:
+        wc_colors = np.where(wc_change < 0, WATERFALL_COLORS['WC Changes'], '#90EE90')
+        ax.bar(x_base + bar_width, wc_change, bar_width,
+               bottom=cumulative[:, 3], color=list(wc_colors), alpha=0.8,
+               edgecolor='black', linewidth=0.3, label='WC Changes')
+        oe_x_positions = x_base + 2*bar_width
+    else:
+        # For banks/insurance, position Owner Earnings where WC would be
+        oe_x_positions = x_base + bar_width
+    
+    # Owner Earnings (final result)
+    oe_colors = np.where(owner_earnings >= 0, WATERFALL_COLORS['Owner Earnings'], '#F44336')
+    ax.bar(oe_x_positions, owner_earnings, bar_width,
+           bottom=0, color=list(oe_colors), alpha=0.8,
+           edgecolor='black', linewidth=0.5, label='Owner Earnings')
+    
+    # Connecting lines to show the flow to positive final results, drawn
+    # above the bars like separately plotted lines
+    positive = owner_earnings >= 0
+    last_cumulative_index = 3 if exclude_working_capital else 4
+    segments = np.stack([
+        np.column_stack([x_base + bar_width + bar_width/2, cumulative[:, last_cumulative_index]]),
+        np.column_stack([x_base + 2*bar_width - bar_width/2, owner_earnings/2]),
+    ], axis=1)[positive]
+    ax.add_collection(LineCollection(segments, colors='k', linestyles='--', alpha=0.3,
+                                     linewidths=1, zorder=2))
+    
+    return oe_x_positions
+
+
 def create_annual_waterfall_chart(ax, df, ticker, exclude_working_capital=False):
     """Create a waterfall chart showing annual owner earnings components for all years.
     
@@ -1120,6 +1196,7 @@ def create_annual_waterfall_chart(ax, df, ticker, exclude_working_capital=False)
         ticker: company ticker symbol
         exclude_working_capital: bool, if True excludes working capital (for banks/insurance)
     """
+    from ..core import periods
     
     # Use all years instead of limiting to recent ones
     recent_years = df.copy()
@@ -1131,91 +1208,20 @@ def create_annual_waterfall_chart(ax, df, ticker, exclude_working_capital=False)
     # Create positions for each year
     year_positions = np.arange(n_years)
     
-    # Colors for each component
-    colors = {
-        'Net Income': '#2E86AB',
-        'Depreciation': '#A23B72', 
-        'CapEx': '#F18F01',
-        'WC Changes': '#C73E1D',
-        'Owner Earnings': '#4CAF50'
-    }
+    # One bar call per component across all years
+    oe_x_positions = _draw_waterfall_bars(ax, recent_years, bar_width,
+                                          show_working_capital=not exclude_working_capital,
+                                          exclude_working_capital=exclude_working_capital)
     
-    # Create grouped waterfall charts for each year
-    for i, (_, year) in enumerate(recent_years.iterrows()):
-        period = year['Period']
-        
-        # Component values
-        net_income = year['net_income_millions']
-        depreciation = year['depreciation_millions']
-        capex = year['capex_millions']
-        wc_change = year['working_capital_change_millions']
-        owner_earnings = year['owner_earnings_millions']
-        
-        # Calculate cumulative positions for waterfall
-        cumulative = [0]
-        cumulative.append(net_income)
-        cumulative.append(cumulative[-1] + depreciation)
-        cumulative.append(cumulative[-1] + capex)
-        
-        # Only add working capital if not excluded (i.e., not a bank/insurance company)
-        if not exclude_working_capital:
-            cumulative.append(cumulative[-1] + wc_change)
-        
-        # X position for this year's bars
-        x_base = i
-        
-        # Net Income (starts from 0)
-        ax.bar(x_base - 2*bar_width, net_income, bar_width, 
-               bottom=0, color=colors['Net Income'], alpha=0.8, 
-               edgecolor='black', linewidth=0.3,
-               label='Net Income' if i == 0 else "")
-        
-        # Depreciation (stacks on Net Income)
-        ax.bar(x_base - bar_width, depreciation, bar_width,
-               bottom=cumulative[1], color=colors['Depreciation'], alpha=0.8,
-               edgecolor='black', linewidth=0.3,
-               label='+ Depreciation' if i == 0 else "")
-        
-        # CapEx (negative, stacks on previous)
-        ax.bar(x_base, capex, bar_width,
-               bottom=cumulative[2], color=colors['CapEx'], alpha=0.8,
-               edgecolor='black', linewidth=0.3,
-               label='- CapEx' if i == 0 else "")
-        
-        # Working Capital Changes (can be positive or negative) - only if not excluded
-        if not exclude_working_capital:
-            wc_color = colors['WC Changes'] if wc_change < 0 else '#90EE90'
-            ax.bar(x_base + bar_width, wc_change, bar_width,
-                   bottom=cumulative[3], color=wc_color, alpha=0.8,
-                   edgecolor='black', linewidth=0.3,
-                   label='WC Changes' if i == 0 else "")
-            oe_x_position = x_base + 2*bar_width
-        else:
-            # For banks/insurance, position Owner Earnings where WC would be
-            oe_x_position = x_base + bar_width
-        
-        # Owner Earnings (final result)
-        oe_color = colors['Owner Earnings'] if owner_earnings >= 0 else '#F44336'
-        ax.bar(oe_x_position, owner_earnings, bar_width,
-               bottom=0, color=oe_color, alpha=0.8,
-               edgecolor='black', linewidth=0.5,
-               label='Owner Earnings' if i == 0 else "")
-        
-        # Add value labels for Owner Earnings (in billions for annual)
+    # Add value labels for Owner Earnings (in billions for annual)
+    for oe_x_position, owner_earnings in zip(oe_x_positions, recent_years['owner_earnings_millions']):
         oe_billions = owner_earnings / 1000
         ax.text(oe_x_position, owner_earnings/2, f'${oe_billions:.1f}B',
                ha='center', va='center', fontweight='bold', fontsize=9, rotation=90)
-        
-        # Add connecting line to show the flow to final result
-        if owner_earnings >= 0:
-            # Use the last cumulative value (different index depending on whether WC is excluded)
-            last_cumulative_index = 3 if exclude_working_capital else 4
-            ax.plot([x_base + bar_width + bar_width/2, x_base + 2*bar_width - bar_width/2], 
-                   [cumulative[last_cumulative_index], owner_earnings/2], 'k--', alpha=0.3, linewidth=1)
     
     # Formatting
     ax.set_xticks(year_positions)
-    ax.set_xticklabels([str(int(y['Period'])) for _, y in recent_years.iterrows()])
+    ax.set_xticklabels(periods.labels(periods.period_codes(recent_years)))
     ax.set_title(f'{ticker} Annual Owner Earnings Waterfall - All Years', fontweight='bold', fontsize=16)
     ax.set_ylabel('Amount ($ Millions)')
     
@@ -1252,6 +1258,7 @@ def create_waterfall_chart(ax, df, ticker, exclude_working_capital=False):
         ticker: company ticker symbol
         exclude_working_capital: bool, if True excludes working capital (for banks/insurance)
     """
+    from ..core import periods
     
     # Use all quarters instead of limiting to recent ones
     recent_quarters = df.copy()
@@ -1263,82 +1270,20 @@ def create_waterfall_chart(ax, df, ticker, exclude_working_capital=False):
     # Create positions for each quarter
     quarter_positions = np.arange(n_quarters)
     
-    # Colors for each component
-    colors = {
-        'Net Income': '#2E86AB',
-        'Depreciation': '#A23B72', 
-        'CapEx': '#F18F01',
-        'WC Changes': '#C73E1D',
-        'Owner Earnings': '#4CAF50'
-    }
+    # One bar call per component across all quarters; the working capital
+    # bar is always drawn here
+    oe_x_positions = _draw_waterfall_bars(ax, recent_quarters, bar_width,
+                                          show_working_capital=True,
+                                          exclude_working_capital=exclude_working_capital)
     
-    # Create grouped waterfall charts for each quarter
-    for i, (_, quarter) in enumerate(recent_quarters.iterrows()):
-        period = quarter['Period']
-        
-        # Component values
-        net_income = quarter['net_income_millions']
-        depreciation = quarter['depreciation_millions']
-        capex = quarter['capex_millions']
-        wc_change = quarter['working_capital_change_millions']
-        owner_earnings = quarter['owner_earnings_millions']
-        
-        # Calculate cumulative positions for waterfall
-        cumulative = [0]
-        cumulative.append(net_income)
-        cumulative.append(cumulative[-1] + depreciation)
-        cumulative.append(cumulative[-1] + capex)
-        cumulative.append(cumulative[-1] + wc_change)
-        
-        # X position for this quarter's bars
-        x_base = i
-        
-        # Net Income (starts from 0)
-        ax.bar(x_base - 2*bar_width, net_income, bar_width, 
-               bottom=0, color=colors['Net Income'], alpha=0.8, 
-               edgecolor='black', linewidth=0.3,
-               label='Net Income' if i == 0 else "")
-        
-        # Depreciation (stacks on Net Income)
-        ax.bar(x_base - bar_width, depreciation, bar_width,
-               bottom=cumulative[1], color=colors['Depreciation'], alpha=0.8,
-               edgecolor='black', linewidth=0.3,
-               label='+ Depreciation' if i == 0 else "")
-        
-        # CapEx (negative, stacks on previous)
-        ax.bar(x_base, capex, bar_width,
-               bottom=cumulative[2], color=colors['CapEx'], alpha=0.8,
-               edgecolor='black', linewidth=0.3,
-               label='- CapEx' if i == 0 else "")
-        
-        # Working Capital Changes (can be positive or negative)
-        wc_color = colors['WC Changes'] if wc_change < 0 else '#90EE90'
-        ax.bar(x_base + bar_width, wc_change, bar_width,
-               bottom=cumulative[3], color=wc_color, alpha=0.8,
-               edgecolor='black', linewidth=0.3,
-               label='WC Changes' if i == 0 else "")
-        
-        # Owner Earnings (final result)
-        oe_color = colors['Owner Earnings'] if owner_earnings >= 0 else '#F44336'
-        ax.bar(x_base + 2*bar_width, owner_earnings, bar_width,
-               bottom=0, color=oe_color, alpha=0.8,
-               edgecolor='black', linewidth=0.5,
-               label='Owner Earnings' if i == 0 else "")
-        
-        # Add value labels for Owner Earnings
-        ax.text(x_base + 2*bar_width, owner_earnings/2, f'${owner_earnings:,.0f}M',
+    # Add value labels for Owner Earnings
+    for oe_x_position, owner_earnings in zip(oe_x_positions, recent_quarters['owner_earnings_millions']):
+        ax.text(oe_x_position, owner_earnings/2, f'${owner_earnings:,.0f}M',
                ha='center', va='center', fontweight='bold', fontsize=8, rotation=90)
-        
-        # Add connecting line to show the flow to final result
-        if owner_earnings >= 0:
-            # Use the last cumulative value (different index depending on whether WC is excluded)
-            last_cumulative_index = 3 if exclude_working_capital else 4
-            ax.plot([x_base + bar_width + bar_width/2, x_base + 2*bar_width - bar_width/2], 
-                   [cumulative[last_cumulative_index], owner_earnings/2], 'k--', alpha=0.3, linewidth=1)
     
     # Formatting
     ax.set_xticks(quarter_positions)
-    quarter_labels = [q['Period'] for _, q in recent_quarters.iterrows()]
+    quarter_labels = list(periods.labels(periods.period_codes(recent_quarters)))
     
     # If too many quarters, show every 4th label (yearly intervals) for readability
     if len(quarter_labels) > 16:
@@ -1380,9 +1325,20 @@ def create_waterfall_chart(ax, df, ticker, exclude_working_capital=False):
     ax.grid(True, alpha=0.3, axis='y')
     ax.axhline(y=0, color='black', linestyle='-', alpha=0.8)
 
-def create_volatility_analysis(quarterly_df, ticker):
-    """Create charts showing the volatility and trends in owner earnings."""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+def create_volatility_analysis(quarterly_df, ticker, statistics=None):
+    """
+    Create charts showing the volatility and trends in owner earnings.
+    
+    Args:
+        quarterly_df (DataFrame): Prepared quarterly owner earnings
+        ticker (str): Stock ticker symbol
+        statistics (EarningsStatistics, optional): Statistics of the same
+            data; computed from quarterly_df when omitted
+        
+    Returns:
+        Figure: The chart, laid out
+    """
+    fig, ((ax1, ax2), (ax3, ax4)) = new_figure(2, 2, figsize=(16, 12))
     
     # Check if we have enough data for volatility analysis
     if len(quarterly_df) < 4:
@@ -1401,18 +1357,19 @@ def create_volatility_analysis(quarterly_df, ticker):
             ax.set_ylim(0, 1)
             ax.set_title(f'{ticker} Volatility Analysis - Insufficient Data', fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
-    # 1. Rolling average to show trend
-    quarterly_df['rolling_4q'] = quarterly_df['owner_earnings_millions'].rolling(window=4, center=True).mean()
-    quarterly_df['rolling_8q'] = quarterly_df['owner_earnings_millions'].rolling(window=8, center=True).mean()
+    if statistics is None:
+        from ..core.analytics import compute_earnings_statistics
+        statistics = compute_earnings_statistics(ticker, None, quarterly_df)
     
+    # 1. Rolling average to show trend
     ax1.plot(quarterly_df['date'], quarterly_df['owner_earnings_millions'], 
              'o-', alpha=0.6, label='Quarterly', linewidth=1, markersize=3)
-    ax1.plot(quarterly_df['date'], quarterly_df['rolling_4q'], 
+    ax1.plot(quarterly_df['date'], np.array(statistics.rolling_4q, dtype=float), 
              '-', linewidth=2, label='4Q Rolling Avg', color='red')
-    ax1.plot(quarterly_df['date'], quarterly_df['rolling_8q'], 
+    ax1.plot(quarterly_df['date'], np.array(statistics.rolling_8q, dtype=float), 
              '-', linewidth=2, label='8Q Rolling Avg', color='green')
     ax1.axhline(y=0, color='black', linestyle='--', alpha=0.7)
     ax1.set_title(f'{ticker} Owner Earnings Trend Analysis', fontweight='bold')
@@ -1421,57 +1378,44 @@ def create_volatility_analysis(quarterly_df, ticker):
     ax1.grid(True, alpha=0.3)
     
     # 2. Year-over-year comparison (same quarter)
-    quarterly_df['year'] = quarterly_df['date'].dt.year
-    quarterly_df['quarter'] = quarterly_df['date'].dt.quarter
-    
-    # Create pivot for YoY comparison
-    try:
-        pivot_data = quarterly_df.pivot(index='quarter', columns='year', values='owner_earnings_millions')
-        recent_years = [col for col in pivot_data.columns if col >= 2020]  # Focus on recent years
-        
-        # Check if we actually have quarterly data (not just annual data)
-        unique_quarters = quarterly_df['quarter'].unique()
-        if len(unique_quarters) == 1:
-            # This is annual data masquerading as quarterly - show a different chart
-            ax2.bar(quarterly_df['year'], quarterly_df['owner_earnings_millions'], alpha=0.7, color='skyblue')
-            ax2.axhline(y=0, color='black', linestyle='--', alpha=0.7)
-            ax2.set_title('Annual Owner Earnings (labeled as quarterly)', fontweight='bold')
-            ax2.set_xlabel('Year')
-            ax2.set_ylabel('Owner Earnings ($ Millions)')
-            ax2.grid(True, alpha=0.3)
-        else:
-            # Real quarterly data - show quarters
-            for year in recent_years:
-                if year in pivot_data.columns:
-                    quarters = [1,2,3,4]
-                    values = [pivot_data.loc[q, year] if q in pivot_data.index else None for q in quarters]
-                    # Filter out None values
-                    valid_quarters = [q for q, v in zip(quarters, values) if v is not None]
-                    valid_values = [v for v in values if v is not None]
-                    if valid_quarters and valid_values:
-                        ax2.plot(valid_quarters, valid_values, 'o-', label=f'{year}', linewidth=2, markersize=6)
-            
-            ax2.axhline(y=0, color='black', linestyle='--', alpha=0.7)
-            ax2.set_title('Year-over-Year Quarterly Comparison', fontweight='bold')
-            ax2.set_xlabel('Quarter')
-            ax2.set_ylabel('Owner Earnings ($ Millions)')
-            ax2.set_xticks([1,2,3,4])
-            ax2.set_xticklabels(['Q1', 'Q2', 'Q3', 'Q4'])
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-            
-    except Exception as e:
-        print(f"[WARNING] Error creating YoY chart: {e}")
-        ax2.text(0.5, 0.5, f'YoY Analysis Error:\n{str(e)}', 
+    if statistics.year_over_year_error:
+        print(f"[WARNING] Error creating YoY chart: {statistics.year_over_year_error}")
+        ax2.text(0.5, 0.5, f'YoY Analysis Error:\n{statistics.year_over_year_error}', 
                 ha='center', va='center', transform=ax2.transAxes, fontsize=10)
         ax2.set_title('Year-over-Year Analysis - Error', fontweight='bold')
-    
-    # 3. Distribution histogram
-    ax3.hist(quarterly_df['owner_earnings_millions'], bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-    ax3.axvline(x=quarterly_df['owner_earnings_millions'].mean(), color='red', 
-                linestyle='--', label=f"Mean: ${quarterly_df['owner_earnings_millions'].mean():.0f}M")
-    ax3.axvline(x=quarterly_df['owner_earnings_millions'].median(), color='green', 
-                linestyle='--', label=f"Median: ${quarterly_df['owner_earnings_millions'].median():.0f}M")
+    elif statistics.quarterly_is_annual:
+        # This is annual data masquerading as quarterly - show a different chart
+        ax2.bar(quarterly_df['date'].dt.year, quarterly_df['owner_earnings_millions'], alpha=0.7, color='skyblue')
+        ax2.axhline(y=0, color='black', linestyle='--', alpha=0.7)
+        ax2.set_title('Annual Owner Earnings (labeled as quarterly)', fontweight='bold')
+        ax2.set_xlabel('Year')
+        ax2.set_ylabel('Owner Earnings ($ Millions)')
+        ax2.grid(True, alpha=0.3)
+    else:
+        # Real quarterly data - show quarters
+        for year, values in statistics.year_over_year.items():
+            valid_quarters = [q for q, v in zip([1, 2, 3, 4], values) if v is not None]
+            valid_values = [v for v in values if v is not None]
+            if valid_quarters:
+                ax2.plot(valid_quarters, valid_values, 'o-', label=year, linewidth=2, markersize=6)
+        
+        ax2.axhline(y=0, color='black', linestyle='--', alpha=0.7)
+        ax2.set_title('Year-over-Year Quarterly Comparison', fontweight='bold')
+        ax2.set_xlabel('Quarter')
+        ax2.set_ylabel('Owner Earnings ($ Millions)')
+        ax2.set_xticks([1,2,3,4])
+        ax2.set_xticklabels(['Q1', 'Q2', 'Q3', 'Q4'])
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+    
+    # 3. Distribution histogram (bins counted by the analytics)
+    edges = statistics.histogram_edges
+    ax3.hist(edges[:-1], bins=edges, weights=statistics.histogram_counts,
+             alpha=0.7, color='skyblue', edgecolor='black')
+    ax3.axvline(x=statistics.mean, color='red', 
+                linestyle='--', label=f"Mean: ${statistics.mean:.0f}M")
+    ax3.axvline(x=statistics.median, color='green', 
+                linestyle='--', label=f"Median: ${statistics.median:.0f}M")
     ax3.set_title('Distribution of Quarterly Owner Earnings', fontweight='bold')
     ax3.set_xlabel('Owner Earnings ($ Millions)')
     ax3.set_ylabel('Frequency')
@@ -1479,17 +1423,9 @@ def create_volatility_analysis(quarterly_df, ticker):
     ax3.grid(True, alpha=0.3)
     
     # 4. Positive vs Negative quarters
-    positive_quarters = quarterly_df[quarterly_df['owner_earnings_millions'] > 0]
-    negative_quarters = quarterly_df[quarterly_df['owner_earnings_millions'] <= 0]
-    
-    summary_data = {
-        'Positive Quarters': [len(positive_quarters), positive_quarters['owner_earnings_millions'].mean() if len(positive_quarters) > 0 else 0],
-        'Negative Quarters': [len(negative_quarters), negative_quarters['owner_earnings_millions'].mean() if len(negative_quarters) > 0 else 0]
-    }
-    
-    categories = list(summary_data.keys())
-    counts = [summary_data[cat][0] for cat in categories]
-    avg_values = [summary_data[cat][1] for cat in categories]
+    categories = ['Positive Quarters', 'Negative Quarters']
+    counts = [statistics.positive_quarters, statistics.negative_quarters]
+    avg_values = [statistics.positive_mean, statistics.negative_mean]
     
     x_pos = np.arange(len(categories))
     
@@ -1513,15 +1449,43 @@ def create_volatility_analysis(quarterly_df, ticker):
         ax4_twin.text(bar.get_x() + bar.get_width()/2, bar.get_height() + (20 if avg_val > 0 else -40), 
                      f'${avg_val:.0f}M', ha='center', va='bottom' if avg_val > 0 else 'top')
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
+# Owner earnings charts by kind; the kind is also the file name suffix
+OWNER_EARNINGS_CHARTS = ("owner_earnings_comparison", "earnings_components_breakdown",
+                         "volatility_analysis")
+
+
+def render_owner_earnings_chart(kind, ticker, annual_df, quarterly_df, is_financial, filepath,
+                                save_options=None):
+    """
+    Create and save one owner earnings chart (a render job).
+    
+    Args:
+        kind (str): One of OWNER_EARNINGS_CHARTS
+        ticker (str): Stock ticker symbol
+        annual_df (DataFrame): Prepared annual owner earnings
+        quarterly_df (DataFrame): Prepared quarterly owner earnings
+        is_financial (bool): Exclude working capital (banks and insurers)
+        filepath (str): File to write; the extension sets the format
+        save_options (dict, optional): savefig() options (default:
+            publication quality)
+    """
+    with chart_style(PLOTTING_STYLE):
+        if kind == "owner_earnings_comparison":
+            fig = create_owner_earnings_comparison(annual_df, quarterly_df, ticker)
+        elif kind == "earnings_components_breakdown":
+            fig = create_components_breakdown(annual_df, quarterly_df, ticker, exclude_working_capital=is_financial)
+        elif kind == "volatility_analysis":
+            fig = create_volatility_analysis(quarterly_df, ticker)
+        else:
+            raise ValueError(f"Unknown chart kind: {kind}")
+    fig.savefig(filepath, **(save_options or _publication_options(SAVE_OPTIONS)))
+    print(f"[CHART] Saved chart: {filepath}")
+
 def save_and_show_plots(figures, filenames, ticker):
     """Save plots to files and display them."""
-    # Ensure we're using non-interactive backend
-    matplotlib.use('Agg')
-    plt.ioff()
-    
     # Create charts directory if it doesn't exist
     charts_dir = "charts"
     if not os.path.exists(charts_dir):
@@ -1531,17 +1495,49 @@ def save_and_show_plots(figures, filenames, ticker):
     for fig, filename in zip(figures, filenames):
         # Use the filename as-is since it's already properly formatted
         filepath = os.path.join(charts_dir, f"{filename}.png")
-        fig.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
+        fig.savefig(filepath, **_publication_options(SAVE_OPTIONS))
         print(f"[CHART] Saved chart: {filepath}")
-        # Close the figure to free memory
-        plt.close(fig)
     
     # Don't show interactive plots in GUI mode - just save them
-    # plt.show()
     print("\n[OK] All charts displayed and saved!")
 
-def main(ticker=None):
-    """Main function to create all visualizations."""
+def print_summary_statistics(statistics):
+    """Print the owner earnings summary of an EarningsStatistics."""
+    print(f"\n[SUMMARY] {statistics.ticker} SUMMARY STATISTICS:")
+    if statistics.annual_periods:
+        print(f"Annual Data Range: {statistics.annual_periods[0]} to {statistics.annual_periods[-1]}")
+    if statistics.quarterly_periods:
+        print(f"Quarterly Data Range: {statistics.quarterly_periods[0]} to {statistics.quarterly_periods[-1]}")
+    for label, extreme in (("Best Annual", statistics.best_annual), ("Worst Annual", statistics.worst_annual),
+                           ("Best Quarterly", statistics.best_quarter), ("Worst Quarterly", statistics.worst_quarter)):
+        if extreme:
+            print(f"{label} Owner Earnings: ${extreme['value']:.0f}M ({extreme['period']})")
+    if statistics.total_quarters:
+        print(f"Positive Quarters: {statistics.positive_quarters}/{statistics.total_quarters} "
+              f"({statistics.positive_ratio*100:.1f}%)")
+
+def main(ticker=None, annual_df=None, quarterly_df=None, force_render=False,
+         profile="publication", chart_format="png", statistics=None):
+    """
+    Main function to create all visualizations.
+    
+    Args:
+        ticker (str, optional): Stock ticker symbol; detected if omitted
+        annual_df (DataFrame, optional): Annual owner earnings already in memory
+        quarterly_df (DataFrame, optional): Quarterly owner earnings already in memory
+        force_render (bool): Render every chart even if it is up to date
+        profile (str): Render profile (publication, draft or thumbnail)
+        chart_format (str): png, svg or webp
+        statistics (EarningsStatistics, optional): Statistics of the same
+            data, e.g. stored by the workflow; computed when omitted
+        
+    When both frames are given the owner earnings CSV files are not read.
+    Charts whose input data and settings are unchanged since they were
+    last rendered are skipped (see render.RenderCache).
+    
+    Returns:
+        bool: True if the charts were created, False if no data was found
+    """
     # Use provided ticker or detect it
     if ticker is None:
         ticker = detect_ticker_symbol()
@@ -1554,13 +1550,11 @@ def main(ticker=None):
     if is_financial:
         print(f"[INFO] Detected {ticker} as bank/insurance - excluding working capital from charts")
     
-    # Set up plotting style
-    setup_plotting_style()
-    
-    # Load data with specific ticker
-    annual_df, quarterly_df = load_data(ticker)
+    # Load data with specific ticker unless handed over in memory
+    if annual_df is None or quarterly_df is None:
+        annual_df, quarterly_df = load_data(ticker)
     if annual_df is None or quarterly_df is None:
-        return
+        return False
     
     # Prepare data
     print("[ANALYSIS] Preparing data for visualization...")
@@ -1569,40 +1563,71 @@ def main(ticker=None):
     
     print(f"[CHARTS] Creating visualizations...")
     
-    # Create all charts
-    figures = []
-    filenames = []
-    
-    # 1. Owner earnings comparison
-    fig1 = create_owner_earnings_comparison(annual_df, quarterly_df, ticker)
-    figures.append(fig1)
-    filenames.append(f"{ticker.lower().replace('.', '')}_owner_earnings_comparison")
+    # Create charts directory if it doesn't exist
+    charts_dir = "charts"
+    if not os.path.exists(charts_dir):
+        os.makedirs(charts_dir)
+        print(f"[DIR] Created directory: {charts_dir}/")
     
-    # 2. Components breakdown (exclude working capital for banks/insurance)
-    fig2 = create_components_breakdown(annual_df, quarterly_df, ticker, exclude_working_capital=is_financial)
-    figures.append(fig2)
-    filenames.append(f"{ticker.lower().replace('.', '')}_earnings_components_breakdown")
+    # Comparison, components breakdown (without working capital for
+    # banks/insurance) and volatility charts, rendered in parallel
+    from .render import owner_earnings_chart_jobs, render_figures
+    render_figures(owner_earnings_chart_jobs(ticker, annual_df, quarterly_df, charts_dir,
+                                             profile, chart_format),
+                   force=force_render)
+    print("\n[OK] All charts displayed and saved!")
     
-    # 3. Volatility analysis
-    fig3 = create_volatility_analysis(quarterly_df, ticker)
-    figures.append(fig3)
-    filenames.append(f"{ticker.lower().replace('.', '')}_volatility_analysis")
+    # Print summary statistics
+    if statistics is None:
+        from ..core.analytics import compute_earnings_statistics
+        statistics = compute_earnings_statistics(ticker, annual_df, quarterly_df)
+    print_summary_statistics(statistics)
+    return True
+
+def visualize_all(data_folder="data", force_render=False, profile="publication", chart_format="png"):
+    """
+    Create the owner earnings charts of every ticker with data in data_folder.
     
-    # Save and show all plots
-    save_and_show_plots(figures, filenames, ticker)
+    The chart sets of all tickers go to the render scheduler as one batch,
+    so figures of different tickers are rendered in parallel.
     
-    # Print summary statistics
-    print(f"\n[SUMMARY] {ticker} SUMMARY STATISTICS:")
-    print(f"Annual Data Range: {annual_df['Period'].min()} to {annual_df['Period'].max()}")
-    print(f"Quarterly Data Range: {quarterly_df['Period'].min()} to {quarterly_df['Period'].max()}")
-    print(f"Best Annual Owner Earnings: ${annual_df['owner_earnings_millions'].max():.0f}M ({annual_df.loc[annual_df['owner_earnings_millions'].idxmax(), 'Period']})")
-    print(f"Worst Annual Owner Earnings: ${annual_df['owner_earnings_millions'].min():.0f}M ({annual_df.loc[annual_df['owner_earnings_millions'].idxmin(), 'Period']})")
-    print(f"Best Quarterly Owner Earnings: ${quarterly_df['owner_earnings_millions'].max():.0f}M ({quarterly_df.loc[quarterly_df['owner_earnings_millions'].idxmax(), 'Period']})")
-    print(f"Worst Quarterly Owner Earnings: ${quarterly_df['owner_earnings_millions'].min():.0f}M ({quarterly_df.loc[quarterly_df['owner_earnings_millions'].idxmin(), 'Period']})")
-    
-    positive_quarters = len(quarterly_df[quarterly_df['owner_earnings_millions'] > 0])
-    total_quarters = len(quarterly_df)
-    print(f"Positive Quarters: {positive_quarters}/{total_quarters} ({positive_quarters/total_quarters*100:.1f}%)")
+    Args:
+        data_folder (str): Folder with owner_earnings_annual_<ticker>.csv files
+        force_render (bool): Render every chart even if it is up to date
+        profile (str): Render profile (publication, draft or thumbnail)
+        chart_format (str): png, svg or webp
+        
+    Returns:
+        list: Tickers whose charts were rendered
+    """
+    from .render import owner_earnings_chart_jobs, render_figures
+    
+    jobs = []
+    tickers = []
+    for annual_path in sorted(glob.glob(os.path.join(data_folder, 'owner_earnings_annual_*.csv'))):
+        ticker = os.path.basename(annual_path)[len('owner_earnings_annual_'):-len('.csv')].upper()
+        quarterly_path = os.path.join(data_folder, f'owner_earnings_quarterly_{ticker.lower()}.csv')
+        if not os.path.exists(quarterly_path):
+            print(f"[WARNING] No quarterly data for {ticker}, skipping")
+            continue
+        try:
+            annual_df = prepare_annual_data(pd.read_csv(annual_path))
+            quarterly_df = prepare_quarterly_data(pd.read_csv(quarterly_path))
+        except Exception as e:
+            print(f"[ERROR] Could not prepare data for {ticker}: {e}")
+            continue
+        jobs.extend(owner_earnings_chart_jobs(ticker, annual_df, quarterly_df, "charts",
+                                              profile, chart_format))
+        tickers.append(ticker)
+    
+    if not jobs:
+        print(f"[ERROR] No owner earnings data found in {data_folder}/")
+        return []
+    
+    os.makedirs("charts", exist_ok=True)
+    print(f"[CHARTS] Rendering {len(jobs)} charts for {len(tickers)} tickers...")
+    render_figures(jobs, force=force_render)
+    return tickers
 
 if __name__ == "__main__":
     # Check for command line argument
@@ -0,0 +1,537 @@
+"""
+Chart render scheduler for MarketSwimmer.
+
+Drawing a chart and writing it as a 300 dpi PNG is CPU bound and mostly
+holds the GIL. The scheduler renders each figure as a separate RenderJob
+in a pool of spawned worker processes, so the five charts of a ticker -
+or the chart sets of a whole universe - are drawn in parallel.
+
+Memory stays bounded: a job builds and saves exactly one figure,
+at most two jobs per worker are in flight at a time, and workers are
+replaced after a number of jobs where Python supports it.
+
+Spawning the workers costs more than a ticker's few charts take to draw,
+so the pool is only started for large batches or once a process has
+rendered enough charts to be long-lived (batch, daemon, GUI); smaller
+runs, and runs with a single worker (one CPU, or
+MARKETSWIMMER_RENDER_WORKERS=1), render in the calling thread instead.
+If a worker dies, the pool is dropped and the unfinished jobs are
+rendered in the calling thread. The chart functions build
+Figure objects with their own canvases (see charts.chart_style), so
+threads may do this concurrently.
+
+A RenderProfile sets the resolution and cropping of the output:
+publication (300 dpi, tight bounding box; the default), draft (100 dpi,
+no second layout pass) and thumbnail (40 dpi, for the GUI). Charts can be
+written as PNG, SVG or WebP. Non-default profiles add the profile name to
+the file name, so a draft never replaces a publication chart.
+
+Charts are only re-rendered when needed: a RenderCache manifest in each
+output directory (e.g. charts/.render_manifest.json) records a key over
+every chart's input data, style and save settings, and jobs whose key
+and file are unchanged are skipped unless rendering is forced.
+"""
+
+import atexit
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.stage_cache import fingerprint_bytes, fingerprint_file
+
+# Environment variable overriding the number of render processes
+WORKERS_ENV = "MARKETSWIMMER_RENDER_WORKERS"
+
+# Jobs a worker renders before it is replaced (Python 3.11+), which
+# returns memory matplotlib and the font cache hold on to
+MAX_JOBS_PER_WORKER = 50
+
+# A cold pool is started for a call with at least POOL_MIN_JOBS jobs, or
+# once a process has rendered POOL_WARMUP_JOBS jobs in total; a running
+# pool is used for any call with more than one job
+POOL_MIN_JOBS = 8
+POOL_WARMUP_JOBS = 12
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Resolution and cropping of rendered charts."""
+
+    name: str
+    dpi: int
+    tight_bbox: bool
+    description: str
+
+    @property
+    def suffix(self) -> str:
+        """File name suffix; publication charts keep their plain names."""
+        return "" if self.name == DEFAULT_PROFILE else f"_{self.name}"
+
+    def save_options(self, base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        savefig() options of this profile.
+
+        Args:
+            base: Chart-specific options (e.g. facecolor) to extend
+
+        Returns:
+            dict: Options including dpi and bbox_inches
+        """
+        options = dict(base or {})
+        options['dpi'] = self.dpi
+        if self.tight_bbox:
+            options['bbox_inches'] = 'tight'
+        return options
+
+
+DEFAULT_PROFILE = "publication"
+
+RENDER_PROFILES = {
+    "publication": RenderProfile("publication", 300, True, "300 dpi, cropped to the content"),
+    "draft": RenderProfile("draft", 100, False, "100 dpi fast preview, not cropped"),
+    "thumbnail": RenderProfile("thumbnail", 40, True, "40 dpi small images for the GUI"),
+}
+
+CHART_FORMATS = ("png", "svg", "webp")
+
+
+def get_profile(name: str) -> RenderProfile:
+    """
+    Look up a render profile by name.
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    try:
+        return RENDER_PROFILES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown render profile {name!r} "
+                         f"(choose from {', '.join(RENDER_PROFILES)})") from None
+
+
+def check_format(chart_format: str) -> str:
+    """
+    Validate an output format.
+
+    Returns:
+        str: The format in lower case
+
+    Raises:
+        ValueError: If the format is unknown or matplotlib cannot write it
+            (WebP needs matplotlib 3.6+)
+    """
+    chart_format = chart_format.lower()
+    if chart_format not in CHART_FORMATS:
+        raise ValueError(f"Unknown chart format {chart_format!r} (choose from {', '.join(CHART_FORMATS)})")
+    from matplotlib.backend_bases import FigureCanvasBase
+    if chart_format not in FigureCanvasBase.get_supported_filetypes():
+        raise ValueError(f"This matplotlib version cannot write {chart_format} files")
+    return chart_format
+
+
+def chart_filename(stem: str, profile: RenderProfile, chart_format: str) -> str:
+    """File name of a chart, e.g. tst_volatility_analysis_draft.svg."""
+    return f"{stem}{profile.suffix}.{chart_format}"
+
+
+@dataclass
+class RenderJob:
+    """
+    One figure to render.
+
+    function(*args, path, save_options) must build the figure and save it
+    to path with the savefig() options. It has to be a module-level
+    function, and args picklable, so the job can be sent to a worker
+    process. settings holds anything else that changes the image (the
+    style); like the save options it is part of the cache key.
+    """
+
+    name: str
+    path: str
+    function: Callable
+    args: Tuple = ()
+    save_options: Dict[str, Any] = field(default_factory=dict)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+
+def _update_digest(digest, value):
+    """Add one job argument to a fingerprint."""
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        # Canonical text with 12 significant digits: frames computed in
+        # memory and the same frames read back from CSV differ in the last
+        # bit of some floats, but draw the same chart
+        layout = [[str(column), str(dtype)] for column, dtype in value.dtypes.items()]
+        digest.update(json.dumps(layout).encode('utf-8'))
+        digest.update(value.to_csv(float_format='%.12g').encode('utf-8'))
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+
+
+def job_key(job: RenderJob) -> str:
+    """
+    Cache key of a job: render function, input data, settings and versions.
+
+    Args:
+        job: Figure to render
+
+    Returns:
+        str: Hex digest
+    """
+    import matplotlib
+    from .. import __version__
+
+    data = hashlib.sha256()
+    for value in job.args:
+        _update_digest(data, value)
+    material = json.dumps({
+        'function': f"{job.function.__module__}.{job.function.__qualname__}",
+        'data': data.hexdigest(),
+        'save_options': job.save_options,
+        'settings': job.settings,
+        'version': __version__,
+        'matplotlib': matplotlib.__version__,
+    }, sort_keys=True, default=str)
+    return fingerprint_bytes(material.encode('utf-8'))
+
+
+# Manifests of different renders in this process may be updated concurrently
+_manifest_lock = threading.Lock()
+
+
+class RenderCache:
+    """
+    Manifest of the charts rendered into one directory.
+
+    A chart is up to date when its job_key() matches the manifest and the
+    file is still present and unmodified.
+    """
+
+    MANIFEST_NAME = ".render_manifest.json"
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory: Output directory of the charts, e.g. charts/
+        """
+        self.manifest_path = Path(directory) / self.MANIFEST_NAME
+        self.records = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the manifest, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as handle:
+                return json.load(handle).get('charts', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def is_current(self, job: RenderJob, key: str) -> bool:
+        """True if the job's file was rendered from the same key and is unmodified."""
+        record = self.records.get(Path(job.path).name)
+        if record is None or record.get('key') != key:
+            return False
+        return fingerprint_file(Path(job.path)) == record.get('digest')
+
+    def record(self, job: RenderJob, key: str):
+        """Remember a rendered job (written by save())."""
+        digest = fingerprint_file(Path(job.path))
+        if digest is not None:
+            self.records[Path(job.path).name] = {
+                'key': key,
+                'digest': digest,
+                'rendered_at': datetime.now().isoformat(timespec='seconds'),
+            }
+
+    def save(self):
+        """
+        Merge the records into the manifest on disk and write it atomically.
+
+        Entries written by other renders since the manifest was loaded are
+        kept.
+        """
+        with _manifest_lock:
+            records = self._load()
+            records.update(self.records)
+            self.records = records
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_path.parent,
+                                            prefix=self.manifest_path.name, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump({'charts': records}, handle, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.manifest_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+
+def _render_in_worker(job: RenderJob) -> Tuple[bool, str]:
+    """Pool entry point: (success, console output or error message)."""
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            job.function(*job.args, job.path, job.save_options)
+    except Exception as e:
+        return False, output.getvalue() + f"[ERROR] Failed to render {job.name}: {e}\n"
+    return True, output.getvalue()
+
+
+def default_workers(jobs: int) -> int:
+    """Number of render processes for a number of jobs."""
+    configured = os.environ.get(WORKERS_ENV)
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            print(f"[WARNING] Ignoring invalid {WORKERS_ENV}={configured!r}")
+    return max(1, min(os.cpu_count() or 1, jobs))
+
+
+class RenderScheduler:
+    """Renders RenderJobs in a process pool that is reused between calls."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Render processes (default: MARKETSWIMMER_RENDER_WORKERS
+                or the number of CPUs)
+        """
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._jobs_rendered = 0
+
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                options = {}
+                if sys.version_info >= (3, 11):
+                    options['max_tasks_per_child'] = MAX_JOBS_PER_WORKER
+                self._pool = ProcessPoolExecutor(max_workers=workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 **options)
+            return self._pool
+
+    def _drop_pool(self, pool: ProcessPoolExecutor):
+        """Forget a broken pool so that the next call starts a new one."""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _use_pool(self, jobs: int, workers: int) -> bool:
+        """Whether jobs are worth sending to the pool rather than rendering here."""
+        if workers == 1 or jobs == 1:
+            return False
+        with self._pool_lock:
+            warm = self._pool is not None
+            self._jobs_rendered += jobs
+            return warm or jobs >= POOL_MIN_JOBS or self._jobs_rendered >= POOL_WARMUP_JOBS
+
+    def render(self, jobs: List[RenderJob], force: bool = False) -> List[bool]:
+        """
+        Render jobs that are not up to date and print their output in job order.
+
+        Args:
+            jobs: Figures to render
+            force: Render every job, even if its chart is up to date
+
+        Returns:
+            List[bool]: Success of each job (True for skipped jobs)
+        """
+        caches: Dict[Path, RenderCache] = {}
+        keys: Dict[int, str] = {}
+        stale: List[int] = []
+        results: Dict[int, bool] = {}
+        for index, job in enumerate(jobs):
+            directory = Path(job.path).parent
+            cache = caches.get(directory)
+            if cache is None:
+                cache = caches[directory] = RenderCache(directory)
+            keys[index] = job_key(job)
+            if not force and cache.is_current(job, keys[index]):
+                print(f"[CACHE] Chart up to date, not re-rendered: {job.path}")
+                results[index] = True
+            else:
+                stale.append(index)
+
+        rendered = self._render_jobs([jobs[index] for index in stale])
+        for index, success in zip(stale, rendered):
+            results[index] = success
+            if success:
+                caches[Path(jobs[index].path).parent].record(jobs[index], keys[index])
+        for cache in caches.values():
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"[WARNING] Could not save render manifest {cache.manifest_path}: {e}")
+        return [results[index] for index in range(len(jobs))]
+
+    def _render_jobs(self, jobs: List[RenderJob]) -> List[bool]:
+        """Render jobs (in the pool if there are workers) in job order."""
+        if not jobs:
+            return []
+        workers = self.workers or default_workers(len(jobs))
+        if not self._use_pool(len(jobs), workers):
+            return [self._render_here(job) for job in jobs]
+
+        pool = self._get_pool(workers)
+        results: List[bool] = []
+        in_flight = deque()
+        pending = deque(jobs)
+        window = 2 * workers
+
+        def submit_next() -> bool:
+            if not pending:
+                return False
+            future = pool.submit(_render_in_worker, pending[0])
+            in_flight.append((pending.popleft(), future))
+            return True
+
+        try:
+            while len(in_flight) < window and submit_next():
+                pass
+            while in_flight:
+                # Collect in submission order so output reads like a serial run
+                success, output = in_flight[0][1].result()
+                in_flight.popleft()
+                print(output, end='')
+                results.append(success)
+                submit_next()
+        except BrokenProcessPool:
+            # A worker died (out of memory, crash): render the rest here
+            print(f"[WARNING] Render worker died, rendering {len(jobs) - len(results)} chart(s) in-process")
+            self._drop_pool(pool)
+            unfinished = [job for job, _ in in_flight] + list(pending)
+            results.extend(self._render_here(job) for job in unfinished)
+        return results
+
+    def _render_here(self, job: RenderJob) -> bool:
+        try:
+            job.function(*job.args, job.path, job.save_options)
+        except Exception as e:
+            print(f"[ERROR] Failed to render {job.name}: {e}")
+            return False
+        return True
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+_scheduler: Optional[RenderScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RenderScheduler:
+    """Shared scheduler; its pool is stopped when the interpreter exits."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RenderScheduler()
+            atexit.register(_scheduler.shutdown)
+        return _scheduler
+
+
+def render_figures(jobs: List[RenderJob], force: bool = False) -> List[bool]:
+    """Render jobs with the shared scheduler; see RenderScheduler.render."""
+    return get_scheduler().render(jobs, force=force)
+
+
+def owner_earnings_chart_paths(ticker: str, charts_dir: str = "charts",
+                               profile: str = DEFAULT_PROFILE, chart_format: str = "png") -> List[str]:
+    """Files of the three owner earnings charts of a ticker, in OWNER_EARNINGS_CHARTS order."""
+    from .charts import OWNER_EARNINGS_CHARTS
+
+    prefix = ticker.lower().replace('.', '')
+    return [os.path.join(charts_dir, chart_filename(f"{prefix}_{kind}", get_profile(profile), chart_format))
+            for kind in OWNER_EARNINGS_CHARTS]
+
+
+def share_chart_paths(ticker: str, output_dir: str = './analysis_output',
+                      profile: str = DEFAULT_PROFILE, chart_format: str = "png") -> Tuple[str, str]:
+    """Files of the shares and debt charts of a ticker."""
+    render_profile = get_profile(profile)
+    return (os.path.join(output_dir, chart_filename(f"{ticker}_shares_analysis", render_profile, chart_format)),
+            os.path.join(output_dir, chart_filename(f"{ticker}_debt_analysis", render_profile, chart_format)))
+
+
+def owner_earnings_chart_jobs(ticker: str, annual_df, quarterly_df, charts_dir: str = "charts",
+                              profile: str = DEFAULT_PROFILE,
+                              chart_format: str = "png") -> List[RenderJob]:
+    """
+    Jobs for the three owner earnings charts of a ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        annual_df: Annual owner earnings prepared by prepare_annual_data
+        quarterly_df: Quarterly owner earnings prepared by prepare_quarterly_data
+        charts_dir: Directory to save the charts in
+        profile: Name of the RenderProfile
+        chart_format: png, svg or webp
+
+    Returns:
+        List[RenderJob]: Comparison, components breakdown and volatility charts
+    """
+    from .charts import (OWNER_EARNINGS_CHARTS, PLOTTING_STYLE, SAVE_OPTIONS, is_bank_or_insurance,
+                         render_owner_earnings_chart)
+
+    is_financial = is_bank_or_insurance(ticker)
+    save_options = get_profile(profile).save_options(SAVE_OPTIONS)
+    paths = owner_earnings_chart_paths(ticker, charts_dir, profile, chart_format)
+    return [RenderJob(name=os.path.basename(path),
+                      path=path,
+                      function=render_owner_earnings_chart,
+                      args=(kind, ticker, annual_df, quarterly_df, is_financial),
+                      save_options=save_options,
+                      settings={'style': PLOTTING_STYLE})
+            for kind, path in zip(OWNER_EARNINGS_CHARTS, paths)]
+
+
+def share_chart_jobs(ticker: str, metrics: dict, output_dir: str = './analysis_output',
+                     profile: str = DEFAULT_PROFILE, chart_format: str = "png") -> List[RenderJob]:
+    """
+    Jobs for the shares and debt charts of a ticker.
+
+    Args:
+        ticker: Stock ticker symbol
+        metrics: Result of charts.extract_share_debt_metrics
+        output_dir: Directory to save the charts in
+        profile: Name of the RenderProfile
+        chart_format: png, svg or webp
+
+    Returns:
+        List[RenderJob]: The charts the metrics have data for
+    """
+    from .charts import (SHARES_SAVE_OPTIONS, has_debt_chart, has_shares_chart, plot_debt_chart,
+                         plot_shares_chart)
+
+    shares_path, debt_path = share_chart_paths(ticker, output_dir, profile, chart_format)
+    save_options = get_profile(profile).save_options(SHARES_SAVE_OPTIONS)
+    settings = {'style': 'default'}
+    jobs = []
+    if has_shares_chart(metrics):
+        jobs.append(RenderJob(os.path.basename(shares_path), shares_path, plot_shares_chart,
+                              (ticker, metrics), save_options, settings))
+    if has_debt_chart(metrics):
+        jobs.append(RenderJob(os.path.basename(debt_path), debt_path, plot_debt_chart,
+                              (ticker, metrics), save_options, settings))
+    return jobs
@@ -0,0 +1,56 @@
+"""
+Tests for reusing stored owner earnings statistics.
+"""
+
+import pandas as pd
+
+from marketswimmer.core.analytics import compute_earnings_statistics, statistics_path
+from marketswimmer.core.context import AnalysisContext
+from marketswimmer.core.stage_cache import fingerprint_file
+
+
+def write_owner_earnings(context, data_folder, quarterly_values):
+    annual = pd.DataFrame({'Period': ["2023", "2024"], 'Owner Earnings': [4e9, 5e9]})
+    quarterly = pd.DataFrame({'Period': ["2024Q1", "2024Q2", "2024Q3", "2024Q4"],
+                              'Owner Earnings': quarterly_values})
+    annual.to_csv(context.owner_earnings_path(data_folder, 'annual'), index=False)
+    quarterly.to_csv(context.owner_earnings_path(data_folder, 'quarterly'), index=False)
+    return annual, quarterly
+
+
+def store_statistics(context, data_folder, annual, quarterly):
+    statistics = compute_earnings_statistics(context.ticker, annual, quarterly)
+    statistics.sources = {period: fingerprint_file(context.owner_earnings_path(data_folder, period))
+                          for period in ('annual', 'quarterly')}
+    statistics.save(statistics_path(data_folder, context.ticker))
+    return statistics
+
+
+def test_stored_statistics_are_reused_while_the_csvs_are_unchanged(tmp_path):
+    context = AnalysisContext(ticker="TST")
+    annual, quarterly = write_owner_earnings(context, tmp_path, [1e9, 2e9, 3e9, 4e9])
+    stored = store_statistics(context, tmp_path, annual, quarterly)
+
+    assert context.ensure_earnings_statistics(tmp_path) == stored
+    assert context.quarterly_owner_earnings is None  # Nothing was recomputed
+
+
+def test_statistics_of_other_csv_content_are_recomputed(tmp_path):
+    context = AnalysisContext(ticker="TST")
+    annual, quarterly = write_owner_earnings(context, tmp_path, [1e9, 2e9, 3e9, 4e9])
+    store_statistics(context, tmp_path, annual, quarterly)
+    write_owner_earnings(context, tmp_path, [5e9, 6e9, 7e9, 8e9])
+
+    statistics = context.ensure_earnings_statistics(tmp_path)
+    assert statistics.mean == 6500.0
+    assert statistics.sources['quarterly'] == fingerprint_file(context.owner_earnings_path(tmp_path, 'quarterly'))
+
+
+def test_statistics_without_sources_are_recomputed(tmp_path):
+    context = AnalysisContext(ticker="TST")
+    annual, quarterly = write_owner_earnings(context, tmp_path, [1e9, 2e9, 3e9, 4e9])
+    stale = compute_earnings_statistics(context.ticker, annual, quarterly)
+    stale.mean = -1.0
+    stale.save(statistics_path(tmp_path, context.ticker))
+
+    assert context.ensure_earnings_statistics(tmp_path).mean == 2500.0
@@ -0,0 +1,62 @@
+"""
+Tests for the permissions of the worker daemon's socket.
+"""
+
+import os
+import stat
+import threading
+
+import pytest
+
+from marketswimmer.core import daemon
+from marketswimmer.core.daemon import DISABLE_ENV, SOCKET_ENV, WorkerDaemon
+
+pytestmark = pytest.mark.skipif(not daemon.daemon_supported(), reason="needs Unix sockets")
+
+
+def mode(path):
+    return stat.S_IMODE(os.lstat(path).st_mode)
+
+
+@pytest.fixture
+def serve(tmp_path, monkeypatch):
+    # serve_forever() sets this for the whole process
+    monkeypatch.setenv(DISABLE_ENV, "1")
+    threads = []
+
+    def start(path):
+        monkeypatch.setenv(SOCKET_ENV, str(path))
+        server = WorkerDaemon(path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        threads.append(thread)
+        for _ in range(100):
+            status = daemon.request("status")
+            if status is not None:
+                return status
+            thread.join(0.05)
+        raise AssertionError("daemon did not come up")
+
+    yield start
+    daemon.request("stop")
+    for thread in threads:
+        thread.join(5)
+
+
+def test_socket_and_directory_are_private(tmp_path, serve):
+    directory = tmp_path / "daemon"
+    directory.mkdir(mode=0o755)
+    os.chmod(directory, 0o755)
+
+    assert serve(directory / "daemon.sock")["pid"] == os.getpid()
+    assert mode(directory) == 0o700
+    assert mode(directory / "daemon.sock") == 0o600
+
+
+def test_symlinked_directory_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setenv(DISABLE_ENV, "1")
+    target = tmp_path / "elsewhere"
+    target.mkdir()
+    (tmp_path / "daemon").symlink_to(target)
+    with pytest.raises(RuntimeError, match="not a directory owned by you"):
+        WorkerDaemon(tmp_path / "daemon" / "daemon.sock").serve_forever()
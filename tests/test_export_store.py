@@ -0,0 +1,81 @@
+"""
+Tests for sharing one export store between several ExportStore instances.
+
+Each instance stands in for a separate process (the download manager,
+`ms fetch`, `ms import`); none of them may lose the others' entries.
+"""
+
+import threading
+
+from marketswimmer.core.export_store import ExportStore
+
+
+def export(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_stores_keep_each_others_entries(tmp_path):
+    root = tmp_path / "downloaded_files"
+    first, second = ExportStore(root), ExportStore(root)
+
+    aapl = first.import_file(export(tmp_path, "a.xlsx", b"aapl"), "AAPL", "financials_export_aapl.xlsx")
+    msft = second.import_file(export(tmp_path, "m.xlsx", b"msft"), "MSFT", "financials_export_msft.xlsx")
+    first.remember_validators("https://example.com/aapl", aapl, '"a1"', None)
+    second.remember_validators("https://example.com/msft", msft, '"m1"', None)
+
+    index = ExportStore(root).index
+    assert set(index['aliases']) == {aapl.name, msft.name}
+    assert set(index['validators']) == {"https://example.com/aapl", "https://example.com/msft"}
+    # Lookups see entries another store wrote after this one was created
+    assert first.validators("https://example.com/msft")['etag'] == '"m1"'
+    assert first.alias_names() == {aapl.name, msft.name}
+    assert first.verify(msft)
+
+
+def test_garbage_collection_keeps_entries_of_other_stores(tmp_path):
+    root = tmp_path / "downloaded_files"
+    first, second = ExportStore(root), ExportStore(root)
+    old = first.import_file(export(tmp_path, "old.xlsx", b"old"), "AAPL", "financials_export_aapl_1.xlsx")
+    new = second.import_file(export(tmp_path, "new.xlsx", b"new"), "AAPL", "financials_export_aapl_2.xlsx")
+    old.unlink()
+
+    assert first.collect_garbage() == 1
+    assert set(ExportStore(root).index['aliases']) == {new.name}
+    assert second.verify(new)
+
+
+def test_concurrent_imports_all_land_in_the_index(tmp_path):
+    root = tmp_path / "downloaded_files"
+    sources = [export(tmp_path, f"{i}.xlsx", f"export {i}".encode()) for i in range(8)]
+
+    def run(i):
+        # A fresh store per thread, like separate processes
+        ExportStore(root).import_file(sources[i], f"T{i}", f"financials_export_t{i}.xlsx")
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(sources))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ExportStore(root).index['aliases']) == len(sources)
+
+
+def test_download_manager_reports_reuse_only_for_known_aliases(tmp_path, monkeypatch, capsys):
+    from marketswimmer.core import download_manager
+    from marketswimmer.core.download_manager import DownloadManager
+
+    monkeypatch.chdir(tmp_path)
+    # Every import in the same second, so new content gets a suffixed alias name
+    monkeypatch.setattr(download_manager.time, 'strftime', lambda fmt, *args: "2025_01_01_120000")
+    manager = DownloadManager()
+
+    first = manager.copy_to_project(export(tmp_path, "v1.xlsx", b"v1"), "TST")
+    second = manager.copy_to_project(export(tmp_path, "v2.xlsx", b"v2"), "TST")
+    again = manager.copy_to_project(export(tmp_path, "v2 copy.xlsx", b"v2"), "TST")
+    output = capsys.readouterr().out
+
+    assert second.name == "financials_export_tst_2025_01_01_120000_1.xlsx" and again == second
+    assert output.count("Copied to") == 2 and output.count("Data unchanged") == 1
@@ -0,0 +1,116 @@
+"""
+Tests for the headless export fetcher against a local stand-in server.
+
+The server answers each request with the next canned response queued for
+its path and records the request headers, so retries and conditional
+requests can be checked.
+"""
+
+import io
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from marketswimmer.core.export_store import ExportStore
+from marketswimmer.core.fetcher import ExportFetcher
+
+
+def workbook_bytes(text):
+    """A small zip archive; the fetcher only checks that exports are zip files."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr("xl/workbook.xml", text)
+    return buffer.getvalue()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.received.append((self.path, dict(self.headers)))
+        queue = self.server.responses.get(self.path)
+        status, headers, body = queue.pop(0) if queue else (404, {}, b"")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.responses = {}
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(server, tmp_path):
+    fetcher = ExportFetcher(url_template=f"http://127.0.0.1:{server.server_port}/exports/{{ticker}}",
+                            workers=1, requests_per_second=0, retries=2, backoff=0.01, timeout=5,
+                            target_folder=tmp_path / "downloaded_files")
+    yield fetcher
+    fetcher.close()
+
+
+def test_download_is_stored_through_the_export_store(server, fetcher, tmp_path):
+    content = workbook_bytes("tst")
+    server.responses["/exports/TST"] = [(200, {'ETag': '"v1"'}, content)]
+
+    result = fetcher.fetch("tst")
+    assert (result.status, result.attempts, result.error) == ('downloaded', 1, None)
+    assert result.path.read_bytes() == content
+    store = ExportStore(tmp_path / "downloaded_files")
+    assert store.verify(result.path)
+    assert store.validators(result.url)['etag'] == '"v1"'
+
+
+def test_service_unavailable_is_retried(server, fetcher):
+    server.responses["/exports/TST"] = [(503, {'Retry-After': '0'}, b""),
+                                        (200, {}, workbook_bytes("tst"))]
+
+    result = fetcher.fetch("TST")
+    assert (result.status, result.attempts) == ('downloaded', 2)
+
+
+def test_not_found_fails_after_one_attempt(server, fetcher):
+    result = fetcher.fetch("NOPE")
+    assert (result.status, result.attempts, result.error) == ('failed', 1, "HTTP 404")
+    assert len(server.received) == 1
+
+
+def test_repeat_fetch_is_conditional(server, fetcher):
+    server.responses["/exports/TST"] = [(200, {'ETag': '"v1"'}, workbook_bytes("tst")),
+                                        (304, {'ETag': '"v1"'}, b"")]
+    first = fetcher.fetch("TST")
+
+    second = fetcher.fetch("TST")
+    assert server.received[-1][1].get('If-None-Match') == '"v1"'
+    assert (second.status, second.path) == ('not_modified', first.path)
+
+
+def test_forced_download_of_identical_bytes_reuses_the_alias(server, fetcher):
+    content = workbook_bytes("tst")
+    server.responses["/exports/TST"] = [(200, {'ETag': '"v1"'}, content), (200, {'ETag': '"v1"'}, content)]
+    first = fetcher.fetch("TST")
+
+    second = fetcher.fetch("TST", force=True)
+    assert 'If-None-Match' not in server.received[-1][1]
+    assert (second.status, second.path) == ('unchanged', first.path)
+
+
+def test_unexpected_not_modified_fails(server, fetcher):
+    server.responses["/exports/TST"] = [(304, {}, b"")]
+
+    result = fetcher.fetch("TST", force=True)
+    assert (result.status, result.error) == ('failed', "unexpected 304 without a conditional request")
@@ -0,0 +1,88 @@
+"""
+Import-time regression tests.
+
+Importing the package or the CLI must not pull in the heavy analysis
+libraries, and must stay within a time budget. The budget (seconds) can be
+raised on slow machines with MARKETSWIMMER_IMPORT_BUDGET.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "seaborn", "requests", "PyQt6"]
+
+IMPORT_BUDGET = float(os.environ.get("MARKETSWIMMER_IMPORT_BUDGET", "0.5"))
+
+
+def run_probe(code):
+    """Run code in a fresh interpreter and return the JSON it prints."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    env["MARKETSWIMMER_NO_DAEMON"] = "1"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            env=env, cwd=PROJECT_ROOT, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def loaded_heavy_modules_after(statements):
+    code = (
+        "import json, sys\n"
+        f"{statements}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    return run_probe(code)
+
+
+@pytest.mark.parametrize("statements", [
+    "import marketswimmer",
+    "import marketswimmer.core",
+    "import marketswimmer.visualization",
+    "import marketswimmer.gui",
+    "import marketswimmer.cli",
+])
+def test_package_imports_are_light(statements):
+    assert loaded_heavy_modules_after(statements) == []
+
+
+@pytest.mark.parametrize("command", ["version", "status"])
+def test_light_commands_do_not_load_analysis_libraries(command):
+    statements = (
+        "import contextlib, io\n"
+        "from marketswimmer.cli import app\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        f"    app([{command!r}], standalone_mode=False)"
+    )
+    assert loaded_heavy_modules_after(statements) == []
+
+
+def test_cli_import_time_within_budget():
+    code = (
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        "import marketswimmer.cli\n"
+        "print(json.dumps(time.perf_counter() - started))\n"
+    )
+    # Best of three, to keep a busy machine from failing the test
+    best = min(run_probe(code) for _ in range(3))
+    assert best < IMPORT_BUDGET, (
+        f"importing marketswimmer.cli took {best:.3f}s (budget {IMPORT_BUDGET:.3f}s)"
+    )
+
+
+def test_lazy_attributes_resolve():
+    code = (
+        "import json\n"
+        "import marketswimmer\n"
+        "from marketswimmer.core import OwnerEarningsCalculator, AnalysisContext\n"
+        "print(json.dumps([marketswimmer.OwnerEarningsCalculator is OwnerEarningsCalculator,\n"
+        "                  AnalysisContext.__name__, callable(marketswimmer.cli_main)]))\n"
+    )
+    assert run_probe(code) == [True, "AnalysisContext", True]
@@ -0,0 +1,98 @@
+"""
+Tests for the integer period codes and the Period type.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from marketswimmer.core import periods
+from marketswimmer.core.periods import INVALID_CODE, Period
+
+
+def test_encode_round_trips_years_and_quarters():
+    codes = periods.encode([2023, 2024, 2024], [2, 3, 1], [False, False, True])
+    assert periods.years(codes).tolist() == [2023, 2024, 2024]
+    assert periods.quarters(codes).tolist() == [2, 3, 4]  # Annual periods are Q4
+    assert periods.is_annual(codes).tolist() == [False, False, True]
+    assert periods.encode(2024, 3) == int(Period("2024Q3"))
+
+
+def test_labels_and_parsing_agree():
+    labels = pd.Series([2024, "2024", "2024Q3", "2024-Q3", "Q3-2024", "TTM", None], dtype=object)
+    codes = periods.codes_from_labels(labels)
+    assert periods.labels(codes[:5]).tolist() == ["2024", "2024", "2024Q3", "2024Q3", "2024Q3"]
+    assert codes[5:].tolist() == [INVALID_CODE, INVALID_CODE]
+
+
+def test_start_dates():
+    codes = [Period("2024Q3"), Period(2024)]
+    assert periods.start_dates(codes).tolist() == [pd.Timestamp("2024-07-01"), pd.Timestamp("2024-01-01")]
+    assert periods.start_dates(codes, annual_month=None)[1] == pd.Timestamp("2024-10-01")
+    assert periods.start_dates([INVALID_CODE]).isna().all()
+
+
+def test_shift_and_year_ago_on_arrays():
+    codes = np.array([Period("2024Q1"), Period("2024Q4"), Period(2024)])
+    assert periods.labels(periods.shift(codes, -1)).tolist() == ["2023Q4", "2024Q3", "2023"]
+    assert periods.labels(periods.shift(codes, 1)).tolist() == ["2024Q2", "2025Q1", "2025"]
+    assert periods.labels(periods.year_ago(codes)).tolist() == ["2023Q1", "2023Q4", "2023"]
+
+
+def test_period_arithmetic():
+    assert Period("2024Q1").previous() == Period("2023Q4")
+    assert Period("2024Q1").shift(5) == Period("2025Q2")
+    assert Period("2024Q3").year_ago() == Period("2023Q3")
+    assert Period(2024).previous() == Period(2023)
+    assert Period(2024).year_ago() == Period(2023)
+
+
+def test_mixed_annual_and_quarterly_sort_chronologically():
+    mixed = [Period("2024Q1"), Period(2023), Period("2023Q4"), Period("2023Q1")]
+    assert [str(p) for p in sorted(mixed)] == ["2023Q1", "2023Q4", "2023", "2024Q1"]
+    order = np.argsort(np.array(mixed, dtype=np.int64))
+    assert [str(mixed[i]) for i in order] == ["2023Q1", "2023Q4", "2023", "2024Q1"]
+
+
+def test_int_constructor_means_a_year():
+    period = Period(2024)
+    assert period.is_annual and period.year == 2024 and str(period) == "2024"
+    assert Period.from_code(int(period)) == period
+    assert Period(period) is period
+
+
+def test_invalid_periods_are_rejected():
+    with pytest.raises(ValueError):
+        Period("TTM")
+    with pytest.raises(ValueError):
+        Period.from_code(2024)  # Would decode to the year 253
+    with pytest.raises(ValueError):
+        Period.quarterly(2024, 5)
+
+
+def test_period_labels_and_pickle():
+    period = Period("2024Q3")
+    assert (str(period), repr(period), f"{period:>8}") == ("2024Q3", "Period('2024Q3')", "  2024Q3")
+    assert period.frequency == periods.QUARTERLY and Period(2024).frequency == periods.ANNUAL
+    restored = pickle.loads(pickle.dumps(period))
+    assert type(restored) is Period and restored == period
+
+
+def test_working_capital_changes_use_the_previous_period_of_the_same_frequency():
+    from marketswimmer.core.owner_earnings import OwnerEarningsCalculator
+
+    calculator = OwnerEarningsCalculator()
+    calculator.preferred_data_type = 'Quarterly'
+    # Quarterly columns plus an annual column; Jun '23 is missing
+    calculator.balance_sheet = pd.DataFrame({
+        'Item': ['Total Current Assets', 'Total Current Liabilities'],
+        "Mar '23": [100.0, 50.0],
+        "Sep '23": [130.0, 60.0],
+        "Dec '23": [150.0, 70.0],
+        "Mar '24": [180.0, 90.0],
+        "FY 2023": [999.0, 1.0],
+    })
+    changes = calculator._calculate_working_capital_from_balance_sheet()
+    assert changes == {Period("2023Q4"): 10.0, Period("2024Q1"): 10.0}
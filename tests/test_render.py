@@ -0,0 +1,63 @@
+"""
+Tests for the render scheduler's pool handling.
+
+The job functions write text files instead of charts, so the tests do
+not depend on matplotlib; they are module-level so that spawned workers
+can import them.
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+from marketswimmer.visualization import render
+from marketswimmer.visualization.render import RenderJob, RenderScheduler
+
+
+def write_text(text, path, save_options):
+    Path(path).write_text(text)
+
+
+def crash_in_worker(text, path, save_options):
+    """Kills a pool worker; renders normally in the calling process."""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    Path(path).write_text(text)
+
+
+def jobs(tmp_path, function, count):
+    return [RenderJob(name=f"chart {i}", path=str(tmp_path / f"chart_{i}.txt"), function=function,
+                      args=(f"chart {i}",)) for i in range(count)]
+
+
+def test_small_runs_render_in_process(tmp_path):
+    scheduler = RenderScheduler(workers=2)
+    assert scheduler._render_jobs(jobs(tmp_path, write_text, 3)) == [True] * 3
+    assert scheduler._pool is None  # Not worth spawning workers for
+
+
+def test_pool_starts_after_warmup(tmp_path, monkeypatch):
+    monkeypatch.setattr(render, 'POOL_WARMUP_JOBS', 4)
+    scheduler = RenderScheduler(workers=2)
+    try:
+        scheduler._render_jobs(jobs(tmp_path, write_text, 2))
+        assert scheduler._pool is None
+        assert scheduler._render_jobs(jobs(tmp_path, write_text, 2)) == [True, True]
+        assert scheduler._pool is not None
+    finally:
+        scheduler.shutdown()
+
+
+def test_broken_pool_falls_back_to_in_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(render, 'POOL_MIN_JOBS', 2)
+    scheduler = RenderScheduler(workers=2)
+    try:
+        batch = jobs(tmp_path, crash_in_worker, 3)
+        assert scheduler._render_jobs(batch) == [True] * 3
+        assert [Path(job.path).read_text() for job in batch] == ["chart 0", "chart 1", "chart 2"]
+        assert scheduler._pool is None
+        # The next call starts a fresh pool instead of failing
+        assert scheduler._render_jobs(jobs(tmp_path, write_text, 2)) == [True, True]
+        assert scheduler._pool is not None
+    finally:
+        scheduler.shutdown()
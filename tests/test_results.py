@@ -0,0 +1,123 @@
+"""
+Tests for the column-backed owner earnings results.
+
+The tables must read exactly like the dict-of-dicts results the
+calculator returned before; the reference functions below are those
+calculations.
+"""
+
+import pickle
+
+import pytest
+
+from marketswimmer.core.owner_earnings import OwnerEarningsCalculator
+from marketswimmer.core.periods import Period
+from marketswimmer.core.results import AlternativeMethodsTable, OwnerEarningsTable
+
+COMPONENTS = {
+    'net_income': {Period(2024): 100.0, Period(2023): 90.0, Period(2022): 80.0},
+    # No operating cash flow in 2022
+    'operating_cash_flow': {Period(2024): 130.0, Period(2023): 0.0},
+    'depreciation': {Period(2024): 20.0, Period(2023): 15.0},
+    'capex': {Period(2024): -40.0, Period(2023): -35.0, Period(2022): -30.0},
+    # 2021 only has a working capital change
+    'working_capital_change': {Period(2024): 5.0, Period(2022): -7.0, Period(2021): 3.0},
+}
+
+
+def reference_owner_earnings(components, exclude_working_capital):
+    result = {}
+    years = set().union(*(series.keys() for series in components.values()))
+    for year in sorted(years, reverse=True):
+        net_income = components['net_income'].get(year, 0)
+        depreciation = components['depreciation'].get(year, 0)
+        capex = components['capex'].get(year, 0)
+        wc_change = components['working_capital_change'].get(year, 0)
+        value = net_income + depreciation - abs(capex)
+        if not exclude_working_capital:
+            value -= wc_change
+        result[year] = {'net_income': net_income, 'depreciation': depreciation, 'capex': capex,
+                        'working_capital_change': wc_change, 'owner_earnings': value}
+    return result
+
+
+def reference_alternative_methods(components):
+    result = {}
+    years = set().union(*(series.keys() for series in components.values()))
+    for year in sorted(years, reverse=True):
+        net_income = components['net_income'].get(year, 0)
+        ocf = components['operating_cash_flow'].get(year, 0)
+        depreciation = components['depreciation'].get(year, 0)
+        capex = components['capex'].get(year, 0)
+        wc_change = components['working_capital_change'].get(year, 0)
+        methods = {'traditional': {
+            'value': net_income + depreciation - abs(capex) - wc_change,
+            'method': 'Net Income + Depreciation - CapEx - Working Capital Changes',
+            'note': 'Standard methodology',
+            'components': {'net_income': net_income, 'depreciation': depreciation,
+                           'capex': capex, 'working_capital_change': wc_change}}}
+        if ocf != 0:
+            cash_flow = {'operating_cash_flow': ocf, 'capex': capex}
+            methods['operating_cash_flow'] = {'value': ocf - abs(capex), 'method': 'Operating Cash Flow - CapEx',
+                                              'note': 'Uses actual cash flow from operations',
+                                              'components': cash_flow}
+            methods['free_cash_flow'] = {'value': ocf - abs(capex),
+                                         'method': 'Free Cash Flow (Operating Cash Flow - CapEx)',
+                                         'note': 'Standard free cash flow definition',
+                                         'components': cash_flow}
+        result[year] = methods
+    return result
+
+
+@pytest.fixture
+def calculator(monkeypatch):
+    calculator = OwnerEarningsCalculator()
+    calculator.company_name = "TST"
+    calculator.owner_earnings_data = COMPONENTS
+    monkeypatch.setattr(calculator, '_detect_insurance_company', lambda: False)
+    monkeypatch.setattr(calculator, '_detect_bank', lambda: False)
+    return calculator
+
+
+@pytest.mark.parametrize("force_bank", [False, True])
+def test_owner_earnings_table_matches_dict_results(calculator, force_bank):
+    calculator.force_bank = force_bank
+    table = calculator.calculate_owner_earnings()
+    expected = reference_owner_earnings(COMPONENTS, exclude_working_capital=force_bank)
+
+    assert isinstance(table, OwnerEarningsTable)
+    assert list(table) == list(expected)  # Most recent first
+    assert {period: dict(record) for period, record in table.items()} == expected
+    assert table.column('owner_earnings').tolist() == [row['owner_earnings'] for row in expected.values()]
+
+
+def test_alternative_methods_table_matches_dict_results(calculator):
+    table = calculator.calculate_alternative_owner_earnings_methods()
+    expected = reference_alternative_methods(COMPONENTS)
+
+    assert isinstance(table, AlternativeMethodsTable)
+    assert list(table) == list(expected)
+    for period, methods in table.items():
+        # Cash flow methods only where there is an operating cash flow
+        assert list(methods) == list(expected[period])
+        for name, method in methods.items():
+            assert dict(method) == expected[period][name]
+    assert 'operating_cash_flow' not in table[2023] and 'operating_cash_flow' in table[2024]
+    assert table.method_values('operating_cash_flow').tolist() == [90.0]
+
+
+def test_tables_accept_the_old_key_types(calculator):
+    table = calculator.calculate_owner_earnings()
+    assert 2024 in table and "2024" in table and Period(2024) in table
+    assert table[2024] == table["2024"] == table[Period(2024)]
+    assert table.get(2024)['owner_earnings'] == 75.0
+    assert 2020 not in table and "TTM" not in table and table.get(2020) is None
+    with pytest.raises(KeyError):
+        table[int(Period(2024))]  # A raw code is not a year
+
+
+def test_tables_pickle(calculator):
+    table = calculator.calculate_owner_earnings()
+    restored = pickle.loads(pickle.dumps(table))
+    assert list(restored) == list(table)
+    assert dict(restored[2024]) == dict(table[2024])
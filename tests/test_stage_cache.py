@@ -0,0 +1,103 @@
+"""
+Tests for the make-style stage cache.
+
+Each "run" opens a fresh StageCache on the same manifest, the way the
+workflow does for every analysis.
+"""
+
+import pytest
+
+from marketswimmer.core.context import AnalysisContext
+from marketswimmer.core.stage_cache import Stage, StageCache
+from marketswimmer.core.workflow import AnalysisWorkflow
+
+
+@pytest.fixture
+def files(tmp_path):
+    workbook = tmp_path / "export.xlsx"
+    workbook.write_bytes(b"workbook v1")
+    return {'manifest': tmp_path / ".stages_tst.json", 'workbook': workbook, 'output': tmp_path / "out.csv"}
+
+
+def make_stage(files, runs, params=None):
+    def run():
+        runs.append(1)
+        files['output'].write_text(f"result of {files['workbook'].read_bytes()!r}")
+        return True
+    return Stage(name="owner_earnings", description="Owner earnings", run=run,
+                 inputs={'workbook': files['workbook']}, outputs=[files['output']],
+                 params=params or {'profile': 'publication'})
+
+
+def run_once(files, stage, version="1.0"):
+    """Check and (if needed) run the stage like the workflow does; returns the decision."""
+    cache = StageCache(files['manifest'], version=version)
+    up_to_date, reasons = cache.check(stage)
+    if not up_to_date:
+        cache.forget(stage.outputs)
+        assert stage.run()
+        assert cache.record(stage, stage.outputs)
+        cache.save()
+    return up_to_date, reasons
+
+
+def test_unchanged_stage_is_skipped(files):
+    runs = []
+    stage = make_stage(files, runs)
+    assert run_once(files, stage) == (False, ["no previous successful run"])
+    up_to_date, reasons = run_once(files, stage)
+    assert up_to_date and reasons[0].startswith("inputs unchanged")
+    assert len(runs) == 1
+
+
+def test_changed_input_file_reruns_the_stage(files):
+    runs = []
+    stage = make_stage(files, runs)
+    run_once(files, stage)
+    files['workbook'].write_bytes(b"workbook v2")
+    assert run_once(files, stage) == (False, ["input 'workbook' changed"])
+    assert len(runs) == 2
+    assert run_once(files, stage)[0]
+
+
+def test_changed_parameter_reruns_the_stage(files):
+    runs = []
+    run_once(files, make_stage(files, runs, {'profile': 'publication'}))
+    draft = make_stage(files, runs, {'profile': 'draft'})
+    assert run_once(files, draft) == (False, ["parameters changed"])
+    assert len(runs) == 2
+    assert run_once(files, draft)[0]
+
+
+def test_version_and_output_changes_rerun_the_stage(files):
+    runs = []
+    stage = make_stage(files, runs)
+    run_once(files, stage)
+    assert run_once(files, stage, version="1.1") == (False, ["MarketSwimmer version changed (1.0 -> 1.1)"])
+    files['output'].write_text("edited by hand")
+    assert run_once(files, stage, version="1.1") == (False, [f"output {files['output']} was modified"])
+    files['output'].unlink()
+    assert run_once(files, stage, version="1.1") == (False, [f"output {files['output']} is missing"])
+    assert len(runs) == 4
+
+
+def test_workflow_explains_why_a_stage_reruns(files, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    workflow = AnalysisWorkflow(stage_workers=1)
+    context = AnalysisContext(ticker="TST")
+    runs = []
+    stage = make_stage(files, runs)
+
+    def run_stage():
+        workflow.stage_cache = StageCache(files['manifest'], version="1.0")
+        state = workflow._run_stage(stage, context, explain=True, use_cache=True)
+        return state, capsys.readouterr().out
+
+    assert run_stage()[0] == 'done'
+    state, output = run_stage()
+    assert state == 'skipped' and "SKIP" in output
+    files['workbook'].write_bytes(b"workbook v2")
+    state, output = run_stage()
+    assert state == 'done'
+    assert "Owner earnings: RUN - input 'workbook' changed" in output
+    assert len(runs) == 2
@@ -0,0 +1,104 @@
+"""
+Tests for the workflow's stage DAG scheduler.
+
+The stages are stubs that print and return a canned result, so the
+scheduling is tested without any workbook or chart.
+"""
+
+import threading
+
+import pytest
+
+from marketswimmer.core.context import AnalysisContext
+from marketswimmer.core.events import STAGE_END, EventBus
+from marketswimmer.core.stage_cache import Stage, StageCache
+from marketswimmer.core.workflow import AnalysisWorkflow
+
+
+@pytest.fixture
+def workflow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    workflow = AnalysisWorkflow(stage_workers=3, events=EventBus())
+    workflow.stage_cache = StageCache(tmp_path / "data" / ".stages_tst.json")
+    return workflow
+
+
+def stage(name, result=True, depends_on=(), fatal=True, before=None):
+    """A stub stage that prints its name; before() runs first and may raise."""
+    def run():
+        if before is not None:
+            before()
+        print(f"output of {name}")
+        return result
+    return Stage(name=name, description=name.title(), run=run, depends_on=list(depends_on), fatal=fatal)
+
+
+def run_graph(workflow, stages, cancel_event=None):
+    ends = []
+    workflow.events.subscribe(lambda event: ends.append(event.stage) if event.kind == STAGE_END else None)
+    status = workflow._run_stage_graph(stages, AnalysisContext(ticker="TST"), explain=False,
+                                       use_cache=False, cancel_event=cancel_event)
+    return status, ends
+
+
+def test_failed_stage_blocks_its_dependents_only(workflow):
+    status, _ = run_graph(workflow, [
+        stage("a", result=False),
+        stage("b", depends_on=["a"]),
+        stage("c", depends_on=["b"]),
+        stage("d"),
+    ])
+    assert status == {'a': 'failed', 'b': 'blocked', 'c': 'blocked', 'd': 'done'}
+
+
+def test_exception_fails_a_fatal_stage(workflow):
+    def boom():
+        raise RuntimeError("boom")
+
+    status, _ = run_graph(workflow, [stage("a", before=boom), stage("b", depends_on=["a"])])
+    assert status == {'a': 'failed', 'b': 'blocked'}
+
+
+def test_non_fatal_stage_never_fails_the_graph(workflow):
+    def boom():
+        raise RuntimeError("boom")
+
+    status, _ = run_graph(workflow, [
+        stage("a", result=False, fatal=False),
+        stage("b", fatal=False, before=boom),
+        stage("c", depends_on=["a", "b"]),
+    ])
+    assert status == {'a': 'done', 'b': 'done', 'c': 'done'}
+
+
+def test_cancel_lets_running_stages_finish_but_starts_no_new_ones(workflow):
+    cancel = threading.Event()
+    status, _ = run_graph(workflow, [
+        stage("a", before=cancel.set),
+        stage("b", depends_on=["a"]),
+        stage("c", depends_on=["b"]),
+    ], cancel_event=cancel)
+    assert status == {'a': 'done', 'b': 'cancelled', 'c': 'cancelled'}
+
+
+def test_output_and_end_events_follow_declaration_order(workflow, capsys):
+    second_done = threading.Event()
+    finished = []
+
+    def second():
+        print("output of second")
+        finished.append("second")
+        second_done.set()
+        return True
+
+    status, ends = run_graph(workflow, [
+        # Only finishes once "second" has
+        stage("first", before=lambda: second_done.wait(5) and finished.append("first")),
+        Stage(name="second", description="Second", run=second),
+        stage("third", depends_on=["second"]),
+    ])
+    assert status == {'first': 'done', 'second': 'done', 'third': 'done'}
+    assert finished == ["second", "first"]
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("output of")]
+    assert lines == ["output of first", "output of second", "output of third"]
+    assert ends == ["first", "second", "third"]